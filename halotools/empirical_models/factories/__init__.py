@@ -5,6 +5,7 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 from .mock_factory_template import *
 from .subhalo_mock_factory import *
 from .hod_mock_factory import *
+from .galaxy_table_buffer import *
 
 from .model_factory_template import *
 from .hod_model_factory import *
@@ -0,0 +1,248 @@
+"""
+Module containing the `~halotools.empirical_models.GalaxyTableBuffer` class,
+a columnar store of the galaxies of a mock that can be reused across
+calls to `~halotools.empirical_models.HodMockFactory.populate`.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import numpy as np
+from astropy.table import Table
+
+from ...custom_exceptions import HalotoolsError
+
+
+__all__ = ('GalaxyTableBuffer', )
+
+_column_alignment = 64
+
+
+class GalaxyTableBuffer(object):
+    """ Structure-of-arrays storage for the ``galaxy_table`` of a mock.
+
+    All columns are contiguous arrays carved out of a single pre-allocated
+    block of memory. The ``gal_type`` column is stored as an array of integer codes,
+    the index of the galaxy type in ``gal_types``, rather than as an array of strings.
+    When a new mock is allocated with the same columns and no more galaxies
+    than the capacity of the buffer, the memory is reused without any new allocation.
+
+    The columns are accessed like those of an `~astropy.table.Table`,
+    and slicing the buffer with a slice object returns a view of its rows, so that
+    a `GalaxyTableBuffer` can be passed to the functions of the
+    ``mock_generation_calling_sequence`` of a model in place of the ``galaxy_table``.
+    The `as_table` method wraps the columns as an `~astropy.table.Table`
+    with a string-valued ``gal_type`` column.
+
+    Examples
+    --------
+    >>> buf = GalaxyTableBuffer(['centrals', 'satellites'])
+    >>> buf.allocate(5, [('halo_mvir', 'f8'), ('gal_type', object)])
+    >>> buf['gal_type'][0:2] = buf.gal_type_code('centrals')
+    >>> buf['gal_type'][2:] = buf.gal_type_code('satellites')
+    >>> buf['halo_mvir'][:] = 1e12
+    >>> galaxy_table = buf.as_table()
+    """
+
+    def __init__(self, gal_types, growth_factor=1.1):
+        """
+        Parameters
+        ----------
+        gal_types : list of strings
+            Galaxy types of the model, e.g., ['centrals', 'satellites'],
+            in the order defining the integer codes of the ``gal_type`` column.
+
+        growth_factor : float, optional
+            Whenever the buffer needs to grow, the new capacity is
+            ``growth_factor`` times the requested number of galaxies,
+            so that the memory can be reused by subsequent mocks with slightly more galaxies.
+            Default is 1.1.
+        """
+        self.gal_types = list(gal_types)
+        if len(self.gal_types) < np.iinfo(np.int8).max:
+            self._gal_type_code_dtype = np.dtype(np.int8)
+        else:
+            self._gal_type_code_dtype = np.dtype(np.int32)
+
+        if growth_factor < 1:
+            msg = "Input ``growth_factor`` must be no smaller than 1"
+            raise HalotoolsError(msg)
+        self.growth_factor = growth_factor
+
+        self.Ngals = 0
+        self.capacity = 0
+        self._arena = np.zeros(0, dtype=np.uint8)
+        self._layout = ()
+        self._columns = {}
+        self._colnames = []
+
+    def gal_type_code(self, gal_type):
+        """ Integer code used to store ``gal_type`` in the ``gal_type`` column.
+        """
+        return self.gal_types.index(gal_type)
+
+    def _column_dtype(self, key, dtype):
+        if key == 'gal_type':
+            return self._gal_type_code_dtype
+        else:
+            return np.dtype(dtype)
+
+    def allocate(self, Ngals, column_dtypes):
+        """ Set up the buffer to store ``Ngals`` galaxies with the input columns.
+
+        The memory of the previous mock is reused whenever the columns are the same
+        and ``Ngals`` does not exceed the capacity of the buffer.
+        In either case, all columns are initialized to zero.
+
+        Parameters
+        ----------
+        Ngals : int
+            Number of galaxies in the mock
+
+        column_dtypes : list
+            List of (name, dtype) pairs, one per column of the ``galaxy_table``.
+            The ``gal_type`` column is always stored as integer codes.
+        """
+        Ngals = int(Ngals)
+        layout = tuple((key, self._column_dtype(key, dtype)) for key, dtype in column_dtypes)
+
+        # The memory can be reused regardless of the order of the columns
+        if (self._layout is None) or (dict(layout) != dict(self._layout)) or (Ngals > self.capacity):
+            capacity = max(Ngals, int(np.ceil(self.growth_factor*Ngals)))
+            self._build_columns(layout, capacity)
+        else:
+            self._arena[:] = 0
+            self._colnames = [key for key, dtype in layout]
+
+        self.Ngals = Ngals
+
+    def _build_columns(self, layout, capacity):
+        """ Carve out one contiguous, aligned array per column from a single block of memory.
+        """
+        offsets = []
+        nbytes = 0
+        for key, dtype in layout:
+            offsets.append(nbytes)
+            column_nbytes = capacity*dtype.itemsize
+            nbytes += _column_alignment*int(np.ceil(column_nbytes/float(_column_alignment)))
+
+        # Over-allocate so that the first column can be aligned
+        arena = np.zeros(nbytes + _column_alignment, dtype=np.uint8)
+        start = (-arena.ctypes.data) % _column_alignment
+
+        columns = {}
+        for (key, dtype), offset in zip(layout, offsets):
+            first, last = start + offset, start + offset + capacity*dtype.itemsize
+            columns[key] = arena[first:last].view(dtype)
+
+        self._arena = arena
+        self._layout = layout
+        self._columns = columns
+        self._colnames = [key for key, dtype in layout]
+        self.capacity = capacity
+
+    @property
+    def nbytes(self):
+        """ Number of bytes of memory held by the buffer.
+        """
+        return self._arena.nbytes
+
+    def keys(self):
+        return list(self._colnames)
+
+    @property
+    def colnames(self):
+        return self.keys()
+
+    def __contains__(self, key):
+        return key in self._columns
+
+    def __len__(self):
+        return self.Ngals
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return _GalaxyTableBufferRows(self, key)
+        try:
+            return self._columns[key][:self.Ngals]
+        except KeyError:
+            msg = "The ``{0}`` column does not appear in the galaxy table".format(key)
+            raise KeyError(msg)
+
+    def __setitem__(self, key, value):
+        if key not in self._columns:
+            self._add_column(key, value)
+        else:
+            self[key][:] = value
+
+    def _add_column(self, key, value):
+        """ Store a column that is not part of the layout of the buffer.
+        The column is allocated separately and dropped at the next call to `allocate`.
+        """
+        value = np.asarray(value)
+        column = np.zeros(self.capacity, dtype=value.dtype)
+        column[:self.Ngals] = value
+        self._columns[key] = column
+        self._colnames.append(key)
+        # Invalidate the layout so that the next mock rebuilds the columns
+        self._layout = None
+
+    def copy(self):
+        """ Independent copy of the buffer storing only the current galaxies.
+        """
+        result = GalaxyTableBuffer(self.gal_types, growth_factor=1)
+        result.allocate(self.Ngals, [(key, self[key].dtype) for key in self._colnames])
+        for key in self._colnames:
+            result[key][:] = self[key]
+        return result
+
+    def as_table(self, copy=False):
+        """ Wrap the columns of the buffer as an `~astropy.table.Table`.
+
+        Parameters
+        ----------
+        copy : bool, optional
+            If False, the numerical columns of the returned table share memory
+            with the buffer, and so are overwritten by the next mock stored in the buffer.
+            Default is False.
+
+        Returns
+        -------
+        galaxy_table : `~astropy.table.Table`
+            Table of galaxies whose ``gal_type`` column stores the galaxy type strings.
+        """
+        gal_type_names = np.array(self.gal_types, dtype=object)
+
+        columns = []
+        for key in self._colnames:
+            if key == 'gal_type':
+                columns.append(gal_type_names[self[key]])
+            else:
+                columns.append(self[key])
+        return Table(columns, names=self._colnames, copy=copy)
+
+
+class _GalaxyTableBufferRows(object):
+    """ View of a contiguous range of rows of a `GalaxyTableBuffer`.
+    """
+
+    def __init__(self, buffer, rows):
+        self._buffer = buffer
+        self._rows = rows
+
+    def keys(self):
+        return self._buffer.keys()
+
+    @property
+    def colnames(self):
+        return self.keys()
+
+    def __contains__(self, key):
+        return key in self._buffer
+
+    def __len__(self):
+        return len(range(*self._rows.indices(len(self._buffer))))
+
+    def __getitem__(self, key):
+        return self._buffer[key][self._rows]
+
+    def __setitem__(self, key, value):
+        self[key][:] = value
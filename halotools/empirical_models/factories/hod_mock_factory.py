@@ -8,17 +8,22 @@ provides an abstract interface between halo catalogs
 and Halotools models.
 """
 
+import os
 import numpy as np
-from copy import copy
+from copy import copy, deepcopy
 from astropy.table import Table
+from astropy.extern import six
 from astropy.utils.misc import NumpyRNGContext
 
 from .mock_factory_template import MockFactory
+from .galaxy_table_buffer import GalaxyTableBuffer
 
-from .. import model_helpers
+from .. import model_helpers, model_defaults
+from ..assembias_models import HeavisideAssembias, PreservingNgalHeavisideAssembias
 
 from ...sim_manager import sim_defaults
-from ...utils.table_utils import SampleSelector
+from ...utils.table_utils import SampleSelector, compute_conditional_percentiles
+from ...utils.multiprocessing_utils import _process_num_threads
 from ...custom_exceptions import HalotoolsError
 
 
@@ -82,6 +87,25 @@ class HodMockFactory(MockFactory):
             will be thrown out immediately after reading the original halo catalog in memory.
             Default is 'halo_mvir'
 
+        galaxy_table_buffer : bool, optional
+            If set to True, the mock is populated in the reusable-arena mode
+            of `~halotools.empirical_models.MockFactory`.
+            The galaxies are stored in a
+            `~halotools.empirical_models.GalaxyTableBuffer` rather than directly in
+            an `~astropy.table.Table`. The columns of the mock are then contiguous arrays
+            in a single block of memory that is reused by subsequent calls to `populate`
+            whenever the new mock has no more galaxies than the capacity of the buffer,
+            and the ``gal_type`` column is stored as integer codes during mock population.
+            The properties of the host halos are gathered directly into the buffer,
+            and the halo table selected by a ``masking_function`` is computed only once
+            per masking function, so that repeated calls to `populate` allocate
+            little memory besides the arrays returned by the component models.
+            The ``galaxy_table`` attribute is only built from the buffer when it is accessed,
+            and its numerical columns share memory with the buffer, so that they are
+            overwritten by the next call to `populate`: use ``galaxy_table.copy()``
+            to keep a mock across calls to `populate`.
+            Default is False.
+
         """
 
         MockFactory.__init__(self, **kwargs)
@@ -89,6 +113,11 @@ class HodMockFactory(MockFactory):
         halocat = kwargs['halocat']
         self.Num_ptcl_requirement = Num_ptcl_requirement
         self.halo_mass_column_key = halo_mass_column_key
+        if self._reuse_memory is True:
+            self._galaxy_table_buffer = GalaxyTableBuffer(self.gal_types)
+        else:
+            self._galaxy_table_buffer = None
+        self._whole_table_halo_columns = {}
 
         self.preprocess_halo_catalog(halocat)
 
@@ -113,16 +142,31 @@ class HodMockFactory(MockFactory):
             Number of control points used in the lookup table for the halo profile.
             Default is set in `~halotools.empirical_models.model_defaults`.
 
+        """
+        additional_haloprops = copy(self.additional_haloprops)
+        try:
+            self._preprocess_halo_table(self._retrieve_halo_table(halocat))
+        except KeyError:
+            # A function creating new halo properties may require a column
+            # that was not read from disk, in which case all columns are used
+            self.additional_haloprops = additional_haloprops
+            self._preprocess_halo_table(halocat.halo_table)
+
+        self.model.build_lookup_tables()
+
+    def _preprocess_halo_table(self, full_halo_table):
+        """ Make the cuts on the input table of halos, create any new halo properties,
+        and bind the ``_orig_halo_table`` storing the ``additional_haloprops`` to the mock.
         """
         try:
-            assert 'halo_upid' in list(halocat.halo_table.keys())
+            assert 'halo_upid' in list(full_halo_table.keys())
         except AssertionError:
             raise HalotoolsError(missing_halo_upid_msg)
 
         # Make cuts on halo catalog #
         # Select host halos only, since this is an HOD-style model
         halo_table, subhalo_table = SampleSelector.host_halo_selection(
-            table=halocat.halo_table, return_subhalos=True)
+            table=full_halo_table, return_subhalos=True)
 
         # make a (possibly trivial) completeness cut
         cutoff_mvir = self.Num_ptcl_requirement*self.particle_mass
@@ -173,7 +217,36 @@ class HodMockFactory(MockFactory):
             except KeyError:
                 raise HalotoolsError(unavailable_haloprop_msg % key)
 
-        self.model.build_lookup_tables()
+    def _retrieve_halo_table(self, halocat):
+        """ Retrieve the table of halos used to pre-process the halo catalog.
+
+        When the halo catalog has a ``lazy_halo_table`` that has not yet been loaded
+        into memory in its entirety, only the columns in ``additional_haloprops``
+        are read from disk, since these are the only columns used to populate the mock,
+        together with the columns bound to the ``*_key`` attributes of the component models,
+        e.g., ``concentration_key``, which may be used to create new halo properties.
+        All columns are retrieved if any component model pre-processes the subhalos,
+        since this function may require any column of the catalog.
+        """
+        try:
+            lazy_halo_table = halocat.lazy_halo_table
+            assert not hasattr(halocat, '_halo_table')
+            for component_model in self.model.model_dictionary.values():
+                assert not hasattr(component_model, 'preprocess_subhalo_table')
+        except (AttributeError, AssertionError):
+            return halocat.halo_table
+
+        available_keys = lazy_halo_table.keys()
+        keys = [key for key in self.additional_haloprops if key in available_keys]
+        required_keys = ['halo_upid', self.halo_mass_column_key]
+        for component_model in self.model.model_dictionary.values():
+            for attr, value in sorted(vars(component_model).items()):
+                if attr.endswith('_key') and isinstance(value, six.string_types):
+                    required_keys.append(value)
+        for key in required_keys:
+            if (key in available_keys) & (key not in keys):
+                keys.append(key)
+        return lazy_halo_table.as_table(keys)
 
     def populate(self, seed=None, **kwargs):
         """
@@ -210,6 +283,51 @@ class HodMockFactory(MockFactory):
             Random number seed used in the Monte Carlo realization.
             Default is None, which will produce stochastic results.
 
+        incremental : bool, optional
+            If set to True, the mock is repopulated incrementally: only the
+            galaxy populations whose mock-making methods read a ``param_dict`` key
+            whose value has changed since the previous incremental call
+            are populated again, and the galaxies of all other populations are reused.
+            For example, when only satellite parameters change, the central galaxies
+            of the previous mock are kept as they are.
+            Populations are entirely repopulated if any of their methods read a changed key,
+            and the mock is populated from scratch if the ``seed``, ``enforce_PBC``
+            or ``masking_function`` arguments differ from the previous incremental call,
+            or if the methods called prior to the occupation methods read a changed key.
+            Since the seed of each step of the calling sequence is the same
+            as in a full population, the resulting mock is identical to the mock
+            that would be obtained by calling `populate` with the same seed.
+            Only changes to the ``param_dict`` are tracked.
+            Default is False.
+
+        num_chunks : int, optional
+            If passed, the halo table is partitioned into ``num_chunks`` chunks of
+            consecutive halos, and the full calling sequence of the model is run on each chunk
+            with its own random number seed, which is drawn from a random stream seeded by ``seed``.
+            The galaxies of all chunks are then stitched together.
+            For a given ``seed`` and ``num_chunks``, the mock is identical regardless of
+            ``num_threads``, though it is a different realization from the mock obtained
+            without ``num_chunks``. Default is None, in which case the halo table is
+            populated in a single chunk, unless ``num_threads`` is larger than 1.
+            Statistics of the entire halo table used by the model, such as the conditional
+            percentiles of the secondary halo property of
+            `~halotools.empirical_models.HeavisideAssembias` models, are computed
+            before the halo table is partitioned, so that the chunks are populated
+            with the same model as the full halo table. Models whose statistics
+            can only be computed during population, such as
+            `~halotools.empirical_models.PreservingNgalHeavisideAssembias` models,
+            raise an exception.
+
+        num_threads : int or string, optional
+            Number of processes used to populate the chunks of the halo table,
+            or the string 'max' to use all available cores.
+            If ``num_threads`` is larger than 1 and ``num_chunks`` is not passed,
+            the halo table is partitioned into
+            ``model_defaults.default_num_populate_chunks`` chunks.
+            The processes are forked from the current process, so that parallel
+            population is only available on platforms supporting the fork start method.
+            Default is 1.
+
         Notes
         -----
         Note the difference between the
@@ -280,12 +398,212 @@ class HodMockFactory(MockFactory):
         >>> model_instance.param_dict['logMmin'] = 12.1
         >>> model_instance.mock.populate()
 
+        In an MCMC where only some of the parameters change from one step
+        to the next, the ``incremental`` argument avoids repopulating the
+        galaxy populations that do not depend on the changed parameters.
+        Here the central galaxies of the previous mock are reused:
+
+        >>> model_instance.mock.populate(seed=43, incremental=True)
+        >>> model_instance.param_dict['alpha'] = 1.1
+        >>> model_instance.mock.populate(seed=43, incremental=True)
+
+        Large halo catalogs can be populated in parallel. For a given seed,
+        the following two mocks are identical:
+
+        >>> model_instance.mock.populate(seed=43, num_chunks=8, num_threads=4) # doctest: +SKIP
+        >>> model_instance.mock.populate(seed=43, num_chunks=8) # doctest: +SKIP
+
         See also
         ---------
         :ref:`hod_mock_factory_source_notes`
 
         """
 
+        masking_function = self._process_populate_kwargs(**kwargs)
+
+        incremental = kwargs.get('incremental', False)
+        num_chunks, num_threads = _process_parallel_populate_args(
+            kwargs.get('num_chunks', None), kwargs.get('num_threads', 1))
+        if incremental & (num_chunks is not None):
+            msg = ("The ``incremental`` option of the populate method "
+                "cannot be used together with ``num_chunks`` or ``num_threads``")
+            raise HalotoolsError(msg)
+
+        populate_settings = (seed, self.enforce_PBC, masking_function)
+        if incremental:
+            stale_gal_types = self._stale_gal_types(populate_settings)
+        else:
+            stale_gal_types = None
+
+        if num_chunks is not None:
+            self._populate_in_chunks(seed, num_chunks, num_threads)
+        elif stale_gal_types is None:
+            self._populate_from_scratch(seed)
+        else:
+            self._populate_stale_gal_types(stale_gal_types, seed)
+
+        self._enforce_periodic_boundary_conditions()
+
+        if incremental:
+            # Store a copy of the mock prior to any galaxy selection,
+            # together with everything needed to reuse its populations
+            self._incremental_populate_state = {
+                'settings': populate_settings,
+                'param_dict': deepcopy(self.model.param_dict),
+                'galaxy_table': self._galaxy_table.copy(),
+                'occupation': copy(self._occupation),
+                'gal_type_indices': copy(self._gal_type_indices)}
+        else:
+            self._incremental_populate_state = None
+
+        if hasattr(self.model, 'galaxy_selection_func'):
+            mask = self.model.galaxy_selection_func(self.galaxy_table)
+            self.galaxy_table = self.galaxy_table[mask]
+
+    def populate_to_disk(self, fname, seed=None, num_chunks=None, overwrite=False, **kwargs):
+        """
+        Method populating host halos with mock galaxies chunk by chunk,
+        streaming the galaxies of each chunk to an hdf5 file rather than
+        storing the ``galaxy_table`` in memory.
+
+        The halo table is partitioned into ``num_chunks`` chunks of consecutive halos,
+        exactly as in the `populate` method called with the same ``seed`` and ``num_chunks``,
+        so that peak memory usage is set by the number of galaxies in a single chunk.
+        The galaxies are written to a resizable dataset named ``data``
+        whose columns are fixed before any galaxy is written, and
+        the ``galaxy_table`` bound to the mock is left unchanged.
+
+        The file stores the same galaxies as the ``galaxy_table`` of `populate`,
+        but in a different order: the rows of the ``galaxy_table`` are grouped by
+        ``gal_type`` and then by chunk, whereas the rows of the file are grouped
+        by chunk and then by ``gal_type``. The galaxies of any given ``gal_type``
+        appear in the same order in both.
+
+        The file is first written under a temporary name, and is only renamed
+        to ``fname`` once all galaxies have been written, so that no partially
+        written file is left behind if mock population fails.
+
+        Parameters
+        ------------
+        fname : string
+            Name of the hdf5 file storing the galaxies.
+            The file can be loaded into memory as an `~astropy.table.Table`
+            with ``Table.read(fname, path='data')``, or accessed directly with h5py.
+
+        seed : int, optional
+            Random number seed used in the Monte Carlo realization.
+            Default is None, which will produce stochastic results.
+
+        num_chunks : int, optional
+            Number of chunks of the halo table.
+            Default is set by ``default_num_populate_chunks``
+            in the `~halotools.empirical_models.model_defaults` module.
+
+        overwrite : bool, optional
+            If set to False, an existing file named ``fname`` will not be overwritten.
+            Default is False.
+
+        masking_function : function, optional
+            Function object used to place a mask on the halo table prior to
+            calling the mock generating functions. See the `populate` method.
+
+        enforce_PBC : bool, optional
+            If set to True, galaxies whose positions spilled over the edge
+            of the periodic box are re-mapped inside the box. Default is True.
+
+        Notes
+        -----
+        The ``gal_type`` column is stored as a fixed-length byte string.
+        The simulation metadata and the ``param_dict`` of the model
+        are stored as attributes of the file and of the ``data`` dataset, respectively.
+
+        Examples
+        ----------
+        >>> from halotools.empirical_models import PrebuiltHodModelFactory
+        >>> from halotools.sim_manager import FakeSim
+        >>> model_instance = PrebuiltHodModelFactory('zheng07')
+        >>> model_instance.populate_mock(FakeSim())
+        >>> model_instance.mock.populate_to_disk('mock.hdf5', seed=43, num_chunks=4) # doctest: +SKIP
+        """
+        try:
+            import h5py
+        except ImportError:
+            msg = ("\nYou must have h5py installed if you want to \n"
+                "stream your mock galaxies to disk. \n")
+            raise HalotoolsError(msg)
+
+        if (overwrite is False) & os.path.isfile(fname):
+            msg = ("\nThe file ``{0}`` already exists.\n"
+                "Call the populate_to_disk method with overwrite=True "
+                "if you want to overwrite this file.\n".format(fname))
+            raise HalotoolsError(msg)
+
+        if num_chunks is None:
+            num_chunks = model_defaults.default_num_populate_chunks
+        num_chunks, __ = _process_parallel_populate_args(num_chunks, 1)
+
+        self._process_populate_kwargs(**kwargs)
+        chunk_slices, chunk_seeds = self._chunk_slices_and_seeds(seed, num_chunks)
+        gal_type_dtype = np.dtype('S{0}'.format(max(len(gal_type) for gal_type in self.gal_types)))
+
+        tmp_fname = fname + '.{0}.tmp'.format(os.getpid())
+        self._whole_table_halo_columns = self._compute_whole_table_halo_columns()
+        try:
+            with h5py.File(tmp_fname, 'w') as f:
+                dset = None
+                for chunk_slice, chunk_seed in zip(chunk_slices, chunk_seeds):
+                    chunk = self._populated_chunk(chunk_slice, chunk_seed)
+                    chunk._enforce_periodic_boundary_conditions()
+                    galaxy_table = chunk._galaxy_table
+                    if hasattr(self.model, 'galaxy_selection_func'):
+                        mask = self.model.galaxy_selection_func(galaxy_table)
+                        galaxy_table = galaxy_table[mask]
+
+                    if dset is None:
+                        galaxy_dtype = np.dtype([
+                            (str(key), gal_type_dtype if key == 'gal_type' else dtype)
+                            for key, dtype in _unique_column_dtypes(chunk._galaxy_table_column_dtypes())])
+                        dset = f.create_dataset('data', shape=(0, ), maxshape=(None, ),
+                            dtype=galaxy_dtype, chunks=True)
+
+                    rows = np.zeros(len(galaxy_table), dtype=galaxy_dtype)
+                    for key in galaxy_dtype.names:
+                        if key == 'gal_type':
+                            rows[key] = np.char.encode(np.asarray(galaxy_table[key], dtype=str), 'ascii')
+                        else:
+                            rows[key] = galaxy_table[key]
+
+                    first_row = dset.shape[0]
+                    dset.resize((first_row + len(rows), ))
+                    dset[first_row:] = rows
+                    del chunk, galaxy_table, rows
+
+                for key in ('simname', 'halo_finder', 'version_name'):
+                    if hasattr(self, key):
+                        f.attrs[key] = str(getattr(self, key))
+                for key in ('redshift', 'Lbox', 'particle_mass'):
+                    if hasattr(self, key):
+                        f.attrs[key] = getattr(self, key)
+                f.attrs['num_chunks'] = len(chunk_slices)
+                if seed is not None:
+                    f.attrs['seed'] = seed
+
+                for key, value in self.model.param_dict.items():
+                    try:
+                        dset.attrs[key] = value
+                    except TypeError:
+                        pass
+            os.rename(tmp_fname, fname)
+        finally:
+            self._whole_table_halo_columns = {}
+            if os.path.isfile(tmp_fname):
+                os.remove(tmp_fname)
+
+    def _process_populate_kwargs(self, **kwargs):
+        """ Process the keyword arguments shared by `populate` and `populate_to_disk`,
+        setting the ``halo_table`` of the mock to the halos selected by the ``masking_function``.
+        Returns the ``masking_function``, or None if none was passed.
+        """
         # The _testing_mode keyword is for unit-testing only
         # it has been intentionally left out of the docstring
         try:
@@ -300,76 +618,461 @@ class HodMockFactory(MockFactory):
 
         try:
             masking_function = kwargs['masking_function']
-            mask = masking_function(self._orig_halo_table)
-            self.halo_table = self._orig_halo_table[mask]
+            if self._reuse_memory is True:
+                self.halo_table = self._masked_halo_table(masking_function)
+            else:
+                mask = masking_function(self._orig_halo_table)
+                self.halo_table = self._orig_halo_table[mask]
         except:
+            masking_function = None
             self.halo_table = self._orig_halo_table
 
+        return masking_function
+
+    def _enforce_periodic_boundary_conditions(self):
+        """ Re-map the galaxies that spilled over the edge of the box, if ``enforce_PBC`` is True.
+        """
+        if (self.enforce_PBC is True) & isinstance(self._galaxy_table, GalaxyTableBuffer):
+            for key, box_length in zip(('x', 'y', 'z'), self.Lbox):
+                coords = self._galaxy_table[key]
+                if self._testing_mode is True:
+                    model_helpers.enforce_periodicity_of_box(coords, box_length,
+                        check_multiple_box_lengths=True)
+                np.mod(coords, box_length, out=coords)
+        elif self.enforce_PBC is True:
+            self._galaxy_table['x'], self._galaxy_table['vx'] = (
+                model_helpers.enforce_periodicity_of_box(
+                    self._galaxy_table['x'], self.Lbox[0],
+                    velocity=self._galaxy_table['vx'],
+                    check_multiple_box_lengths=self._testing_mode)
+                )
+
+            self._galaxy_table['y'], self._galaxy_table['vy'] = (
+                model_helpers.enforce_periodicity_of_box(
+                    self._galaxy_table['y'], self.Lbox[1],
+                    velocity=self._galaxy_table['vy'],
+                    check_multiple_box_lengths=self._testing_mode)
+                )
+
+            self._galaxy_table['z'], self._galaxy_table['vz'] = (
+                model_helpers.enforce_periodicity_of_box(
+                    self._galaxy_table['z'], self.Lbox[2],
+                    velocity=self._galaxy_table['vz'],
+                    check_multiple_box_lengths=self._testing_mode)
+                )
+
+    def _populate_from_scratch(self, seed):
+        """ Run the full calling sequence of the model on the halo_table.
+        """
         self.allocate_memory(seed=seed)
 
         # Loop over all gal_types in the model
         for gal_type in self.gal_types:
+            self._initialize_gal_type_rows(gal_type)
 
-            # Retrieve the indices of our pre-allocated arrays
-            # that store the info pertaining to gal_type galaxies
-            gal_type_slice = self._gal_type_indices[gal_type]
-            # gal_type_slice is a slice object
+        self._galaxy_table['x'] = self._galaxy_table['halo_x']
+        self._galaxy_table['y'] = self._galaxy_table['halo_y']
+        self._galaxy_table['z'] = self._galaxy_table['halo_z']
+        self._galaxy_table['vx'] = self._galaxy_table['halo_vx']
+        self._galaxy_table['vy'] = self._galaxy_table['halo_vy']
+        self._galaxy_table['vz'] = self._galaxy_table['halo_vz']
+
+        stage_seeds = self._calling_sequence_seeds(seed)
+        for method in self._remaining_methods_to_call:
+            self._call_galaxy_table_method(method, stage_seeds[method])
+
+    def _populate_chunk(self, chunk_slice, seed):
+        """ Run the full calling sequence of the model on the halos in ``chunk_slice``.
+
+        The chunk is populated by a shallow copy of the mock, so that the mock itself
+        is left untouched. The galaxy_table columns, the occupations and the
+        halo_table columns created during mock population are returned.
+        """
+        chunk = self._populated_chunk(chunk_slice, seed)
+
+        galaxy_columns = {key: np.asarray(chunk._galaxy_table[key])
+            for key in chunk._galaxy_table.keys()}
+        halo_columns = {key: np.asarray(chunk.halo_table[key])
+            for key in self._halo_columns_created_by_populate()}
+        return (chunk._galaxy_table.keys(), galaxy_columns, chunk._gal_type_indices,
+            chunk._occupation, halo_columns, chunk.additional_haloprops)
+
+    def _populated_chunk(self, chunk_slice, seed):
+        """ Shallow copy of the mock whose halo_table stores the halos in ``chunk_slice``,
+        populated with the full calling sequence of the model.
+        """
+        chunk = copy(self)
+        chunk.halo_table = self.halo_table[chunk_slice]
+        for key, column in self._whole_table_halo_columns.items():
+            chunk.halo_table[key] = column[chunk_slice]
+        chunk.additional_haloprops = copy(self.additional_haloprops)
+        chunk._galaxy_table_buffer = None
+        chunk._reuse_memory = False
+        chunk._populate_from_scratch(seed)
+        return chunk
+
+    def _halo_columns_created_by_populate(self):
+        """ Names of the halo_table columns written during mock population.
+        """
+        keys = []
+        for func_name in self._pre_occupation_methods():
+            keys.extend(getattr(self.model, func_name)._galprop_dtypes_to_allocate.names)
+        keys.extend('halo_num_'+gal_type for gal_type in self.gal_types)
+        return list(set(keys))
+
+    def _populate_in_chunks(self, seed, num_chunks, num_threads):
+        """ Populate the halo_table in ``num_chunks`` chunks of consecutive halos,
+        using ``num_threads`` processes, and stitch the resulting galaxies together.
+
+        The seed of each chunk is drawn from a random stream seeded by ``seed``,
+        so that the resulting mock does not depend on ``num_threads``.
+        """
+        chunk_slices, chunk_seeds = self._chunk_slices_and_seeds(seed, num_chunks)
+
+        num_processes = min(num_threads, len(chunk_slices))
+        self._whole_table_halo_columns = self._compute_whole_table_halo_columns()
+        try:
+            if num_processes > 1:
+                context = model_helpers._get_fork_context()
+                global _parallel_populate_mock
+                _parallel_populate_mock = self
+                try:
+                    pool = context.Pool(num_processes)
+                    try:
+                        results = pool.map(_populate_chunk_in_worker,
+                            list(zip(chunk_slices, chunk_seeds)))
+                    finally:
+                        pool.close()
+                        pool.join()
+                finally:
+                    _parallel_populate_mock = None
+            else:
+                results = [self._populate_chunk(chunk_slice, chunk_seed)
+                    for chunk_slice, chunk_seed in zip(chunk_slices, chunk_seeds)]
+        finally:
+            self._whole_table_halo_columns = {}
+
+        self._stitch_chunks(results)
+
+    def _chunk_slices_and_seeds(self, seed, num_chunks):
+        """ Partition the halo_table into ``num_chunks`` chunks of consecutive halos,
+        and draw the seed of each chunk from a random stream seeded by ``seed``.
+        If ``seed`` is None, the random stream is seeded by a single draw
+        from the global random state, so that the chunks populated by forked processes,
+        which inherit the same global random state, still receive distinct seeds.
+        """
+        num_halos = len(self.halo_table)
+        num_chunks = max(1, min(num_chunks, num_halos))
+        chunk_edges = np.linspace(0, num_halos, num_chunks+1).astype(int)
+        chunk_slices = [slice(first, last) for first, last in zip(chunk_edges[:-1], chunk_edges[1:])]
+
+        # Leave room for the seed increments of the calling sequence
+        max_chunk_seed = np.iinfo(np.int32).max - len(self.model._mock_generation_calling_sequence) - 1
+        if seed is None:
+            seed = np.random.randint(0, max_chunk_seed)
+        with NumpyRNGContext(seed):
+            chunk_seeds = [int(s) for s in np.random.randint(0, max_chunk_seed, num_chunks)]
+        return chunk_slices, chunk_seeds
+
+    def _compute_whole_table_halo_columns(self):
+        """ Dictionary of the halo_table columns that the model computes from statistics
+        of the entire halo_table, computed before the halo_table is partitioned into chunks.
+
+        `~halotools.empirical_models.HeavisideAssembias` occupation models compute
+        the conditional percentiles of their secondary halo property from the table
+        passed to them, unless it already has a ``sec_haloprop_key + '_percentile'`` column.
+        A HalotoolsError is raised for the models whose statistics cannot be computed
+        in advance, since computing them on each chunk would change the model.
+        """
+        columns = {}
+        prim_haloprop_keys = {}
+        for component_model in self.model.model_dictionary.values():
+            if not isinstance(component_model, HeavisideAssembias):
+                continue
+
+            model_name = component_model.__class__.__name__
+            if isinstance(component_model, PreservingNgalHeavisideAssembias):
+                msg = ("The ``{0}`` component model preserves the number of galaxies "
+                    "of the entire halo table,\nso the mock cannot be populated in chunks.\n")
+                raise HalotoolsError(msg.format(model_name))
+
+            if hasattr(component_model, 'halo_type_tuple'):
+                continue
+            key = component_model.sec_haloprop_key + '_percentile'
+            if key in list(self.halo_table.keys()):
+                continue
+
+            occupation_model = all('mc_occupation' in func_name
+                for func_name in component_model._mock_generation_calling_sequence)
+            prim_haloprop_key = prim_haloprop_keys.setdefault(key, component_model.prim_haloprop_key)
+            if (occupation_model is False) | (prim_haloprop_key != component_model.prim_haloprop_key):
+                msg = ("The ``{0}`` component model computes the conditional percentiles of ``{1}``\n"
+                    "during mock population, so the mock cannot be populated in chunks.\n"
+                    "Store these percentiles in a ``{2}`` column of the halo table "
+                    "to populate the mock in chunks.\n")
+                raise HalotoolsError(msg.format(model_name, component_model.sec_haloprop_key, key))
+
+            if key not in columns:
+                columns[key] = np.asarray(compute_conditional_percentiles(
+                    prim_haloprop=self.halo_table[component_model.prim_haloprop_key],
+                    sec_haloprop=self.halo_table[component_model.sec_haloprop_key]))
+        return columns
+
+    def _stitch_chunks(self, results):
+        """ Assemble the galaxy_table from the galaxies of the chunks of the halo_table.
+        Galaxies are grouped by gal_type, and within each gal_type ordered by chunk.
+        """
+        colnames, galaxy_columns, __, __, halo_columns, additional_haloprops = results[0]
+        self.additional_haloprops = additional_haloprops
+        self._remaining_methods_to_call = []
+
+        for key in halo_columns.keys():
+            self.halo_table[key] = np.concatenate([result[4][key] for result in results])
 
-            # For the gal_type_slice indices of
-            # the pre-allocated array self.gal_type,
-            # set each string-type entry equal to the gal_type string
-            self.galaxy_table['gal_type'][gal_type_slice] = (
+        self._occupation = {}
+        self._total_abundance = {}
+        self._gal_type_indices = {}
+        first_galaxy_index = 0
+        for gal_type in self.gal_types:
+            self._occupation[gal_type] = np.concatenate(
+                [result[3][gal_type] for result in results])
+            self._total_abundance[gal_type] = self._occupation[gal_type].sum()
+            last_galaxy_index = first_galaxy_index + self._total_abundance[gal_type]
+            self._gal_type_indices[gal_type] = slice(first_galaxy_index, last_galaxy_index)
+            first_galaxy_index = last_galaxy_index
+        self.Ngals = np.sum(list(self._total_abundance.values()))
+
+        self._allocate_galaxy_table([(key, galaxy_columns[key].dtype) for key in colnames])
+        is_buffer = isinstance(self._galaxy_table, GalaxyTableBuffer)
+        for gal_type in self.gal_types:
+            first_galaxy_index = self._gal_type_indices[gal_type].start
+            for __, chunk_galaxy_columns, chunk_gal_type_indices, __, __, __ in results:
+                chunk_gal_type_slice = chunk_gal_type_indices[gal_type]
+                last_galaxy_index = (first_galaxy_index +
+                    chunk_gal_type_slice.stop - chunk_gal_type_slice.start)
+                gal_type_slice = slice(first_galaxy_index, last_galaxy_index)
+                for key in colnames:
+                    if (key == 'gal_type') & is_buffer:
+                        self._galaxy_table[key][gal_type_slice] = self._galaxy_table.gal_type_code(gal_type)
+                    else:
+                        self._galaxy_table[key][gal_type_slice] = (
+                            chunk_galaxy_columns[key][chunk_gal_type_slice])
+                first_galaxy_index = last_galaxy_index
+
+    def _initialize_gal_type_rows(self, gal_type):
+        """ Fill the rows of the galaxy_table storing gal_type galaxies
+        with the properties of their host halos.
+        """
+        # Retrieve the indices of our pre-allocated arrays
+        # that store the info pertaining to gal_type galaxies
+        gal_type_slice = self._gal_type_indices[gal_type]
+        # gal_type_slice is a slice object
+
+        # For the gal_type_slice indices of
+        # the pre-allocated array self.gal_type,
+        # set each string-type entry equal to the gal_type string
+        if isinstance(self._galaxy_table, GalaxyTableBuffer):
+            self._galaxy_table['gal_type'][gal_type_slice] = self._galaxy_table.gal_type_code(gal_type)
+
+            # Gather the host halo properties directly into the buffer
+            # with a single index array for all properties
+            halo_index = np.repeat(self._halo_table_index(), self._occupation[gal_type])
+            for halocatkey in self.additional_haloprops:
+                _take_into(self.halo_table[halocatkey], halo_index,
+                    self._galaxy_table[halocatkey][gal_type_slice])
+        else:
+            self._galaxy_table['gal_type'][gal_type_slice] = (
                 np.repeat(gal_type, self._total_abundance[gal_type], axis=0))
 
             # Store all other relevant host halo properties into their
             # appropriate pre-allocated array
             for halocatkey in self.additional_haloprops:
-                self.galaxy_table[halocatkey][gal_type_slice] = np.repeat(
+                self._galaxy_table[halocatkey][gal_type_slice] = np.repeat(
                     self.halo_table[halocatkey], self._occupation[gal_type], axis=0)
 
-        self.galaxy_table['x'] = self.galaxy_table['halo_x']
-        self.galaxy_table['y'] = self.galaxy_table['halo_y']
-        self.galaxy_table['z'] = self.galaxy_table['halo_z']
-        self.galaxy_table['vx'] = self.galaxy_table['halo_vx']
-        self.galaxy_table['vy'] = self.galaxy_table['halo_vy']
-        self.galaxy_table['vz'] = self.galaxy_table['halo_vz']
+    def _halo_table_index(self):
+        """ Array storing the row number of each halo in the halo_table.
+        """
+        try:
+            assert len(self._halo_table_index_array) == len(self.halo_table)
+        except (AttributeError, AssertionError):
+            self._halo_table_index_array = np.arange(len(self.halo_table))
+        return self._halo_table_index_array
+
+    def _detach_population_state(self):
+        """ Detach the mock from the objects that are modified in place during mock population,
+        and return the attributes of the mock prior to detaching it.
+        The halo_table columns written during mock population are copied,
+        the galaxies of the detached mock are stored in a new buffer, if applicable,
+        and the halo tables selected by masking functions are computed again.
+        """
+        state = MockFactory._detach_population_state(self)
+        for key in ('halo_table', '_orig_halo_table'):
+            table = getattr(self, key)
+            for colname in self._halo_columns_created_by_populate():
+                if colname in table.keys():
+                    table.replace_column(colname, table[colname].copy())
+        if self._galaxy_table_buffer is not None:
+            self._galaxy_table_buffer = GalaxyTableBuffer(self.gal_types)
+        self.__dict__.pop('_masked_halo_table_cache', None)
+        return state
+
+    def _masked_halo_table(self, masking_function):
+        """ In reusable-arena mode, the halo table selected by
+        a masking function is only computed the first time the function is used.
+        """
+        try:
+            previous_masking_function, masked_halo_table = self._masked_halo_table_cache
+            assert previous_masking_function is masking_function
+        except (AttributeError, AssertionError):
+            mask = masking_function(self._orig_halo_table)
+            masked_halo_table = self._orig_halo_table[mask]
+            self._masked_halo_table_cache = (masking_function, masked_halo_table)
+        return masked_halo_table
 
-        for method in self._remaining_methods_to_call:
-            func = getattr(self.model, method)
-            try:
-                d = {key: getattr(self, key) for key in func.additional_kwargs}
-            except AttributeError:
-                d = {}
-            gal_type_slice = self._gal_type_indices[func.gal_type]
-            if seed is not None:
-                seed += 1
-            func(table=self.galaxy_table[gal_type_slice], seed=seed, **d)
+    def _call_galaxy_table_method(self, method, seed):
+        """ Call the input method of the composite model on the rows of
+        the galaxy_table storing galaxies of the gal_type of the method.
+        """
+        func = getattr(self.model, method)
+        try:
+            d = {key: getattr(self, key) for key in func.additional_kwargs}
+        except AttributeError:
+            d = {}
+        gal_type_slice = self._gal_type_indices[func.gal_type]
+        func(table=self._galaxy_table[gal_type_slice], seed=seed, **d)
 
-        if self.enforce_PBC is True:
-            self.galaxy_table['x'], self.galaxy_table['vx'] = (
-                model_helpers.enforce_periodicity_of_box(
-                    self.galaxy_table['x'], self.Lbox[0],
-                    velocity=self.galaxy_table['vx'],
-                    check_multiple_box_lengths=self._testing_mode)
-                )
+    def _pre_occupation_methods(self):
+        """ Names of the methods of the calling sequence that are applied to
+        the halo_table prior to the first occupation method.
+        """
+        pre_occupation_methods = []
+        for func_name in self.model._mock_generation_calling_sequence:
+            if 'mc_occupation' in func_name:
+                break
+            pre_occupation_methods.append(func_name)
+        return pre_occupation_methods
 
-            self.galaxy_table['y'], self.galaxy_table['vy'] = (
-                model_helpers.enforce_periodicity_of_box(
-                    self.galaxy_table['y'], self.Lbox[1],
-                    velocity=self.galaxy_table['vy'],
-                    check_multiple_box_lengths=self._testing_mode)
-                )
+    def _calling_sequence_seeds(self, seed):
+        """ Dictionary storing the seed passed to each method of the
+        calling sequence during mock population.
 
-            self.galaxy_table['z'], self.galaxy_table['vz'] = (
-                model_helpers.enforce_periodicity_of_box(
-                    self.galaxy_table['z'], self.Lbox[2],
-                    velocity=self.galaxy_table['vz'],
-                    check_multiple_box_lengths=self._testing_mode)
-                )
+        The methods called prior to the occupation methods and then the occupation method
+        of each gal_type receive seeds one larger than the previous, beginning with ``seed+1``.
+        The remaining methods, which are applied to the galaxy_table,
+        separately receive seeds beginning with ``seed+1``.
+        """
+        pre_occupation_methods = self._pre_occupation_methods()
+        occupation_methods = ['mc_occupation_'+gal_type for gal_type in self.gal_types]
+        remaining_methods = [func_name for func_name in self.model._mock_generation_calling_sequence
+            if (func_name not in pre_occupation_methods) & (func_name not in occupation_methods)]
+
+        stage_seeds = {}
+        for method_list in (pre_occupation_methods + occupation_methods, remaining_methods):
+            for i, func_name in enumerate(method_list):
+                if seed is None:
+                    stage_seeds[func_name] = None
+                else:
+                    stage_seeds[func_name] = seed + 1 + i
+        return stage_seeds
+
+    def _stale_gal_types(self, populate_settings):
+        """ Determine the gal_types that need to be repopulated by an incremental call to `populate`.
+
+        The list of stale gal_types is returned, or None if the mock must be populated from scratch.
+        A method of the composite model is stale if it has read a ``param_dict`` key
+        whose value has changed since the previous incremental call to `populate`.
+        """
+        state = getattr(self, '_incremental_populate_state', None)
+        if state is None:
+            return None
+
+        previous_seed, previous_enforce_PBC, previous_masking_function = state['settings']
+        seed, enforce_PBC, masking_function = populate_settings
+        if (masking_function is not None) | (previous_masking_function is not None):
+            return None
+        if (seed != previous_seed) | (enforce_PBC != previous_enforce_PBC):
+            return None
+
+        previous_param_dict = state['param_dict']
+        changed_keys = set(self.model.param_dict.keys()) ^ set(previous_param_dict.keys())
+        for key in set(self.model.param_dict.keys()) & set(previous_param_dict.keys()):
+            if _param_value_changed(previous_param_dict[key], self.model.param_dict[key]):
+                changed_keys.add(key)
+
+        def method_is_stale(func_name):
+            keys_read = getattr(getattr(self.model, func_name), 'param_dict_keys_read', None)
+            if keys_read is None:
+                return True
+            return len(keys_read & changed_keys) > 0
+
+        pre_occupation_methods = self._pre_occupation_methods()
+        for func_name in pre_occupation_methods:
+            if method_is_stale(func_name):
+                return None
+
+        stale_gal_types = []
+        for func_name in self.model._mock_generation_calling_sequence:
+            if func_name not in pre_occupation_methods:
+                gal_type = getattr(self.model, func_name).gal_type
+                if (gal_type not in stale_gal_types) and method_is_stale(func_name):
+                    stale_gal_types.append(gal_type)
+        return stale_gal_types
+
+    def _populate_stale_gal_types(self, stale_gal_types, seed):
+        """ Repopulate the gal_types in ``stale_gal_types``, reusing the galaxies
+        of all other gal_types from the previous call to `populate`.
+        """
+        state = self._incremental_populate_state
+        previous_galaxy_table = state['galaxy_table']
+        previous_gal_type_indices = state['gal_type_indices']
+        self._occupation = copy(state['occupation'])
+        stage_seeds = self._calling_sequence_seeds(seed)
 
-        if hasattr(self.model, 'galaxy_selection_func'):
-            mask = self.model.galaxy_selection_func(self.galaxy_table)
-            self.galaxy_table = self.galaxy_table[mask]
+        for gal_type in stale_gal_types:
+            occupation_func_name = 'mc_occupation_'+gal_type
+            occupation_func = getattr(self.model, occupation_func_name)
+            self._occupation[gal_type] = occupation_func(
+                table=self.halo_table, seed=stage_seeds[occupation_func_name])
+            self.halo_table['halo_num_'+gal_type][:] = self._occupation[gal_type]
+
+        # Rebuild the bookkeeping of the galaxy_table for the new occupations
+        self._total_abundance = {}
+        self._gal_type_indices = {}
+        first_galaxy_index = 0
+        for gal_type in self.gal_types:
+            self._total_abundance[gal_type] = self._occupation[gal_type].sum()
+            last_galaxy_index = first_galaxy_index + self._total_abundance[gal_type]
+            self._gal_type_indices[gal_type] = slice(first_galaxy_index, last_galaxy_index)
+            first_galaxy_index = last_galaxy_index
+        self.Ngals = np.sum(list(self._total_abundance.values()))
+
+        self._allocate_galaxy_table(
+            [(key, previous_galaxy_table[key].dtype) for key in previous_galaxy_table.keys()])
+
+        for gal_type in self.gal_types:
+            gal_type_slice = self._gal_type_indices[gal_type]
+            if gal_type in stale_gal_types:
+                self._initialize_gal_type_rows(gal_type)
+                for key in ('x', 'y', 'z', 'vx', 'vy', 'vz'):
+                    self._galaxy_table[key][gal_type_slice] = self._galaxy_table['halo_'+key][gal_type_slice]
+            else:
+                previous_gal_type_slice = previous_gal_type_indices[gal_type]
+                for key in previous_galaxy_table.keys():
+                    self._galaxy_table[key][gal_type_slice] = (
+                        previous_galaxy_table[key][previous_gal_type_slice])
+                # The occupations of other gal_types may have changed
+                for other_gal_type in stale_gal_types:
+                    key = 'halo_num_'+other_gal_type
+                    self._galaxy_table[key][gal_type_slice] = np.repeat(
+                        self.halo_table[key], self._occupation[gal_type], axis=0)
+
+        pre_occupation_methods = self._pre_occupation_methods()
+        for method in self.model._mock_generation_calling_sequence:
+            if (method in pre_occupation_methods) or ('mc_occupation' in method):
+                continue
+            if getattr(self.model, method).gal_type in stale_gal_types:
+                self._call_galaxy_table_method(method, stage_seeds[method])
 
     def allocate_memory(self, seed=None):
         """ Method allocates the memory for all the numpy arrays
@@ -381,8 +1084,6 @@ class HodMockFactory(MockFactory):
 
         """
 
-        self.galaxy_table = Table()
-
         # We will keep track of the calling sequence with a list called _remaining_methods_to_call
         # Each time a function in this list is called, we will remove that function from the list
         # Mock generation will be complete when _remaining_methods_to_call is exhausted
@@ -424,7 +1125,11 @@ class HodMockFactory(MockFactory):
         self._gal_type_indices = {}
 
         for gal_type in self.gal_types:
-            self.halo_table['halo_num_'+gal_type] = 0
+            key = 'halo_num_'+gal_type
+            if (self._reuse_memory is True) and (key in self.halo_table.keys()):
+                self.halo_table[key][:] = 0
+            else:
+                self.halo_table[key] = 0
 
         first_galaxy_index = 0
         for gal_type in self.gal_types:
@@ -454,23 +1159,56 @@ class HodMockFactory(MockFactory):
 
         self.Ngals = np.sum(list(self._total_abundance.values()))
 
+        self._allocate_galaxy_table(self._galaxy_table_column_dtypes())
+
+    def _galaxy_table_column_dtypes(self):
+        """ List of (name, dtype) pairs of the columns of the galaxy_table,
+        which can only be determined once the methods called prior to the
+        occupation methods have added their columns to the halo_table.
+        """
         # Allocate memory for all additional halo properties,
         # including profile parameters of the halos such as 'conc_NFWmodel'
-        for halocatkey in self.additional_haloprops:
-            self.galaxy_table[halocatkey] = np.zeros(self.Ngals,
-                dtype=self.halo_table[halocatkey].dtype)
+        column_dtypes = [(halocatkey, self.halo_table[halocatkey].dtype)
+            for halocatkey in self.additional_haloprops]
 
         # Separately allocate memory for the galaxy profile parameters
         for galcatkey in self.model.halo_prof_param_keys:
-            self.galaxy_table[galcatkey] = 0.
+            column_dtypes.append((galcatkey, np.dtype('f8')))
         for galcatkey in self.model.gal_prof_param_keys:
-            self.galaxy_table[galcatkey] = 0.
+            column_dtypes.append((galcatkey, np.dtype('f8')))
 
-        self.galaxy_table['gal_type'] = np.zeros(self.Ngals, dtype=object)
+        column_dtypes.append(('gal_type', object))
 
         dt = self.model._galprop_dtypes_to_allocate
         for key in dt.names:
-            self.galaxy_table[key] = np.zeros(self.Ngals, dtype=dt[key].type)
+            column_dtypes.append((key, dt[key].type))
+
+        # Galaxy positions and velocities are initialized to those of the host halo,
+        # and so inherit the dtype of the halo catalog
+        for key in ('x', 'y', 'z', 'vx', 'vy', 'vz'):
+            column_dtypes.append((key, self.halo_table['halo_'+key].dtype))
+
+        return column_dtypes
+
+    def _allocate_galaxy_table(self, column_dtypes):
+        """ Allocate a galaxy_table of length ``self.Ngals`` with the input columns,
+        either as a new `~astropy.table.Table` or in the memory of the galaxy table buffer.
+
+        Parameters
+        ----------
+        column_dtypes : list
+            List of (name, dtype) pairs. When a name appears more than once,
+            the column is placed at its first position with its last dtype.
+        """
+        column_dtypes = _unique_column_dtypes(column_dtypes)
+
+        if self._galaxy_table_buffer is None:
+            self._galaxy_table = Table()
+            for key, dtype in column_dtypes:
+                self._galaxy_table[key] = np.zeros(self.Ngals, dtype=dtype)
+        else:
+            self._galaxy_table_buffer.allocate(self.Ngals, column_dtypes)
+            self._galaxy_table = self._galaxy_table_buffer
 
     def estimate_ngals(self, seed=None):
         """ Method to estimate the number of galaxies produced by the
@@ -505,3 +1243,67 @@ class HodMockFactory(MockFactory):
             ngals = ngals + np.sum(occupation_func(table=halo_table, seed=seed))
 
         return ngals
+
+
+_parallel_populate_mock = None
+
+
+def _populate_chunk_in_worker(args):
+    """ Populate a chunk of the halo table of the mock stored in the
+    module-level ``_parallel_populate_mock`` variable, which the worker processes
+    inherit from the parent process when they are forked, so that the
+    composite model does not need to be pickled.
+    """
+    chunk_slice, seed = args
+    return _parallel_populate_mock._populate_chunk(chunk_slice, seed)
+
+
+def _process_parallel_populate_args(num_chunks, num_threads):
+    """ Process the ``num_chunks`` and ``num_threads`` arguments of `HodMockFactory.populate`.
+    """
+    num_threads = _process_num_threads(num_threads)
+
+    if num_chunks is None:
+        if num_threads > 1:
+            num_chunks = model_defaults.default_num_populate_chunks
+    else:
+        try:
+            num_chunks = int(num_chunks)
+            assert num_chunks >= 1
+        except (TypeError, ValueError, AssertionError):
+            msg = "Input ``num_chunks`` argument must be a positive integer"
+            raise ValueError(msg)
+    return num_chunks, num_threads
+
+
+def _unique_column_dtypes(column_dtypes):
+    """ Remove the duplicate names of a list of (name, dtype) pairs,
+    keeping each name at its first position with its last dtype.
+    """
+    dtypes = {}
+    colnames = []
+    for key, dtype in column_dtypes:
+        if key not in dtypes:
+            colnames.append(key)
+        dtypes[key] = dtype
+    return [(key, dtypes[key]) for key in colnames]
+
+
+def _take_into(source, indices, out):
+    """ Write ``source[indices]`` into ``out`` without allocating a temporary array
+    whenever ``out`` has the dtype of ``source``.
+    """
+    source = np.asarray(source)
+    if source.dtype == out.dtype:
+        np.take(source, indices, out=out, mode='clip')
+    else:
+        out[:] = source[indices]
+
+
+def _param_value_changed(previous_value, value):
+    """ Determine whether the value of a ``param_dict`` entry has changed.
+    """
+    try:
+        return bool(np.any(np.asarray(previous_value) != np.asarray(value)))
+    except (TypeError, ValueError):
+        return True
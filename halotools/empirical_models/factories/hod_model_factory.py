@@ -1122,6 +1122,15 @@ class HodModelFactory(ModelFactory):
             Default is 'halo_mvir'.
             Currently only supported for instances of `~halotools.empirical_models.HodModelFactory`.
 
+        galaxy_table_buffer : bool, optional
+            If set to True, the mock is populated in the reusable-arena mode of
+            `~halotools.empirical_models.MockFactory`, in which subsequent calls to
+            ``mock.populate`` write the galaxies in place into the memory allocated by the first call.
+            For HOD-style models, the galaxies are stored in a
+            `~halotools.empirical_models.GalaxyTableBuffer`,
+            and the ``galaxy_table`` is only built when it is accessed.
+            See `~halotools.empirical_models.HodMockFactory` for details. Default is False.
+
         masking_function : function, optional
             Function object used to place a mask on the halo table prior to
             calling the mock generating functions. Calling signature of the
@@ -1140,6 +1149,10 @@ class HodModelFactory(ModelFactory):
             no longer apply.
             Currently only supported for instances of `~halotools.empirical_models.HodModelFactory`.
 
+        num_chunks, num_threads : int, optional
+            Populate the halo catalog in chunks, possibly in parallel.
+            See `~halotools.empirical_models.HodMockFactory.populate`.
+
         Notes
         -----
         Note the difference between the
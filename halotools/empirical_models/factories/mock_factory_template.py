@@ -12,6 +12,7 @@ from abc import ABCMeta, abstractmethod
 from astropy.table import Table
 
 from .mock_helpers import three_dim_pos_bundle, infer_mask_from_kwargs
+from .galaxy_table_buffer import GalaxyTableBuffer
 
 from .. import model_helpers, model_defaults
 
@@ -51,6 +52,18 @@ class MockFactory(object):
         model : object
             A model built by a sub-class of `~halotools.empirical_models.ModelFactory`.
 
+        galaxy_table_buffer : bool, optional
+            If set to True, the mock is populated in reusable-arena mode,
+            intended for the repeated population of the same halo catalog
+            in an MCMC or when generating an ensemble of mocks.
+            In this mode, the memory storing the galaxies is allocated by the first call
+            to ``populate`` and written in place by subsequent calls,
+            growing only when a mock has more galaxies than ever before.
+            See `~halotools.empirical_models.HodMockFactory` for how
+            HOD-style mocks store their galaxies in a
+            `~halotools.empirical_models.GalaxyTableBuffer`; subhalo-based mocks
+            reuse the columns of their ``galaxy_table``. Default is False.
+
         """
 
         required_kwargs = ['model']
@@ -85,6 +98,42 @@ class MockFactory(object):
         self.additional_haloprops = list(set(self.additional_haloprops))
 
         self.galaxy_table = Table()
+        self._reuse_memory = kwargs.get('galaxy_table_buffer', False) is True
+
+    @property
+    def galaxy_table(self):
+        """ `~astropy.table.Table` storing the mock galaxy population.
+        """
+        if isinstance(self._galaxy_table, GalaxyTableBuffer):
+            # Wrap the buffer lazily, so that repeated calls to populate
+            # that never access the galaxy_table do not pay for building a Table
+            self._galaxy_table = self._galaxy_table.as_table()
+        return self._galaxy_table
+
+    @galaxy_table.setter
+    def galaxy_table(self, galaxy_table):
+        self._galaxy_table = galaxy_table
+
+    def _detach_population_state(self):
+        """ Detach the mock from the objects that are modified in place during mock population,
+        and return the attributes of the mock prior to detaching it, so that
+        `_restore_population_state` can restore the current mock after it has been repopulated,
+        as in `~halotools.empirical_models.ModelFactory.populate_mock_ensemble`.
+        """
+        state = copy(self.__dict__)
+        table_copies = {}
+        for key, value in state.items():
+            if isinstance(value, Table):
+                if id(value) not in table_copies:
+                    table_copies[id(value)] = value.copy(copy_data=False)
+                self.__dict__[key] = table_copies[id(value)]
+        return state
+
+    def _restore_population_state(self, state):
+        """ Restore the attributes of the mock returned by `_detach_population_state`.
+        """
+        self.__dict__.clear()
+        self.__dict__.update(state)
 
     @abstractmethod
     def populate(self, **kwargs):
@@ -322,6 +371,64 @@ class MockFactory(object):
                 approx_cell1_size=[rmax, rmax, rmax])
             return rbin_centers, xi11, xi12, xi22
 
+    def _compute_summary_statistics(self, statistics, rbins=None, rp_bins=None,
+            pi_max=None, mask_function=None, num_threads=1):
+        """ Compute the summary statistics of the current mock used by
+        `~halotools.empirical_models.ModelFactory.populate_mock_ensemble`.
+
+        Returns a dictionary storing the number density and/or the
+        `~halotools.mock_observables.tpcf` and `~halotools.mock_observables.wp`
+        of the galaxies selected by ``mask_function``, or of all galaxies
+        if ``mask_function`` is None.
+        """
+        if mask_function is None:
+            Ngals = len(self.galaxy_table)
+            mask = None
+        else:
+            mask = mask_function(self.galaxy_table)
+            Ngals = np.count_nonzero(mask)
+
+        result = {}
+        if 'number_density' in statistics:
+            result['number_density'] = Ngals/float(np.prod(self.Lbox))
+
+        if ('tpcf' not in statistics) and ('wp' not in statistics):
+            return result
+
+        if HAS_MOCKOBS is False:
+            msg = ("\nThe tpcf and wp summary statistics are only available "
+                " if the mock_observables sub-package has been compiled.\n")
+            raise HalotoolsError(msg)
+        if Ngals == 0:
+            msg = "Zero mock galaxies pass your cuts"
+            raise HalotoolsError(msg)
+
+        if mask is None:
+            pos = three_dim_pos_bundle(table=self.galaxy_table, key1='x', key2='y', key3='z')
+        else:
+            pos = three_dim_pos_bundle(table=self.galaxy_table,
+                key1='x', key2='y', key3='z', mask=mask, return_complement=False)
+
+        if 'tpcf' in statistics:
+            if rbins is None:
+                rbins = model_defaults.default_rbins
+            rmax = np.max(rbins)
+            result['tpcf'] = mock_observables.tpcf(pos, rbins,
+                period=self.Lbox, num_threads=num_threads,
+                approx_cell1_size=[rmax, rmax, rmax])
+
+        if 'wp' in statistics:
+            if rp_bins is None:
+                rp_bins = model_defaults.default_rbins
+            if pi_max is None:
+                pi_max = model_defaults.default_pi_max
+            rp_max = np.max(rp_bins)
+            result['wp'] = mock_observables.wp(pos, rp_bins, pi_max,
+                period=self.Lbox, num_threads=num_threads,
+                approx_cell1_size=[rp_max, rp_max, pi_max])
+
+        return result
+
     def compute_galaxy_matter_cross_clustering(self, include_complement=False, seed=None, **kwargs):
         """
         Built-in method for all mock catalogs to compute the galaxy-matter cross-correlation function.
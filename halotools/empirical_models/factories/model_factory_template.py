@@ -5,14 +5,16 @@ any composite model of the galaxy-halo connection.
 """
 
 import numpy as np
+from copy import copy
 from astropy.extern import six
 from abc import ABCMeta
 
 
-from .. import model_defaults
+from .. import model_defaults, model_helpers
 
 from ...sim_manager import CachedHaloCatalog, FakeSim
 from ...sim_manager import sim_defaults
+from ...utils.multiprocessing_utils import _process_num_threads
 from ...custom_exceptions import HalotoolsError
 
 __all__ = ['ModelFactory']
@@ -129,6 +131,15 @@ class ModelFactory(object):
             Default is 'halo_mvir'.
             Currently only supported for instances of `~halotools.empirical_models.HodModelFactory`.
 
+        galaxy_table_buffer : bool, optional
+            If set to True, the mock is populated in the reusable-arena mode of
+            `~halotools.empirical_models.MockFactory`, in which subsequent calls to
+            ``mock.populate`` write the galaxies in place into the memory allocated by the first call.
+            For HOD-style models, the galaxies are stored in a
+            `~halotools.empirical_models.GalaxyTableBuffer`,
+            and the ``galaxy_table`` is only built when it is accessed.
+            See `~halotools.empirical_models.HodMockFactory` for details. Default is False.
+
         masking_function : function, optional
             Function object used to place a mask on the halo table prior to
             calling the mock generating functions. Calling signature of the
@@ -151,6 +162,11 @@ class ModelFactory(object):
             Random number seed used in the Monte Carlo realization.
             Default is None, which will produce stochastic results.
 
+        num_chunks, num_threads : int, optional
+            Populate the halo catalog in chunks, possibly in parallel.
+            See `~halotools.empirical_models.HodMockFactory.populate`.
+            Currently only supported for instances of `~halotools.empirical_models.HodModelFactory`.
+
         Notes
         -----
         Note the difference between the
@@ -216,6 +232,19 @@ class ModelFactory(object):
         ---------
         :ref:`mock_making_tutorials`
 
+        """
+        self._instantiate_mock(halocat, Num_ptcl_requirement=Num_ptcl_requirement, **kwargs)
+
+        additional_potential_kwargs = ('masking_function', '_testing_mode', 'enforce_PBC', 'seed',
+            'num_chunks', 'num_threads')
+        mockpop_keys = set(additional_potential_kwargs) & set(kwargs)
+        mockpop_kwargs = {key: kwargs[key] for key in mockpop_keys}
+        self.mock.populate(**mockpop_kwargs)
+
+    def _instantiate_mock(self, halocat,
+            Num_ptcl_requirement=sim_defaults.Num_ptcl_requirement, **kwargs):
+        """ Bind a new ``mock`` to the model, carrying out all the pre-processing
+        of the halo catalog but without populating it with galaxies.
         """
         if hasattr(self, 'redshift'):
             if abs(self.redshift - halocat.redshift) > 0.05:
@@ -228,13 +257,12 @@ class ModelFactory(object):
             mock_factory_init_args['halo_mass_column_key'] = kwargs['halo_mass_column_key']
         except KeyError:
             pass
+        try:
+            mock_factory_init_args['galaxy_table_buffer'] = kwargs['galaxy_table_buffer']
+        except KeyError:
+            pass
         self.mock = self.mock_factory(**mock_factory_init_args)
 
-        additional_potential_kwargs = ('masking_function', '_testing_mode', 'enforce_PBC', 'seed')
-        mockpop_keys = set(additional_potential_kwargs) & set(kwargs)
-        mockpop_kwargs = {key: kwargs[key] for key in mockpop_keys}
-        self.mock.populate(**mockpop_kwargs)
-
     def update_param_dict_decorator(self, component_model, func_name):
         r"""
         Decorator used to propagate any possible changes in the composite model param_dict
@@ -268,6 +296,12 @@ class ModelFactory(object):
             to the behavior of the function in the component model,
             except that the component model param_dict is first updated with any
             possible changes to corresponding parameters in the composite model param_dict.
+            The ``param_dict_keys_read`` attribute of the returned function
+            is a set storing the keys of the component model param_dict
+            that have been read by the function in any of its calls, which
+            `~halotools.empirical_models.HodMockFactory.populate` uses
+            to determine which steps of mock population need to be repeated
+            when the ``param_dict`` changes.
 
         See also
         --------
@@ -284,8 +318,20 @@ class ModelFactory(object):
                     component_model.param_dict[key] = self.param_dict[key]
 
             func = getattr(component_model, func_name)
-            return func(*args, **kwargs)
 
+            # Record the param_dict keys read by the component model during the call
+            param_dict = component_model.param_dict
+            recorder = _ParamDictReadRecorder(param_dict)
+            component_model.param_dict = recorder
+            try:
+                return func(*args, **kwargs)
+            finally:
+                component_model.param_dict = param_dict
+                for key, value in dict.items(recorder):
+                    param_dict[key] = value
+                decorated_func.param_dict_keys_read.update(recorder.keys_read)
+
+        decorated_func.param_dict_keys_read = set()
         return decorated_func
 
     def compute_average_galaxy_clustering(self, num_iterations=5, summary_statistic='median', **kwargs):
@@ -302,7 +348,8 @@ class ModelFactory(object):
         If you wish to use the 3d correlation function in a performance-critical application,
         see :ref:`galaxy_catalog_analysis_tutorial2` for a demonstration of how to
         call the `~halotools.mock_observables.tpcf` function once,
-        directly on the mock galaxy catalog.
+        directly on the mock galaxy catalog, or see `populate_mock_ensemble`
+        to compute the clustering of a batch of mocks in parallel.
 
         Parameters
         ----------
@@ -458,7 +505,7 @@ class ModelFactory(object):
         if use_fake_sim is True:
             halocat = FakeSim(**halocat_kwargs)
         else:
-            halocat = CachedHaloCatalog(preload_halo_table=True, **halocat_kwargs)
+            halocat = CachedHaloCatalog(**halocat_kwargs)
 
         if 'rbins' in kwargs:
             rbins = kwargs['rbins']
@@ -672,7 +719,7 @@ class ModelFactory(object):
         if use_fake_sim is True:
             halocat = FakeSim(num_ptcl=int(1e5), **halocat_kwargs)
         else:
-            halocat = CachedHaloCatalog(preload_halo_table=True, **halocat_kwargs)
+            halocat = CachedHaloCatalog(**halocat_kwargs)
 
         if 'rbins' in kwargs:
             rbins = kwargs['rbins']
@@ -707,3 +754,262 @@ class ModelFactory(object):
                 rbin_centers, xi_coll[i, :] = self.mock.compute_galaxy_matter_cross_clustering(**kwargs)
             xi = summary_func(xi_coll, axis=0)
             return rbin_centers, xi
+
+    def populate_mock_ensemble(self, param_dicts=None, seeds=None, halocat=None,
+            statistics=('number_density', ), rbins=None, rp_bins=None, pi_max=None,
+            mask_function=None, num_threads=1, return_galaxy_tables=False, **kwargs):
+        r"""
+        Method populating a batch of mock galaxy catalogs, one per
+        point in parameter space and/or random number seed, and computing
+        the summary statistics of each mock.
+
+        All mocks are populated into the same halo catalog, so that
+        the pre-processing of the halo catalog and the lookup tables of the model
+        are only computed once for the entire ensemble.
+        The realizations can be populated concurrently in forked processes.
+        Unlike `compute_average_galaxy_clustering`, the method returns
+        the statistics of each individual mock, so that it can be used
+        to evaluate a batch of points in an MCMC or a grid of parameter values.
+
+        Parameters
+        ----------
+        param_dicts : list of dicts, optional
+            List of dictionaries storing the values of the model parameters
+            of each mock. Each dictionary only needs to store the parameters
+            that differ from the current ``param_dict`` of the model.
+            Default is None, in which case all mocks use the current ``param_dict``.
+
+        seeds : list of ints, optional
+            List of random number seeds of each mock.
+            If both ``param_dicts`` and ``seeds`` are passed, they must have the same length.
+            Default is None, in which case the seed of each mock is drawn at random
+            and stored in its result, so that the mocks are stochastic
+            but distinct even when they are populated in forked processes.
+            At least one of ``param_dicts`` and ``seeds`` must be passed.
+
+        halocat : object, optional
+            Halo catalog into which the mocks will be populated.
+            Default is None, in which case the mocks are populated into the
+            halo catalog of the ``mock`` already bound to the model.
+
+        statistics : sequence of strings, optional
+            Summary statistics computed for each mock, any of ``number_density``,
+            ``tpcf`` and ``wp``. Default is ('number_density', ).
+
+        rbins : array, optional
+            Bins in which the ``tpcf`` is calculated.
+            Default is set in `~halotools.empirical_models.model_defaults` module.
+
+        rp_bins : array, optional
+            Bins in projected separation in which the ``wp`` is calculated.
+            Default is set in `~halotools.empirical_models.model_defaults` module.
+
+        pi_max : float, optional
+            Maximum line-of-sight separation used to compute ``wp``.
+            Default is set in `~halotools.empirical_models.model_defaults` module.
+
+        mask_function : function, optional
+            Function object returning a masking array when operating on the galaxy_table,
+            used to select the galaxies entering the summary statistics.
+            Default is None, in which case all galaxies are used.
+
+        num_threads : int or string, optional
+            Number of processes used to populate the mocks,
+            or the string 'max' to use all available cores.
+            The processes are forked from the current process, so that parallel
+            population is only available on platforms supporting the fork start method.
+            Default is 1.
+
+        return_galaxy_tables : bool, optional
+            If set to True, the result of each mock also stores a copy of its ``galaxy_table``.
+            Default is False.
+
+        **kwargs : optional
+            Any other keyword argument is passed on to
+            the `populate_mock` method when ``halocat`` is passed,
+            and to the ``populate`` method of the mock, e.g., ``masking_function``,
+            or ``incremental`` to only repopulate the galaxies affected
+            by each change of parameters of an HOD-style model.
+
+        Returns
+        -------
+        results : list of dicts
+            One dictionary per mock, storing the ``param_dict`` and ``seed``
+            used to populate the mock together with each of the requested ``statistics``,
+            and the ``galaxy_table`` if ``return_galaxy_tables`` is True.
+
+        Examples
+        --------
+        >>> from halotools.empirical_models import PrebuiltHodModelFactory
+        >>> from halotools.sim_manager import FakeSim
+        >>> model_instance = PrebuiltHodModelFactory('zheng07')
+        >>> halocat = FakeSim()
+        >>> param_dicts = [{'logMmin': 12}, {'logMmin': 12.5}]
+        >>> results = model_instance.populate_mock_ensemble(param_dicts=param_dicts, seeds=[43, 43], halocat=halocat)
+        >>> ngal_low_mass, ngal_high_mass = [result['number_density'] for result in results]
+
+        The ``param_dict`` of the model and the galaxies of its ``mock``
+        are left unchanged by the method, unless a ``halocat`` is passed,
+        in which case a new ``mock`` is bound to the model without being populated.
+        """
+        realizations = self._process_ensemble_args(param_dicts, seeds)
+
+        statistics = list(statistics)
+        available_statistics = ('number_density', 'tpcf', 'wp')
+        for statistic in statistics:
+            if statistic not in available_statistics:
+                msg = ("Input statistic ``{0}`` is not recognized.\n"
+                    "Available summary statistics are {1}".format(statistic, available_statistics))
+                raise HalotoolsError(msg)
+
+        if halocat is not None:
+            self._instantiate_mock(halocat, **kwargs)
+        elif not hasattr(self, 'mock'):
+            msg = ("The populate_mock_ensemble method must be passed a ``halocat`` "
+                "if the model has not yet been used to populate a mock")
+            raise HalotoolsError(msg)
+
+        populate_keys = ('masking_function', 'enforce_PBC', 'incremental', 'num_chunks')
+        populate_kwargs = {key: kwargs[key] for key in populate_keys if key in kwargs}
+        statistic_kwargs = {'statistics': statistics, 'rbins': rbins, 'rp_bins': rp_bins,
+            'pi_max': pi_max, 'mask_function': mask_function}
+
+        num_threads = _process_num_threads(num_threads)
+        num_threads = min(num_threads, len(realizations))
+
+        baseline_param_dict = copy(self.param_dict)
+        if num_threads == 1:
+            mock_state = self.mock._detach_population_state()
+            try:
+                results = [self._populate_ensemble_member(param_dict, seed, baseline_param_dict,
+                    populate_kwargs, statistic_kwargs, return_galaxy_tables)
+                    for param_dict, seed in realizations]
+            finally:
+                self.param_dict.update(baseline_param_dict)
+                self.mock._restore_population_state(mock_state)
+        else:
+            global _parallel_ensemble_model
+            _parallel_ensemble_model = self
+            try:
+                context = model_helpers._get_fork_context()
+                pool = context.Pool(num_threads)
+                try:
+                    results = pool.map(_populate_ensemble_member_in_worker,
+                        [(param_dict, seed, baseline_param_dict, populate_kwargs,
+                            statistic_kwargs, return_galaxy_tables)
+                        for param_dict, seed in realizations])
+                finally:
+                    pool.close()
+                    pool.join()
+            finally:
+                _parallel_ensemble_model = None
+
+        return results
+
+    def _process_ensemble_args(self, param_dicts, seeds):
+        """ Return the list of (param_dict, seed) pairs of the mocks of
+        `populate_mock_ensemble`.
+        """
+        if (param_dicts is None) and (seeds is None):
+            msg = ("The populate_mock_ensemble method must be passed "
+                "at least one of the ``param_dicts`` and ``seeds`` arguments")
+            raise HalotoolsError(msg)
+        elif param_dicts is None:
+            seeds = list(seeds)
+            param_dicts = [{} for seed in seeds]
+        elif seeds is None:
+            # Forked processes inherit the global random state of the parent process,
+            # so that each mock is given an explicit seed
+            param_dicts = list(param_dicts)
+            max_seed = np.iinfo(np.int32).max - len(self._mock_generation_calling_sequence) - 1
+            seeds = [int(seed) for seed in np.random.randint(0, max_seed, len(param_dicts))]
+        else:
+            param_dicts, seeds = list(param_dicts), list(seeds)
+            if len(param_dicts) != len(seeds):
+                msg = ("Input ``param_dicts`` and ``seeds`` must have the same length.\n"
+                    "Received len(param_dicts) = {0} and len(seeds) = {1}".format(
+                        len(param_dicts), len(seeds)))
+                raise HalotoolsError(msg)
+
+        if len(seeds) == 0:
+            msg = "The populate_mock_ensemble method requires at least one mock"
+            raise HalotoolsError(msg)
+
+        for param_dict in param_dicts:
+            unrecognized_keys = set(param_dict) - set(self.param_dict)
+            if len(unrecognized_keys) > 0:
+                msg = ("The following keys of an input ``param_dicts`` entry "
+                    "do not appear in the ``param_dict`` of the model:\n{0}".format(
+                        sorted(unrecognized_keys)))
+                raise HalotoolsError(msg)
+
+        return list(zip(param_dicts, seeds))
+
+    def _populate_ensemble_member(self, param_dict, seed, baseline_param_dict,
+            populate_kwargs, statistic_kwargs, return_galaxy_table):
+        """ Populate the mock of a single member of the ensemble of
+        `populate_mock_ensemble` and compute its summary statistics.
+        """
+        self.param_dict.update(baseline_param_dict)
+        self.param_dict.update(param_dict)
+        self.mock.populate(seed=seed, **populate_kwargs)
+
+        result = self.mock._compute_summary_statistics(**statistic_kwargs)
+        result['param_dict'] = copy(self.param_dict)
+        result['seed'] = seed
+        if return_galaxy_table is True:
+            result['galaxy_table'] = self.mock.galaxy_table.copy()
+        return result
+
+
+_parallel_ensemble_model = None
+
+
+def _populate_ensemble_member_in_worker(args):
+    """ Populate a member of the ensemble of `ModelFactory.populate_mock_ensemble`
+    with the model stored in the module-level ``_parallel_ensemble_model`` variable,
+    which the worker processes inherit from the parent process when they are forked.
+    """
+    return _parallel_ensemble_model._populate_ensemble_member(*args)
+
+
+class _ParamDictReadRecorder(dict):
+    """ Copy of a param_dict that records the keys that are read from it.
+    Accessing the dictionary as a whole, e.g., by iterating over it,
+    counts as reading every key.
+    """
+
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        self.keys_read = set()
+
+    def __getitem__(self, key):
+        self.keys_read.add(key)
+        return dict.__getitem__(self, key)
+
+    def get(self, key, *args):
+        self.keys_read.add(key)
+        return dict.get(self, key, *args)
+
+    def _read_all(self):
+        self.keys_read.update(dict.keys(self))
+
+    def __iter__(self):
+        self._read_all()
+        return dict.__iter__(self)
+
+    def keys(self):
+        self._read_all()
+        return dict.keys(self)
+
+    def values(self):
+        self._read_all()
+        return dict.values(self)
+
+    def items(self):
+        self._read_all()
+        return dict.items(self)
+
+    def copy(self):
+        self._read_all()
+        return dict(self)
@@ -58,6 +58,12 @@ class SubhaloMockFactory(MockFactory):
             If set to ``False``, the class will perform all pre-processing tasks
             but will not call the ``model`` to populate the ``galaxy_table``
             with mock galaxies and their observable properties. Default is ``True``.
+
+        galaxy_table_buffer : bool, optional
+            If set to True, the columns of the ``galaxy_table`` allocated by
+            the first call to `populate` are written in place by subsequent calls,
+            as in the reusable-arena mode of `~halotools.empirical_models.MockFactory`.
+            Default is False.
         """
 
         MockFactory.__init__(self, **kwargs)
@@ -251,4 +257,12 @@ class SubhaloMockFactory(MockFactory):
 
         for key in new_column_generator:
             dt = self.model._galprop_dtypes_to_allocate[key]
+            if self._reuse_memory is True:
+                # In reusable-arena mode, columns allocated by a previous call are written in place
+                try:
+                    column = self.galaxy_table[key]
+                    if (len(column) == Ngals) & (column.dtype == dt):
+                        continue
+                except KeyError:
+                    pass
             self.galaxy_table[key] = np.empty(Ngals, dtype=dt)
@@ -0,0 +1,103 @@
+"""
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import numpy as np
+import pytest
+
+from ..galaxy_table_buffer import GalaxyTableBuffer
+
+from ....custom_exceptions import HalotoolsError
+
+__all__ = ('test_galaxy_table_buffer_reuse', )
+
+
+def test_galaxy_table_buffer_reuse():
+    buf = GalaxyTableBuffer(['centrals', 'satellites'])
+    column_dtypes = [('halo_mvir', 'f4'), ('gal_type', object), ('x', 'f8')]
+    buf.allocate(100, column_dtypes)
+    assert len(buf) == 100
+    assert buf.capacity >= 100
+    assert buf['gal_type'].dtype == np.int8
+    buf['x'][:] = 1.
+    arena = buf._arena
+
+    buf.allocate(buf.capacity, column_dtypes)
+    assert buf._arena is arena
+    assert np.all(buf['x'] == 0)
+
+    buf.allocate(buf.capacity + 1, column_dtypes)
+    assert buf._arena is not arena
+
+
+def test_galaxy_table_buffer_alignment():
+    buf = GalaxyTableBuffer(['centrals', 'satellites'])
+    buf.allocate(17, [('halo_mvir', 'f4'), ('gal_type', object), ('x', 'f8'), ('halo_id', 'i8')])
+    for key in buf.keys():
+        assert buf[key].flags.c_contiguous
+        assert buf[key].ctypes.data % 64 == 0
+
+
+def test_galaxy_table_buffer_rows():
+    buf = GalaxyTableBuffer(['centrals', 'satellites'])
+    buf.allocate(10, [('halo_mvir', 'f8'), ('gal_type', object)])
+    rows = buf[slice(4, 10)]
+    assert len(rows) == 6
+    assert 'halo_mvir' in rows.keys()
+    rows['halo_mvir'] = 2.
+    rows['gal_type'][:] = buf.gal_type_code('satellites')
+    assert np.all(buf['halo_mvir'][4:] == 2)
+    assert np.all(buf['halo_mvir'][:4] == 0)
+
+    t = buf.as_table()
+    assert list(t.keys()) == ['halo_mvir', 'gal_type']
+    assert np.all(t['gal_type'][:4] == 'centrals')
+    assert np.all(t['gal_type'][4:] == 'satellites')
+
+
+def test_galaxy_table_buffer_as_table_shares_memory():
+    buf = GalaxyTableBuffer(['centrals'])
+    buf.allocate(5, [('halo_mvir', 'f8'), ('gal_type', object)])
+    t = buf.as_table()
+    buf['halo_mvir'][:] = 3.
+    assert np.all(t['halo_mvir'] == 3)
+
+    t2 = buf.as_table(copy=True)
+    buf['halo_mvir'][:] = 4.
+    assert np.all(t2['halo_mvir'] == 3)
+
+
+def test_galaxy_table_buffer_copy():
+    buf = GalaxyTableBuffer(['centrals'])
+    buf.allocate(5, [('halo_mvir', 'f8'), ('gal_type', object)])
+    buf['halo_mvir'][:] = 3.
+    buf2 = buf.copy()
+    buf.allocate(5, [('halo_mvir', 'f8'), ('gal_type', object)])
+    assert np.all(buf2['halo_mvir'] == 3)
+    assert np.all(buf['halo_mvir'] == 0)
+
+
+def test_galaxy_table_buffer_new_column():
+    buf = GalaxyTableBuffer(['centrals'])
+    column_dtypes = [('halo_mvir', 'f8'), ('gal_type', object)]
+    buf.allocate(5, column_dtypes)
+    buf['new_column'] = np.arange(5)
+    assert np.all(buf['new_column'] == np.arange(5))
+    buf.allocate(5, column_dtypes)
+    assert 'new_column' not in buf
+
+
+def test_galaxy_table_buffer_missing_key():
+    buf = GalaxyTableBuffer(['centrals'])
+    buf.allocate(5, [('halo_mvir', 'f8')])
+    with pytest.raises(KeyError) as err:
+        buf['x']
+    substr = "The ``x`` column does not appear in the galaxy table"
+    assert substr in err.value.args[0]
+
+
+def test_galaxy_table_buffer_growth_factor():
+    with pytest.raises(HalotoolsError) as err:
+        GalaxyTableBuffer(['centrals'], growth_factor=0.5)
+    substr = "Input ``growth_factor`` must be no smaller than 1"
+    assert substr in err.value.args[0]
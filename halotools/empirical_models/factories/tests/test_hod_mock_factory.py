@@ -2,11 +2,20 @@
 """
 from __future__ import (absolute_import, division, print_function)
 
+import os
+import shutil
 import pytest
 from astropy.config.paths import _find_home
+from astropy.table import Table
 import numpy as np
 from copy import deepcopy
 
+try:
+    import h5py
+    HAS_H5PY = True
+except ImportError:
+    HAS_H5PY = False
+
 from ....mock_observables import return_xyz_formatted_array, tpcf_one_two_halo_decomp
 
 
@@ -15,9 +24,11 @@ from ....empirical_models import TrivialPhaseSpace
 from ....empirical_models import AssembiasZheng07Sats
 from ....empirical_models import NFWPhaseSpace
 from ....empirical_models import HodModelFactory
+from ....empirical_models import PreservingNgalAssembiasZheng07Cens
 
 from ....sim_manager import FakeSim, CachedHaloCatalog
 from ....sim_manager.fake_sim import FakeSimHalosNearBoundaries
+from ....utils.table_utils import compute_conditional_percentiles
 from ..prebuilt_model_factory import PrebuiltHodModelFactory
 from ....custom_exceptions import HalotoolsError
 
@@ -288,3 +299,421 @@ def test_one_two_halo_decomposition_on_mock():
     xi_1h, xi_2h = tpcf_one_two_halo_decomp(pos, halo_hostid, rbins,
         period=model.mock.Lbox, num_threads='max')
     assert xi_1h[-1] == -1
+
+
+def test_incremental_populate_satellite_param():
+    """ Changing a parameter that only the satellites depend upon and
+    re-populating incrementally should give exactly the same mock as
+    a full re-population with the same seed, re-using the centrals.
+    """
+    model = PrebuiltHodModelFactory('zheng07', threshold=-20)
+    halocat = FakeSim(seed=fixed_seed)
+    model.populate_mock(halocat, seed=fixed_seed)
+
+    assert 'logMmin' in model.mc_occupation_centrals.param_dict_keys_read
+    assert 'alpha' not in model.mc_occupation_centrals.param_dict_keys_read
+    assert 'alpha' in model.mc_occupation_satellites.param_dict_keys_read
+
+    model.mock.populate(seed=fixed_seed, incremental=True)
+    cens1 = deepcopy(model.mock.galaxy_table[model.mock.galaxy_table['gal_type'] == 'centrals'])
+
+    model.param_dict['alpha'] *= 1.1
+    model.mock.populate(seed=fixed_seed, incremental=True)
+    incremental_table = deepcopy(model.mock.galaxy_table)
+
+    model.mock.populate(seed=fixed_seed)
+    full_table = model.mock.galaxy_table
+
+    assert len(incremental_table) == len(full_table)
+    assert set(incremental_table.keys()) == set(full_table.keys())
+    for key in full_table.keys():
+        assert np.all(incremental_table[key] == full_table[key])
+
+    cens2 = incremental_table[incremental_table['gal_type'] == 'centrals']
+    assert np.all(cens1['halo_id'] == cens2['halo_id'])
+    assert np.all(cens1['x'] == cens2['x'])
+
+
+def test_incremental_populate_seed_change():
+    """ Changing the seed between incremental calls should trigger a full re-population.
+    """
+    model = PrebuiltHodModelFactory('zheng07', threshold=-20)
+    halocat = FakeSim(seed=fixed_seed)
+    model.populate_mock(halocat, seed=fixed_seed)
+
+    model.mock.populate(seed=fixed_seed, incremental=True)
+    model.mock.populate(seed=fixed_seed+1, incremental=True)
+    incremental_table = deepcopy(model.mock.galaxy_table)
+
+    model.mock.populate(seed=fixed_seed+1)
+    full_table = model.mock.galaxy_table
+
+    assert len(incremental_table) == len(full_table)
+    for key in full_table.keys():
+        assert np.all(incremental_table[key] == full_table[key])
+
+
+def test_galaxy_table_buffer_populate():
+    """ Populating a mock with the galaxy table buffer should give exactly the same
+    galaxies as populating an astropy Table, and reuse the buffer memory across calls.
+    """
+    model = PrebuiltHodModelFactory('zheng07', threshold=-20)
+    halocat = FakeSim(seed=fixed_seed)
+    model.populate_mock(halocat, seed=fixed_seed)
+    table_gals = deepcopy(model.mock.galaxy_table)
+
+    model2 = PrebuiltHodModelFactory('zheng07', threshold=-20)
+    model2.populate_mock(halocat, seed=fixed_seed, galaxy_table_buffer=True)
+    buffer_gals = model2.mock.galaxy_table
+
+    assert buffer_gals.keys() == table_gals.keys()
+    for key in table_gals.keys():
+        assert buffer_gals[key].dtype == table_gals[key].dtype
+        assert np.all(buffer_gals[key] == table_gals[key])
+
+    arena = model2.mock._galaxy_table_buffer._arena
+    model2.param_dict['logMmin'] += 0.01
+    model2.mock.populate(seed=fixed_seed)
+    assert len(model2.mock.galaxy_table) <= len(buffer_gals)
+    assert model2.mock._galaxy_table_buffer._arena is arena
+
+
+def test_reusable_arena_masking_function():
+    """ Populating a subvolume in reusable-arena mode should give the same galaxies as
+    populating it without the arena, and reuse the halos selected by the masking function.
+    """
+    def masking_function(t):
+        return t['halo_x'] < 100
+
+    model = PrebuiltHodModelFactory('zheng07', threshold=-20)
+    halocat = FakeSim(seed=fixed_seed)
+    model.populate_mock(halocat, seed=fixed_seed,
+        masking_function=masking_function, enforce_PBC=False)
+
+    model2 = PrebuiltHodModelFactory('zheng07', threshold=-20)
+    model2.populate_mock(halocat, seed=fixed_seed, galaxy_table_buffer=True,
+        masking_function=masking_function, enforce_PBC=False)
+    masked_halo_table = model2.mock.halo_table
+
+    for key in model.mock.galaxy_table.keys():
+        assert np.all(model.mock.galaxy_table[key] == model2.mock.galaxy_table[key])
+
+    model2.mock.populate(seed=fixed_seed+1, masking_function=masking_function, enforce_PBC=False)
+    assert model2.mock.halo_table is masked_halo_table
+    model.mock.populate(seed=fixed_seed+1, masking_function=masking_function, enforce_PBC=False)
+    for key in model.mock.galaxy_table.keys():
+        assert np.all(model.mock.galaxy_table[key] == model2.mock.galaxy_table[key])
+
+
+def test_populate_in_chunks_deterministic():
+    """ For a given seed and number of chunks, the mock should not depend on the number of processes.
+    """
+    model = PrebuiltHodModelFactory('zheng07', threshold=-20)
+    halocat = FakeSim(seed=fixed_seed)
+    model.populate_mock(halocat, seed=fixed_seed)
+    ngals_serial = len(model.mock.galaxy_table)
+
+    model.mock.populate(seed=fixed_seed, num_chunks=5)
+    gals1 = deepcopy(model.mock.galaxy_table)
+    model.mock.populate(seed=fixed_seed, num_chunks=5, num_threads=3)
+    gals2 = deepcopy(model.mock.galaxy_table)
+
+    assert len(gals1) == len(gals2)
+    assert set(gals1.keys()) == set(gals2.keys())
+    for key in gals1.keys():
+        assert np.all(gals1[key] == gals2[key])
+
+    assert np.allclose(len(gals1), ngals_serial, rtol=0.05)
+    assert np.all(model.mock.halo_table['halo_num_centrals'] ==
+        model.mock._occupation['centrals'])
+    cenmask = gals1['gal_type'] == 'centrals'
+    assert np.all(gals1['x'][cenmask] == gals1['halo_x'][cenmask])
+    assert np.all(gals1['x'] >= 0) & np.all(gals1['x'] <= model.mock.Lbox[0])
+
+    model.mock.populate(seed=fixed_seed+1, num_chunks=5)
+    assert len(model.mock.galaxy_table) != len(gals1)
+
+
+def test_populate_in_chunks_galaxy_table_buffer():
+    model = PrebuiltHodModelFactory('zheng07', threshold=-20)
+    halocat = FakeSim(seed=fixed_seed)
+    model.populate_mock(halocat, seed=fixed_seed, num_chunks=4)
+    gals1 = deepcopy(model.mock.galaxy_table)
+
+    model2 = PrebuiltHodModelFactory('zheng07', threshold=-20)
+    model2.populate_mock(halocat, seed=fixed_seed, galaxy_table_buffer=True)
+    model2.mock.populate(seed=fixed_seed, num_chunks=4, num_threads=2)
+    gals2 = model2.mock.galaxy_table
+    for key in gals1.keys():
+        assert np.all(gals1[key] == gals2[key])
+
+
+def test_populate_in_chunks_incremental():
+    model = PrebuiltHodModelFactory('zheng07', threshold=-20)
+    halocat = FakeSim(seed=fixed_seed)
+    model.populate_mock(halocat, seed=fixed_seed)
+
+    with pytest.raises(HalotoolsError) as err:
+        model.mock.populate(seed=fixed_seed, num_chunks=4, incremental=True)
+    substr = "cannot be used together with ``num_chunks`` or ``num_threads``"
+    assert substr in err.value.args[0]
+
+    with pytest.raises(ValueError) as err:
+        model.mock.populate(seed=fixed_seed, num_threads=0)
+    substr = "Input ``num_threads`` argument must be a positive integer or the string 'max'"
+    assert substr in err.value.args[0]
+
+
+def test_populate_in_chunks_assembias_percentiles():
+    """ The conditional percentiles of assembias models should be computed on the
+    entire halo table rather than on each chunk.
+    """
+    cen_occ_model = AssembiasZheng07Cens(prim_haloprop_key='halo_mvir', sec_haloprop_key='halo_nfw_conc')
+    sat_occ_model = AssembiasZheng07Sats(prim_haloprop_key='halo_mvir', sec_haloprop_key='halo_nfw_conc')
+    model = HodModelFactory(centrals_occupation=cen_occ_model, centrals_profile=TrivialPhaseSpace(),
+                satellites_occupation=sat_occ_model, satellites_profile=NFWPhaseSpace())
+    halocat = FakeSim(seed=fixed_seed)
+    model.populate_mock(halocat, seed=fixed_seed)
+
+    model.mock.populate(seed=fixed_seed, num_chunks=5)
+    gals1 = deepcopy(model.mock.galaxy_table)
+    assert 'halo_nfw_conc_percentile' not in model.mock.halo_table.keys()
+
+    model.mock.halo_table['halo_nfw_conc_percentile'] = compute_conditional_percentiles(
+        prim_haloprop=model.mock.halo_table['halo_mvir'],
+        sec_haloprop=model.mock.halo_table['halo_nfw_conc'])
+    model.mock.populate(seed=fixed_seed, num_chunks=5)
+    gals2 = model.mock.galaxy_table
+    assert len(gals1) == len(gals2)
+    for key in gals1.keys():
+        assert np.all(gals1[key] == gals2[key])
+
+
+def test_populate_in_chunks_preserving_ngal_assembias():
+    model = HodModelFactory(centrals_occupation=PreservingNgalAssembiasZheng07Cens(),
+        centrals_profile=TrivialPhaseSpace())
+    halocat = FakeSim(seed=fixed_seed)
+    model.populate_mock(halocat, seed=fixed_seed)
+
+    with pytest.raises(HalotoolsError) as err:
+        model.mock.populate(seed=fixed_seed, num_chunks=4)
+    substr = "so the mock cannot be populated in chunks"
+    assert substr in err.value.args[0]
+
+
+def test_populate_in_chunks_distinct_seeds():
+    """ Without a seed, the chunks should still be populated with distinct seeds,
+    since forked processes share the random state of the parent process.
+    """
+    model = PrebuiltHodModelFactory('zheng07', threshold=-20)
+    halocat = FakeSim(seed=fixed_seed)
+    model.populate_mock(halocat, seed=fixed_seed)
+
+    __, chunk_seeds = model.mock._chunk_slices_and_seeds(None, 8)
+    assert None not in chunk_seeds
+    assert len(set(chunk_seeds)) == 8
+    __, chunk_seeds2 = model.mock._chunk_slices_and_seeds(None, 8)
+    assert chunk_seeds != chunk_seeds2
+
+
+def test_populate_mock_ensemble():
+    """ Each member of the ensemble should be identical to the mock populated
+    with the same param_dict and seed, regardless of the number of processes.
+    """
+    model = PrebuiltHodModelFactory('zheng07', threshold=-20)
+    halocat = FakeSim(seed=fixed_seed)
+    param_dicts = [{'logMmin': 12.}, {'logMmin': 12.5}, {'logM1': 13.5}]
+    seeds = [fixed_seed, fixed_seed, fixed_seed+1]
+    rbins = np.logspace(-1, 0.5, 5)
+    statistics = ('number_density', 'tpcf', 'wp')
+
+    results = model.populate_mock_ensemble(param_dicts=param_dicts, seeds=seeds,
+        halocat=halocat, statistics=statistics, rbins=rbins, rp_bins=rbins, pi_max=10.,
+        return_galaxy_tables=True)
+    results2 = model.populate_mock_ensemble(param_dicts=param_dicts, seeds=seeds,
+        statistics=statistics, rbins=rbins, rp_bins=rbins, pi_max=10., num_threads=2)
+    assert model.param_dict['logMmin'] == PrebuiltHodModelFactory('zheng07', threshold=-20).param_dict['logMmin']
+
+    model2 = PrebuiltHodModelFactory('zheng07', threshold=-20)
+    for param_dict, seed, result, result2 in zip(param_dicts, seeds, results, results2):
+        model2.param_dict.update(param_dict)
+        model2.populate_mock(halocat, seed=seed)
+        gals = model2.mock.galaxy_table
+
+        assert result['seed'] == seed
+        assert result['param_dict'] == model2.param_dict
+        assert len(result['galaxy_table']) == len(gals)
+        assert np.all(result['galaxy_table']['x'] == gals['x'])
+        assert result['number_density'] == model2.mock.number_density
+        assert len(result['tpcf']) == len(rbins) - 1
+        assert len(result['wp']) == len(rbins) - 1
+        for statistic in statistics:
+            assert np.all(result[statistic] == result2[statistic])
+        model2 = PrebuiltHodModelFactory('zheng07', threshold=-20)
+
+    assert results[0]['number_density'] > results[1]['number_density']
+
+
+def test_populate_mock_ensemble_restores_mock():
+    """ The mock bound to the model should be left unchanged by the ensemble,
+    whose mocks should have distinct seeds when no seeds are passed.
+    """
+    for galaxy_table_buffer in (False, True):
+        model = PrebuiltHodModelFactory('zheng07', threshold=-20)
+        halocat = FakeSim(seed=fixed_seed)
+        model.populate_mock(halocat, seed=fixed_seed, galaxy_table_buffer=galaxy_table_buffer)
+        gals = model.mock.galaxy_table.copy()
+        halo_num_centrals = np.copy(model.mock.halo_table['halo_num_centrals'])
+
+        param_dicts = [{'logMmin': 12.}, {'logMmin': 12.}]
+        for num_threads in (1, 2):
+            results = model.populate_mock_ensemble(param_dicts=param_dicts,
+                num_threads=num_threads)
+            assert results[0]['seed'] != results[1]['seed']
+            assert results[0]['number_density'] != results[1]['number_density']
+
+            assert len(model.mock.galaxy_table) == len(gals)
+            for key in gals.keys():
+                assert np.all(model.mock.galaxy_table[key] == gals[key])
+            assert np.all(model.mock.halo_table['halo_num_centrals'] == halo_num_centrals)
+
+
+def test_populate_mock_ensemble_bad_args():
+    model = PrebuiltHodModelFactory('zheng07', threshold=-20)
+
+    with pytest.raises(HalotoolsError) as err:
+        model.populate_mock_ensemble(seeds=[fixed_seed])
+    substr = "must be passed a ``halocat``"
+    assert substr in err.value.args[0]
+
+    halocat = FakeSim(seed=fixed_seed)
+    with pytest.raises(HalotoolsError) as err:
+        model.populate_mock_ensemble(halocat=halocat)
+    substr = "at least one of the ``param_dicts`` and ``seeds`` arguments"
+    assert substr in err.value.args[0]
+
+    with pytest.raises(HalotoolsError) as err:
+        model.populate_mock_ensemble(param_dicts=[{}], seeds=[1, 2], halocat=halocat)
+    substr = "must have the same length"
+    assert substr in err.value.args[0]
+
+    with pytest.raises(HalotoolsError) as err:
+        model.populate_mock_ensemble(param_dicts=[{'Air': 'Bud'}], halocat=halocat)
+    substr = "do not appear in the ``param_dict`` of the model"
+    assert substr in err.value.args[0]
+
+    with pytest.raises(HalotoolsError) as err:
+        model.populate_mock_ensemble(seeds=[1], halocat=halocat, statistics=['ds'])
+    substr = "Input statistic ``ds`` is not recognized"
+    assert substr in err.value.args[0]
+
+
+@pytest.mark.skipif('not HAS_H5PY')
+def test_populate_to_disk():
+    """ The galaxies streamed to disk should be those of the mock populated
+    in memory with the same seed and number of chunks.
+    """
+    model = PrebuiltHodModelFactory('zheng07', threshold=-20)
+    halocat = FakeSim(seed=fixed_seed)
+    model.populate_mock(halocat, seed=fixed_seed, num_chunks=5)
+    gals = model.mock.galaxy_table
+
+    tmpdir = os.path.join(_find_home(), '.tmp_testingdir_populate_to_disk')
+    try:
+        os.makedirs(tmpdir)
+    except OSError:
+        pass
+    fname = os.path.join(tmpdir, 'mock.hdf5')
+    try:
+        model.mock.populate_to_disk(fname, seed=fixed_seed, num_chunks=5, overwrite=True)
+        assert model.mock.galaxy_table is gals
+
+        with h5py.File(fname, 'r') as f:
+            assert f['data'].shape == (len(gals), )
+            assert f['data'].attrs['logMmin'] == model.param_dict['logMmin']
+            assert np.all(f.attrs['Lbox'] == model.mock.Lbox)
+
+        disk_gals = Table.read(fname, path='data')
+        assert set(disk_gals.keys()) == set(gals.keys())
+        for gal_type in model.mock.gal_types:
+            mask = gals['gal_type'] == gal_type
+            disk_mask = disk_gals['gal_type'] == gal_type.encode('ascii')
+            for key in gals.keys():
+                if key != 'gal_type':
+                    assert np.all(disk_gals[key][disk_mask] == gals[key][mask])
+
+        # The rows of the galaxy_table are grouped by gal_type, and those of the file by chunk
+        assert np.all(np.diff((gals['gal_type'] == 'centrals').astype(int)) <= 0)
+        assert np.any(np.diff((disk_gals['gal_type'] == b'centrals').astype(int)) > 0)
+
+        with pytest.raises(HalotoolsError) as err:
+            model.mock.populate_to_disk(fname, seed=fixed_seed)
+        substr = "Call the populate_to_disk method with overwrite=True"
+        assert substr in err.value.args[0]
+
+        # No partially written file is left behind if mock population fails
+        def failing_selection_func(table):
+            raise ValueError("Selection failed")
+        model.mock.model.galaxy_selection_func = failing_selection_func
+        fname2 = os.path.join(tmpdir, 'mock2.hdf5')
+        with pytest.raises(ValueError):
+            model.mock.populate_to_disk(fname2, seed=fixed_seed, num_chunks=5)
+        assert os.listdir(tmpdir) == ['mock.hdf5']
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+@pytest.mark.skipif('not HAS_H5PY')
+def test_populate_lazy_halo_table():
+    """ A mock populated from a halo catalog whose columns are read lazily
+    should be identical to the mock populated from the fully loaded catalog,
+    and only the columns used by the model should be read from disk.
+    """
+    from ....sim_manager import UserSuppliedHaloCatalog, HaloTableCache
+
+    fakesim = FakeSim(seed=fixed_seed)
+    halo_columns = dict((key, fakesim.halo_table[key]) for key in fakesim.halo_table.keys())
+    halo_columns['halo_spin'] = np.zeros(len(fakesim.halo_table))
+    halocat = UserSuppliedHaloCatalog(Lbox=fakesim.Lbox,
+        particle_mass=fakesim.particle_mass, redshift=fakesim.redshift, **halo_columns)
+
+    tmpdir = os.path.join(_find_home(), '.tmp_testingdir_populate_lazy_halo_table')
+    try:
+        os.makedirs(tmpdir)
+    except OSError:
+        pass
+    fname = os.path.join(tmpdir, 'lazy_halocat.hdf5')
+    halocat.add_halocat_to_cache(fname, 'lazy_fake', 'rockstar', 'dummy_version',
+        'dummy processing notes', overwrite=True, columnar_layout=True)
+
+    try:
+        model = PrebuiltHodModelFactory('zheng07', threshold=-20)
+
+        lazy_halocat = CachedHaloCatalog(fname=fname)
+        model.populate_mock(lazy_halocat, seed=fixed_seed)
+        lazy_gals = model.mock.galaxy_table
+        assert not hasattr(lazy_halocat, '_halo_table')
+        loaded_colnames = lazy_halocat.lazy_halo_table.loaded_colnames
+        assert 'halo_spin' not in loaded_colnames
+        assert 'halo_nfw_conc' in loaded_colnames
+        assert len(loaded_colnames) < len(lazy_halocat.lazy_halo_table.keys())
+
+        full_halocat = CachedHaloCatalog(fname=fname, preload_halo_table=True)
+        model.populate_mock(full_halocat, seed=fixed_seed)
+        gals = model.mock.galaxy_table
+
+        assert lazy_gals.keys() == gals.keys()
+        for key in gals.keys():
+            assert np.all(lazy_gals[key] == gals[key])
+    finally:
+        cache = HaloTableCache()
+        cache.remove_entry_from_cache_log(
+            halocat.log_entry.simname,
+            halocat.log_entry.halo_finder,
+            halocat.log_entry.version_name,
+            halocat.log_entry.redshift,
+            halocat.log_entry.fname,
+            raise_non_existence_exception=False,
+            update_ascii=True,
+            delete_corresponding_halo_catalog=True)
+        shutil.rmtree(tmpdir)
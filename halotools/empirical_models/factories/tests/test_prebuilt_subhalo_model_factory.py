@@ -74,3 +74,21 @@ def test_fake_mock_observations2():
     assert np.shape(result) == (3, 2)
     xi = result[0]
     assert len(xi) == 2
+
+
+def test_reusable_arena_mock_population():
+    """ In reusable-arena mode, repeated calls to populate should write the galaxy properties
+    in place, and give the same results as mocks populated without the arena.
+    """
+    halocat = FakeSim()
+    model = PrebuiltSubhaloModelFactory('behroozi10')
+    model.populate_mock(halocat, seed=43)
+    model2 = PrebuiltSubhaloModelFactory('behroozi10')
+    model2.populate_mock(halocat, seed=43, galaxy_table_buffer=True)
+    assert np.all(model.mock.galaxy_table['stellar_mass'] == model2.mock.galaxy_table['stellar_mass'])
+
+    stellar_mass = model2.mock.galaxy_table['stellar_mass']
+    model2.mock.populate(seed=44)
+    assert np.shares_memory(stellar_mass, model2.mock.galaxy_table['stellar_mass'])
+    model.mock.populate(seed=44)
+    assert np.all(model.mock.galaxy_table['stellar_mass'] == model2.mock.galaxy_table['stellar_mass'])
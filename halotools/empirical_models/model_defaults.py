@@ -99,7 +99,12 @@ concentration_key = 'halo_nfw_conc'
 
 
 default_rbins = np.logspace(-1, 1.25, 15)
+default_pi_max = 40.
 default_nptcls = 1e5
 
+# Number of chunks of the halo table populated by HodMockFactory.populate when running in parallel.
+# The mock only depends on the number of chunks, and not on the number of processes.
+default_num_populate_chunks = 32
+
 default_b_perp = 0.2
 default_b_para = 0.75
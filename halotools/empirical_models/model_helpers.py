@@ -3,6 +3,7 @@ This module contains general purpose helper functions
 used by many of the Halotools models.
 """
 
+import multiprocessing
 import numpy as np
 from scipy.interpolate import InterpolatedUnivariateSpline as spline
 from scipy.special import gammaincc, gamma, expi
@@ -13,7 +14,7 @@ from ..custom_exceptions import HalotoolsError
 
 __all__ = ('solve_for_polynomial_coefficients', 'polynomial_from_table',
             'enforce_periodicity_of_box', 'custom_spline', 'create_composite_dtype',
-            'bind_default_kwarg_mixin_safe', 'custom_incomplete_gamma')
+            'bind_default_kwarg_mixin_safe', 'custom_incomplete_gamma', 'interp_table_rows')
 
 __author__ = ['Andrew Hearin', 'Surhud More', 'Johannes Ulf Lange']
 
@@ -268,6 +269,80 @@ def call_func_table(func_table, abscissa, func_indices):
     return out
 
 
+def interp_table_rows(table_abscissa, table_ordinates, abscissa, row_indices):
+    r""" Returns the linear interpolation of a stack of tabulated functions
+    evaluated at a set of input points, if the row of the table to use for each point is known.
+
+    All points are interpolated together with a vectorized binary search,
+    so that the cost does not depend on the number of rows in the table.
+    Points lying outside the range of their row of ``table_abscissa``
+    are linearly extrapolated from the first or last segment of the row.
+
+    Parameters
+    ----------
+    table_abscissa : array_like
+        Array of shape (k, m) whose rows store the monotonically increasing
+        abscissa values of the k tabulated functions. A length-m array
+        can be passed if all the functions are tabulated at the same abscissa.
+
+    table_ordinates : array_like
+        Array of shape (k, m) whose rows store the ordinate values of the k
+        tabulated functions. A length-m array can be passed
+        if all the functions share the same ordinates.
+
+    abscissa : array_like
+        Length Npts array of points at which to evaluate the functions.
+
+    row_indices : array_like
+        Length Npts array of integers between 0 and k-1 providing the row
+        of the table used to interpolate each abscissa element.
+
+    Returns
+    -------
+    out : array_like
+        Length Npts array giving the interpolation of the appropriate row of the table
+        at each abscissa element.
+
+    Examples
+    --------
+    >>> table_abscissa = np.linspace(0, 1, 5)
+    >>> table_ordinates = np.array((table_abscissa, 2*table_abscissa))
+    >>> result = interp_table_rows(table_abscissa, table_ordinates, (0.3, 0.3), (0, 1))
+    >>> assert np.allclose(result, (0.3, 0.6))
+    """
+    table_abscissa, table_ordinates = np.broadcast_arrays(
+        np.atleast_2d(table_abscissa), np.atleast_2d(table_ordinates))
+    if len(table_abscissa.shape) != 2:
+        msg = ("Input ``table_abscissa`` and ``table_ordinates`` must be "
+            "one- or two-dimensional, but have shape = {0}")
+        raise HalotoolsError(msg.format(table_abscissa.shape))
+    npts_table = table_abscissa.shape[1]
+    if npts_table < 2:
+        msg = "Input tables must have at least two abscissa values per row"
+        raise HalotoolsError(msg)
+
+    abscissa = np.atleast_1d(abscissa).astype(np.float64)
+    row_indices = np.atleast_1d(row_indices).astype(np.int64)
+
+    # Binary search for the largest segment index ``low`` in [0, npts_table-2]
+    # whose left edge does not exceed the abscissa.
+    # Points below the first edge of their row keep low = 0.
+    low = np.zeros(len(abscissa), dtype=np.int64)
+    high = np.zeros(len(abscissa), dtype=np.int64) + npts_table - 2
+    num_iterations = int(np.ceil(np.log2(npts_table - 1)))
+    for __ in range(num_iterations):
+        mid = (low + high + 1) // 2
+        go_right = table_abscissa[row_indices, mid] <= abscissa
+        low = np.where(go_right, mid, low)
+        high = np.where(go_right, high, mid - 1)
+
+    x0 = table_abscissa[row_indices, low]
+    x1 = table_abscissa[row_indices, low + 1]
+    y0 = table_ordinates[row_indices, low]
+    y1 = table_ordinates[row_indices, low + 1]
+    return y0 + (abscissa - x0)*(y1 - y0)/(x1 - x0)
+
+
 def bind_required_kwargs(required_kwargs, obj, **kwargs):
     r""" Method binds each element of ``required_kwargs`` to
     the input object ``obj``, or raises and exception for cases
@@ -443,3 +518,17 @@ def custom_incomplete_gamma(a, x):
         else:
             return gammaincc(a, x) * gamma(a)
 custom_incomplete_gamma.__author__ = ['Surhud More', 'Johannes Ulf Lange']
+
+
+def _get_fork_context():
+    """ Multiprocessing context used to fork the processes populating mocks in parallel.
+    """
+    try:
+        return multiprocessing.get_context('fork')
+    except AttributeError:
+        # Python 2 always forks on platforms supporting it
+        return multiprocessing
+    except ValueError:
+        msg = ("Parallel mock population requires the ``fork`` start method of multiprocessing,\n"
+            "which is not available on this platform. Use num_threads=1 instead.\n")
+        raise HalotoolsError(msg)
@@ -3,5 +3,6 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 
 from .cacciato09_sats_mc_prim_galprop_engine import cacciato09_sats_mc_prim_galprop_engine
+from .poisson_occupation_engine import poisson_occupation_engine
 
-__all__ = ('cacciato09_sats_mc_prim_galprop_engine', )
+__all__ = ('cacciato09_sats_mc_prim_galprop_engine', 'poisson_occupation_engine')
@@ -0,0 +1,84 @@
+""" Module containing the `~halotools.empirical_models.occupation_models.engines.poisson_occupation_engine`
+cython function driving the `_poisson_distribution` method of the
+`~halotools.empirical_models.OccupationComponent` class.
+"""
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+
+import numpy as np
+cimport numpy as cnp
+cimport cython
+from libc.math cimport exp
+
+__all__ = ('poisson_occupation_engine', )
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+def poisson_occupation_engine(randoms_in, mean_in, cnp.float64_t max_mean):
+    """
+    Cython engine for determining Monte-Carlo realizations of Poisson-distributed
+    occupations by inversion of the cumulative distribution function.
+    For each entry, the engine returns the smallest integer *n* such that
+    the Poisson CDF with the input mean evaluated at *n* is no smaller
+    than the input random number, by summing the probability mass function term by term.
+    The function itself does not generate random numbers, and so each occupation
+    is a monotonic function of the mean for a fixed random number.
+
+    Parameters
+    ----------
+    randoms_in : numpy.array
+        Array storing random numbers in [0.0, 1.0).
+
+    mean_in : numpy.array
+        Array storing the mean of the Poisson distribution of each entry.
+
+    max_mean : float
+        Entries whose mean exceeds ``max_mean`` are not evaluated,
+        since the probability of zero galaxies underflows for very large means.
+
+    Returns
+    -------
+    mc_occupation : numpy.array
+        Integer array storing the Monte Carlo occupations.
+        Entries equal to -1 could not be evaluated by the engine, either because
+        their mean exceeds ``max_mean`` or because the summation of the
+        probability mass function did not reach the input random number
+        in floating point arithmetic. These entries must be evaluated by other means.
+    """
+
+    cdef cnp.float64_t[:] randoms = np.ascontiguousarray(randoms_in, dtype=np.float64)
+    cdef cnp.float64_t[:] mean = np.ascontiguousarray(mean_in, dtype=np.float64)
+
+    cdef cnp.int64_t n = len(mean)
+    cdef cnp.int64_t[:] mc_occupation = np.zeros(n, dtype=np.int64)
+
+    cdef cnp.int64_t i, k
+    cdef cnp.float64_t u, m, pmf, cdf, next_cdf
+
+    for i in range(n):
+        u = randoms[i]
+        m = mean[i]
+
+        if m <= 0.:
+            mc_occupation[i] = 0
+            continue
+        elif m > max_mean:
+            mc_occupation[i] = -1
+            continue
+
+        k = 0
+        pmf = exp(-m)
+        cdf = pmf
+        while cdf < u:
+            k = k + 1
+            pmf = pmf*m/k
+            next_cdf = cdf + pmf
+            if (next_cdf == cdf) and (k > m):
+                # The CDF has converged to a value smaller than u
+                k = -1
+                break
+            cdf = next_cdf
+        mc_occupation[i] = k
+
+    return np.array(mc_occupation)
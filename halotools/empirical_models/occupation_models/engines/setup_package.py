@@ -2,7 +2,7 @@ from distutils.extension import Extension
 import os
 
 PATH_TO_PKG = os.path.relpath(os.path.dirname(__file__))
-SOURCES = ("cacciato09_sats_mc_prim_galprop_engine.pyx", )
+SOURCES = ("cacciato09_sats_mc_prim_galprop_engine.pyx", "poisson_occupation_engine.pyx")
 THIS_PKG_NAME = '.'.join(__name__.split('.')[:-1])
 
 
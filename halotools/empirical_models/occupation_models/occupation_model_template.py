@@ -10,6 +10,8 @@ from astropy.extern import six
 from abc import ABCMeta
 from astropy.utils.misc import NumpyRNGContext
 
+from .engines import poisson_occupation_engine
+
 from .. import model_defaults, model_helpers
 
 from ...utils.array_utils import custom_len
@@ -17,6 +19,10 @@ from ...custom_exceptions import HalotoolsError
 
 __all__ = ('OccupationComponent', )
 
+# Largest mean occupation for which the Poisson CDF is inverted by direct summation;
+# exp(-mean) underflows double precision for means above ~745
+_max_poisson_engine_mean = 500.
+
 
 @six.add_metaclass(ABCMeta)
 class OccupationComponent(object):
@@ -157,7 +163,7 @@ class OccupationComponent(object):
         with NumpyRNGContext(seed):
             mc_generator = np.random.random(custom_len(first_occupation_moment))
 
-        result = np.where(mc_generator < first_occupation_moment, 1, 0)
+        result = np.less(mc_generator, first_occupation_moment).astype(int)
         if 'table' in kwargs:
             kwargs['table']['halo_num_'+self.gal_type] = result
         return result
@@ -182,9 +188,22 @@ class OccupationComponent(object):
         """
         # We don't use the built-in Poisson number generator so that when a seed
         # is specified, it preserves the ranks among rvs even when mean is changed.
+        first_occupation_moment = np.asarray(first_occupation_moment)
         with NumpyRNGContext(seed):
-            result = np.ceil(pdtrik(np.random.rand(*first_occupation_moment.shape),
-                                    first_occupation_moment)).astype(np.int)
+            uniform_randoms = np.random.rand(*first_occupation_moment.shape)
+
+        # Invert the CDF with the cython engine, which is much faster than pdtrik,
+        # and only fall back on pdtrik for the rare entries the engine cannot evaluate
+        uniform_randoms = np.atleast_1d(uniform_randoms).ravel()
+        mean = np.atleast_1d(first_occupation_moment).ravel()
+        result = poisson_occupation_engine(uniform_randoms, mean, _max_poisson_engine_mean)
+        unresolved = result == -1
+        if np.any(unresolved):
+            result[unresolved] = np.ceil(pdtrik(uniform_randoms[unresolved], mean[unresolved]))
+        result = result.reshape(first_occupation_moment.shape)
+        if result.ndim == 0:
+            result = result[()]
+
         if 'table' in kwargs:
             kwargs['table']['halo_num_'+self.gal_type] = result
         return result
@@ -4,8 +4,10 @@ import numpy as np
 
 import pytest
 from astropy.utils.misc import NumpyRNGContext
+from scipy.special import pdtrik
 
 from ..occupation_model_template import OccupationComponent
+from ..engines import poisson_occupation_engine
 
 from ...factories import PrebuiltHodModelFactory, HodModelFactory
 
@@ -205,3 +207,43 @@ def test_nonexistent_prim_haloprop_key():
 
     halocat = FakeSim()
     new_model.populate_mock(halocat)
+
+
+def test_poisson_distribution_inverse_cdf():
+    """ The Poisson occupations should be identical to the inversion
+    of the Poisson CDF with pdtrik for the same seed, including for means
+    too large to be handled by the cython engine.
+    """
+
+    class MySatelliteOccupation(OccupationComponent):
+
+        def __init__(self):
+            OccupationComponent.__init__(self, gal_type='satellites',
+                threshold=-20, upper_occupation_bound=float("inf"))
+
+        def mean_occupation(self, **kwargs):
+            return kwargs['prim_haloprop']
+
+    model = MySatelliteOccupation()
+    with NumpyRNGContext(43):
+        mean = np.concatenate((np.random.uniform(0, 1, 10000),
+            np.random.uniform(1, 100, 10000), np.random.uniform(500, 2000, 100), [0.]))
+        uniform_randoms = np.random.rand(len(mean))
+
+    result = model.mc_occupation(prim_haloprop=mean, seed=43)
+    with NumpyRNGContext(43):
+        correct_result = np.ceil(pdtrik(np.random.rand(len(mean)), mean)).astype(int)
+    assert np.all(result == correct_result)
+    assert result[-1] == 0
+
+    # Occupations drawn with the same seed are monotonic in the mean
+    result2 = model.mc_occupation(prim_haloprop=mean*1.1, seed=43)
+    assert np.all(result2 >= result)
+
+    scalar_result = model._poisson_distribution(np.sum(mean), seed=43)
+    assert np.shape(scalar_result) == ()
+    with NumpyRNGContext(43):
+        assert scalar_result == np.ceil(pdtrik(np.random.rand(), np.sum(mean)))
+
+    engine_result = poisson_occupation_engine(uniform_randoms, mean, 500.)
+    assert np.all(engine_result[mean > 500] == -1)
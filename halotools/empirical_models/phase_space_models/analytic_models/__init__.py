@@ -2,4 +2,5 @@ from .centrals import *
 from .satellites import *
 from .halo_boundary_functions import *
 from .monte_carlo_helpers import MonteCarloGalProf
+from .profile_lookup_table_cache import ProfileLookupTableCache
 from .profile_model_template import AnalyticDensityProf
@@ -12,7 +12,7 @@ import numpy as np
 from itertools import product
 from astropy.utils.misc import NumpyRNGContext
 
-from ...model_helpers import custom_spline, call_func_table
+from ...model_helpers import interp_table_rows
 from ... import model_defaults
 
 from ....custom_exceptions import HalotoolsError
@@ -81,18 +81,25 @@ class MonteCarloGalProf(object):
             Npts_radius_table=model_defaults.Npts_radius_table):
         r""" Method used to create a lookup table of the spatial and velocity radial profiles.
 
+        For every point on the grid of profile parameters, the logarithm of
+        the cumulative galaxy PDF and the dimensionless radial velocity dispersion
+        are tabulated at ``Npts_radius_table`` log-spaced radii.
+        The tables are stored in the ``rad_prof_func_table`` and ``vel_prof_func_table``
+        attributes, arrays whose last axis runs over radius and whose
+        remaining axes run over the grid of each profile parameter.
+
         Parameters
         ----------
         logrmin : float, optional
-            Minimum radius used to build the spline table.
+            Minimum radius used to build the lookup table.
             Default is set in `~halotools.empirical_models.model_defaults`.
 
         logrmax : float, optional
-            Maximum radius used to build the spline table
+            Maximum radius used to build the lookup table
             Default is set in `~halotools.empirical_models.model_defaults`.
 
         Npts_radius_table : int, optional
-            Number of control points used in the spline.
+            Number of radii at which the profiles are tabulated.
             Default is set in `~halotools.empirical_models.model_defaults`.
 
         """
@@ -111,28 +118,39 @@ class MonteCarloGalProf(object):
             profile_params = getattr(self, '_' + prof_param_key + '_lookup_table_bins')
             profile_params_list.append(profile_params)
 
+        # Models may store a ProfileLookupTableCache that holds
+        # the tables built by previous instances of the same model
+        lookup_table_cache = getattr(self, '_lookup_table_cache', None)
+        if (lookup_table_cache is not None) & (len(profile_params_list) > 0):
+            cache_key = lookup_table_cache.key(self, logrmin, logrmax, self.Npts_radius_table)
+            rad_prof_table, vel_prof_table = lookup_table_cache.load(cache_key)
+        else:
+            rad_prof_table, vel_prof_table = None, None
+
         # Using the itertools product method requires
         # special handling of the length-zero edge case
         if len(profile_params_list) == 0:
             self.rad_prof_func_table = np.array([])
             self.rad_prof_func_table_indices = np.array([])
         else:
-            func_table = []
-            velocity_func_table = []
-            for ii, items in enumerate(product(*profile_params_list)):
-                table_ordinates = self.cumulative_gal_PDF(radius_array, *items)
-                log_table_ordinates = np.log10(table_ordinates)
-                funcobj = custom_spline(log_table_ordinates, self.logradius_array, k=3)
-                func_table.append(funcobj)
-
-                velocity_table_ordinates = self.dimensionless_radial_velocity_dispersion(
-                    radius_array, *items)
-                velocity_funcobj = custom_spline(self.logradius_array, velocity_table_ordinates, k=3)
-                velocity_func_table.append(velocity_funcobj)
-
             profile_params_dimensions = [len(p) for p in profile_params_list]
-            self.rad_prof_func_table = np.array(func_table).reshape(profile_params_dimensions)
-            self.vel_prof_func_table = np.array(velocity_func_table).reshape(profile_params_dimensions)
+            table_shape = profile_params_dimensions + [self.Npts_radius_table]
+
+            if rad_prof_table is None:
+                num_tables = int(np.prod(profile_params_dimensions))
+                log_cumu_prob_table = np.zeros((num_tables, self.Npts_radius_table))
+                velocity_table = np.zeros((num_tables, self.Npts_radius_table))
+                for ii, items in enumerate(product(*profile_params_list)):
+                    log_cumu_prob_table[ii, :] = np.log10(self.cumulative_gal_PDF(radius_array, *items))
+                    velocity_table[ii, :] = self.dimensionless_radial_velocity_dispersion(
+                        radius_array, *items)
+                rad_prof_table = log_cumu_prob_table.reshape(table_shape)
+                vel_prof_table = velocity_table.reshape(table_shape)
+                if lookup_table_cache is not None:
+                    lookup_table_cache.store(cache_key, rad_prof_table, vel_prof_table)
+
+            self.rad_prof_func_table = rad_prof_table
+            self.vel_prof_func_table = vel_prof_table
 
             self.rad_prof_func_table_indices = (
                 np.arange(np.prod(profile_params_dimensions)).reshape(profile_params_dimensions)
@@ -199,18 +217,18 @@ class MonteCarloGalProf(object):
         # the profile function object f_0, which we need to then evaluate
         # on the randomly generated rho[0], and likewise for
         # [A_i, B_i, ...], f_i, and rho[i], for i = 0, ..., Ngals-1.
-        # To do this, we first determine the index in the profile function table
-        # where the relevant function object is stored:
+        # To do this, we first determine the row of the flattened profile table
+        # where the relevant tabulated function is stored:
         rad_prof_func_table_indices = (
-            self.rad_prof_func_table_indices[digitized_param_list]
+            self.rad_prof_func_table_indices[tuple(digitized_param_list)]
             )
-        # Now we have an array of indices for our functions, and we need to evaluate
-        # the i^th function on the i^th element of rho.
-        # Call the model_helpers module to access generic code for doing this.
+        # Now we have an array of rows, and we need to invert the cumulative PDF
+        # tabulated in the i^th row at the i^th element of rho.
+        # Call the model_helpers module to interpolate all galaxies at once.
         # (Remember that the interpolation is being done in log-space)
-        return 10.**call_func_table(
-            self.rad_prof_func_table.flatten(), np.log10(rho),
-            rad_prof_func_table_indices.flatten())
+        return 10.**interp_table_rows(
+            self.rad_prof_func_table.reshape(-1, self.Npts_radius_table), self.logradius_array,
+            np.log10(rho), rad_prof_func_table_indices.flatten())
 
     def mc_unit_sphere(self, Npts, **kwargs):
         r""" Returns Npts random points on the unit sphere.
@@ -516,17 +534,17 @@ class MonteCarloGalProf(object):
         # the profile function object f_0, which we need to then evaluate
         # on the randomly generated rho[0], and likewise for
         # [A_i, B_i, ...], f_i, and rho[i], for i = 0, ..., Ngals-1.
-        # To do this, we first determine the index in the profile function table
-        # where the relevant function object is stored:
+        # To do this, we first determine the row of the flattened velocity table
+        # where the relevant tabulated function is stored:
         vel_prof_func_table_indices = (
-            self.rad_prof_func_table_indices[digitized_param_list]
+            self.rad_prof_func_table_indices[tuple(digitized_param_list)]
             )
-        # Now we have an array of indices for our functions, and we need to evaluate
-        # the i^th function on the i^th element of rho.
-        # Call the model_helpers module to access generic code for doing this.
-        dimensionless_radial_dispersions = call_func_table(
-            self.vel_prof_func_table.flatten(), np.log10(scaled_radius),
-            vel_prof_func_table_indices.flatten())
+        # Now we have an array of rows, and we need to evaluate
+        # the function tabulated in the i^th row at the i^th element of scaled_radius.
+        # Call the model_helpers module to interpolate all galaxies at once.
+        dimensionless_radial_dispersions = interp_table_rows(
+            self.logradius_array, self.vel_prof_func_table.reshape(-1, self.Npts_radius_table),
+            np.log10(scaled_radius), vel_prof_func_table_indices.flatten())
 
         return dimensionless_radial_dispersions
 
@@ -0,0 +1,193 @@
+""" Module containing `~halotools.empirical_models.ProfileLookupTableCache`,
+an on-disk store of the lookup tables built by
+`~halotools.empirical_models.MonteCarloGalProf.build_lookup_tables`.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+import hashlib
+from tempfile import NamedTemporaryFile
+try:
+    from zipfile import BadZipFile
+except ImportError:
+    from zipfile import BadZipfile as BadZipFile
+
+import numpy as np
+
+from .... import __version__
+from ....sim_manager import halotools_cache_dirname
+
+__all__ = ('ProfileLookupTableCache', )
+
+default_profile_lookup_table_cache_dirname = os.path.join(
+    halotools_cache_dirname, 'profile_lookup_tables')
+
+
+class ProfileLookupTableCache(object):
+    """ On-disk cache of the radial and velocity profile lookup tables
+    used to populate mocks with `~halotools.empirical_models.MonteCarloGalProf` models.
+
+    Building the lookup tables of `~halotools.empirical_models.BiasedNFWPhaseSpace`
+    requires a numerical solution to the Jeans equation for every point on the grid
+    of profile parameters, yet the tables only depend on the model class, the grid,
+    the radial binning, the cosmology, redshift and mass definition,
+    the integration tolerance and the Halotools version.
+    The `~halotools.empirical_models.NFWPhaseSpace` and
+    `~halotools.empirical_models.BiasedNFWPhaseSpace` models only use a
+    `ProfileLookupTableCache` if one is passed as their ``lookup_table_cache`` argument,
+    or if this argument is set to True, which selects a cache
+    stored in the Halotools cache directory. The tables are stored in a ``.npz`` file named after a hash
+    of these quantities, so that subsequent model instances,
+    including those in other processes, load the tables instead of recomputing them.
+
+    Files are written to a temporary file that is then renamed,
+    so that several processes can share the same cache directory.
+
+    Examples
+    --------
+    >>> from halotools.empirical_models import BiasedNFWPhaseSpace
+    >>> cache = ProfileLookupTableCache() # doctest: +SKIP
+    >>> model = BiasedNFWPhaseSpace(lookup_table_cache=cache) # doctest: +SKIP
+    >>> model.build_lookup_tables() # doctest: +SKIP
+
+    The second model loads the tables stored by the first:
+
+    >>> model2 = BiasedNFWPhaseSpace(lookup_table_cache=cache) # doctest: +SKIP
+    >>> model2.build_lookup_tables() # doctest: +SKIP
+    """
+
+    def __init__(self, dirname=default_profile_lookup_table_cache_dirname):
+        """
+        Parameters
+        ----------
+        dirname : string, optional
+            Directory storing the cached tables.
+            Default is ``profile_lookup_tables`` in the Halotools cache directory.
+        """
+        self.dirname = dirname
+
+    @staticmethod
+    def key(model, logrmin, logrmax, Npts_radius_table):
+        """ Hash identifying the lookup tables of ``model``.
+
+        Parameters
+        ----------
+        model : object
+            Instance of a `~halotools.empirical_models.MonteCarloGalProf` model
+            whose lookup table grid has been set up
+
+        logrmin, logrmax : float
+            Log10 of the minimum and maximum scaled radius of the tables
+
+        Npts_radius_table : int
+            Number of radii at which the profiles are tabulated
+
+        Returns
+        -------
+        key : string
+        """
+        cls = model.__class__
+        h = hashlib.sha1('.'.join((cls.__module__, cls.__name__)).encode('utf-8'))
+
+        for prof_param_key in model.gal_prof_param_keys:
+            arr = np.ascontiguousarray(
+                getattr(model, '_' + prof_param_key + '_lookup_table_bins'), dtype='f8')
+            h.update(prof_param_key.encode('utf-8'))
+            h.update(str(arr.shape).encode('utf-8'))
+            h.update(arr.tobytes())
+
+        settings = (__version__, float(logrmin), float(logrmax), int(Npts_radius_table),
+            repr(getattr(model, 'cosmology', None)),
+            getattr(model, 'redshift', None),
+            getattr(model, 'mdef', None),
+            getattr(model, '_profile_integration_tol', None))
+        h.update(repr(settings).encode('utf-8'))
+        return h.hexdigest()
+
+    def _fname(self, key):
+        return os.path.join(self.dirname, key + '.npz')
+
+    def load(self, key):
+        """ Retrieve the tables stored under ``key``.
+
+        Parameters
+        ----------
+        key : string
+            Hash returned by `key`
+
+        Returns
+        -------
+        rad_prof_table : ndarray or None
+            Stored table of the log10 of the cumulative galaxy PDF,
+            or None if there is no entry for ``key``
+
+        vel_prof_table : ndarray or None
+            Stored table of the dimensionless radial velocity dispersion
+        """
+        fname = self._fname(key)
+        if not os.path.isfile(fname):
+            return None, None
+
+        try:
+            with np.load(fname) as f:
+                return f['rad_prof_table'], f['vel_prof_table']
+        except (IOError, OSError, KeyError, ValueError, BadZipFile):
+            # A corrupted entry is treated as missing and rebuilt
+            return None, None
+
+    def store(self, key, rad_prof_table, vel_prof_table):
+        """ Store the tables under ``key``.
+
+        Parameters
+        ----------
+        key : string
+            Hash returned by `key`
+
+        rad_prof_table : ndarray
+            Table of the log10 of the cumulative galaxy PDF
+
+        vel_prof_table : ndarray
+            Table of the dimensionless radial velocity dispersion
+        """
+        if not os.path.isdir(self.dirname):
+            try:
+                os.makedirs(self.dirname)
+            except OSError:
+                # another process may have just created the directory
+                if not os.path.isdir(self.dirname):
+                    raise
+
+        with NamedTemporaryFile(dir=self.dirname, suffix='.tmp', delete=False) as f:
+            np.savez(f, rad_prof_table=rad_prof_table, vel_prof_table=vel_prof_table)
+            tmp_fname = f.name
+        os.replace(tmp_fname, self._fname(key))
+
+    def clear(self):
+        """ Delete all the stored tables.
+        """
+        if os.path.isdir(self.dirname):
+            for basename in os.listdir(self.dirname):
+                if basename.endswith('.npz'):
+                    os.remove(os.path.join(self.dirname, basename))
+
+    def __len__(self):
+        if not os.path.isdir(self.dirname):
+            return 0
+        return len([basename for basename in os.listdir(self.dirname)
+            if basename.endswith('.npz')])
+
+
+def _get_profile_lookup_table_cache(lookup_table_cache):
+    """ Process the ``lookup_table_cache`` argument of the phase space models.
+    The boolean True selects a cache stored in the default location.
+    """
+    if lookup_table_cache is None or lookup_table_cache is False:
+        return None
+    elif lookup_table_cache is True:
+        return ProfileLookupTableCache()
+    elif isinstance(lookup_table_cache, ProfileLookupTableCache):
+        return lookup_table_cache
+    else:
+        msg = ("Input ``lookup_table_cache`` must be a boolean or "
+            "an instance of ProfileLookupTableCache")
+        raise ValueError(msg)
@@ -92,6 +92,13 @@ class BiasedNFWPhaseSpace(NFWPhaseSpace):
         profile_integration_tol : float, optional
             Default is 1e-5
 
+        lookup_table_cache : bool or `~halotools.empirical_models.ProfileLookupTableCache`, optional
+            Cache used to store the lookup tables built for mock-population purposes,
+            so that the Jeans equation is only solved once for any given binning,
+            cosmology, mass definition and ``profile_integration_tol``.
+            Default is False, in which case the tables are always rebuilt.
+            Set to True to store the cache in the Halotools cache directory.
+
         Examples
         ---------
         >>> biased_nfw = BiasedNFWPhaseSpace()
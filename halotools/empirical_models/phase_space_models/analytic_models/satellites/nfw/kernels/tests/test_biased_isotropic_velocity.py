@@ -48,3 +48,20 @@ def test_unbiased_vel_rad_disp_external_ch5_cg10():
     frank_dimless_sigma_rad = x[:, 2]
     aph_result = biased_dimless_vel_rad_disp(frank_r_by_Rvir, halo_conc, gal_conc)
     assert np.allclose(aph_result, frank_dimless_sigma_rad, rtol=1e-3)
+
+
+def test_biased_vel_rad_disp_array_conc():
+    """ Verify that passing arrays of concentrations gives the same result
+    as evaluating each (halo_conc, gal_conc) pair separately.
+    """
+    scaled_radius = np.array((0, 0.001, 0.01, 0.1, 0.5, 1.))
+    halo_conc = np.array((5, 5, 10, 10, 20, 3.))
+    gal_conc = np.array((5, 10, 5, 2, 30, 3.))
+    result = biased_dimless_vel_rad_disp(scaled_radius, halo_conc, gal_conc)
+    assert result.shape == scaled_radius.shape
+    assert result[0] == 0
+
+    for i in range(len(scaled_radius)):
+        correct_result = biased_dimless_vel_rad_disp(
+            scaled_radius[i], halo_conc[i], gal_conc[i])
+        assert np.allclose(result[i], correct_result)
@@ -1,26 +1,14 @@
 """
 """
 import numpy as np
-from scipy.integrate import quad as quad_integration
 
 from .mass_profile import _g_integral
+from .biased_isotropic_velocity import _jeans_integral
 
 
 __all__ = ('dimensionless_radial_velocity_dispersion', )
 
 
-def _jeans_integrand_term1(y):
-    r"""
-    """
-    return np.log(1+y)/(y**3*(1+y)**2)
-
-
-def _jeans_integrand_term2(y):
-    r"""
-    """
-    return 1/(y**2*(1+y)**3)
-
-
 def dimensionless_radial_velocity_dispersion(scaled_radius, *conc):
     r"""
     Analytical solution to the isotropic jeans equation for an NFW potential,
@@ -46,18 +34,17 @@ def dimensionless_radial_velocity_dispersion(scaled_radius, *conc):
         Radial velocity dispersion profile scaled by the virial velocity.
         The returned result has the same dimension as the input ``scaled_radius``.
     """
-    x = np.atleast_1d(scaled_radius).astype(np.float64)
-    result = np.zeros_like(x)
+    x, conc = np.broadcast_arrays(
+        np.atleast_1d(scaled_radius).astype(np.float64),
+        np.atleast_1d(conc).astype(np.float64))
 
     prefactor = conc*(conc*x)*(1. + conc*x)**2/_g_integral(conc)
 
+    # The dispersion vanishes at the halo center, where the integral diverges
     lower_limit = conc*x
-    upper_limit = float("inf")
-    for i in range(len(x)):
-        term1, _ = quad_integration(_jeans_integrand_term1,
-            lower_limit[i], upper_limit, epsrel=1e-5)
-        term2, _ = quad_integration(_jeans_integrand_term2,
-            lower_limit[i], upper_limit, epsrel=1e-5)
-        result[i] = term1 - term2
+    at_center = lower_limit <= 0
+    lower_limit = np.where(at_center, 1., lower_limit)
+    result = _jeans_integral(lower_limit.ravel(), 1.)
+    result = np.where(at_center, 0., result.reshape(x.shape))
 
     return np.sqrt(result*prefactor)
@@ -9,6 +9,7 @@ from .nfw_profile import NFWProfile
 from .kernels import unbiased_dimless_vrad_disp as unbiased_dimless_vrad_disp_kernel
 
 from ...monte_carlo_helpers import MonteCarloGalProf
+from ...profile_lookup_table_cache import _get_profile_lookup_table_cache
 
 from ..... import model_defaults
 
@@ -66,12 +67,20 @@ class NFWPhaseSpace(NFWProfile, MonteCarloGalProf):
             The spacing of this array sets a limit on how accurately the
             concentration parameter can be recovered in a likelihood analysis.
 
+        lookup_table_cache : bool or `~halotools.empirical_models.ProfileLookupTableCache`, optional
+            Cache used to store the lookup tables built for mock-population purposes,
+            so that they are only computed once for any given binning, cosmology
+            and mass definition. Default is False, in which case the tables are always rebuilt.
+            Set to True to store the cache in the Halotools cache directory.
+
         Examples
         --------
         >>> model = NFWPhaseSpace()
         """
         NFWProfile.__init__(self, **kwargs)
         MonteCarloGalProf.__init__(self)
+        self._lookup_table_cache = _get_profile_lookup_table_cache(
+            kwargs.get('lookup_table_cache', False))
 
         prof_lookup_args = self._retrieve_prof_lookup_info(**kwargs)
         self.setup_prof_lookup_tables(*prof_lookup_args)
@@ -625,15 +634,15 @@ class NFWPhaseSpace(NFWProfile, MonteCarloGalProf):
         Parameters
         ----------
         logrmin : float, optional
-            Minimum radius used to build the spline table.
+            Minimum radius used to build the lookup table.
             Default is set in `~halotools.empirical_models.model_defaults`.
 
         logrmax : float, optional
-            Maximum radius used to build the spline table
+            Maximum radius used to build the lookup table
             Default is set in `~halotools.empirical_models.model_defaults`.
 
         Npts_radius_table : int, optional
-            Number of control points used in the spline.
+            Number of radii at which the profiles are tabulated.
             Default is set in `~halotools.empirical_models.model_defaults`.
 
         """
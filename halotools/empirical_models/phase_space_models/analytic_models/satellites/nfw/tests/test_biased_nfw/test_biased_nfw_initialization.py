@@ -65,7 +65,10 @@ def test_biased_nfw_phase_space_lookup_tables():
 
     assert hasattr(model, 'rad_prof_func_table')
     npts_conc, npts_conc_bias = len(conc_bins), len(gal_bias_bins)
-    assert model.rad_prof_func_table.shape == (npts_conc, npts_conc_bias)
+    npts_radius = len(model.logradius_array)
+    assert model.rad_prof_func_table.shape == (npts_conc, npts_conc_bias, npts_radius)
+    assert model.vel_prof_func_table.shape == (npts_conc, npts_conc_bias, npts_radius)
+    assert model.rad_prof_func_table_indices.shape == (npts_conc, npts_conc_bias)
 
 
 def test_raises_memory_warning():
@@ -0,0 +1,91 @@
+""" Module providing unit-testing for
+`~halotools.empirical_models.ProfileLookupTableCache`.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+import numpy as np
+import pytest
+
+from ..profile_lookup_table_cache import ProfileLookupTableCache
+from ..satellites.nfw import NFWPhaseSpace, BiasedNFWPhaseSpace
+
+__all__ = ('test_profile_lookup_table_cache_key', )
+
+conc_bins = np.linspace(5, 10, 3)
+gal_bias_bins = np.array((0.5, 1., 2.))
+
+
+def test_profile_lookup_table_cache_key():
+    model = BiasedNFWPhaseSpace(concentration_bins=conc_bins,
+        conc_gal_bias_bins=gal_bias_bins, lookup_table_cache=False)
+    key = ProfileLookupTableCache.key(model, -3, 0, 101)
+    assert key == ProfileLookupTableCache.key(model, -3, 0, 101)
+    assert key != ProfileLookupTableCache.key(model, -3, 0, 51)
+    assert key != ProfileLookupTableCache.key(model, -4, 0, 101)
+
+    model2 = BiasedNFWPhaseSpace(concentration_bins=conc_bins[1:],
+        conc_gal_bias_bins=gal_bias_bins, lookup_table_cache=False)
+    assert key != ProfileLookupTableCache.key(model2, -3, 0, 101)
+
+    model3 = BiasedNFWPhaseSpace(concentration_bins=conc_bins,
+        conc_gal_bias_bins=gal_bias_bins, lookup_table_cache=False, mdef='200m')
+    assert key != ProfileLookupTableCache.key(model3, -3, 0, 101)
+
+    model4 = BiasedNFWPhaseSpace(concentration_bins=conc_bins,
+        conc_gal_bias_bins=gal_bias_bins, lookup_table_cache=False,
+        profile_integration_tol=1e-4)
+    assert key != ProfileLookupTableCache.key(model4, -3, 0, 101)
+
+    model5 = NFWPhaseSpace(concentration_bins=conc_bins, lookup_table_cache=False)
+    assert key != ProfileLookupTableCache.key(model5, -3, 0, 101)
+
+
+def test_biased_nfw_lookup_table_cache(tmpdir):
+    cache = ProfileLookupTableCache(os.path.join(str(tmpdir), 'profile_lookup_tables'))
+    assert len(cache) == 0
+
+    model = BiasedNFWPhaseSpace(concentration_bins=conc_bins,
+        conc_gal_bias_bins=gal_bias_bins, lookup_table_cache=False)
+    model.build_lookup_tables()
+
+    model1 = BiasedNFWPhaseSpace(concentration_bins=conc_bins,
+        conc_gal_bias_bins=gal_bias_bins, lookup_table_cache=cache)
+    model1.build_lookup_tables()
+    assert len(cache) == 1
+
+    model2 = BiasedNFWPhaseSpace(concentration_bins=conc_bins,
+        conc_gal_bias_bins=gal_bias_bins, lookup_table_cache=cache)
+    model2.dimensionless_radial_velocity_dispersion = None
+    model2.build_lookup_tables()
+    assert len(cache) == 1
+
+    for m in (model1, model2):
+        assert np.all(m.rad_prof_func_table == model.rad_prof_func_table)
+        assert np.all(m.vel_prof_func_table == model.vel_prof_func_table)
+        assert np.all(m.rad_prof_func_table_indices == model.rad_prof_func_table_indices)
+
+    model1.build_lookup_tables(Npts_radius_table=51)
+    assert len(cache) == 2
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_lookup_table_cache_is_opt_in():
+    model = NFWPhaseSpace(concentration_bins=conc_bins)
+    assert model._lookup_table_cache is None
+
+
+def test_lookup_table_cache_corrupted_entry(tmpdir):
+    cache = ProfileLookupTableCache(str(tmpdir))
+    with open(os.path.join(str(tmpdir), 'abc.npz'), 'wb') as f:
+        f.write(b'PK\x03\x04 truncated')
+    assert cache.load('abc') == (None, None)
+
+
+def test_lookup_table_cache_argument_error():
+    with pytest.raises(ValueError) as err:
+        __ = NFWPhaseSpace(lookup_table_cache='cache')
+    substr = "Input ``lookup_table_cache`` must be a boolean"
+    assert substr in err.value.args[0]
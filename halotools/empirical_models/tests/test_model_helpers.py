@@ -7,6 +7,7 @@ from astropy.utils.misc import NumpyRNGContext
 from ..model_helpers import custom_spline, create_composite_dtype
 from ..model_helpers import enforce_periodicity_of_box
 from ..model_helpers import call_func_table, bind_default_kwarg_mixin_safe
+from ..model_helpers import interp_table_rows
 
 from ...custom_exceptions import HalotoolsError
 
@@ -176,3 +177,41 @@ def test_call_func_table2():
 
 def test_call_func_table3():
     pass
+
+
+def test_interp_table_rows1():
+    """ Verify that `interp_table_rows` agrees with np.interp applied to each row.
+    """
+    num_rows, npts_table, npts = 6, 20, 1000
+    with NumpyRNGContext(fixed_seed):
+        table_abscissa = np.sort(np.random.uniform(0, 1, (num_rows, npts_table)), axis=1)
+        table_ordinates = np.random.normal(size=(num_rows, npts_table))
+        row_indices = np.random.randint(0, num_rows, npts)
+        abscissa = np.random.uniform(table_abscissa[row_indices, 0], table_abscissa[row_indices, -1])
+
+    result = interp_table_rows(table_abscissa, table_ordinates, abscissa, row_indices)
+    for i in range(num_rows):
+        mask = row_indices == i
+        correct_result = np.interp(abscissa[mask], table_abscissa[i], table_ordinates[i])
+        assert np.allclose(result[mask], correct_result)
+
+
+def test_interp_table_rows2():
+    """ Verify that `interp_table_rows` broadcasts one-dimensional tables
+    and linearly extrapolates points outside the table.
+    """
+    table_abscissa = np.linspace(0, 1, 11)
+    table_ordinates = np.array((table_abscissa, 2*table_abscissa + 1))
+    abscissa = np.array((-0.5, 0.25, 1.5, -0.5, 0.25, 1.5))
+    row_indices = np.array((0, 0, 0, 1, 1, 1))
+
+    result = interp_table_rows(table_abscissa, table_ordinates, abscissa, row_indices)
+    assert np.allclose(result, (-0.5, 0.25, 1.5, 0, 1.5, 4))
+
+
+def test_interp_table_rows3():
+    table_abscissa = np.zeros(1)
+    with pytest.raises(HalotoolsError) as err:
+        __ = interp_table_rows(table_abscissa, table_abscissa, 0.5, 0)
+    substr = "Input tables must have at least two abscissa values per row"
+    assert substr in err.value.args[0]
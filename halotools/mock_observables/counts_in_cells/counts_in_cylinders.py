@@ -3,7 +3,6 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 
 import numpy as np
-import multiprocessing
 from functools import partial
 
 from .engines import counts_in_cylinders_engine
@@ -12,6 +11,8 @@ from ..mock_observables_helpers import get_num_threads, get_period
 from ..pair_counters.rectangular_mesh import RectangularDoubleMesh
 from ..pair_counters.mesh_helpers import (_set_approximate_cell_sizes,
     _cell1_parallelization_indices, _enclose_in_box, _enforce_maximum_search_length)
+from ..pair_counters.mesh_helpers import _map_engine_over_cell1_tuples, _coordinates_with_precision
+from ..pair_counters.mesh_helpers import _is_auto
 
 from ...utils.array_utils import custom_len
 
@@ -21,7 +22,8 @@ __all__ = ('counts_in_cylinders', )
 
 def counts_in_cylinders(sample1, sample2, proj_search_radius, cylinder_half_length,
         period=None, verbose=False, num_threads=1,
-        approx_cell1_size=None, approx_cell2_size=None, return_indexes=False):
+        approx_cell1_size=None, approx_cell2_size=None, return_indexes=False,
+        precision=None):
     """
     Function counts the number of points in ``sample2`` separated by a xy-distance
     *r* and z-distance *z* from each point in ``sample1``,
@@ -87,6 +89,20 @@ def counts_in_cylinders(sample1, sample2, proj_search_radius, cylinder_half_leng
     return_indexes: bool, optional
         If true, return both counts and the indexes of the pairs.
 
+    precision : string, optional
+        Floating-point type in which the engine stores the coordinates,
+        either 'float32' or 'float64'. Storing float32 coordinates halves the
+        memory footprint and bandwidth of the engine. Separations are always computed
+        in double precision, so the only loss of accuracy comes from rounding
+        float64 input coordinates to float32, which changes each coordinate by at most
+        a fraction 2**-24 of its absolute value, and each xy-separation by at most
+        sqrt(2)*2**-23 ~ 2e-7 times the size of the box, e.g., 4e-5 Mpc/h in a
+        250 Mpc/h box, and each z-separation by at most half as much.
+        Only pairs this close to the surface of a cylinder can change from inside to outside.
+        Default is None, in which case float32 is used if the input coordinates
+        are all float32, which is exact and avoids an upcast copy,
+        and float64 otherwise.
+
     Returns
     -------
     num_pairs : array_like
@@ -145,7 +161,8 @@ def counts_in_cylinders(sample1, sample2, proj_search_radius, cylinder_half_leng
     result = _counts_in_cylinders_process_args(sample1, sample2, proj_search_radius,
             cylinder_half_length, period, verbose, num_threads, approx_cell1_size, approx_cell2_size,
             return_indexes)
-    x1in, y1in, z1in, x2in, y2in, z2in, proj_search_radius, cylinder_half_length = result[0:8]
+    x1in, y1in, z1in, x2in, y2in, z2in = _coordinates_with_precision(precision, *result[0:6])
+    proj_search_radius, cylinder_half_length = result[6:8]
     period, num_threads, PBCs, approx_cell1_size, approx_cell2_size = result[8:]
     xperiod, yperiod, zperiod = period
 
@@ -155,7 +172,9 @@ def counts_in_cylinders(sample1, sample2, proj_search_radius, cylinder_half_leng
 
     # Compute the estimates for the cell sizes
     approx_cell1_size, approx_cell2_size = (
-        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period)
+        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period,
+            npts1=len(x1in), npts2=len(x2in),
+            search_length=(search_xlength, search_ylength, search_zlength), num_threads=num_threads)
         )
     approx_x1cell_size, approx_y1cell_size, approx_z1cell_size = approx_cell1_size
     approx_x2cell_size, approx_y2cell_size, approx_z2cell_size = approx_cell2_size
@@ -172,24 +191,14 @@ def counts_in_cylinders(sample1, sample2, proj_search_radius, cylinder_half_leng
 
     # Calculate the cell1 indices that will be looped over by the engine
     num_threads, cell1_tuples = _cell1_parallelization_indices(
-        double_mesh.mesh1.ncells, num_threads)
-
-    if num_threads > 1:
-        pool = multiprocessing.Pool(num_threads)
-        result = pool.map(engine, cell1_tuples)
-        pool.close()
-        if return_indexes:
-            counts = np.sum([res[0] for res in result], axis=0)
-            indexes = np.concatenate([res[1] for res in result])
-        else:
-            counts = np.sum(result, axis=0)
+        double_mesh.mesh1.ncells, num_threads, double_mesh=double_mesh)
+
+    result = _map_engine_over_cell1_tuples(engine, cell1_tuples, num_threads)
+    if return_indexes:
+        counts = np.sum([res[0] for res in result], axis=0)
+        indexes = np.concatenate([res[1] for res in result])
     else:
-        result = engine(cell1_tuples[0])
-        if return_indexes:
-            counts = result[0]
-            indexes = result[1]
-        else:
-            counts = result
+        counts = np.sum(result, axis=0)
 
     if return_indexes:
         return counts, indexes
@@ -217,7 +226,7 @@ def _counts_in_cylinders_process_args(sample1, sample2, proj_search_radius, cyli
 
     proj_search_radius = np.atleast_1d(proj_search_radius).astype('f8')
     if len(proj_search_radius) == 1:
-        proj_search_radius = np.zeros_like(x1) + proj_search_radius[0]
+        proj_search_radius = np.zeros_like(x1, dtype='f8') + proj_search_radius[0]
     elif len(proj_search_radius) == len(x1):
         pass
     else:
@@ -227,7 +236,7 @@ def _counts_in_cylinders_process_args(sample1, sample2, proj_search_radius, cyli
 
     cylinder_half_length = np.atleast_1d(cylinder_half_length).astype('f8')
     if len(cylinder_half_length) == 1:
-        cylinder_half_length = np.zeros_like(x1) + cylinder_half_length[0]
+        cylinder_half_length = np.zeros_like(x1, dtype='f8') + cylinder_half_length[0]
     elif len(cylinder_half_length) == len(x1):
         pass
     else:
@@ -267,6 +276,8 @@ def _counts_in_cylinders_process_args(sample1, sample2, proj_search_radius, cyli
         approx_cell1_size = [max_rp_max, max_rp_max, max_pi_max]
     elif custom_len(approx_cell1_size) == 1:
         approx_cell1_size = [approx_cell1_size, approx_cell1_size, approx_cell1_size]
+    if approx_cell2_size is None and _is_auto(approx_cell1_size):
+        approx_cell2_size = approx_cell1_size
     if approx_cell2_size is None:
         approx_cell2_size = [max_rp_max, max_rp_max, max_pi_max]
     elif custom_len(approx_cell2_size) == 1:
@@ -9,6 +9,11 @@ from libc.math cimport ceil
 
 from ....utils import unsorting_indices
 
+# Floating-point types in which the engine stores the coordinates
+ctypedef fused coordinate_t:
+    cnp.float32_t
+    cnp.float64_t
+
 __author__ = ('Andrew Hearin', )
 __all__ = ('counts_in_cylinders_engine', )
 
@@ -17,8 +22,8 @@ __all__ = ('counts_in_cylinders_engine', )
 @cython.nonecheck(False)
 def counts_in_cylinders_engine(
         double_mesh,
-        x1in, y1in, z1in,
-        x2in, y2in, z2in,
+        coordinate_t[:] x1in, coordinate_t[:] y1in, coordinate_t[:] z1in,
+        coordinate_t[:] x2in, coordinate_t[:] y2in, coordinate_t[:] z2in,
         rp_max, pi_max,
         return_indexes,
         cell1_tuple):
@@ -48,6 +53,8 @@ def counts_in_cylinders_engine(
 
     z2in : numpy.array
         Length-Npts2 array storing Cartesian z-coordinates of points of 'sample 2'
+        All six coordinate arrays must be either float32 or float64.
+        Distances are always computed in double precision.
 
     rp_max : numpy.array
         Length-Npts1 array storing the x-y projected radial distance,
@@ -96,18 +103,18 @@ def counts_in_cylinders_engine(
     cdef int Ncell1 = double_mesh.mesh1.ncells
     cdef int Npts1 = len(x1in)
 
-    cdef cnp.float64_t[:] x1_sorted = np.ascontiguousarray(
-        x1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
-    cdef cnp.float64_t[:] y1_sorted = np.ascontiguousarray(
-        y1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
-    cdef cnp.float64_t[:] z1_sorted = np.ascontiguousarray(
-        z1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
-    cdef cnp.float64_t[:] x2_sorted = np.ascontiguousarray(
-        x2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
-    cdef cnp.float64_t[:] y2_sorted = np.ascontiguousarray(
-        y2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
-    cdef cnp.float64_t[:] z2_sorted = np.ascontiguousarray(
-        z2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
+    cdef coordinate_t[:] x1_sorted = np.ascontiguousarray(
+        np.asarray(x1in)[double_mesh.mesh1.idx_sorted])
+    cdef coordinate_t[:] y1_sorted = np.ascontiguousarray(
+        np.asarray(y1in)[double_mesh.mesh1.idx_sorted])
+    cdef coordinate_t[:] z1_sorted = np.ascontiguousarray(
+        np.asarray(z1in)[double_mesh.mesh1.idx_sorted])
+    cdef coordinate_t[:] x2_sorted = np.ascontiguousarray(
+        np.asarray(x2in)[double_mesh.mesh2.idx_sorted])
+    cdef coordinate_t[:] y2_sorted = np.ascontiguousarray(
+        np.asarray(y2in)[double_mesh.mesh2.idx_sorted])
+    cdef coordinate_t[:] z2_sorted = np.ascontiguousarray(
+        np.asarray(z2in)[double_mesh.mesh2.idx_sorted])
 
     cdef bint c_return_indexes = return_indexes
     cdef cnp.int64_t[:] counts = np.zeros(len(x1_sorted), dtype=np.int64)
@@ -152,9 +159,9 @@ def counts_in_cylinders_engine(
     cdef cnp.float64_t x1tmp, y1tmp, z1tmp, rp_max_squaredtmp, pi_max_squaredtmp
     cdef int Ni, Nj, i, j, k, l, current_data1_index
 
-    cdef cnp.float64_t[:] x_icell1, x_icell2
-    cdef cnp.float64_t[:] y_icell1, y_icell2
-    cdef cnp.float64_t[:] z_icell1, z_icell2
+    cdef coordinate_t[:] x_icell1, x_icell2
+    cdef coordinate_t[:] y_icell1, y_icell2
+    cdef coordinate_t[:] z_icell1, z_icell2
 
     for icell1 in range(first_cell1_element, last_cell1_element):
         ifirst1 = cell1_indices[icell1]
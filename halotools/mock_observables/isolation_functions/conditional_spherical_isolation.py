@@ -6,7 +6,6 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 import numpy as np
 from functools import partial
-import multiprocessing
 
 from .spherical_isolation import _spherical_isolation_process_args
 from .isolation_functions_helpers import _conditional_isolation_process_marks
@@ -14,6 +13,7 @@ from .engines import marked_spherical_isolation_engine
 
 from ..pair_counters.rectangular_mesh import RectangularDoubleMesh
 from ..pair_counters.mesh_helpers import _set_approximate_cell_sizes, _cell1_parallelization_indices
+from ..pair_counters.mesh_helpers import _map_engine_over_cell1_tuples
 
 __all__ = ('conditional_spherical_isolation', )
 
@@ -260,7 +260,9 @@ def conditional_spherical_isolation(sample1, sample2, r_max,
 
     # Compute the estimates for the cell sizes
     approx_cell1_size, approx_cell2_size = (
-        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period)
+        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period,
+            npts1=len(x1in), npts2=len(x2in),
+            search_length=(search_xlength, search_ylength, search_zlength), num_threads=num_threads)
         )
     approx_x1cell_size, approx_y1cell_size, approx_z1cell_size = approx_cell1_size
     approx_x2cell_size, approx_y2cell_size, approx_z2cell_size = approx_cell2_size
@@ -287,15 +289,10 @@ def conditional_spherical_isolation(sample1, sample2, r_max,
 
     # Calculate the cell1 indices that will be looped over by the engine
     num_threads, cell1_tuples = _cell1_parallelization_indices(
-        double_mesh.mesh1.ncells, num_threads)
-
-    if num_threads > 1:
-        pool = multiprocessing.Pool(num_threads)
-        result = pool.map(engine, cell1_tuples)
-        counts = np.sum(np.array(result), axis=0)
-        pool.close()
-    else:
-        counts = engine(cell1_tuples[0])
+        double_mesh.mesh1.ncells, num_threads, double_mesh=double_mesh)
+
+    result = _map_engine_over_cell1_tuples(engine, cell1_tuples, num_threads)
+    counts = np.sum(np.array(result), axis=0)
 
     is_isolated = np.array(counts, dtype=bool)
 
@@ -3,6 +3,7 @@ the isolation_functions sub-package.
 """
 import numpy as np
 
+from ..pair_counters.mesh_helpers import _is_auto
 from ...custom_exceptions import HalotoolsError
 
 __all__ = ('_get_r_max', '_set_isolation_approx_cell_sizes')
@@ -39,6 +40,10 @@ def _set_isolation_approx_cell_sizes(approx_cell1_size, approx_cell2_size,
         xsearch_length, ysearch_length, zsearch_length):
     """
     """
+    if _is_auto(approx_cell1_size) and (approx_cell2_size is None or _is_auto(approx_cell2_size)):
+        #  The cell sizes are chosen by _set_approximate_cell_sizes
+        return 'auto', 'auto'
+
     if approx_cell1_size is None:
         approx_cell1_size = np.array([xsearch_length, ysearch_length, zsearch_length]).astype(float)
     else:
@@ -7,6 +7,8 @@ from warnings import warn
 import numpy as np
 import multiprocessing
 
+from .pair_counters.shared_memory_pool import SharedMemoryPool
+from .pair_counters.openmp_threads import OpenMPThreads
 from ..utils.array_utils import array_is_monotonic
 
 
@@ -63,8 +65,13 @@ def get_num_threads(input_num_threads, enforce_max_cores=False):
     number of available cores, a warning will be issued.
     In this event,  ``enforce_max_cores`` is set to True,
     then ``num_threads`` is automatically set to num_cores.
+    An instance of `~halotools.mock_observables.pair_counters.SharedMemoryPool`
+    or `~halotools.mock_observables.pair_counters.OpenMPThreads`
+    is returned unchanged.
     """
-    if input_num_threads == 'max':
+    if isinstance(input_num_threads, (SharedMemoryPool, OpenMPThreads)):
+        return input_num_threads
+    elif input_num_threads == 'max':
         num_threads = num_available_cores
     else:
         try:
@@ -1,8 +1,12 @@
 from __future__ import (absolute_import, division, print_function, unicode_literals)
 
-from .rectangular_mesh import RectangularDoubleMesh
+from .rectangular_mesh import RectangularDoubleMesh, RectangularMeshCache, default_mesh_cache
 from .rectangular_mesh_2d import RectangularDoubleMesh2D
+from .shared_memory_pool import SharedMemoryPool
+from .openmp_threads import OpenMPThreads
+from .cell_size_tuning import auto_cell_sizes, tune_cell_sizes
 from .npairs_3d import npairs_3d
+from .npairs_multi_3d import npairs_multi_3d
 from .npairs_projected import npairs_projected
 from .npairs_xy_z import npairs_xy_z
 from .marked_npairs_3d import marked_npairs_3d
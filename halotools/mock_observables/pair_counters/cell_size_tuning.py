@@ -0,0 +1,316 @@
+""" Module containing the functions used to choose the ``approx_cell1_size`` and
+``approx_cell2_size`` arguments of the `~halotools.mock_observables` pair counters
+when these arguments are set to the string 'auto'.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+import json
+from functools import partial
+from time import time
+
+import numpy as np
+
+from .rectangular_mesh import (RectangularDoubleMesh, RectangularMeshCache,
+    sample1_cell_size, sample2_cell_sizes)
+from .cpairs import npairs_3d_engine
+from ...sim_manager import halotools_cache_dirname
+
+__all__ = ('auto_cell_sizes', 'tune_cell_sizes')
+
+default_cell_size_cache_fname = os.path.join(halotools_cache_dirname, 'pair_counter_cell_sizes.json')
+
+#  Candidate mesh1 cell sizes in units of the search length,
+#  and candidate numbers of mesh2 cells per mesh1 cell in each dimension
+_cell1_size_grid = (1., 1.25, 1.5, 2., 2.5, 3., 4., 5., 6., 8., 10.)
+_num_cell2_per_cell1_grid = (1, 2, 3, 4, 5, 6, 8)
+
+#  Approximate cost of visiting a cell2, and of visiting a cell2 for each point in cell1,
+#  in units of the cost of computing the distance between a pair of points
+_cell2_visit_cost = 20.
+_cell1_point_visit_cost = 4.
+
+#  Minimum number of mesh1 cells per process required for effective load balancing
+_min_cells_per_process = 16
+
+#  Maximum number of signatures stored in the cache; the oldest entries are discarded first
+_max_cached_signatures = 1000
+
+
+def auto_cell_sizes(npts1, npts2, search_length, period, num_threads=1,
+        cache_fname=default_cell_size_cache_fname):
+    """ Choose the ``approx_cell1_size`` and ``approx_cell2_size`` arguments
+    of the pair counters for samples with the input number of points,
+    search length and periodic box.
+
+    The choice is first looked up in an on-disk cache storing previous choices for the same
+    (npts1, npts2, search_length, period, num_threads) signature, which includes choices
+    refined by a timed trial with `tune_cell_sizes`. In the absence of a cached choice,
+    the cell sizes minimizing a simple model for the cost of the pair-counting engine
+    are chosen, and stored in the cache.
+
+    Parameters
+    ----------
+    npts1, npts2 : int
+        Number of points in sample1 and sample2
+
+    search_length : float or array_like
+        Maximum length over which pairs will be searched for in each dimension,
+        e.g., rbins.max() for `~halotools.mock_observables.npairs_3d`.
+
+    period : float or array_like
+        Length-3 sequence defining the periodic boundary conditions in each dimension.
+
+    num_threads : int, optional
+        Number of processes used to count pairs. Default is 1.
+
+    cache_fname : string, optional
+        Path to the json file storing the cached cell sizes.
+        Default is ``pair_counter_cell_sizes.json`` in the Halotools cache directory.
+        Set to None to disable the cache.
+
+    Returns
+    -------
+    approx_cell1_size, approx_cell2_size : arrays
+        Length-3 arrays storing the chosen cell sizes
+
+    Examples
+    --------
+    >>> approx_cell1_size, approx_cell2_size = auto_cell_sizes(10**5, 10**5, 20., 250., cache_fname=None)
+
+    The same choice is made when calling the pair counters with ``approx_cell1_size='auto'``:
+
+    >>> from halotools.mock_observables import npairs_3d
+    >>> Npts, Lbox = 1000, 250.
+    >>> sample1 = np.random.uniform(0, Lbox, Npts*3).reshape((Npts, 3))
+    >>> rbins = np.logspace(-1, 1, 10)
+    >>> result = npairs_3d(sample1, sample1, rbins, period=Lbox, approx_cell1_size='auto')
+    """
+    search_length, period = _broadcast_to_3d(search_length), _broadcast_to_3d(period)
+    num_threads = _num_processes(num_threads)
+    key = _cell_size_signature(npts1, npts2, search_length, period, num_threads)
+
+    cache = _read_cell_size_cache(cache_fname)
+    try:
+        approx_cell1_size, approx_cell2_size = cache[key]
+        return np.array(approx_cell1_size), np.array(approx_cell2_size)
+    except (KeyError, TypeError, ValueError):
+        pass
+
+    candidates = _candidate_cell_sizes(npts1, npts2, search_length, period, num_threads)
+    approx_cell1_size, approx_cell2_size = candidates[0]
+
+    _store_cell_sizes(cache, key, approx_cell1_size, approx_cell2_size, cache_fname)
+    return approx_cell1_size, approx_cell2_size
+
+
+def tune_cell_sizes(sample1, sample2, search_length, period, num_threads=1,
+        num_candidates=3, trial_fraction=0.2, cache_fname=default_cell_size_cache_fname):
+    """ Refine the choice of `auto_cell_sizes` by timing a short trial of the
+    pair-counting engine for the most promising candidate cell sizes,
+    and store the fastest choice in the on-disk cache so that subsequent calls to
+    the pair counters with ``approx_cell1_size='auto'`` for samples of the same size
+    use the refined choice.
+
+    Parameters
+    ----------
+    sample1, sample2 : arrays
+        Numpy arrays of shape (npts1, 3) and (npts2, 3) storing the points
+        of a representative pair of samples
+
+    search_length : float or array_like
+        Maximum length over which pairs will be searched for in each dimension
+
+    period : float or array_like
+        Length-3 sequence defining the periodic boundary conditions in each dimension.
+
+    num_threads : int, optional
+        Number of processes that will be used to count pairs. Default is 1.
+
+    num_candidates : int, optional
+        Number of candidate cell sizes, ranked by the cost model, that are timed.
+        Default is 3.
+
+    trial_fraction : float, optional
+        Fraction of the mesh1 cells looped over in each trial. Default is 0.2.
+
+    cache_fname : string, optional
+        Path to the json file storing the cached cell sizes.
+        Set to None to disable the cache.
+
+    Returns
+    -------
+    approx_cell1_size, approx_cell2_size : arrays
+        Length-3 arrays storing the fastest cell sizes
+
+    Examples
+    --------
+    >>> Npts, Lbox = 10000, 250.
+    >>> sample1 = np.random.uniform(0, Lbox, Npts*3).reshape((Npts, 3))
+    >>> approx_cell1_size, approx_cell2_size = tune_cell_sizes(sample1, sample1, 20., Lbox, cache_fname=None)
+    """
+    search_length, period = _broadcast_to_3d(search_length), _broadcast_to_3d(period)
+    num_threads = _num_processes(num_threads)
+    x1, y1, z1 = sample1[:, 0], sample1[:, 1], sample1[:, 2]
+    x2, y2, z2 = sample2[:, 0], sample2[:, 1], sample2[:, 2]
+    npts1, npts2 = len(x1), len(x2)
+
+    candidates = _candidate_cell_sizes(npts1, npts2, search_length, period, num_threads)
+    rbins = np.array([search_length.min()])
+    mesh_cache = RectangularMeshCache(maxsize=0)
+
+    trial_times = []
+    for approx_cell1_size, approx_cell2_size in candidates[:num_candidates]:
+        start = time()
+        double_mesh = RectangularDoubleMesh(x1, y1, z1, x2, y2, z2,
+            approx_cell1_size[0], approx_cell1_size[1], approx_cell1_size[2],
+            approx_cell2_size[0], approx_cell2_size[1], approx_cell2_size[2],
+            search_length[0], search_length[1], search_length[2],
+            period[0], period[1], period[2], mesh_cache=mesh_cache)
+        mesh_time = time() - start
+
+        #  Loop over a slab of complete x-layers of mesh1 so that the trial covers
+        #  the same fraction of the volume for every candidate
+        num_trial_xdivs = max(1, int(np.round(trial_fraction*double_mesh.mesh1.num_xdivs)))
+        covered_fraction = num_trial_xdivs/float(double_mesh.mesh1.num_xdivs)
+        num_cells_per_xdiv = double_mesh.mesh1.num_ydivs*double_mesh.mesh1.num_zdivs
+        cell1_tuple = (0, num_trial_xdivs*num_cells_per_xdiv)
+
+        engine = partial(npairs_3d_engine, double_mesh, x1, y1, z1, x2, y2, z2, rbins)
+        start = time()
+        engine(cell1_tuple)
+        engine_time = (time() - start)/covered_fraction
+
+        trial_times.append(mesh_time + engine_time/num_threads)
+
+    approx_cell1_size, approx_cell2_size = candidates[int(np.argmin(trial_times))]
+
+    key = _cell_size_signature(npts1, npts2, search_length, period, num_threads)
+    cache = _read_cell_size_cache(cache_fname)
+    _store_cell_sizes(cache, key, approx_cell1_size, approx_cell2_size, cache_fname)
+    return approx_cell1_size, approx_cell2_size
+
+
+def _candidate_cell_sizes(npts1, npts2, search_length, period, num_threads=1):
+    """ Return a list of (approx_cell1_size, approx_cell2_size) candidates
+    sorted in increasing order of the cost model of `_pair_counting_cost`.
+    Candidates leaving fewer than ``_min_cells_per_process`` mesh1 cells per process
+    are only considered when no other candidate is available.
+    """
+    candidates, costs, ncells = [], [], []
+    for cell1_size_factor in _cell1_size_grid:
+        for num_cell2_per_cell1 in _num_cell2_per_cell1_grid:
+            cell1_sizes = np.array([sample1_cell_size(p, s, cell1_size_factor*s)
+                for p, s in zip(period, search_length)])
+            cell2_sizes = np.array([sample2_cell_sizes(p, c1, c1/float(num_cell2_per_cell1))
+                for p, c1 in zip(period, cell1_sizes)])
+            costs.append(_pair_counting_cost(npts1, npts2, search_length, period,
+                cell1_sizes, cell2_sizes))
+            ncells.append(np.prod(np.round(period/cell1_sizes)))
+
+            #  Offset the number of divisions by one half so that the mesh recovers
+            #  the same number of divisions when rounding down the ratio period/approx_cell1_size
+            approx_cell1_size = period/(np.round(period/cell1_sizes) + 0.5)
+            candidates.append((approx_cell1_size, cell2_sizes))
+
+    costs, ncells = np.array(costs), np.array(ncells)
+    enough_cells = ncells >= _min_cells_per_process*num_threads
+    if np.any(enough_cells):
+        costs = np.where(enough_cells, costs, np.inf)
+
+    #  Many grid points map onto the same mesh geometry, so remove duplicates
+    result, seen = [], set()
+    for idx in np.argsort(costs, kind='mergesort'):
+        cell1_sizes, cell2_sizes = candidates[idx]
+        key = tuple(np.floor(period/cell1_sizes)) + tuple(np.round(period/cell2_sizes))
+        if key not in seen:
+            seen.add(key)
+            result.append((cell1_sizes, cell2_sizes))
+    return result
+
+
+def _pair_counting_cost(npts1, npts2, search_length, period, cell1_sizes, cell2_sizes):
+    """ Model for the cost of the pair-counting engine for a uniform distribution of points.
+
+    For every point in a mesh1 cell, the engine loops over all the points in the mesh2 cells
+    covering the mesh1 cell plus a buffer of ceil(search_length/cell2_size) cells
+    on either side, in each dimension. The number of distance computations is thus npts1 times
+    the mean number of sample2 points in this covering volume. The model adds the overhead
+    of visiting each mesh2 cell for each mesh1 cell, and for each point in the mesh1 cell.
+    """
+    num_covering_steps = np.ceil(search_length/cell2_sizes)
+    covering_volume = np.prod(cell1_sizes + 2*num_covering_steps*cell2_sizes)
+    num_cell2_visits = np.prod(np.round(cell1_sizes/cell2_sizes) + 2*num_covering_steps)
+    num_cells1 = np.prod(np.round(period/cell1_sizes))
+
+    num_pairs = npts1*npts2*covering_volume/np.prod(period)
+    cell_overhead = num_cells1*num_cell2_visits*_cell2_visit_cost
+    point_overhead = npts1*num_cell2_visits*_cell1_point_visit_cost
+    return num_pairs + cell_overhead + point_overhead
+
+
+def _broadcast_to_3d(x):
+    x = np.atleast_1d(x).astype(float)
+    if len(x) == 1:
+        x = np.array([x[0]]*3)
+    return x
+
+
+def _num_processes(num_threads):
+    """ Number of processes corresponding to the ``num_threads`` argument of the pair counters,
+    which may also be a `~halotools.mock_observables.pair_counters.SharedMemoryPool` or
+    `~halotools.mock_observables.pair_counters.OpenMPThreads` instance.
+    """
+    num_threads = getattr(num_threads, 'num_processes', num_threads)
+    num_threads = getattr(num_threads, 'num_threads', num_threads)
+    return int(num_threads)
+
+
+def _cell_size_signature(npts1, npts2, search_length, period, num_threads):
+    """ String used as the key of the cell size cache.
+    """
+    return '{0}_{1}_{2}_{3}_{4}'.format(int(npts1), int(npts2),
+        '_'.join('{0:.6g}'.format(s) for s in search_length),
+        '_'.join('{0:.6g}'.format(p) for p in period), int(num_threads))
+
+
+def _read_cell_size_cache(cache_fname):
+    """ Return the dictionary stored in the cell size cache,
+    or an empty dictionary if the cache is disabled, missing or unreadable.
+    """
+    if cache_fname is None:
+        return {}
+    try:
+        with open(cache_fname, 'r') as f:
+            cache = json.load(f)
+        assert isinstance(cache, dict)
+    except (IOError, OSError, ValueError, AssertionError):
+        cache = {}
+    return cache
+
+
+def _store_cell_sizes(cache, key, approx_cell1_size, approx_cell2_size, cache_fname):
+    """ Add the cell sizes to the cache as its most recent entry,
+    discard the oldest entries in excess of ``_max_cached_signatures``,
+    and write the cache to disk.
+    """
+    cache.pop(key, None)
+    cache[key] = [list(approx_cell1_size), list(approx_cell2_size)]
+    while len(cache) > _max_cached_signatures:
+        cache.pop(next(iter(cache)))
+    _write_cell_size_cache(cache, cache_fname)
+
+
+def _write_cell_size_cache(cache, cache_fname):
+    """ Store the cell size cache on disk. Failure to write the cache,
+    e.g., because of a read-only file system, is silently ignored.
+    """
+    if cache_fname is None:
+        return
+    tmp_fname = cache_fname + '.{0}.tmp'.format(os.getpid())
+    try:
+        with open(tmp_fname, 'w') as f:
+            json.dump(cache, f, indent=1)
+        os.rename(tmp_fname, cache_fname)
+    except (IOError, OSError):
+        pass
@@ -0,0 +1,30 @@
+cimport numpy as cnp
+
+##### inline bin lookup used by the pair-counting engines ####
+
+cdef inline int first_edge_not_below(cnp.float64_t value,
+        cnp.float64_t* edges, int num_edges) nogil:
+    """ Return the index of the first element of the monotonically increasing
+    array ``edges`` that is no smaller than ``value``, or ``num_edges`` if
+    there is no such element, or if ``value`` is NaN.
+
+    The index is found with a binary search, so that the cost of locating
+    the bin of a pair separation grows only logarithmically with the number of bins.
+    Pairs are binned by incrementing the histogram at the returned index,
+    and the cumulative counts are recovered with a cumulative sum.
+    """
+    cdef int low = 0
+    cdef int high = num_edges
+    cdef int mid
+
+    # most pairs lie beyond the largest edge
+    if not (value <= edges[num_edges-1]):
+        return num_edges
+
+    while low < high:
+        mid = (low + high) >> 1
+        if edges[mid] < value:
+            low = mid + 1
+        else:
+            high = mid
+    return low
@@ -6,6 +6,7 @@ import numpy as np
 cimport numpy as cnp
 cimport cython 
 from libc.math cimport ceil 
+from .bin_lookup cimport first_edge_not_below
 
 __author__ = ('Andrew Hearin', 'Duncan Campbell')
 __all__ = ('npairs_jackknife_3d_engine', )
@@ -223,15 +224,14 @@ def npairs_jackknife_3d_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
                                     w2 = w_icell2[j]
                                     j2 = j_icell2[j]
 
-                                    for s in range(N_samples+1):
-                                        k = num_rbins-1
-                                        while dsq<=rbins_squared[k]:
+                                    # histogram each pair in the first bin containing it
+                                    k = first_edge_not_below(dsq, &rbins_squared[0], num_rbins)
+                                    if k < num_rbins:
+                                        for s in range(N_samples+1):
                                             counts[s,k] += jweight(s, j1, j2, w1, w2)
-                                            k=k-1
-                                            if k<0: break                                        
-                                        
-                                        
-    return np.array(counts)
+
+    # a pair in the kth bin is separated by less than every edge k' >= k
+    return np.cumsum(np.array(counts), axis=1)
 
 
 cdef inline cnp.float64_t jweight(cnp.int64_t j, cnp.int64_t j1, cnp.int64_t j2,
@@ -6,6 +6,7 @@ import numpy as np
 cimport numpy as cnp
 cimport cython
 from libc.math cimport ceil
+from .bin_lookup cimport first_edge_not_below
 
 __author__ = ('Duncan Campbell', )
 __all__ = ('npairs_jackknife_xy_z_engine', )
@@ -231,19 +232,15 @@ def npairs_jackknife_xy_z_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in
                                     w2 = w_icell2[j]
                                     j2 = j_icell2[j]
 
-                                    for s in range(N_samples+1):
-                                        k = num_rp_bins-1
-                                        while dxy_sq<=rp_bins_squared[k]:
-                                            g = num_pi_bins-1
-                                            while dz_sq<=pi_bins_squared[g]:
-                                                counts[s,k,g] += jweight(s, j1, j2, w1, w2)
-                                                g=g-1
-                                                if g<0: break
-                                            k=k-1
-                                            if k<0: break
+                                    # histogram each pair in the first (rp, pi) bin containing it
+                                    k = first_edge_not_below(dxy_sq, &rp_bins_squared[0], num_rp_bins)
+                                    g = first_edge_not_below(dz_sq, &pi_bins_squared[0], num_pi_bins)
+                                    if (k < num_rp_bins) and (g < num_pi_bins):
+                                        for s in range(N_samples+1):
+                                            counts[s,k,g] += jweight(s, j1, j2, w1, w2)
 
-
-    return np.array(counts)
+    # a pair in the (k, g) bin is counted in every bin (k', g') with k' >= k and g' >= g
+    return np.cumsum(np.cumsum(np.array(counts), axis=1), axis=2)
 
 
 cdef inline cnp.float64_t jweight(cnp.int64_t j, cnp.int64_t j1, cnp.int64_t j2,
@@ -0,0 +1,246 @@
+"""
+"""
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+
+import numpy as np
+cimport numpy as cnp
+cimport cython
+from cython.parallel cimport prange, threadid
+from libc.math cimport ceil
+from .bin_lookup cimport first_edge_not_below
+
+__all__ = ('npairs_multi_3d_engine', )
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+def npairs_multi_3d_engine(double_mesh, x1in, y1in, z1in, labels1in,
+        x2in, y2in, z2in, labels2in, pair_slots, rbins, cell1_tuple,
+        int num_omp_threads=1, int half_pairs=0):
+    """ Cython engine for simultaneously counting pairs of points between several
+    pairs of labelled samples as a function of three-dimensional separation.
+    The distance between each pair of points is computed only once, during a single
+    traversal of the mesh, and the pair is added to the histogram of the slot
+    assigned to the labels of the two points.
+
+    Parameters 
+    ------------
+    double_mesh : object 
+        Instance of `~halotools.mock_observables.RectangularDoubleMesh`
+
+    x1in, y1in, z1in : arrays 
+        Numpy arrays storing Cartesian coordinates of points in sample 1
+
+    labels1in : array
+        Integer array storing the label of each point in sample 1
+
+    x2in, y2in, z2in : arrays 
+        Numpy arrays storing Cartesian coordinates of points in sample 2
+
+    labels2in : array
+        Integer array storing the label of each point in sample 2
+
+    pair_slots : array
+        Integer array of shape (num_labels1, num_labels2). The element (l1, l2) stores
+        the index of the histogram in which pairs formed by a point with label l1
+        in sample 1 and a point with label l2 in sample 2 are counted,
+        or -1 if such pairs should not be counted.
+
+    rbins : array
+        Boundaries defining the bins in which pairs are counted.
+
+    cell1_tuple : tuple
+        Two-element tuple defining the first and last cells in 
+        double_mesh.mesh1 that will be looped over. Intended for use with 
+        python multiprocessing. 
+
+    num_omp_threads : int, optional
+        Number of OpenMP threads used to loop over the cells of double_mesh.mesh1.
+        Each thread accumulates its own histogram, and the histograms are summed
+        at the end. If halotools was compiled without OpenMP support,
+        the loop is executed serially. Default is 1.
+
+    half_pairs : int, optional
+        If set to 1, sample 1 and sample 2 must be the same sample, sorted by identical
+        meshes whose cell sizes are no smaller than the search length.
+        Each unordered pair of cells, and each unordered pair of points,
+        is then visited only once, and pairs of distinct points are counted in the slots
+        of both orderings of their labels, so that the returned counts are identical
+        to the default behavior for roughly half the number of distance computations.
+        Default is 0.
+
+    Returns 
+    --------
+    counts : array 
+        Integer array of shape (num_slots, len(rbins)) giving the number of pairs
+        in each slot separated by a distance less than the corresponding entry of ``rbins``.
+
+    """    
+    cdef cnp.float64_t[:] rbins_squared = rbins*rbins
+    cdef cnp.float64_t xperiod = double_mesh.xperiod
+    cdef cnp.float64_t yperiod = double_mesh.yperiod
+    cdef cnp.float64_t zperiod = double_mesh.zperiod
+    cdef cnp.int64_t first_cell1_element = cell1_tuple[0]
+    cdef cnp.int64_t last_cell1_element = cell1_tuple[1]
+    cdef int PBCs = double_mesh._PBCs
+
+    cdef int Ncell1 = double_mesh.mesh1.ncells
+    cdef int num_rbins = len(rbins)
+    cdef cnp.int64_t[:, :] slots = np.ascontiguousarray(pair_slots, dtype=np.int64)
+    cdef int num_slots = max(np.max(pair_slots) + 1, 1)
+    cdef cnp.int64_t[:, :, :] thread_counts = np.zeros(
+        (num_omp_threads, num_slots, num_rbins), dtype=np.int64)
+    cdef int tid
+
+    cdef cnp.float64_t[:] x1 = np.ascontiguousarray(x1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] y1 = np.ascontiguousarray(y1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] z1 = np.ascontiguousarray(z1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] x2 = np.ascontiguousarray(x2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] y2 = np.ascontiguousarray(y2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] z2 = np.ascontiguousarray(z2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
+    cdef cnp.int64_t[:] labels1 = np.ascontiguousarray(labels1in[double_mesh.mesh1.idx_sorted], dtype=np.int64)
+    cdef cnp.int64_t[:] labels2 = np.ascontiguousarray(labels2in[double_mesh.mesh2.idx_sorted], dtype=np.int64)
+
+    cdef cnp.int64_t icell1, icell2
+    cdef cnp.int64_t[:] cell1_indices = np.ascontiguousarray(double_mesh.mesh1.cell_id_indices, dtype=np.int64)
+    cdef cnp.int64_t[:] cell2_indices = np.ascontiguousarray(double_mesh.mesh2.cell_id_indices, dtype=np.int64)
+
+    cdef cnp.int64_t ifirst1, ilast1, ifirst2, ilast2
+
+    cdef int ix2, iy2, iz2, ix1, iy1, iz1
+    cdef int nonPBC_ix2, nonPBC_iy2, nonPBC_iz2
+
+    cdef int num_x2_covering_steps = int(np.ceil(
+        double_mesh.search_xlength / double_mesh.mesh2.xcell_size))
+    cdef int num_y2_covering_steps = int(np.ceil(
+        double_mesh.search_ylength / double_mesh.mesh2.ycell_size))
+    cdef int num_z2_covering_steps = int(np.ceil(
+        double_mesh.search_zlength / double_mesh.mesh2.zcell_size))
+
+    cdef int leftmost_ix2, rightmost_ix2
+    cdef int leftmost_iy2, rightmost_iy2
+    cdef int leftmost_iz2, rightmost_iz2
+
+    cdef int num_x1divs = double_mesh.mesh1.num_xdivs
+    cdef int num_y1divs = double_mesh.mesh1.num_ydivs
+    cdef int num_z1divs = double_mesh.mesh1.num_zdivs
+    cdef int num_x2divs = double_mesh.mesh2.num_xdivs
+    cdef int num_y2divs = double_mesh.mesh2.num_ydivs
+    cdef int num_z2divs = double_mesh.mesh2.num_zdivs
+    cdef int num_x2_per_x1 = num_x2divs // num_x1divs
+    cdef int num_y2_per_y1 = num_y2divs // num_y1divs
+    cdef int num_z2_per_z1 = num_z2divs // num_z1divs
+
+    cdef cnp.float64_t x2shift, y2shift, z2shift, dx, dy, dz, dsq
+    cdef cnp.float64_t x1tmp, y1tmp, z1tmp
+    cdef int Ni, Nj, i, j, k, l
+    cdef int jstart
+    cdef cnp.int64_t label1, islot, jslot
+
+    if half_pairs:
+        if ((num_x2_per_x1 != 1) or (num_y2_per_y1 != 1) or (num_z2_per_z1 != 1) or
+                (num_x2_covering_steps != 1) or (num_y2_covering_steps != 1) or
+                (num_z2_covering_steps != 1)):
+            msg = ("Counting half pairs requires mesh1 and mesh2 to have identical cells\n"
+                "that are no smaller than the search length")
+            raise ValueError(msg)
+
+    with nogil:
+        for icell1 in prange(first_cell1_element, last_cell1_element,
+                num_threads=num_omp_threads, schedule='dynamic'):
+            tid = threadid()
+            ifirst1 = cell1_indices[icell1]
+            ilast1 = cell1_indices[icell1+1]
+
+            Ni = ilast1 - ifirst1
+            if Ni > 0:
+
+                ix1 = icell1 // (num_y1divs*num_z1divs)
+                iy1 = (icell1 - ix1*num_y1divs*num_z1divs) // num_z1divs
+                iz1 = icell1 - (ix1*num_y1divs*num_z1divs) - (iy1*num_z1divs)
+
+                leftmost_ix2 = ix1*num_x2_per_x1 - num_x2_covering_steps
+                leftmost_iy2 = iy1*num_y2_per_y1 - num_y2_covering_steps
+                leftmost_iz2 = iz1*num_z2_per_z1 - num_z2_covering_steps
+
+                rightmost_ix2 = (ix1+1)*num_x2_per_x1 + num_x2_covering_steps
+                rightmost_iy2 = (iy1+1)*num_y2_per_y1 + num_y2_covering_steps
+                rightmost_iz2 = (iz1+1)*num_z2_per_z1 + num_z2_covering_steps
+
+                for nonPBC_ix2 in range(leftmost_ix2, rightmost_ix2):
+                    if nonPBC_ix2 < 0:
+                        x2shift = -xperiod*PBCs
+                    elif nonPBC_ix2 >= num_x2divs:
+                        x2shift = +xperiod*PBCs
+                    else:
+                        x2shift = 0.
+                    # Now apply the PBCs
+                    ix2 = nonPBC_ix2 % num_x2divs
+
+                    for nonPBC_iy2 in range(leftmost_iy2, rightmost_iy2):
+                        if nonPBC_iy2 < 0:
+                            y2shift = -yperiod*PBCs
+                        elif nonPBC_iy2 >= num_y2divs:
+                            y2shift = +yperiod*PBCs
+                        else:
+                            y2shift = 0.
+                        # Now apply the PBCs
+                        iy2 = nonPBC_iy2 % num_y2divs
+
+                        for nonPBC_iz2 in range(leftmost_iz2, rightmost_iz2):
+                            if nonPBC_iz2 < 0:
+                                z2shift = -zperiod*PBCs
+                            elif nonPBC_iz2 >= num_z2divs:
+                                z2shift = +zperiod*PBCs
+                            else:
+                                z2shift = 0.
+                            # Now apply the PBCs
+                            iz2 = nonPBC_iz2 % num_z2divs
+
+                            icell2 = ix2*(num_y2divs*num_z2divs) + iy2*num_z2divs + iz2
+                            if half_pairs and (icell2 < icell1):
+                                continue
+
+                            ifirst2 = cell2_indices[icell2]
+                            ilast2 = cell2_indices[icell2+1]
+
+                            Nj = ilast2 - ifirst2
+                            #loop over points in cell1 points
+                            if Nj > 0:
+                                for i in range(0,Ni):
+                                    x1tmp = x1[ifirst1+i] - x2shift
+                                    y1tmp = y1[ifirst1+i] - y2shift
+                                    z1tmp = z1[ifirst1+i] - z2shift
+                                    label1 = labels1[ifirst1+i]
+                                    #loop over points in cell2 points
+                                    if half_pairs and (icell2 == icell1):
+                                        jstart = i
+                                    else:
+                                        jstart = 0
+                                    for j in range(jstart,Nj):
+                                        islot = slots[label1, labels2[ifirst2+j]]
+                                        # pairs of distinct points also stand in for the
+                                        # pair in which the order of the points is swapped
+                                        if half_pairs and ((icell2 != icell1) or (j != i)):
+                                            jslot = slots[labels2[ifirst2+j], label1]
+                                        else:
+                                            jslot = -1
+                                        if (islot < 0) and (jslot < 0):
+                                            continue
+
+                                        #calculate the square distance
+                                        dx = x1tmp - x2[ifirst2+j]
+                                        dy = y1tmp - y2[ifirst2+j]
+                                        dz = z1tmp - z2[ifirst2+j]
+                                        dsq = dx*dx + dy*dy + dz*dz
+
+                                        # histogram each pair in the first bin containing it
+                                        k = first_edge_not_below(dsq, &rbins_squared[0], num_rbins)
+                                        if k < num_rbins:
+                                            if islot >= 0:
+                                                thread_counts[tid, islot, k] += 1
+                                            if jslot >= 0:
+                                                thread_counts[tid, jslot, k] += 1
+
+    # a pair in the kth bin is separated by less than every edge k' >= k
+    return np.cumsum(np.sum(np.asarray(thread_counts), axis=0), axis=1)
@@ -6,16 +6,23 @@ import numpy as np
 cimport numpy as cnp
 cimport cython
 from libc.math cimport ceil
+from .bin_lookup cimport first_edge_not_below
 
 from ....utils import unsorting_indices
 
+# Floating-point types in which the engine stores the coordinates
+ctypedef fused coordinate_t:
+    cnp.float32_t
+    cnp.float64_t
+
 __author__ = ('Andrew Hearin', 'Duncan Campbell')
 __all__ = ('npairs_per_object_3d_engine', )
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
 @cython.nonecheck(False)
-def npairs_per_object_3d_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in, rbins, cell1_tuple):
+def npairs_per_object_3d_engine(double_mesh, coordinate_t[:] x1in, coordinate_t[:] y1in, coordinate_t[:] z1in,
+        coordinate_t[:] x2in, coordinate_t[:] y2in, coordinate_t[:] z2in, rbins, cell1_tuple):
     """ Cython engine for counting pairs of points as a function of three-dimensional separation.
 
     Parameters
@@ -28,6 +35,8 @@ def npairs_per_object_3d_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
 
     x2in, y2in, z2in : arrays
         Numpy arrays storing Cartesian coordinates of points in sample 2
+        All six coordinate arrays must be either float32 or float64.
+        Distances are always computed in double precision.
 
     rbins : array
         Boundaries defining the bins in which pairs are counted.
@@ -56,20 +65,19 @@ def npairs_per_object_3d_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
     cdef int Ncell1 = double_mesh.mesh1.ncells
     cdef int num_rbins = len(rbins)
 
-    cdef cnp.float64_t[:] x1_sorted = np.ascontiguousarray(
-        x1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
-    cdef cnp.float64_t[:] y1_sorted = np.ascontiguousarray(
-        y1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
-    cdef cnp.float64_t[:] z1_sorted = np.ascontiguousarray(
-        z1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
-    cdef cnp.float64_t[:] x2_sorted = np.ascontiguousarray(
-        x2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
-    cdef cnp.float64_t[:] y2_sorted = np.ascontiguousarray(
-        y2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
-    cdef cnp.float64_t[:] z2_sorted = np.ascontiguousarray(
-        z2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
-
-    cdef cnp.int64_t[:] inner_counts = np.zeros((num_rbins,), dtype=np.int64)
+    cdef coordinate_t[:] x1_sorted = np.ascontiguousarray(
+        np.asarray(x1in)[double_mesh.mesh1.idx_sorted])
+    cdef coordinate_t[:] y1_sorted = np.ascontiguousarray(
+        np.asarray(y1in)[double_mesh.mesh1.idx_sorted])
+    cdef coordinate_t[:] z1_sorted = np.ascontiguousarray(
+        np.asarray(z1in)[double_mesh.mesh1.idx_sorted])
+    cdef coordinate_t[:] x2_sorted = np.ascontiguousarray(
+        np.asarray(x2in)[double_mesh.mesh2.idx_sorted])
+    cdef coordinate_t[:] y2_sorted = np.ascontiguousarray(
+        np.asarray(y2in)[double_mesh.mesh2.idx_sorted])
+    cdef coordinate_t[:] z2_sorted = np.ascontiguousarray(
+        np.asarray(z2in)[double_mesh.mesh2.idx_sorted])
+
     cdef cnp.int64_t[:, :] outer_counts = np.zeros(
         (len(x1_sorted), num_rbins), dtype=np.int64)
 
@@ -107,9 +115,9 @@ def npairs_per_object_3d_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
     cdef cnp.float64_t x1tmp, y1tmp, z1tmp
     cdef int Ni, Nj, i, j, k, l
 
-    cdef cnp.float64_t[:] x_icell1, x_icell2
-    cdef cnp.float64_t[:] y_icell1, y_icell2
-    cdef cnp.float64_t[:] z_icell1, z_icell2
+    cdef coordinate_t[:] x_icell1, x_icell2
+    cdef coordinate_t[:] y_icell1, y_icell2
+    cdef coordinate_t[:] z_icell1, z_icell2
 
     for icell1 in range(first_cell1_element, last_cell1_element):
         ifirst1 = cell1_indices[icell1]
@@ -186,20 +194,14 @@ def npairs_per_object_3d_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
                                     dz = z1tmp - z_icell2[j]
                                     dsq = dx*dx + dy*dy + dz*dz
 
-                                    k = num_rbins-1
-                                    while dsq <= rbins_squared[k]:
-                                        inner_counts[k] += 1
-                                        k=k-1
-                                        if k<0: break
-
-                                # update the outer counts
-                                for k in range(0, num_rbins):
-                                    outer_counts[ifirst1 + i, k] += inner_counts[k]
-                                    inner_counts[k] = 0 #re-zero the inner counts
+                                    # histogram each pair in the first bin containing it
+                                    k = first_edge_not_below(dsq, &rbins_squared[0], num_rbins)
+                                    if k < num_rbins:
+                                        outer_counts[ifirst1 + i, k] += 1
 
     # At this point, we have calculated our counts on the input arrays *after* sorting
     # Since the order of counts matters in this calculation, we need to undo the sorting
-    sorted_counts = np.array(outer_counts)
+    sorted_counts = np.cumsum(np.array(outer_counts), axis=1)
     idx_unsorted = unsorting_indices(double_mesh.mesh1.idx_sorted)
     return sorted_counts[idx_unsorted, :]
 
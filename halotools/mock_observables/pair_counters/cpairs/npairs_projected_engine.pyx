@@ -6,6 +6,7 @@ import numpy as np
 cimport numpy as cnp
 cimport cython
 from libc.math cimport ceil
+from .bin_lookup cimport first_edge_not_below
 
 __author__ = ('Andrew Hearin', 'Duncan Campbell')
 __all__ = ('npairs_projected_engine', )
@@ -181,14 +182,14 @@ def npairs_projected_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
                                     dxy_sq = dx*dx + dy*dy
                                     dz_sq = dz*dz
 
-                                    k = num_rp_bins-1
-                                    while dxy_sq <= rp_bins_squared[k]:
-                                        if dz_sq <= pi_max_squared:
+                                    # histogram each pair in the first bin containing it
+                                    if dz_sq <= pi_max_squared:
+                                        k = first_edge_not_below(dxy_sq, &rp_bins_squared[0], num_rp_bins)
+                                        if k < num_rp_bins:
                                             counts[k] += 1
-                                        k=k-1
-                                        if k<0: break
 
-    return np.array(counts)
+    # a pair in the kth bin is separated by less than every edge k' >= k
+    return np.cumsum(np.array(counts))
 
 
 
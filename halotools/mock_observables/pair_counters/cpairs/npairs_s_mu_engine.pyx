@@ -5,7 +5,9 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 import numpy as np
 cimport numpy as cnp
 cimport cython
+from cython.parallel cimport prange, threadid
 from libc.math cimport ceil
+from .bin_lookup cimport first_edge_not_below
 from libc.math cimport sqrt
 
 __author__ = ('Andrew Hearin', 'Duncan Campbell', 'Manodeep Sinha')
@@ -15,7 +17,8 @@ __all__ = ('npairs_s_mu_engine', )
 @cython.wraparound(False)
 @cython.nonecheck(False)
 def npairs_s_mu_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
-    s_bins_in, mu_bins_in, cell1_tuple):
+    s_bins_in, mu_bins_in, cell1_tuple,
+    int num_omp_threads=1, int half_pairs=0):
     r""" Cython engine for counting pairs of points as a function of radial separation, s,
     and the angle between the line-of-sight (LOS) and s.
 
@@ -44,6 +47,20 @@ def npairs_s_mu_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
         double_mesh.mesh1 that will be looped over. Intended for use with
         python multiprocessing.
 
+    num_omp_threads : int, optional
+        Number of OpenMP threads used to loop over the cells of double_mesh.mesh1.
+        Each thread accumulates its own histogram, and the histograms are summed
+        at the end. If halotools was compiled without OpenMP support,
+        the loop is executed serially. Default is 1.
+
+    half_pairs : int, optional
+        If set to 1, sample 1 and sample 2 must be the same sample, sorted by identical
+        meshes whose cell sizes are no smaller than the search length.
+        Each unordered pair of cells, and each unordered pair of points,
+        is then visited only once, and pairs of distinct points are counted twice,
+        so that the returned counts are identical to the default behavior
+        for roughly half the number of distance computations. Default is 0.
+
     Returns
     --------
     counts : array
@@ -68,8 +85,9 @@ def npairs_s_mu_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
     cdef int Ncell1 = double_mesh.mesh1.ncells
     cdef int num_s_bins = len(sqr_s_bins)
     cdef int num_mu_bins = len(sqr_mu_bins)
-    cdef cnp.int64_t[:,:] counts = np.zeros((num_s_bins, num_mu_bins), dtype=np.int64)
-    cdef cnp.int64_t[:,:] counts_sum = np.zeros((num_s_bins, num_mu_bins), dtype=np.int64)
+    cdef cnp.int64_t[:,:,:] thread_counts = np.zeros(
+        (num_omp_threads, num_s_bins, num_mu_bins), dtype=np.int64)
+    cdef int tid
 
     cdef cnp.float64_t[:] x1 = np.ascontiguousarray(x1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
     cdef cnp.float64_t[:] y1 = np.ascontiguousarray(y1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
@@ -111,128 +129,135 @@ def npairs_s_mu_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
     cdef cnp.float64_t x2shift, y2shift, z2shift, dx, dy, dz, dxy_sq, dz_sq
     cdef cnp.float64_t x1tmp, y1tmp, z1tmp, s, mu
     cdef int Ni, Nj, i, j, k, l, g, max_k
+    cdef int jstart
+    cdef cnp.int64_t w
     cdef cnp.float64_t sqr_s_max = np.max(sqr_s_bins)
     cdef cnp.float64_t sqr_mu_max = np.max(sqr_mu_bins)
     cdef cnp.float64_t sqr_s, sqr_mu
 
-    cdef cnp.float64_t[:] x_icell1, x_icell2
-    cdef cnp.float64_t[:] y_icell1, y_icell2
-    cdef cnp.float64_t[:] z_icell1, z_icell2
-
-    for icell1 in range(first_cell1_element, last_cell1_element):
-        ifirst1 = cell1_indices[icell1]
-        ilast1 = cell1_indices[icell1+1]
-        x_icell1 = x1[ifirst1:ilast1]
-        y_icell1 = y1[ifirst1:ilast1]
-        z_icell1 = z1[ifirst1:ilast1]
-
-        Ni = ilast1 - ifirst1
-        if Ni > 0:
-
-            ix1 = icell1 // (num_y1divs*num_z1divs)
-            iy1 = (icell1 - ix1*num_y1divs*num_z1divs) // num_z1divs
-            iz1 = icell1 - (ix1*num_y1divs*num_z1divs) - (iy1*num_z1divs)
-
-            leftmost_ix2 = ix1*num_x2_per_x1 - num_x2_covering_steps
-            leftmost_iy2 = iy1*num_y2_per_y1 - num_y2_covering_steps
-            leftmost_iz2 = iz1*num_z2_per_z1 - num_z2_covering_steps
-
-            rightmost_ix2 = (ix1+1)*num_x2_per_x1 + num_x2_covering_steps
-            rightmost_iy2 = (iy1+1)*num_y2_per_y1 + num_y2_covering_steps
-            rightmost_iz2 = (iz1+1)*num_z2_per_z1 + num_z2_covering_steps
-
-            for nonPBC_ix2 in range(leftmost_ix2, rightmost_ix2):
-                if nonPBC_ix2 < 0:
-                    x2shift = -xperiod*PBCs
-                elif nonPBC_ix2 >= num_x2divs:
-                    x2shift = +xperiod*PBCs
-                else:
-                    x2shift = 0.
-                # Now apply the PBCs
-                ix2 = nonPBC_ix2 % num_x2divs
-
-                for nonPBC_iy2 in range(leftmost_iy2, rightmost_iy2):
-                    if nonPBC_iy2 < 0:
-                        y2shift = -yperiod*PBCs
-                    elif nonPBC_iy2 >= num_y2divs:
-                        y2shift = +yperiod*PBCs
+    if half_pairs:
+        if ((num_x2_per_x1 != 1) or (num_y2_per_y1 != 1) or (num_z2_per_z1 != 1) or
+                (num_x2_covering_steps != 1) or (num_y2_covering_steps != 1) or
+                (num_z2_covering_steps != 1)):
+            msg = ("Counting half pairs requires mesh1 and mesh2 to have identical cells\n"
+                "that are no smaller than the search length")
+            raise ValueError(msg)
+
+    with nogil:
+        for icell1 in prange(first_cell1_element, last_cell1_element,
+                num_threads=num_omp_threads, schedule='dynamic'):
+            tid = threadid()
+            ifirst1 = cell1_indices[icell1]
+            ilast1 = cell1_indices[icell1+1]
+
+            Ni = ilast1 - ifirst1
+            if Ni > 0:
+
+                ix1 = icell1 // (num_y1divs*num_z1divs)
+                iy1 = (icell1 - ix1*num_y1divs*num_z1divs) // num_z1divs
+                iz1 = icell1 - (ix1*num_y1divs*num_z1divs) - (iy1*num_z1divs)
+
+                leftmost_ix2 = ix1*num_x2_per_x1 - num_x2_covering_steps
+                leftmost_iy2 = iy1*num_y2_per_y1 - num_y2_covering_steps
+                leftmost_iz2 = iz1*num_z2_per_z1 - num_z2_covering_steps
+
+                rightmost_ix2 = (ix1+1)*num_x2_per_x1 + num_x2_covering_steps
+                rightmost_iy2 = (iy1+1)*num_y2_per_y1 + num_y2_covering_steps
+                rightmost_iz2 = (iz1+1)*num_z2_per_z1 + num_z2_covering_steps
+
+                for nonPBC_ix2 in range(leftmost_ix2, rightmost_ix2):
+                    if nonPBC_ix2 < 0:
+                        x2shift = -xperiod*PBCs
+                    elif nonPBC_ix2 >= num_x2divs:
+                        x2shift = +xperiod*PBCs
                     else:
-                        y2shift = 0.
+                        x2shift = 0.
                     # Now apply the PBCs
-                    iy2 = nonPBC_iy2 % num_y2divs
+                    ix2 = nonPBC_ix2 % num_x2divs
 
-                    for nonPBC_iz2 in range(leftmost_iz2, rightmost_iz2):
-                        if nonPBC_iz2 < 0:
-                            z2shift = -zperiod*PBCs
-                        elif nonPBC_iz2 >= num_z2divs:
-                            z2shift = +zperiod*PBCs
+                    for nonPBC_iy2 in range(leftmost_iy2, rightmost_iy2):
+                        if nonPBC_iy2 < 0:
+                            y2shift = -yperiod*PBCs
+                        elif nonPBC_iy2 >= num_y2divs:
+                            y2shift = +yperiod*PBCs
                         else:
-                            z2shift = 0.
+                            y2shift = 0.
                         # Now apply the PBCs
-                        iz2 = nonPBC_iz2 % num_z2divs
-
-                        icell2 = ix2*(num_y2divs*num_z2divs) + iy2*num_z2divs + iz2
-                        ifirst2 = cell2_indices[icell2]
-                        ilast2 = cell2_indices[icell2+1]
-
-                        x_icell2 = x2[ifirst2:ilast2]
-                        y_icell2 = y2[ifirst2:ilast2]
-                        z_icell2 = z2[ifirst2:ilast2]
-
-                        Nj = ilast2 - ifirst2
-                        # loop over points in cell1 points
-                        if Nj > 0:
-                            for i in range(0,Ni):
-                                x1tmp = x_icell1[i] - x2shift
-                                y1tmp = y_icell1[i] - y2shift
-                                z1tmp = z_icell1[i] - z2shift
-                                # loop over points in cell2 points
-                                for j in range(0,Nj):
-                                    # calculate the square distance
-                                    dx = x1tmp - x_icell2[j]
-                                    dy = y1tmp - y_icell2[j]
-                                    dz = z1tmp - z_icell2[j]
-                                    dxy_sq = dx*dx + dy*dy
-                                    dz_sq = dz*dz
-
-                                    # transform to s and mu
-                                    sqr_s = dz_sq + dxy_sq
-
-                                    if sqr_s > sqr_s_max:
-                                        continue
-
-                                    if sqr_s > 0.0:
-                                        sqr_mu = dxy_sq/sqr_s
+                        iy2 = nonPBC_iy2 % num_y2divs
+
+                        for nonPBC_iz2 in range(leftmost_iz2, rightmost_iz2):
+                            if nonPBC_iz2 < 0:
+                                z2shift = -zperiod*PBCs
+                            elif nonPBC_iz2 >= num_z2divs:
+                                z2shift = +zperiod*PBCs
+                            else:
+                                z2shift = 0.
+                            # Now apply the PBCs
+                            iz2 = nonPBC_iz2 % num_z2divs
+
+                            icell2 = ix2*(num_y2divs*num_z2divs) + iy2*num_z2divs + iz2
+                            if half_pairs and (icell2 < icell1):
+                                continue
+
+                            ifirst2 = cell2_indices[icell2]
+                            ilast2 = cell2_indices[icell2+1]
+
+                            Nj = ilast2 - ifirst2
+                            # loop over points in cell1 points
+                            if Nj > 0:
+                                for i in range(0,Ni):
+                                    x1tmp = x1[ifirst1+i] - x2shift
+                                    y1tmp = y1[ifirst1+i] - y2shift
+                                    z1tmp = z1[ifirst1+i] - z2shift
+                                    # loop over points in cell2 points
+                                    if half_pairs and (icell2 == icell1):
+                                        jstart = i
                                     else:
-                                        sqr_mu = 0.0
-
-                                    if sqr_mu > sqr_mu_max:
-                                        continue
-
-                                    # The loop has been intentionally split up
-                                    # Since division is slow,
-                                    # computing mu is a bottle-neck.
-                                    # Computing the 's' bin however can proceed
-                                    # in the meantime.
-                                    k = num_s_bins-2
-                                    while k!=-1:
-                                        if sqr_s > sqr_s_bins[k]: break
-                                        k=k-1
-
-                                    g = num_mu_bins-2
-                                    while g!=-1:
-                                        if sqr_mu > sqr_mu_bins[g]: break
-                                        g=g-1
-
-                                    # Only counts pairs in that bin.
-                                    counts[k+1,g+1] += 1
+                                        jstart = 0
+                                    for j in range(jstart,Nj):
+                                        # pairs of distinct points stand in for both of their orderings
+                                        if half_pairs and ((icell2 != icell1) or (j != i)):
+                                            w = 2
+                                        else:
+                                            w = 1
+
+                                        # calculate the square distance
+                                        dx = x1tmp - x2[ifirst2+j]
+                                        dy = y1tmp - y2[ifirst2+j]
+                                        dz = z1tmp - z2[ifirst2+j]
+                                        dxy_sq = dx*dx + dy*dy
+                                        dz_sq = dz*dz
+
+                                        # transform to s and mu
+                                        sqr_s = dz_sq + dxy_sq
+
+                                        if sqr_s > sqr_s_max:
+                                            continue
+
+                                        if sqr_s > 0.0:
+                                            sqr_mu = dxy_sq/sqr_s
+                                        else:
+                                            sqr_mu = 0.0
+
+                                        if sqr_mu > sqr_mu_max:
+                                            continue
+
+                                        # The loop has been intentionally split up
+                                        # Since division is slow,
+                                        # computing mu is a bottle-neck.
+                                        # Computing the 's' bin however can proceed
+                                        # in the meantime.
+                                        k = first_edge_not_below(sqr_s, &sqr_s_bins[0], num_s_bins)
+                                        g = first_edge_not_below(sqr_mu, &sqr_mu_bins[0], num_mu_bins)
+
+                                        # Only counts pairs in that bin.
+                                        if (k < num_s_bins) and (g < num_mu_bins):
+                                            thread_counts[tid, k, g] += w
+
+    counts = np.sum(np.asarray(thread_counts), axis=0)
 
     # Adds counts for all bins where s < s_bin and mu < mu_bin.
-    for k in range(num_s_bins):
-        for g in range(num_mu_bins):
-            counts_sum[k,g] = np.sum(counts[:k+1,:g+1])
-
-    return np.array(counts_sum)
+    return np.cumsum(np.cumsum(counts, axis=0), axis=1)
 
 
 
@@ -5,7 +5,14 @@ from __future__ import (absolute_import, division, print_function, unicode_liter
 import numpy as np
 cimport numpy as cnp
 cimport cython
+from cython.parallel cimport prange, threadid
 from libc.math cimport ceil
+from .bin_lookup cimport first_edge_not_below
+
+# Floating-point types in which the engine stores the coordinates
+ctypedef fused coordinate_t:
+    cnp.float32_t
+    cnp.float64_t
 
 __author__ = ('Andrew Hearin', 'Duncan Campbell')
 __all__ = ('npairs_xy_z_engine', )
@@ -13,8 +20,10 @@ __all__ = ('npairs_xy_z_engine', )
 @cython.boundscheck(False)
 @cython.wraparound(False)
 @cython.nonecheck(False)
-def npairs_xy_z_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
-    rp_bins, pi_bins, cell1_tuple):
+def npairs_xy_z_engine(double_mesh, coordinate_t[:] x1in, coordinate_t[:] y1in, coordinate_t[:] z1in,
+        coordinate_t[:] x2in, coordinate_t[:] y2in, coordinate_t[:] z2in,
+    rp_bins, pi_bins, cell1_tuple,
+    int num_omp_threads=1, int half_pairs=0):
     r""" Cython engine for counting pairs of points as a function of projected and parrallel separation.
 
     Parameters
@@ -27,6 +36,8 @@ def npairs_xy_z_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
 
     x2in, y2in, z2in : arrays
         Numpy arrays storing Cartesian coordinates of points in sample 2
+        All six coordinate arrays must be either float32 or float64.
+        Distances are always computed in double precision.
 
     rp_bins : array_like
         numpy array of boundaries defining the bins of separation in the xy-plane
@@ -40,6 +51,20 @@ def npairs_xy_z_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
         double_mesh.mesh1 that will be looped over. Intended for use with
         python multiprocessing.
 
+    num_omp_threads : int, optional
+        Number of OpenMP threads used to loop over the cells of double_mesh.mesh1.
+        Each thread accumulates its own histogram, and the histograms are summed
+        at the end. If halotools was compiled without OpenMP support,
+        the loop is executed serially. Default is 1.
+
+    half_pairs : int, optional
+        If set to 1, sample 1 and sample 2 must be the same sample, sorted by identical
+        meshes whose cell sizes are no smaller than the search length.
+        Each unordered pair of cells, and each unordered pair of points,
+        is then visited only once, and pairs of distinct points are counted twice,
+        so that the returned counts are identical to the default behavior
+        for roughly half the number of distance computations. Default is 0.
+
     Returns
     --------
     counts : array
@@ -59,14 +84,16 @@ def npairs_xy_z_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
     cdef int Ncell1 = double_mesh.mesh1.ncells
     cdef int num_rp_bins = len(rp_bins)
     cdef int num_pi_bins = len(pi_bins)
-    cdef cnp.int64_t[:,:] counts = np.zeros((num_rp_bins, num_pi_bins), dtype=np.int64)
+    cdef cnp.int64_t[:,:,:] thread_counts = np.zeros(
+        (num_omp_threads, num_rp_bins, num_pi_bins), dtype=np.int64)
+    cdef int tid
 
-    cdef cnp.float64_t[:] x1 = np.ascontiguousarray(x1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
-    cdef cnp.float64_t[:] y1 = np.ascontiguousarray(y1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
-    cdef cnp.float64_t[:] z1 = np.ascontiguousarray(z1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
-    cdef cnp.float64_t[:] x2 = np.ascontiguousarray(x2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
-    cdef cnp.float64_t[:] y2 = np.ascontiguousarray(y2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
-    cdef cnp.float64_t[:] z2 = np.ascontiguousarray(z2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
+    cdef coordinate_t[:] x1 = np.ascontiguousarray(np.asarray(x1in)[double_mesh.mesh1.idx_sorted])
+    cdef coordinate_t[:] y1 = np.ascontiguousarray(np.asarray(y1in)[double_mesh.mesh1.idx_sorted])
+    cdef coordinate_t[:] z1 = np.ascontiguousarray(np.asarray(z1in)[double_mesh.mesh1.idx_sorted])
+    cdef coordinate_t[:] x2 = np.ascontiguousarray(np.asarray(x2in)[double_mesh.mesh2.idx_sorted])
+    cdef coordinate_t[:] y2 = np.ascontiguousarray(np.asarray(y2in)[double_mesh.mesh2.idx_sorted])
+    cdef coordinate_t[:] z2 = np.ascontiguousarray(np.asarray(z2in)[double_mesh.mesh2.idx_sorted])
 
     cdef cnp.int64_t icell1, icell2
     cdef cnp.int64_t[:] cell1_indices = np.ascontiguousarray(double_mesh.mesh1.cell_id_indices, dtype=np.int64)
@@ -101,98 +128,111 @@ def npairs_xy_z_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
     cdef cnp.float64_t x2shift, y2shift, z2shift, dx, dy, dz, dxy_sq, dz_sq
     cdef cnp.float64_t x1tmp, y1tmp, z1tmp
     cdef int Ni, Nj, i, j, k, l, g, max_k
-
-    cdef cnp.float64_t[:] x_icell1, x_icell2
-    cdef cnp.float64_t[:] y_icell1, y_icell2
-    cdef cnp.float64_t[:] z_icell1, z_icell2
-
-    for icell1 in range(first_cell1_element, last_cell1_element):
-        ifirst1 = cell1_indices[icell1]
-        ilast1 = cell1_indices[icell1+1]
-        x_icell1 = x1[ifirst1:ilast1]
-        y_icell1 = y1[ifirst1:ilast1]
-        z_icell1 = z1[ifirst1:ilast1]
-
-        Ni = ilast1 - ifirst1
-        if Ni > 0:
-
-            ix1 = icell1 // (num_y1divs*num_z1divs)
-            iy1 = (icell1 - ix1*num_y1divs*num_z1divs) // num_z1divs
-            iz1 = icell1 - (ix1*num_y1divs*num_z1divs) - (iy1*num_z1divs)
-
-            leftmost_ix2 = ix1*num_x2_per_x1 - num_x2_covering_steps
-            leftmost_iy2 = iy1*num_y2_per_y1 - num_y2_covering_steps
-            leftmost_iz2 = iz1*num_z2_per_z1 - num_z2_covering_steps
-
-            rightmost_ix2 = (ix1+1)*num_x2_per_x1 + num_x2_covering_steps
-            rightmost_iy2 = (iy1+1)*num_y2_per_y1 + num_y2_covering_steps
-            rightmost_iz2 = (iz1+1)*num_z2_per_z1 + num_z2_covering_steps
-
-            for nonPBC_ix2 in range(leftmost_ix2, rightmost_ix2):
-                if nonPBC_ix2 < 0:
-                    x2shift = -xperiod*PBCs
-                elif nonPBC_ix2 >= num_x2divs:
-                    x2shift = +xperiod*PBCs
-                else:
-                    x2shift = 0.
-                # Now apply the PBCs
-                ix2 = nonPBC_ix2 % num_x2divs
-
-                for nonPBC_iy2 in range(leftmost_iy2, rightmost_iy2):
-                    if nonPBC_iy2 < 0:
-                        y2shift = -yperiod*PBCs
-                    elif nonPBC_iy2 >= num_y2divs:
-                        y2shift = +yperiod*PBCs
+    cdef int jstart
+    cdef cnp.int64_t w
+
+    if half_pairs:
+        if ((num_x2_per_x1 != 1) or (num_y2_per_y1 != 1) or (num_z2_per_z1 != 1) or
+                (num_x2_covering_steps != 1) or (num_y2_covering_steps != 1) or
+                (num_z2_covering_steps != 1)):
+            msg = ("Counting half pairs requires mesh1 and mesh2 to have identical cells\n"
+                "that are no smaller than the search length")
+            raise ValueError(msg)
+
+    with nogil:
+        for icell1 in prange(first_cell1_element, last_cell1_element,
+                num_threads=num_omp_threads, schedule='dynamic'):
+            tid = threadid()
+            ifirst1 = cell1_indices[icell1]
+            ilast1 = cell1_indices[icell1+1]
+
+            Ni = ilast1 - ifirst1
+            if Ni > 0:
+
+                ix1 = icell1 // (num_y1divs*num_z1divs)
+                iy1 = (icell1 - ix1*num_y1divs*num_z1divs) // num_z1divs
+                iz1 = icell1 - (ix1*num_y1divs*num_z1divs) - (iy1*num_z1divs)
+
+                leftmost_ix2 = ix1*num_x2_per_x1 - num_x2_covering_steps
+                leftmost_iy2 = iy1*num_y2_per_y1 - num_y2_covering_steps
+                leftmost_iz2 = iz1*num_z2_per_z1 - num_z2_covering_steps
+
+                rightmost_ix2 = (ix1+1)*num_x2_per_x1 + num_x2_covering_steps
+                rightmost_iy2 = (iy1+1)*num_y2_per_y1 + num_y2_covering_steps
+                rightmost_iz2 = (iz1+1)*num_z2_per_z1 + num_z2_covering_steps
+
+                for nonPBC_ix2 in range(leftmost_ix2, rightmost_ix2):
+                    if nonPBC_ix2 < 0:
+                        x2shift = -xperiod*PBCs
+                    elif nonPBC_ix2 >= num_x2divs:
+                        x2shift = +xperiod*PBCs
                     else:
-                        y2shift = 0.
+                        x2shift = 0.
                     # Now apply the PBCs
-                    iy2 = nonPBC_iy2 % num_y2divs
+                    ix2 = nonPBC_ix2 % num_x2divs
 
-                    for nonPBC_iz2 in range(leftmost_iz2, rightmost_iz2):
-                        if nonPBC_iz2 < 0:
-                            z2shift = -zperiod*PBCs
-                        elif nonPBC_iz2 >= num_z2divs:
-                            z2shift = +zperiod*PBCs
+                    for nonPBC_iy2 in range(leftmost_iy2, rightmost_iy2):
+                        if nonPBC_iy2 < 0:
+                            y2shift = -yperiod*PBCs
+                        elif nonPBC_iy2 >= num_y2divs:
+                            y2shift = +yperiod*PBCs
                         else:
-                            z2shift = 0.
+                            y2shift = 0.
                         # Now apply the PBCs
-                        iz2 = nonPBC_iz2 % num_z2divs
-
-                        icell2 = ix2*(num_y2divs*num_z2divs) + iy2*num_z2divs + iz2
-                        ifirst2 = cell2_indices[icell2]
-                        ilast2 = cell2_indices[icell2+1]
-
-                        x_icell2 = x2[ifirst2:ilast2]
-                        y_icell2 = y2[ifirst2:ilast2]
-                        z_icell2 = z2[ifirst2:ilast2]
-
-                        Nj = ilast2 - ifirst2
-                        #loop over points in cell1 points
-                        if Nj > 0:
-                            for i in range(0,Ni):
-                                x1tmp = x_icell1[i] - x2shift
-                                y1tmp = y_icell1[i] - y2shift
-                                z1tmp = z_icell1[i] - z2shift
-                                #loop over points in cell2 points
-                                for j in range(0,Nj):
-                                    #calculate the square distance
-                                    dx = x1tmp - x_icell2[j]
-                                    dy = y1tmp - y_icell2[j]
-                                    dz = z1tmp - z_icell2[j]
-                                    dxy_sq = dx*dx + dy*dy
-                                    dz_sq = dz*dz
-
-                                    k = num_rp_bins-1
-                                    while dxy_sq<=rp_bins_squared[k]:
-                                        g = num_pi_bins-1
-                                        while dz_sq<=pi_bins_squared[g]:
-                                            counts[k,g] += 1
-                                            g=g-1
-                                            if g<0: break
-                                        k=k-1
-                                        if k<0: break
-
-    return np.array(counts)
+                        iy2 = nonPBC_iy2 % num_y2divs
+
+                        for nonPBC_iz2 in range(leftmost_iz2, rightmost_iz2):
+                            if nonPBC_iz2 < 0:
+                                z2shift = -zperiod*PBCs
+                            elif nonPBC_iz2 >= num_z2divs:
+                                z2shift = +zperiod*PBCs
+                            else:
+                                z2shift = 0.
+                            # Now apply the PBCs
+                            iz2 = nonPBC_iz2 % num_z2divs
+
+                            icell2 = ix2*(num_y2divs*num_z2divs) + iy2*num_z2divs + iz2
+                            if half_pairs and (icell2 < icell1):
+                                continue
+
+                            ifirst2 = cell2_indices[icell2]
+                            ilast2 = cell2_indices[icell2+1]
+
+                            Nj = ilast2 - ifirst2
+                            #loop over points in cell1 points
+                            if Nj > 0:
+                                for i in range(0,Ni):
+                                    x1tmp = x1[ifirst1+i] - x2shift
+                                    y1tmp = y1[ifirst1+i] - y2shift
+                                    z1tmp = z1[ifirst1+i] - z2shift
+                                    #loop over points in cell2 points
+                                    if half_pairs and (icell2 == icell1):
+                                        jstart = i
+                                    else:
+                                        jstart = 0
+                                    for j in range(jstart,Nj):
+                                        # pairs of distinct points stand in for both of their orderings
+                                        if half_pairs and ((icell2 != icell1) or (j != i)):
+                                            w = 2
+                                        else:
+                                            w = 1
+
+                                        #calculate the square distance
+                                        dx = x1tmp - x2[ifirst2+j]
+                                        dy = y1tmp - y2[ifirst2+j]
+                                        dz = z1tmp - z2[ifirst2+j]
+                                        dxy_sq = dx*dx + dy*dy
+                                        dz_sq = dz*dz
+
+                                        # histogram each pair in the first (rp, pi) bin containing it
+                                        k = first_edge_not_below(dxy_sq, &rp_bins_squared[0], num_rp_bins)
+                                        if k < num_rp_bins:
+                                            g = first_edge_not_below(dz_sq, &pi_bins_squared[0], num_pi_bins)
+                                            if g < num_pi_bins:
+                                                thread_counts[tid, k, g] += w
+
+    # a pair in the (k, g) bin is counted in every bin (k', g') with k' >= k and g' >= g
+    return np.cumsum(np.cumsum(np.sum(np.asarray(thread_counts), axis=0), axis=0), axis=1)
 
 
 
@@ -1,14 +1,46 @@
 from distutils.extension import Extension
+from distutils.ccompiler import new_compiler
+from distutils.errors import CompileError, LinkError
+from distutils.sysconfig import customize_compiler
 import os
+import shutil
+import tempfile
 
 PATH_TO_PKG = os.path.relpath(os.path.dirname(__file__))
 SOURCES = ("distances.pyx", "pairwise_distances.pyx",
     "npairs_3d_engine.pyx", "npairs_projected_engine.pyx",
     "npairs_xy_z_engine.pyx", "npairs_jackknife_3d_engine.pyx", "npairs_s_mu_engine.pyx",
     "pairwise_distance_3d_engine.pyx", "pairwise_distance_xy_z_engine.pyx",
-    "weighted_npairs_s_mu_engine.pyx", "npairs_jackknife_xy_z_engine.pyx")
+    "weighted_npairs_s_mu_engine.pyx", "npairs_jackknife_xy_z_engine.pyx",
+    "npairs_multi_3d_engine.pyx")
 THIS_PKG_NAME = '.'.join(__name__.split('.')[:-1])
 
+# Engines whose loop over mesh1 cells is parallelized with cython.parallel.prange
+OPENMP_SOURCES = ("npairs_3d_engine.pyx", "npairs_xy_z_engine.pyx", "npairs_s_mu_engine.pyx",
+    "npairs_multi_3d_engine.pyx")
+
+
+def _openmp_flags():
+    """ Return the compile and link flags enabling OpenMP,
+    or two empty lists if the compiler does not support OpenMP,
+    in which case the prange loops are compiled to serial loops.
+    """
+    flags = ['-fopenmp']
+    tmpdir = tempfile.mkdtemp()
+    try:
+        fname = os.path.join(tmpdir, 'test_openmp.c')
+        with open(fname, 'w') as f:
+            f.write("#include <omp.h>\nint main(void) { return omp_get_num_threads() - 1; }\n")
+        compiler = new_compiler()
+        customize_compiler(compiler)
+        objects = compiler.compile([fname], output_dir=tmpdir, extra_postargs=flags)
+        compiler.link_executable(objects, 'test_openmp', output_dir=tmpdir, extra_postargs=flags)
+    except (CompileError, LinkError, OSError):
+        return [], []
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    return flags, flags
+
 
 def get_extensions():
 
@@ -18,14 +50,22 @@ def get_extensions():
     libraries = []
     language = 'c++'
     extra_compile_args = ['-Ofast']
+    openmp_compile_args, openmp_link_args = _openmp_flags()
 
     extensions = []
-    for name, source in zip(names, sources):
+    for name, source, src in zip(names, sources, SOURCES):
+        if src in OPENMP_SOURCES:
+            compile_args = extra_compile_args + openmp_compile_args
+            link_args = openmp_link_args
+        else:
+            compile_args = extra_compile_args
+            link_args = []
         extensions.append(Extension(name=name,
             sources=[source],
             include_dirs=include_dirs,
             libraries=libraries,
             language=language,
-            extra_compile_args=extra_compile_args))
+            extra_compile_args=compile_args,
+            extra_link_args=link_args))
 
     return extensions
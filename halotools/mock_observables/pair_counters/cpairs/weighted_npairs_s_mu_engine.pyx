@@ -7,6 +7,7 @@ cimport numpy as cnp
 cimport cython
 from libc.math cimport ceil
 from libc.math cimport sqrt
+from .bin_lookup cimport first_edge_not_below
 
 __author__ = ('Andrew Hearin', 'Duncan Campbell', 'Manodeep Sinha')
 __all__ = ('weighted_npairs_s_mu_engine', )
@@ -75,9 +76,7 @@ def weighted_npairs_s_mu_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
     cdef int num_s_bins = len(sqr_s_bins)
     cdef int num_mu_bins = len(sqr_mu_bins)
     cdef cnp.int64_t[:,:] counts = np.zeros((num_s_bins, num_mu_bins), dtype=np.int64)
-    cdef cnp.int64_t[:,:] counts_sum = np.zeros((num_s_bins, num_mu_bins), dtype=np.int64)
     cdef cnp.float64_t[:,:] weighted_counts = np.zeros((num_s_bins, num_mu_bins), dtype=np.float64)
-    cdef cnp.float64_t[:,:] weighted_counts_sum = np.zeros((num_s_bins, num_mu_bins), dtype=np.float64)
 
     cdef cnp.float64_t[:] x1 = np.ascontiguousarray(x1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
     cdef cnp.float64_t[:] y1 = np.ascontiguousarray(y1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
@@ -233,27 +232,19 @@ def weighted_npairs_s_mu_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
                                     # computing mu is a bottle-neck.
                                     # Computing the 's' bin however can proceed
                                     # in the meantime.
-                                    k = num_s_bins-2
-                                    while k!=-1:
-                                        if sqr_s > sqr_s_bins[k]: break
-                                        k=k-1
-
-                                    g = num_mu_bins-2
-                                    while g!=-1:
-                                        if sqr_mu > sqr_mu_bins[g]: break
-                                        g=g-1
+                                    k = first_edge_not_below(sqr_s, &sqr_s_bins[0], num_s_bins)
+                                    g = first_edge_not_below(sqr_mu, &sqr_mu_bins[0], num_mu_bins)
 
                                     # Only counts pairs in that bin.
-                                    counts[k+1,g+1] += 1
-                                    weighted_counts[k+1,g+1] += w1tmp*w2tmp
+                                    if (k < num_s_bins) and (g < num_mu_bins):
+                                        counts[k,g] += 1
+                                        weighted_counts[k,g] += w1tmp*w2tmp
 
     # Adds counts for all bins where s < s_bin and mu < mu_bin.
-    for k in range(num_s_bins):
-        for g in range(num_mu_bins):
-            counts_sum[k,g] = np.sum(counts[:k+1,:g+1])
-            weighted_counts_sum[k,g] = np.sum(weighted_counts[:k+1,:g+1])
+    counts_sum = np.cumsum(np.cumsum(np.asarray(counts), axis=0), axis=1)
+    weighted_counts_sum = np.cumsum(np.cumsum(np.asarray(weighted_counts), axis=0), axis=1)
 
-    return np.array(counts_sum), np.array(weighted_counts_sum)
+    return counts_sum, weighted_counts_sum
 
 
 
@@ -7,11 +7,22 @@ control flow on function arguments, bounds-checking and exception-handling.
 from __future__ import absolute_import, division, print_function, unicode_literals
 
 import numpy as np
+import multiprocessing
 from copy import copy
 
+from .shared_memory_pool import SharedMemoryPool
+from .openmp_threads import OpenMPThreads
+from .cell_size_tuning import auto_cell_sizes
+from .rectangular_mesh import sample1_cell_size
+
 __author__ = ['Duncan Campbell', 'Andrew Hearin']
 
-__all__ = ('_set_approximate_cell_sizes', '_cell1_parallelization_indices')
+__all__ = ('_set_approximate_cell_sizes', '_cell1_parallelization_indices',
+    '_map_engine_over_cell1_tuples')
+
+# Number of cost-balanced work units per process used to dynamically balance
+# the load of the pair-counting engines among the processes
+num_work_units_per_process = 4
 
 
 def _enclose_in_box(x1, y1, z1, x2, y2, z2, min_size=None):
@@ -110,11 +121,25 @@ def _enclose_in_square(x1, y1, x2, y2, min_size=None):
     return x1, y1, x2, y2, Lbox
 
 
-def _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period):
+def _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period,
+        npts1=None, npts2=None, search_length=None, num_threads=1):
     """
     process the approximate cell size parameters.
     If either is set to None, apply default settings.
+    If either is set to the string 'auto', the cell sizes are chosen by
+    `~halotools.mock_observables.pair_counters.auto_cell_sizes`,
+    which requires ``npts1``, ``npts2`` and ``search_length``.
     """
+    if _is_auto(approx_cell1_size) or _is_auto(approx_cell2_size):
+        if (npts1 is None) or (npts2 is None) or (search_length is None):
+            msg = ("This function does not support ``approx_cell1_size`` = 'auto'")
+            raise ValueError(msg)
+        auto_cell1_size, auto_cell2_size = auto_cell_sizes(
+            npts1, npts2, search_length, period, num_threads=num_threads)
+        if _is_auto(approx_cell2_size) or (approx_cell2_size is None and _is_auto(approx_cell1_size)):
+            approx_cell2_size = auto_cell2_size
+        if _is_auto(approx_cell1_size):
+            approx_cell1_size = auto_cell1_size
 
     #################################################
     # Set the approximate cell sizes of the trees
@@ -145,6 +170,67 @@ def _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period):
     return approx_cell1_size, approx_cell2_size
 
 
+def _is_auto(approx_cell_size):
+    """ Return True if the input cell size is the string 'auto'.
+    """
+    try:
+        return approx_cell_size.lower() == 'auto'
+    except AttributeError:
+        return False
+
+
+def _coordinates_with_precision(precision, *coords):
+    """ Cast the input coordinate arrays to the floating-point type in which
+    the engines store the coordinates, without copying arrays that already have this type.
+    If ``precision`` is None, float32 is used if all the input arrays are float32,
+    and float64 is used otherwise.
+    """
+    coords = [np.asarray(x) for x in coords]
+    if precision is None:
+        if all(x.dtype == np.float32 for x in coords):
+            precision = 'float32'
+        else:
+            precision = 'float64'
+    if precision not in ('float32', 'float64'):
+        msg = "Input ``precision`` must be None, 'float32' or 'float64'"
+        raise ValueError(msg)
+    return tuple(x.astype(precision, copy=False) for x in coords)
+
+
+def _samples_are_identical(x1, y1, z1, x2, y2, z2):
+    """ Return True if sample1 and sample2 store the same points in the same order,
+    in which case the engines need only visit each unordered pair of points once.
+    """
+    if x1 is x2 and y1 is y2 and z1 is z2:
+        return True
+    return (np.array_equal(x1, x2) and np.array_equal(y1, y2) and np.array_equal(z1, z2))
+
+
+def _half_pairs_approx_cell2_size(approx_cell1_size, search_length, period):
+    """ Return the ``approx_cell2_size`` for which the cells of mesh2
+    coincide with the cells of mesh1, as required by the ``half_pairs`` option
+    of the pair-counting engines.
+    """
+    return np.array([sample1_cell_size(p, s, a)
+        for p, s, a in zip(period, search_length, approx_cell1_size)])
+
+
+def _mesh_supports_half_pairs(double_mesh):
+    """ Return True if the cells of the two meshes coincide and are no smaller than
+    the search length, so that every pair of points is found by searching
+    the adjacent cells only, as required by the ``half_pairs`` option
+    of the pair-counting engines.
+    """
+    mesh1, mesh2 = double_mesh.mesh1, double_mesh.mesh2
+    num_divs1 = np.array((mesh1.num_xdivs, mesh1.num_ydivs, mesh1.num_zdivs))
+    num_divs2 = np.array((mesh2.num_xdivs, mesh2.num_ydivs, mesh2.num_zdivs))
+    search_length = np.array((double_mesh.search_xlength,
+        double_mesh.search_ylength, double_mesh.search_zlength))
+    cell2_size = np.array((mesh2.xcell_size, mesh2.ycell_size, mesh2.zcell_size))
+    num_covering_steps = np.ceil(search_length/cell2_size)
+    return bool(np.all(num_divs1 == num_divs2) and np.all(num_covering_steps == 1))
+
+
 def _set_approximate_2d_cell_sizes(approx_cell1_size, approx_cell2_size, period):
     """
     process the approximate cell size parameters.
@@ -180,7 +266,7 @@ def _set_approximate_2d_cell_sizes(approx_cell1_size, approx_cell2_size, period)
     return approx_cell1_size, approx_cell2_size
 
 
-def _cell1_parallelization_indices(ncells, num_threads):
+def _cell1_parallelization_indices(ncells, num_threads, double_mesh=None):
     """ Return a list of tuples that will be passed to multiprocessing.pool.map
     to count pairs in parallel. Each tuple has two entries storing the first and last
     cell_id that will be looped over in the outermost loop in the pair-counting engine.
@@ -190,14 +276,25 @@ def _cell1_parallelization_indices(ncells, num_threads):
     ncells : int
         Total number of cells in the 3d mesh
 
-    num_threads : int
-        Number of cores requested to perform the pair-counting in parallel
+    num_threads : int, `~halotools.mock_observables.pair_counters.SharedMemoryPool` or `~halotools.mock_observables.pair_counters.OpenMPThreads`
+        Number of cores requested to perform the pair-counting in parallel,
+        a persistent pool of worker processes, or a request for OpenMP threads.
+
+    double_mesh : object, optional
+        Instance of `~halotools.mock_observables.pair_counters.RectangularDoubleMesh`
+        or `~halotools.mock_observables.pair_counters.RectangularDoubleMesh2D`
+        that will be passed to the engine. If provided, the cells are divided into
+        ``num_work_units_per_process`` work units per process of approximately equal cost,
+        as estimated by `_cell1_work_estimates`. Default is None, in which case
+        the cells are divided into ``num_threads`` chunks with equal numbers of cells.
 
     Returns
     -------
-    num_threads : int
+    num_threads : int, `~halotools.mock_observables.pair_counters.SharedMemoryPool` or `~halotools.mock_observables.pair_counters.OpenMPThreads`
         Number of threads to use when counting pairs. Only differs from the
-        input value for the case where the input num_threads > ncells
+        input value for the case where the input num_threads > ncells.
+        If the input ``num_threads`` is a pool or an instance of OpenMPThreads,
+        it is returned unchanged.
 
     list_of_tuples : list
         List of two-element tuples containing the first and last values of icell1
@@ -208,12 +305,33 @@ def _cell1_parallelization_indices(ncells, num_threads):
     Care is taken to avoid the problem of potentially having more threads available than cells.
     In the serial case, the returned list of tuples is a one-element list containing (0, ncells).
     If there are two cores available, cell1_tuples = [(0, ncells/2), (ncells/2, ncells)]
+    For OpenMPThreads, the threads are scheduled within the engine,
+    and so the list is also (0, ncells).
+
+    For spatially clustered samples, a few cells containing e.g. cluster cores
+    dominate the cost of the calculation, so that splitting the cells into chunks
+    with equal numbers of cells leaves most processes idle while one process
+    works through the dense region. When ``double_mesh`` is provided, the cells
+    are instead split into many contiguous work units of equal estimated cost,
+    which `_map_engine_over_cell1_tuples` hands out to the processes one at a time
+    as each process becomes free.
 
     """
-    if num_threads == 1:
+    if isinstance(num_threads, OpenMPThreads):
+        return num_threads, [(0, ncells)]
+    elif isinstance(num_threads, SharedMemoryPool):
+        __, list_of_tuples = _cell1_parallelization_indices(
+            ncells, num_threads.num_processes, double_mesh=double_mesh)
+        return num_threads, list_of_tuples
+    elif num_threads == 1:
         return 1, [(0, ncells)]
     elif num_threads > ncells:
         return ncells, [(a, a+1) for a in np.arange(ncells)]
+    elif double_mesh is not None:
+        num_work_units = min(num_threads*num_work_units_per_process, ncells)
+        work = _cell1_work_estimates(double_mesh)
+        list_of_tuples = _cost_balanced_cell1_tuples(work, num_work_units)
+        return min(num_threads, len(list_of_tuples)), list_of_tuples
     else:
         list_with_possibly_empty_arrays = np.array_split(np.arange(ncells), num_threads)
         list_of_nonempty_arrays = [a for a in list_with_possibly_empty_arrays if len(a) > 0]
@@ -221,6 +339,125 @@ def _cell1_parallelization_indices(ncells, num_threads):
         return num_threads, list_of_tuples
 
 
+def _cell1_work_estimates(double_mesh):
+    """ Estimate the cost of the outermost loop of the pair-counting engine
+    for each cell of ``double_mesh.mesh1``.
+
+    Parameters
+    -----------
+    double_mesh : object
+        Instance of `~halotools.mock_observables.pair_counters.RectangularDoubleMesh`
+        or `~halotools.mock_observables.pair_counters.RectangularDoubleMesh2D`
+
+    Returns
+    -------
+    work : array
+        Float array of length ``double_mesh.mesh1.ncells``. For each cell1,
+        the estimated work is the number of points Ni in cell1 times the total number of
+        points Nj in the cells of mesh2 that the engine searches for pairs of cell1, plus one
+        to account for the overhead of visiting the cell.
+    """
+    mesh1, mesh2 = double_mesh.mesh1, double_mesh.mesh2
+    if hasattr(mesh1, 'num_zdivs'):
+        dims = ('x', 'y', 'z')
+    else:
+        dims = ('x', 'y')
+
+    num_cell2_points = np.diff(mesh2.cell_id_indices).astype('f8')
+    num_cell2_points = num_cell2_points.reshape(
+        [getattr(mesh2, 'num_'+dim+'divs') for dim in dims])
+
+    #  For each dimension in turn, sum the mesh2 counts over the range of
+    #  cell2 indices searched by the engine for each cell1 index, with the
+    #  same periodic wrapping of the cell2 index that is applied in the engine
+    for axis, dim in enumerate(dims):
+        num_divs1 = getattr(mesh1, 'num_'+dim+'divs')
+        num_divs2 = getattr(mesh2, 'num_'+dim+'divs')
+        num_cell2_per_cell1 = num_divs2 // num_divs1
+        num_covering_steps = int(np.ceil(
+            getattr(double_mesh, 'search_'+dim+'length') / getattr(mesh2, dim+'cell_size')))
+        offsets = np.arange(-num_covering_steps, num_cell2_per_cell1 + num_covering_steps)
+        cell2_indices = (np.arange(num_divs1)[:, np.newaxis]*num_cell2_per_cell1 + offsets) % num_divs2
+        num_cell2_points = np.take(num_cell2_points, cell2_indices, axis=axis).sum(axis=axis+1)
+
+    num_cell1_points = np.diff(mesh1.cell_id_indices)
+    return num_cell1_points*num_cell2_points.flatten() + 1.
+
+
+def _cost_balanced_cell1_tuples(work, num_work_units):
+    """ Divide the cells into at most ``num_work_units`` contiguous ranges
+    with approximately equal total ``work``.
+
+    Parameters
+    -----------
+    work : array
+        Array of length ncells storing the estimated cost of each cell
+
+    num_work_units : int
+        Requested number of work units
+
+    Returns
+    -------
+    list_of_tuples : list
+        List of two-element tuples containing the first and last values of icell1
+        of each work unit. Individual cells are never split, so a cell whose cost exceeds
+        the target cost of a work unit forms its own work unit,
+        and fewer than ``num_work_units`` tuples may be returned.
+
+    Examples
+    --------
+    >>> work = np.array([1, 1, 1, 1, 100, 1, 1, 1])
+    >>> _cost_balanced_cell1_tuples(work, 3)
+    [(0, 4), (4, 5), (5, 8)]
+    """
+    cumulative_work = np.cumsum(work)
+    #  Assign each cell to a work unit according to the cumulative work at its midpoint
+    cell_midpoints = (cumulative_work - 0.5*work)/float(cumulative_work[-1])
+    unit_ids = np.floor(cell_midpoints*num_work_units).astype(int)
+    boundaries = np.flatnonzero(np.diff(unit_ids)) + 1
+    boundaries = np.concatenate(([0], boundaries, [len(work)]))
+    return [(int(first), int(last)) for first, last in zip(boundaries[:-1], boundaries[1:])]
+
+
+def _map_engine_over_cell1_tuples(engine, cell1_tuples, num_threads):
+    """ Evaluate a pair-counting engine on each of the input ``cell1_tuples``,
+    in parallel if requested.
+
+    Parameters
+    -----------
+    engine : functools.partial
+        Pair-counting engine with all arguments bound except the final ``cell1_tuple``.
+
+    cell1_tuples : list
+        List of two-element tuples returned by `_cell1_parallelization_indices`.
+
+    num_threads : int, `~halotools.mock_observables.pair_counters.SharedMemoryPool` or `~halotools.mock_observables.pair_counters.OpenMPThreads`
+        Number of processes to use. If an integer larger than 1,
+        a temporary multiprocessing Pool is created and the engine arguments
+        are pickled to each worker. If a
+        `~halotools.mock_observables.pair_counters.SharedMemoryPool`,
+        the persistent workers of the pool read the engine arrays from shared memory.
+        If an instance of `~halotools.mock_observables.pair_counters.OpenMPThreads`,
+        the engine is called in this process and loops over cells with OpenMP threads.
+
+    Returns
+    -------
+    result : list
+        List storing the output of the engine for each element of ``cell1_tuples``.
+    """
+    if isinstance(num_threads, (SharedMemoryPool, OpenMPThreads)):
+        return num_threads.map(engine, cell1_tuples)
+    elif num_threads > 1:
+        pool = multiprocessing.Pool(num_threads)
+        # chunksize=1 dispatches each work unit to the next idle process,
+        # while imap preserves the order of the results so that the reduction is deterministic
+        result = list(pool.imap(engine, cell1_tuples, chunksize=1))
+        pool.close()
+        return result
+    else:
+        return [engine(cell1_tuple) for cell1_tuple in cell1_tuples]
+
+
 def _enforce_maximum_search_length(search_length, period=None):
     """ The `~halotools.mock_observables.pair_counters.RectangularDoubleMesh`
     algorithm requires that the search length cannot exceed period/3 in any dimension.
@@ -8,6 +8,12 @@ from functools import partial
 
 from .rectangular_mesh import RectangularDoubleMesh
 from .mesh_helpers import _set_approximate_cell_sizes, _enclose_in_box, _cell1_parallelization_indices
+from .mesh_helpers import _map_engine_over_cell1_tuples, _coordinates_with_precision
+from .mesh_helpers import (_samples_are_identical, _half_pairs_approx_cell2_size,
+    _mesh_supports_half_pairs)
+from .mesh_helpers import _is_auto
+from .shared_memory_pool import SharedMemoryPool
+from .openmp_threads import OpenMPThreads
 from .cpairs import npairs_3d_engine
 from ...utils.array_utils import array_is_monotonic, custom_len
 
@@ -19,7 +25,7 @@ __all__ = ('npairs_3d', )
 
 def npairs_3d(sample1, sample2, rbins, period=None,
         verbose=False, num_threads=1,
-        approx_cell1_size=None, approx_cell2_size=None):
+        approx_cell1_size=None, approx_cell2_size=None, precision=None):
     """
     Function counts the number of pairs of points separated by
     a three-dimensional distance smaller than the input ``rbins``.
@@ -28,6 +34,11 @@ def npairs_3d(sample1, sample2, rbins, period=None,
     `~halotools.mock_observables.npairs_3d` function double-counts pairs.
     If your science application requires sample1==sample2 inputs and also pairs
     to not be double-counted, simply divide the final counts by 2.
+    When sample1 and sample2 store identical points, each unordered pair of points
+    is only visited once by the engine, and counted twice, so that the
+    result is unchanged but the number of distance computations is roughly halved.
+    In this case the ``approx_cell2_size`` argument is ignored, since the cells of
+    both meshes must coincide.
 
     A common variation of pair-counting calculations is to count pairs with
     separations *between* two different distances *r1* and *r2*. You can retrieve
@@ -65,6 +76,9 @@ def npairs_3d(sample1, sample2, rbins, period=None,
         calculation, in which case a multiprocessing Pool object will
         never be instantiated. A string 'max' may be used to indicate that
         the pair counters should use all available cores on the machine.
+        Alternatively, pass an instance of
+        `~halotools.mock_observables.pair_counters.OpenMPThreads` to loop over the
+        cells of the mesh with OpenMP threads sharing a single copy of the data.
 
     approx_cell1_size : array_like, optional
         Length-3 array serving as a guess for the optimal manner by how points
@@ -75,11 +89,28 @@ def npairs_3d(sample1, sample2, rbins, period=None,
         Performance can vary sensitively with this parameter, so it is highly
         recommended that you experiment with this parameter when carrying out
         performance-critical calculations.
+        Alternatively, the string 'auto' may be passed to choose the cell sizes
+        with `~halotools.mock_observables.pair_counters.auto_cell_sizes`,
+        which can be refined for your machine with
+        `~halotools.mock_observables.pair_counters.tune_cell_sizes`.
 
     approx_cell2_size : array_like, optional
         Analogous to ``approx_cell1_size``, but for sample2.  See comments for
         ``approx_cell1_size`` for details.
 
+    precision : string, optional
+        Floating-point type in which the engine stores the coordinates,
+        either 'float32' or 'float64'. Storing float32 coordinates halves the
+        memory footprint and bandwidth of the engine. Separations are always computed
+        in double precision, so the only loss of accuracy comes from rounding
+        float64 input coordinates to float32, which changes each coordinate by at most
+        a fraction 2**-24 of its absolute value, and each pair separation by at most
+        sqrt(3)*2**-23 ~ 2e-7 times the size of the box, e.g., 5e-5 Mpc/h
+        in a 250 Mpc/h box. Only pairs this close to a bin edge can change bins.
+        Default is None, in which case float32 is used if the input coordinates
+        are all float32, which is exact and avoids an upcast copy,
+        and float64 otherwise.
+
     Returns
     -------
     num_pairs : array_like
@@ -115,7 +146,7 @@ def npairs_3d(sample1, sample2, rbins, period=None,
     # Process the inputs with the helper function
     result = _npairs_3d_process_args(sample1, sample2, rbins, period,
             verbose, num_threads, approx_cell1_size, approx_cell2_size)
-    x1in, y1in, z1in, x2in, y2in, z2in = result[0:6]
+    x1in, y1in, z1in, x2in, y2in, z2in = _coordinates_with_precision(precision, *result[0:6])
     rbins, period, num_threads, PBCs, approx_cell1_size, approx_cell2_size = result[6:]
     xperiod, yperiod, zperiod = period
 
@@ -124,8 +155,17 @@ def npairs_3d(sample1, sample2, rbins, period=None,
 
     # Compute the estimates for the cell sizes
     approx_cell1_size, approx_cell2_size = (
-        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period)
+        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period,
+            npts1=len(x1in), npts2=len(x2in),
+            search_length=(search_xlength, search_ylength, search_zlength), num_threads=num_threads)
         )
+
+    # Count each unordered pair of an auto-sample only once
+    half_pairs = _samples_are_identical(x1in, y1in, z1in, x2in, y2in, z2in)
+    if half_pairs:
+        approx_cell2_size = _half_pairs_approx_cell2_size(approx_cell1_size,
+            (search_xlength, search_ylength, search_zlength), period)
+
     approx_x1cell_size, approx_y1cell_size, approx_z1cell_size = approx_cell1_size
     approx_x2cell_size, approx_y2cell_size, approx_z2cell_size = approx_cell2_size
 
@@ -135,21 +175,19 @@ def npairs_3d(sample1, sample2, rbins, period=None,
         approx_x2cell_size, approx_y2cell_size, approx_z2cell_size,
         search_xlength, search_ylength, search_zlength, xperiod, yperiod, zperiod, PBCs)
 
+    half_pairs = half_pairs and _mesh_supports_half_pairs(double_mesh)
+
     # Create a function object that has a single argument, for parallelization purposes
     engine = partial(npairs_3d_engine,
-        double_mesh, x1in, y1in, z1in, x2in, y2in, z2in, rbins)
+        double_mesh, x1in, y1in, z1in, x2in, y2in, z2in, rbins,
+        half_pairs=int(half_pairs))
 
     # Calculate the cell1 indices that will be looped over by the engine
     num_threads, cell1_tuples = _cell1_parallelization_indices(
-        double_mesh.mesh1.ncells, num_threads)
+        double_mesh.mesh1.ncells, num_threads, double_mesh=double_mesh)
 
-    if num_threads > 1:
-        pool = multiprocessing.Pool(num_threads)
-        result = pool.map(engine, cell1_tuples)
-        counts = np.sum(np.array(result), axis=0)
-        pool.close()
-    else:
-        counts = engine(cell1_tuples[0])
+    result = _map_engine_over_cell1_tuples(engine, cell1_tuples, num_threads)
+    counts = np.sum(np.array(result), axis=0)
 
     return np.array(counts)
 
@@ -161,8 +199,9 @@ def _npairs_3d_process_args(sample1, sample2, rbins, period,
     if num_threads is not 1:
         if num_threads == 'max':
             num_threads = multiprocessing.cpu_count()
-        if not isinstance(num_threads, int):
-            msg = "Input ``num_threads`` argument must be an integer or the string 'max'"
+        if not isinstance(num_threads, (int, SharedMemoryPool, OpenMPThreads)):
+            msg = ("Input ``num_threads`` argument must be an integer or the string 'max',\n"
+                "or an instance of SharedMemoryPool or OpenMPThreads")
             raise ValueError(msg)
 
     # Passively enforce that we are working with ndarrays
@@ -207,6 +246,8 @@ def _npairs_3d_process_args(sample1, sample2, rbins, period,
         approx_cell1_size = [rmax, rmax, rmax]
     elif custom_len(approx_cell1_size) == 1:
         approx_cell1_size = [approx_cell1_size, approx_cell1_size, approx_cell1_size]
+    if approx_cell2_size is None and _is_auto(approx_cell1_size):
+        approx_cell2_size = approx_cell1_size
     if approx_cell2_size is None:
         approx_cell2_size = [rmax, rmax, rmax]
     elif custom_len(approx_cell2_size) == 1:
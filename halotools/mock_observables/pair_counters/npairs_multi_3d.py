@@ -0,0 +1,225 @@
+""" Module containing the `~halotools.mock_observables.pair_counters.npairs_multi_3d` function
+used to simultaneously count pairs between several samples as a function of separation.
+"""
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+import numpy as np
+import multiprocessing
+from functools import partial
+
+from .rectangular_mesh import RectangularDoubleMesh
+from .mesh_helpers import _set_approximate_cell_sizes, _enclose_in_box, _cell1_parallelization_indices
+from .mesh_helpers import _map_engine_over_cell1_tuples
+from .mesh_helpers import _half_pairs_approx_cell2_size, _mesh_supports_half_pairs
+from .shared_memory_pool import SharedMemoryPool
+from .openmp_threads import OpenMPThreads
+from .cpairs import npairs_multi_3d_engine
+from ...utils.array_utils import array_is_monotonic, custom_len
+
+
+__all__ = ('npairs_multi_3d', )
+
+
+def npairs_multi_3d(samples, pairs, rbins, period=None,
+        num_threads=1, approx_cell1_size=None):
+    """
+    Function simultaneously counts the number of pairs of points separated by
+    a three-dimensional distance smaller than the input ``rbins``
+    for several pairs of samples.
+
+    The samples are merged into a single labelled sample and the pairs of every requested
+    combination of samples are counted during a single traversal of a shared mesh,
+    so that calling `npairs_multi_3d` is faster than calling
+    `~halotools.mock_observables.npairs_3d` once for each element of ``pairs``.
+    For example, all the DD, DR and RR counts of a two-point function
+    are computed with a single call.
+
+    The counts of each element of ``pairs`` are identical to the result of
+    `~halotools.mock_observables.npairs_3d`, so that pairs are double-counted
+    for auto-sample pair counts.
+
+    Parameters
+    ----------
+    samples : sequence
+        Sequence of Numpy arrays of shape (Npts, 3) containing 3-D positions of points.
+        See the :ref:`mock_obs_pos_formatting` documentation page for
+        instructions on how to transform your coordinate position arrays into the
+        format accepted by the pair counters.
+        Length units are comoving and assumed to be in Mpc/h, here and throughout Halotools.
+
+    pairs : sequence
+        Sequence of two-element tuples (i, j) requesting the pair counts between
+        ``samples[i]`` and ``samples[j]``. Use (i, i) for auto-sample pair counts.
+
+    rbins : array_like
+        Boundaries defining the bins in which pairs are counted.
+
+    period : array_like, optional
+        Length-3 sequence defining the periodic boundary conditions
+        in each dimension. If you instead provide a single scalar, Lbox,
+        period is assumed to be the same in all Cartesian directions.
+
+    num_threads : int, optional
+        Number of threads to use in calculation, where parallelization is performed
+        using the python ``multiprocessing`` module. Default is 1 for a purely serial
+        calculation, in which case a multiprocessing Pool object will
+        never be instantiated. A string 'max' may be used to indicate that
+        the pair counters should use all available cores on the machine.
+        Alternatively, pass an instance of
+        `~halotools.mock_observables.pair_counters.SharedMemoryPool` or
+        `~halotools.mock_observables.pair_counters.OpenMPThreads`.
+
+    approx_cell1_size : array_like, optional
+        Length-3 array serving as a guess for the optimal manner by how points
+        will be apportioned into subvolumes of the simulation box.
+        Since all samples share a single mesh, the same cell sizes apply to every sample.
+        See `~halotools.mock_observables.npairs_3d` for details.
+        The merged sample is paired with itself, so the cells of the mesh of
+        neighboring points coincide with these cells, and each unordered pair
+        of points is only visited once.
+
+    Returns
+    -------
+    num_pairs : array_like
+        Numpy array of shape (len(pairs), len(rbins)) storing the numbers of pairs
+        in the input bins for each element of ``pairs``.
+
+    Examples
+    --------
+    >>> Npts, Nran, Lbox = 1000, 5000, 250.
+    >>> rbins = np.logspace(-1, 1.5, 15)
+    >>> data = np.random.uniform(0, Lbox, Npts*3).reshape((Npts, 3))
+    >>> randoms = np.random.uniform(0, Lbox, Nran*3).reshape((Nran, 3))
+
+    >>> DD, DR, RR = npairs_multi_3d([data, randoms], [(0, 0), (0, 1), (1, 1)], rbins, period=Lbox)
+    """
+    # Process the inputs with the helper function
+    result = _npairs_multi_3d_process_args(samples, pairs, rbins, period,
+            num_threads, approx_cell1_size)
+    xin, yin, zin, labels, pair_slots = result[0:5]
+    rbins, period, num_threads, PBCs, approx_cell1_size = result[5:]
+    xperiod, yperiod, zperiod = period
+
+    rmax = np.max(rbins)
+    search_xlength, search_ylength, search_zlength = rmax, rmax, rmax
+
+    # Compute the estimates for the cell sizes
+    approx_cell1_size, approx_cell2_size = (
+        _set_approximate_cell_sizes(approx_cell1_size, None, period,
+            npts1=len(xin), npts2=len(xin),
+            search_length=(search_xlength, search_ylength, search_zlength), num_threads=num_threads)
+        )
+
+    # The merged sample is paired with itself, so count each unordered pair only once
+    approx_cell2_size = _half_pairs_approx_cell2_size(approx_cell1_size,
+        (search_xlength, search_ylength, search_zlength), period)
+
+    approx_x1cell_size, approx_y1cell_size, approx_z1cell_size = approx_cell1_size
+    approx_x2cell_size, approx_y2cell_size, approx_z2cell_size = approx_cell2_size
+
+    # Build the rectangular mesh shared by all the samples
+    double_mesh = RectangularDoubleMesh(xin, yin, zin, xin, yin, zin,
+        approx_x1cell_size, approx_y1cell_size, approx_z1cell_size,
+        approx_x2cell_size, approx_y2cell_size, approx_z2cell_size,
+        search_xlength, search_ylength, search_zlength, xperiod, yperiod, zperiod, PBCs)
+
+    half_pairs = _mesh_supports_half_pairs(double_mesh)
+
+    # Create a function object that has a single argument, for parallelization purposes
+    engine = partial(npairs_multi_3d_engine,
+        double_mesh, xin, yin, zin, labels, xin, yin, zin, labels, pair_slots, rbins,
+        half_pairs=int(half_pairs))
+
+    # Calculate the cell1 indices that will be looped over by the engine
+    num_threads, cell1_tuples = _cell1_parallelization_indices(
+        double_mesh.mesh1.ncells, num_threads, double_mesh=double_mesh)
+
+    result = _map_engine_over_cell1_tuples(engine, cell1_tuples, num_threads)
+    counts = np.sum(np.array(result), axis=0)
+
+    # Duplicate requests share a slot
+    slot_indices = [pair_slots[i, j] for i, j in pairs]
+    return np.array(counts[slot_indices])
+
+
+def _npairs_multi_3d_process_args(samples, pairs, rbins, period,
+        num_threads, approx_cell1_size):
+    """
+    """
+    if num_threads != 1:
+        if num_threads == 'max':
+            num_threads = multiprocessing.cpu_count()
+        if not isinstance(num_threads, (int, SharedMemoryPool, OpenMPThreads)):
+            msg = ("Input ``num_threads`` argument must be an integer or the string 'max',\n"
+                "or an instance of SharedMemoryPool or OpenMPThreads")
+            raise ValueError(msg)
+
+    samples = [np.atleast_2d(sample) for sample in samples]
+    try:
+        assert len(samples) > 0
+        for sample in samples:
+            assert sample.ndim == 2
+            assert sample.shape[1] == 3
+    except AssertionError:
+        msg = "Input ``samples`` must be a non-empty sequence of arrays of shape (Npts, 3)"
+        raise ValueError(msg)
+    num_samples = len(samples)
+
+    # Assign a histogram slot to each distinct requested pair of samples
+    pair_slots = np.zeros((num_samples, num_samples), dtype=np.int64) - 1
+    try:
+        pairs = [(int(i), int(j)) for i, j in pairs]
+        assert len(pairs) > 0
+        for i, j in pairs:
+            assert 0 <= i < num_samples
+            assert 0 <= j < num_samples
+            if pair_slots[i, j] < 0:
+                pair_slots[i, j] = np.max(pair_slots) + 1
+    except (TypeError, ValueError, AssertionError):
+        msg = ("Input ``pairs`` must be a non-empty sequence of two-element tuples\n"
+            "storing indices of the input ``samples``")
+        raise ValueError(msg)
+
+    # Merge the samples into a single labelled sample
+    merged_sample = np.concatenate(samples)
+    labels = np.repeat(np.arange(num_samples), [len(sample) for sample in samples])
+    x = merged_sample[:, 0]
+    y = merged_sample[:, 1]
+    z = merged_sample[:, 2]
+    rbins = np.atleast_1d(rbins).astype('f8')
+
+    rmax = np.max(rbins)
+
+    try:
+        assert rbins.ndim == 1
+        assert len(rbins) > 1
+        if len(rbins) > 2:
+            assert array_is_monotonic(rbins, strict=True) == 1
+    except AssertionError:
+        msg = "Input ``rbins`` must be a monotonically increasing 1D array with at least two entries"
+        raise ValueError(msg)
+
+    # Set the boolean value for the PBCs variable
+    if period is None:
+        PBCs = False
+        x, y, z, __, __, __, period = (
+            _enclose_in_box(x, y, z, x, y, z,
+                min_size=[rmax*3.0, rmax*3.0, rmax*3.0]))
+    else:
+        PBCs = True
+        period = np.atleast_1d(period).astype(float)
+        if len(period) == 1:
+            period = np.array([period[0]]*3)
+        try:
+            assert np.all(period < np.inf)
+            assert np.all(period > 0)
+        except AssertionError:
+            msg = "Input ``period`` must be a bounded positive number in all dimensions"
+            raise ValueError(msg)
+
+    if approx_cell1_size is None:
+        approx_cell1_size = [rmax, rmax, rmax]
+    elif custom_len(approx_cell1_size) == 1:
+        approx_cell1_size = [approx_cell1_size, approx_cell1_size, approx_cell1_size]
+
+    return (x, y, z, labels, pair_slots,
+        rbins, period, num_threads, PBCs, approx_cell1_size)
@@ -3,11 +3,11 @@ used to count pairs as a function of separation.
 """
 from __future__ import (absolute_import, division, print_function, unicode_literals)
 import numpy as np
-import multiprocessing
 from functools import partial
 
 from .rectangular_mesh import RectangularDoubleMesh
 from .mesh_helpers import _set_approximate_cell_sizes, _cell1_parallelization_indices
+from .mesh_helpers import _map_engine_over_cell1_tuples, _coordinates_with_precision
 from .cpairs import npairs_per_object_3d_engine
 from .npairs_3d import _npairs_3d_process_args
 
@@ -18,7 +18,7 @@ __all__ = ('npairs_per_object_3d', )
 
 def npairs_per_object_3d(sample1, sample2, rbins, period=None,
         verbose=False, num_threads=1,
-        approx_cell1_size=None, approx_cell2_size=None):
+        approx_cell1_size=None, approx_cell2_size=None, precision=None):
     """
     Function counts the number of points in ``sample2`` separated by a distance
     ``r`` from each point in ``sample1``, where ``r`` is defined by the input ``rbins``.
@@ -72,6 +72,19 @@ def npairs_per_object_3d(sample1, sample2, rbins, period=None,
         Analogous to ``approx_cell1_size``, but for sample2.  See comments for
         ``approx_cell1_size`` for details.
 
+    precision : string, optional
+        Floating-point type in which the engine stores the coordinates,
+        either 'float32' or 'float64'. Storing float32 coordinates halves the
+        memory footprint and bandwidth of the engine. Separations are always computed
+        in double precision, so the only loss of accuracy comes from rounding
+        float64 input coordinates to float32, which changes each coordinate by at most
+        a fraction 2**-24 of its absolute value, and each pair separation by at most
+        sqrt(3)*2**-23 ~ 2e-7 times the size of the box, e.g., 5e-5 Mpc/h
+        in a 250 Mpc/h box. Only pairs this close to a bin edge can change bins.
+        Default is None, in which case float32 is used if the input coordinates
+        are all float32, which is exact and avoids an upcast copy,
+        and float64 otherwise.
+
     Returns
     -------
     num_pairs : array_like
@@ -106,7 +119,7 @@ def npairs_per_object_3d(sample1, sample2, rbins, period=None,
     # Process the inputs with the helper function
     result = _npairs_3d_process_args(sample1, sample2, rbins, period,
             verbose, num_threads, approx_cell1_size, approx_cell2_size)
-    x1in, y1in, z1in, x2in, y2in, z2in = result[0:6]
+    x1in, y1in, z1in, x2in, y2in, z2in = _coordinates_with_precision(precision, *result[0:6])
     rbins, period, num_threads, PBCs, approx_cell1_size, approx_cell2_size = result[6:]
     xperiod, yperiod, zperiod = period
 
@@ -115,7 +128,9 @@ def npairs_per_object_3d(sample1, sample2, rbins, period=None,
 
     # Compute the estimates for the cell sizes
     approx_cell1_size, approx_cell2_size = (
-        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period)
+        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period,
+            npts1=len(x1in), npts2=len(x2in),
+            search_length=(search_xlength, search_ylength, search_zlength), num_threads=num_threads)
         )
     approx_x1cell_size, approx_y1cell_size, approx_z1cell_size = approx_cell1_size
     approx_x2cell_size, approx_y2cell_size, approx_z2cell_size = approx_cell2_size
@@ -132,15 +147,9 @@ def npairs_per_object_3d(sample1, sample2, rbins, period=None,
 
     # Calculate the cell1 indices that will be looped over by the engine
     num_threads, cell1_tuples = _cell1_parallelization_indices(
-        double_mesh.mesh1.ncells, num_threads)
-
-    if num_threads > 1:
-        pool = multiprocessing.Pool(num_threads)
-        result = pool.map(engine, cell1_tuples)
-        counts = np.sum(np.array(result), axis=0)
-        pool.close()
-    else:
-        result = engine(cell1_tuples[0])
-        counts = np.vstack(result)
+        double_mesh.mesh1.ncells, num_threads, double_mesh=double_mesh)
+
+    result = _map_engine_over_cell1_tuples(engine, cell1_tuples, num_threads)
+    counts = np.sum(np.array(result), axis=0)
 
     return np.array(counts)
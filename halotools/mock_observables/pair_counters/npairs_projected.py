@@ -9,6 +9,10 @@ from functools import partial
 from .rectangular_mesh import RectangularDoubleMesh
 from .mesh_helpers import (_set_approximate_cell_sizes, _enclose_in_box,
     _cell1_parallelization_indices)
+from .mesh_helpers import _map_engine_over_cell1_tuples
+from .mesh_helpers import _is_auto
+from .shared_memory_pool import SharedMemoryPool
+from .openmp_threads import OpenMPThreads
 from .cpairs import npairs_projected_engine
 from ...utils.array_utils import array_is_monotonic, custom_len
 
@@ -81,6 +85,10 @@ def npairs_projected(sample1, sample2, rp_bins, pi_max, period=None,
         Performance can vary sensitively with this parameter, so it is highly
         recommended that you experiment with this parameter when carrying out
         performance-critical calculations.
+        Alternatively, the string 'auto' may be passed to choose the cell sizes
+        with `~halotools.mock_observables.pair_counters.auto_cell_sizes`,
+        which can be refined for your machine with
+        `~halotools.mock_observables.pair_counters.tune_cell_sizes`.
 
     approx_cell2_size : array_like, optional
         Analogous to ``approx_cell1_size``, but for sample2.  See comments for
@@ -131,7 +139,9 @@ def npairs_projected(sample1, sample2, rp_bins, pi_max, period=None,
 
     # Compute the estimates for the cell sizes
     approx_cell1_size, approx_cell2_size = (
-        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period)
+        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period,
+            npts1=len(x1in), npts2=len(x2in),
+            search_length=(search_xlength, search_ylength, search_zlength), num_threads=num_threads)
         )
     approx_x1cell_size, approx_y1cell_size, approx_z1cell_size = approx_cell1_size
     approx_x2cell_size, approx_y2cell_size, approx_z2cell_size = approx_cell2_size
@@ -148,15 +158,10 @@ def npairs_projected(sample1, sample2, rp_bins, pi_max, period=None,
 
     # # Calculate the cell1 indices that will be looped over by the engine
     num_threads, cell1_tuples = _cell1_parallelization_indices(
-        double_mesh.mesh1.ncells, num_threads)
+        double_mesh.mesh1.ncells, num_threads, double_mesh=double_mesh)
 
-    if num_threads > 1:
-        pool = multiprocessing.Pool(num_threads)
-        result = pool.map(engine, cell1_tuples)
-        counts = np.sum(np.array(result), axis=0)
-        pool.close()
-    else:
-        counts = engine(cell1_tuples[0])
+    result = _map_engine_over_cell1_tuples(engine, cell1_tuples, num_threads)
+    counts = np.sum(np.array(result), axis=0)
 
     return np.array(counts)
 
@@ -168,8 +173,9 @@ def _npairs_projected_process_args(sample1, sample2, rp_bins, pi_max, period,
     if num_threads is not 1:
         if num_threads == 'max':
             num_threads = multiprocessing.cpu_count()
-        if not isinstance(num_threads, int):
-            msg = "Input ``num_threads`` argument must be an integer or the string 'max'"
+        if not isinstance(num_threads, (int, SharedMemoryPool, OpenMPThreads)):
+            msg = ("Input ``num_threads`` argument must be an integer or the string 'max',\n"
+                "or an instance of SharedMemoryPool or OpenMPThreads")
             raise ValueError(msg)
 
     # Passively enforce that we are working with ndarrays
@@ -221,6 +227,8 @@ def _npairs_projected_process_args(sample1, sample2, rp_bins, pi_max, period,
         approx_cell1_size = [rp_max, rp_max, rp_max]
     elif custom_len(approx_cell1_size) == 1:
         approx_cell1_size = [approx_cell1_size, approx_cell1_size, approx_cell1_size]
+    if approx_cell2_size is None and _is_auto(approx_cell1_size):
+        approx_cell2_size = approx_cell1_size
     if approx_cell2_size is None:
         approx_cell2_size = [rp_max, rp_max, rp_max]
     elif custom_len(approx_cell2_size) == 1:
@@ -3,11 +3,13 @@ used to count pairs as a function of separation.
 """
 from __future__ import (absolute_import, division, print_function, unicode_literals)
 import numpy as np
-import multiprocessing
 from functools import partial
 
 from .rectangular_mesh import RectangularDoubleMesh
 from .mesh_helpers import _set_approximate_cell_sizes, _cell1_parallelization_indices
+from .mesh_helpers import _map_engine_over_cell1_tuples
+from .mesh_helpers import (_samples_are_identical, _half_pairs_approx_cell2_size,
+    _mesh_supports_half_pairs)
 from .cpairs import npairs_s_mu_engine
 from .npairs_3d import _npairs_3d_process_args
 from ...utils.array_utils import array_is_monotonic
@@ -77,6 +79,9 @@ def npairs_s_mu(sample1, sample2, s_bins, mu_bins, period=None,
         calculation, in which case a multiprocessing Pool object will
         never be instantiated. A string 'max' may be used to indicate that
         the pair counters should use all available cores on the machine.
+        Alternatively, pass an instance of
+        `~halotools.mock_observables.pair_counters.OpenMPThreads` to loop over the
+        cells of the mesh with OpenMP threads sharing a single copy of the data.
 
     approx_cell1_size : array_like, optional
         Length-3 array serving as a guess for the optimal manner by how points
@@ -87,6 +92,10 @@ def npairs_s_mu(sample1, sample2, s_bins, mu_bins, period=None,
         Performance can vary sensitively with this parameter, so it is highly
         recommended that you experiment with this parameter when carrying out
         performance-critical calculations.
+        Alternatively, the string 'auto' may be passed to choose the cell sizes
+        with `~halotools.mock_observables.pair_counters.auto_cell_sizes`,
+        which can be refined for your machine with
+        `~halotools.mock_observables.pair_counters.tune_cell_sizes`.
 
     approx_cell2_size : array_like, optional
         Analogous to ``approx_cell1_size``, but for sample2.  See comments for
@@ -120,6 +129,11 @@ def npairs_s_mu(sample1, sample2, s_bins, mu_bins, period=None,
     If sample1 == sample2 that the `~halotools.mock_observables.npairs_s_mu` function
     double-counts pairs. If your science application requires sample1==sample2 inputs
     and also pairs to not be double-counted, simply divide the final counts by 2.
+    When sample1 and sample2 store identical points, each unordered pair of points
+    is only visited once by the engine, and counted twice, so that the
+    result is unchanged but the number of distance computations is roughly halved.
+    In this case the ``approx_cell2_size`` argument is ignored, since the cells of
+    both meshes must coincide.
 
     One final point of clarification concerning double-counting may be in order.
     Suppose sample1==sample2 and s_bins[0]==0. Then the returned value for this bin
@@ -182,8 +196,17 @@ def npairs_s_mu(sample1, sample2, s_bins, mu_bins, period=None,
 
     # Compute the estimates for the cell sizes
     approx_cell1_size, approx_cell2_size = (
-        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period)
+        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period,
+            npts1=len(x1in), npts2=len(x2in),
+            search_length=(search_xlength, search_ylength, search_zlength), num_threads=num_threads)
         )
+
+    # Count each unordered pair of an auto-sample only once
+    half_pairs = _samples_are_identical(x1in, y1in, z1in, x2in, y2in, z2in)
+    if half_pairs:
+        approx_cell2_size = _half_pairs_approx_cell2_size(approx_cell1_size,
+            (search_xlength, search_ylength, search_zlength), period)
+
     approx_x1cell_size, approx_y1cell_size, approx_z1cell_size = approx_cell1_size
     approx_x2cell_size, approx_y2cell_size, approx_z2cell_size = approx_cell2_size
 
@@ -193,20 +216,18 @@ def npairs_s_mu(sample1, sample2, s_bins, mu_bins, period=None,
         approx_x2cell_size, approx_y2cell_size, approx_z2cell_size,
         search_xlength, search_ylength, search_zlength, xperiod, yperiod, zperiod, PBCs)
 
+    half_pairs = half_pairs and _mesh_supports_half_pairs(double_mesh)
+
     # Create a function object that has a single argument, for parallelization purposes
     engine = partial(npairs_s_mu_engine,
-        double_mesh, x1in, y1in, z1in, x2in, y2in, z2in, s_bins, mu_bins_prime)
+        double_mesh, x1in, y1in, z1in, x2in, y2in, z2in, s_bins, mu_bins_prime,
+        half_pairs=int(half_pairs))
 
     # Calculate the cell1 indices that will be looped over by the engine
     num_threads, cell1_tuples = _cell1_parallelization_indices(
-        double_mesh.mesh1.ncells, num_threads)
-
-    if num_threads > 1:
-        pool = multiprocessing.Pool(num_threads)
-        result = pool.map(engine, cell1_tuples)
-        counts = np.sum(np.array(result), axis=0)
-        pool.close()
-    else:
-        counts = engine(cell1_tuples[0])
+        double_mesh.mesh1.ncells, num_threads, double_mesh=double_mesh)
+
+    result = _map_engine_over_cell1_tuples(engine, cell1_tuples, num_threads)
+    counts = np.sum(np.array(result), axis=0)
 
     return np.array(counts)
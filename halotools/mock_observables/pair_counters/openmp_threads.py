@@ -0,0 +1,96 @@
+""" Module containing `~halotools.mock_observables.pair_counters.OpenMPThreads`,
+used to request that the pair-counting engines loop over the cells of the mesh
+with OpenMP threads that share a single copy of the input arrays.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import multiprocessing
+
+from .cpairs import npairs_3d_engine, npairs_xy_z_engine, npairs_s_mu_engine, npairs_multi_3d_engine
+
+__all__ = ('OpenMPThreads', )
+
+# Engines whose outermost loop is a cython.parallel.prange accepting ``num_omp_threads``
+openmp_engines = (npairs_3d_engine, npairs_xy_z_engine, npairs_s_mu_engine, npairs_multi_3d_engine)
+
+
+class OpenMPThreads(object):
+    """ Request OpenMP parallelization of the
+    `~halotools.mock_observables` pair counters.
+
+    When the pair counters are called with ``num_threads`` set to an integer,
+    parallelization is performed with python ``multiprocessing``,
+    so that every process receives its own copy of the
+    `~halotools.mock_observables.pair_counters.RectangularDoubleMesh` and coordinate arrays.
+    If instead an instance of `OpenMPThreads` is passed as the ``num_threads`` argument,
+    the Cython engine releases the GIL and loops over the cells of the mesh
+    with OpenMP threads that share the input arrays. Each thread accumulates
+    pair counts in its own histogram, and the histograms are summed at the end.
+
+    Notes
+    -----
+    Currently supported by `~halotools.mock_observables.npairs_3d`,
+    `~halotools.mock_observables.npairs_xy_z`,
+    `~halotools.mock_observables.pair_counters.npairs_s_mu` and
+    `~halotools.mock_observables.pair_counters.npairs_multi_3d`, and by the
+    two-point functions built upon them such as
+    `~halotools.mock_observables.tpcf`, `~halotools.mock_observables.wp`,
+    `~halotools.mock_observables.rp_pi_tpcf` and `~halotools.mock_observables.s_mu_tpcf`.
+
+    If halotools was compiled with a compiler that does not support OpenMP,
+    the engines fall back to a serial loop and return identical results.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from halotools.mock_observables import npairs_3d
+    >>> Npts, Lbox = 1000, 250.
+    >>> sample1 = np.random.uniform(0, Lbox, Npts*3).reshape((Npts, 3))
+    >>> rbins = np.logspace(-1, 1, 10)
+    >>> result = npairs_3d(sample1, sample1, rbins, period=Lbox, num_threads=OpenMPThreads(2))
+    """
+
+    def __init__(self, num_threads='max'):
+        """
+        Parameters
+        ----------
+        num_threads : int, optional
+            Number of OpenMP threads. A string 'max' may be used to indicate that
+            all available cores on the machine should be used. Default is 'max'.
+        """
+        if num_threads == 'max':
+            num_threads = multiprocessing.cpu_count()
+        try:
+            assert int(num_threads) == num_threads
+            assert num_threads > 0
+        except (TypeError, ValueError, AssertionError):
+            msg = "Input ``num_threads`` must be a positive integer or the string 'max'"
+            raise ValueError(msg)
+
+        self.num_threads = int(num_threads)
+
+    def map(self, engine, cell1_tuples):
+        """ Evaluate the pair-counting ``engine`` on each element of ``cell1_tuples``
+        using ``num_threads`` OpenMP threads within each call.
+
+        Parameters
+        ----------
+        engine : functools.partial
+            Pair-counting engine with all arguments bound except the final ``cell1_tuple``.
+
+        cell1_tuples : list
+            List of two-element tuples passed as the final argument of ``engine``.
+
+        Returns
+        -------
+        result : list
+            List storing the output of ``engine`` for each element of ``cell1_tuples``.
+        """
+        if getattr(engine, 'func', engine) not in openmp_engines:
+            msg = ("OpenMPThreads is only supported by the pair counters "
+                "npairs_3d, npairs_xy_z, npairs_s_mu and npairs_multi_3d.\n"
+                "Use an integer value for ``num_threads`` instead.\n")
+            raise ValueError(msg)
+
+        return [engine(cell1_tuple, num_omp_threads=self.num_threads)
+            for cell1_tuple in cell1_tuples]
@@ -11,6 +11,10 @@ from scipy.sparse import coo_matrix
 
 from .rectangular_mesh import RectangularDoubleMesh
 from .mesh_helpers import _set_approximate_cell_sizes, _enclose_in_box, _cell1_parallelization_indices
+from .mesh_helpers import _map_engine_over_cell1_tuples
+from .mesh_helpers import _is_auto
+from .shared_memory_pool import SharedMemoryPool
+from .openmp_threads import OpenMPThreads
 from .cpairs import pairwise_distance_3d_engine
 
 from ...utils.array_utils import custom_len
@@ -124,7 +128,9 @@ def pairwise_distance_3d(data1, data2, r_max, period=None,
 
     # Compute the estimates for the cell sizes
     approx_cell1_size, approx_cell2_size = (
-        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period)
+        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period,
+            npts1=len(x1in), npts2=len(x2in),
+            search_length=(search_xlength, search_ylength, search_zlength), num_threads=num_threads)
         )
     approx_x1cell_size, approx_y1cell_size, approx_z1cell_size = approx_cell1_size
     approx_x2cell_size, approx_y2cell_size, approx_z2cell_size = approx_cell2_size
@@ -141,14 +147,9 @@ def pairwise_distance_3d(data1, data2, r_max, period=None,
 
     # Calculate the cell1 indices that will be looped over by the engine
     num_threads, cell1_tuples = _cell1_parallelization_indices(
-        double_mesh.mesh1.ncells, num_threads)
+        double_mesh.mesh1.ncells, num_threads, double_mesh=double_mesh)
 
-    if num_threads > 1:
-        pool = multiprocessing.Pool(num_threads)
-        result = pool.map(engine, cell1_tuples)
-        pool.close()
-    else:
-        result = [engine(cell1_tuples[0])]
+    result = _map_engine_over_cell1_tuples(engine, cell1_tuples, num_threads)
 
     # unpack result
     d = np.zeros((0,), dtype='float')
@@ -172,8 +173,9 @@ def _pairwise_distance_3d_process_args(data1, data2, r_max, period,
     if num_threads is not 1:
         if num_threads == 'max':
             num_threads = multiprocessing.cpu_count()
-        if not isinstance(num_threads, int):
-            msg = "Input ``num_threads`` argument must be an integer or the string 'max'"
+        if not isinstance(num_threads, (int, SharedMemoryPool, OpenMPThreads)):
+            msg = ("Input ``num_threads`` argument must be an integer or the string 'max',\n"
+                "or an instance of SharedMemoryPool or OpenMPThreads")
             raise ValueError(msg)
 
     # Passively enforce that we are working with ndarrays
@@ -209,6 +211,8 @@ def _pairwise_distance_3d_process_args(data1, data2, r_max, period,
         approx_cell1_size = [max_r_max, max_r_max, max_r_max]
     elif custom_len(approx_cell1_size) == 1:
         approx_cell1_size = [approx_cell1_size, approx_cell1_size, approx_cell1_size]
+    if approx_cell2_size is None and _is_auto(approx_cell1_size):
+        approx_cell2_size = approx_cell1_size
     if approx_cell2_size is None:
         approx_cell2_size = [max_r_max, max_r_max, max_r_max]
     elif custom_len(approx_cell2_size) == 1:
@@ -4,12 +4,15 @@ calculations throughout the `~halotools.mock_observables` sub-package.
 """
 import numpy as np
 from math import floor
+from collections import OrderedDict
+import hashlib
 
-__all__ = ('RectangularDoubleMesh', )
+__all__ = ('RectangularDoubleMesh', 'RectangularMeshCache')
 __author__ = ('Andrew Hearin', )
 
 default_max_cells_per_dimension_cell1 = 50
 default_max_cells_per_dimension_cell2 = 50
+default_mesh_cache_maxsize = 4
 
 
 def digitized_position(p, cell_size, num_divs):
@@ -155,9 +158,9 @@ class RectangularMesh(object):
         self.yperiod = yperiod
         self.zperiod = zperiod
 
-        self.num_xdivs = max(int(np.round(xperiod / approx_xcell_size)), 1)
-        self.num_ydivs = max(int(np.round(yperiod / approx_ycell_size)), 1)
-        self.num_zdivs = max(int(np.round(zperiod / approx_zcell_size)), 1)
+        self.num_xdivs = _num_divs(xperiod, approx_xcell_size)
+        self.num_ydivs = _num_divs(yperiod, approx_ycell_size)
+        self.num_zdivs = _num_divs(zperiod, approx_zcell_size)
         self.ncells = self.num_xdivs*self.num_ydivs*self.num_zdivs
 
         self.xcell_size = self.xperiod / float(self.num_xdivs)
@@ -180,6 +183,155 @@ class RectangularMesh(object):
         return ix*(self.num_ydivs*self.num_zdivs) + iy*self.num_zdivs + iz
 
 
+def _num_divs(period, approx_cell_size):
+    """ Number of cells per dimension of a
+    `~halotools.mock_observables.pair_counters.rectangular_mesh.RectangularMesh`.
+    Must agree with the calculation in `RectangularMesh.__init__`.
+    """
+    return max(int(np.round(period / approx_cell_size)), 1)
+
+
+def _array_fingerprint(*arrays):
+    """ Function returns a hex digest of the dtype, shape and contents of the input arrays.
+    """
+    h = hashlib.sha1()
+    for arr in arrays:
+        arr = np.ascontiguousarray(arr)
+        h.update(str((arr.dtype.str, arr.shape)).encode('utf-8'))
+        h.update(arr)
+    return h.hexdigest()
+
+
+class RectangularMeshCache(object):
+    """ Least-recently-used cache of
+    `~halotools.mock_observables.pair_counters.rectangular_mesh.RectangularMesh` objects.
+
+    Meshes are keyed by a hash of the point coordinates together with the
+    periodicity and number of divisions in each dimension, so that repeated
+    pair-counting calls on the same sample (e.g., a fixed random catalog
+    used in DR and RR counts) reuse the already-sorted mesh rather than
+    digitizing and argsorting the points again.
+    Every `~halotools.mock_observables.pair_counters.RectangularDoubleMesh`
+    retrieves its two meshes through the module-level instance ``default_mesh_cache``
+    unless a different cache is passed to its constructor.
+
+    Caching is opt-in: ``default_mesh_cache`` has a ``maxsize`` of zero, in which case
+    meshes are built exactly as without a cache. To cache the meshes built by all
+    pair counters, set ``default_mesh_cache.maxsize`` to a positive integer.
+    Note that each lookup computes a SHA1 hash of the coordinates, a single pass over
+    the points that is much cheaper than building the mesh but is paid on every call,
+    and that the cached meshes keep copies of the sorted coordinates alive
+    until they are evicted or the cache is cleared.
+
+    Examples
+    ---------
+    >>> cache = RectangularMeshCache(maxsize=2)
+    >>> Npts, Lbox = 1000, 250.
+    >>> x, y, z = np.random.uniform(0, Lbox, Npts*3).reshape((3, Npts))
+    >>> mesh = cache.get_mesh(x, y, z, Lbox, Lbox, Lbox, Lbox/10., Lbox/10., Lbox/10.)
+    >>> mesh2 = cache.get_mesh(x, y, z, Lbox, Lbox, Lbox, Lbox/10., Lbox/10., Lbox/10.)
+    >>> assert mesh is mesh2
+    >>> assert cache.hits == 1
+
+    Setting ``maxsize`` to zero disables caching:
+
+    >>> cache.maxsize = 0
+    >>> assert len(cache) == 0
+
+    Opting in to caching for all pair counters:
+
+    >>> from halotools.mock_observables.pair_counters import default_mesh_cache
+    >>> default_mesh_cache.maxsize = 4 # doctest: +SKIP
+    """
+
+    def __init__(self, maxsize=default_mesh_cache_maxsize):
+        """
+        Parameters
+        ----------
+        maxsize : int, optional
+            Maximum number of meshes stored in the cache. Default is 4.
+            Set to zero to disable caching.
+        """
+        self._meshes = OrderedDict()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize):
+        try:
+            maxsize = int(maxsize)
+            assert maxsize >= 0
+        except (TypeError, ValueError, AssertionError):
+            msg = "Input ``maxsize`` must be a non-negative integer"
+            raise ValueError(msg)
+        self._maxsize = maxsize
+        self._evict()
+
+    def __len__(self):
+        return len(self._meshes)
+
+    def clear(self):
+        """ Remove all meshes from the cache.
+        """
+        self._meshes.clear()
+
+    def get_mesh(self, x, y, z, xperiod, yperiod, zperiod,
+            approx_xcell_size, approx_ycell_size, approx_zcell_size):
+        """ Return the
+        `~halotools.mock_observables.pair_counters.rectangular_mesh.RectangularMesh`
+        for the input points, building it only if an identical mesh is not already cached.
+
+        Parameters
+        ----------
+        x, y, z : arrays
+            Length-*Npts* arrays containing the spatial position of the *Npts* points.
+
+        xperiod, yperiod, zperiod : floats
+            Length scale defining the periodic boundary conditions in each dimension.
+
+        approx_xcell_size, approx_ycell_size, approx_zcell_size : float
+            approximate cell sizes into which the simulation box will be divided.
+
+        Returns
+        -------
+        mesh : object
+            Instance of `~halotools.mock_observables.pair_counters.rectangular_mesh.RectangularMesh`
+        """
+        if self.maxsize == 0:
+            return RectangularMesh(x, y, z, xperiod, yperiod, zperiod,
+                approx_xcell_size, approx_ycell_size, approx_zcell_size)
+
+        key = (_array_fingerprint(x, y, z),
+            float(xperiod), float(yperiod), float(zperiod),
+            _num_divs(xperiod, approx_xcell_size),
+            _num_divs(yperiod, approx_ycell_size),
+            _num_divs(zperiod, approx_zcell_size))
+
+        try:
+            mesh = self._meshes.pop(key)
+            self.hits += 1
+        except KeyError:
+            mesh = RectangularMesh(x, y, z, xperiod, yperiod, zperiod,
+                approx_xcell_size, approx_ycell_size, approx_zcell_size)
+            self.misses += 1
+        self._meshes[key] = mesh
+        self._evict()
+        return mesh
+
+    def _evict(self):
+        while len(self._meshes) > self.maxsize:
+            self._meshes.popitem(last=False)
+
+
+# Disabled by default; see the docstring of RectangularMeshCache to opt in
+default_mesh_cache = RectangularMeshCache(maxsize=0)
+
+
 class RectangularDoubleMesh(object):
     """ Fundamental data structure of the `~halotools.mock_observables` sub-package.
     `~halotools.mock_observables.RectangularDoubleMesh` is built up from two instances
@@ -192,7 +344,8 @@ class RectangularDoubleMesh(object):
             search_xlength, search_ylength, search_zlength,
             xperiod, yperiod, zperiod, PBCs=True,
             max_cells_per_dimension_cell1=default_max_cells_per_dimension_cell1,
-            max_cells_per_dimension_cell2=default_max_cells_per_dimension_cell2):
+            max_cells_per_dimension_cell2=default_max_cells_per_dimension_cell2,
+            mesh_cache=None):
         """
         Parameters
         ----------
@@ -236,6 +389,12 @@ class RectangularDoubleMesh(object):
         max_cells_per_dimension_cell2 : int, optional
             Maximum number of cells per dimension. Default is 50.
 
+        mesh_cache : object, optional
+            Instance of `~halotools.mock_observables.pair_counters.RectangularMeshCache`
+            used to retrieve previously built meshes of identical samples.
+            Default is the module-level ``default_mesh_cache``, which does not
+            store any meshes unless its ``maxsize`` has been set to a positive integer.
+
         """
         self.xperiod = xperiod
         self.yperiod = yperiod
@@ -247,13 +406,16 @@ class RectangularDoubleMesh(object):
 
         self._check_sensible_constructor_inputs()
 
+        if mesh_cache is None:
+            mesh_cache = default_mesh_cache
+
         approx_x1cell_size = sample1_cell_size(xperiod, search_xlength, approx_x1cell_size,
             max_cells_per_dimension=max_cells_per_dimension_cell1)
         approx_y1cell_size = sample1_cell_size(yperiod, search_ylength, approx_y1cell_size,
             max_cells_per_dimension=max_cells_per_dimension_cell1)
         approx_z1cell_size = sample1_cell_size(zperiod, search_zlength, approx_z1cell_size,
                 max_cells_per_dimension=max_cells_per_dimension_cell1)
-        self.mesh1 = RectangularMesh(x1, y1, z1, xperiod, yperiod, zperiod,
+        self.mesh1 = mesh_cache.get_mesh(x1, y1, z1, xperiod, yperiod, zperiod,
             approx_x1cell_size, approx_y1cell_size, approx_z1cell_size)
 
         approx_x2cell_size = sample2_cell_sizes(xperiod, self.mesh1.xcell_size, approx_x2cell_size,
@@ -262,7 +424,7 @@ class RectangularDoubleMesh(object):
             max_cells_per_dimension=max_cells_per_dimension_cell2)
         approx_z2cell_size = sample2_cell_sizes(zperiod, self.mesh1.zcell_size, approx_z2cell_size,
             max_cells_per_dimension=max_cells_per_dimension_cell2)
-        self.mesh2 = RectangularMesh(x2, y2, z2, xperiod, yperiod, zperiod,
+        self.mesh2 = mesh_cache.get_mesh(x2, y2, z2, xperiod, yperiod, zperiod,
             approx_x2cell_size, approx_y2cell_size, approx_z2cell_size)
 
         self.num_xcell2_per_xcell1 = self.mesh2.num_xdivs // self.mesh1.num_xdivs
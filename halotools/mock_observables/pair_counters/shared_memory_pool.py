@@ -0,0 +1,256 @@
+""" Module containing `~halotools.mock_observables.pair_counters.SharedMemoryPool`,
+a persistent pool of worker processes used to parallelize the pair-counting engines
+without serializing the input coordinates and mesh arrays to every worker.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import numpy as np
+import multiprocessing
+import weakref
+from copy import copy
+
+try:
+    from multiprocessing import shared_memory, resource_tracker
+except ImportError:
+    shared_memory = None
+
+from .rectangular_mesh import RectangularMesh, RectangularDoubleMesh
+from .rectangular_mesh_2d import RectangularMesh2D, RectangularDoubleMesh2D
+from ...custom_exceptions import HalotoolsError
+
+__all__ = ('SharedMemoryPool', )
+
+# Arrays smaller than this are cheaper to pickle than to place in shared memory
+min_shared_nbytes = 2**16
+
+_mesh_classes = (RectangularMesh, RectangularDoubleMesh, RectangularMesh2D, RectangularDoubleMesh2D)
+
+
+class _SharedArrayDescriptor(object):
+    """ Lightweight picklable placeholder for an array stored in a shared memory block.
+    """
+
+    def __init__(self, name, shape, dtype):
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+
+
+class SharedMemoryPool(object):
+    """ Persistent pool of worker processes for the
+    `~halotools.mock_observables` pair counters.
+
+    When the pair counters are called with ``num_threads`` set to an integer,
+    a new ``multiprocessing.Pool`` is created on every call and the
+    `~halotools.mock_observables.pair_counters.RectangularDoubleMesh` and coordinate arrays
+    are pickled and sent to each worker. If instead an instance of
+    `SharedMemoryPool` is passed as the ``num_threads`` argument,
+    the worker processes are reused across calls,
+    and the coordinate and mesh arrays are placed in shared memory
+    that the workers attach to without copying.
+
+    Each array is copied into shared memory the first time it is passed to the pool,
+    and the shared memory block is reused whenever the same array object
+    is passed again, e.g., a fixed random catalog, or the meshes of a
+    `~halotools.mock_observables.pair_counters.RectangularMeshCache`.
+    A block is released when its array is garbage collected or the pool is closed.
+
+    Notes
+    -----
+    Requires python 3.8 or later.
+
+    Because shared memory blocks are matched to arrays by identity,
+    an array must not be modified in place between calls that use the same pool.
+
+    Examples
+    --------
+    >>> from halotools.mock_observables import npairs_3d
+    >>> Npts, Lbox = 1000, 250.
+    >>> sample1 = np.random.uniform(0, Lbox, Npts*3).reshape((Npts, 3))
+    >>> rbins = np.logspace(-1, 1, 10)
+
+    >>> with SharedMemoryPool(2) as pool: # doctest: +SKIP
+    ...     result = npairs_3d(sample1, sample1, rbins, period=Lbox, num_threads=pool)
+    ...     result2 = npairs_3d(sample1, sample1, rbins[:5], period=Lbox, num_threads=pool)
+    """
+
+    def __init__(self, num_processes='max'):
+        """
+        Parameters
+        ----------
+        num_processes : int, optional
+            Number of worker processes. A string 'max' may be used to indicate that
+            the pool should use all available cores on the machine. Default is 'max'.
+        """
+        if shared_memory is None:
+            msg = ("The SharedMemoryPool class requires python 3.8 or later.\n"
+                "Use an integer value for ``num_threads`` instead.\n")
+            raise HalotoolsError(msg)
+
+        if num_processes == 'max':
+            num_processes = multiprocessing.cpu_count()
+        try:
+            assert int(num_processes) == num_processes
+            assert num_processes > 0
+        except (TypeError, ValueError, AssertionError):
+            msg = "Input ``num_processes`` must be a positive integer or the string 'max'"
+            raise ValueError(msg)
+
+        self.num_processes = int(num_processes)
+        self._pool = multiprocessing.Pool(self.num_processes)
+        # id of each shared array -> (weak reference to the array, block, descriptor)
+        self._segments = {}
+
+    def map(self, engine, cell1_tuples):
+        """ Evaluate the pair-counting ``engine`` on each element of ``cell1_tuples``.
+
+        Parameters
+        ----------
+        engine : functools.partial
+            Pair-counting engine with all arguments bound except the final ``cell1_tuple``.
+
+        cell1_tuples : list
+            List of two-element tuples passed as the final argument of ``engine``.
+
+        Returns
+        -------
+        result : list
+            List storing the output of ``engine`` for each element of ``cell1_tuples``.
+        """
+        if self._pool is None:
+            raise HalotoolsError("Cannot use a SharedMemoryPool after it has been closed")
+
+        args = tuple(_share(arg, self._share_array) for arg in engine.args)
+        keywords = dict((key, _share(val, self._share_array))
+            for key, val in engine.keywords.items())
+        tasks = [(engine.func, args, keywords, cell1_tuple) for cell1_tuple in cell1_tuples]
+        return list(self._pool.imap(_shared_memory_engine_worker, tasks, chunksize=1))
+
+    @property
+    def num_shared_arrays(self):
+        """ Number of arrays currently stored in shared memory by the pool.
+        """
+        return len(self._segments)
+
+    def _share_array(self, arr):
+        """ Return the descriptor of the shared memory block storing ``arr``,
+        copying ``arr`` into a new block only if it has not been shared before.
+        """
+        key = id(arr)
+        try:
+            ref, block, descriptor = self._segments[key]
+            if ref() is arr:
+                return descriptor
+        except KeyError:
+            pass
+
+        block = shared_memory.SharedMemory(create=True, size=arr.nbytes)
+        np.ndarray(arr.shape, dtype=arr.dtype, buffer=block.buf)[...] = arr
+        descriptor = _SharedArrayDescriptor(block.name, arr.shape, arr.dtype)
+
+        # The callback only references the dictionary of segments, not the pool,
+        # so that the segments do not keep the pool alive
+        segments = self._segments
+
+        def release_segment(ref, key=key):
+            if (key in segments) and (segments[key][0] is ref):
+                _release_block(segments.pop(key)[1])
+
+        self._segments[key] = (weakref.ref(arr, release_segment), block, descriptor)
+        return descriptor
+
+    def close(self):
+        """ Shut down the worker processes and release all shared memory blocks.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        while len(self._segments) > 0:
+            __, (ref, block, descriptor) = self._segments.popitem()
+            _release_block(block)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _share(obj, share_array):
+    """ Return a picklable version of ``obj`` in which every sufficiently large array,
+    including the arrays bound to mesh objects, is replaced with the descriptor
+    of its shared memory block returned by the ``share_array`` function.
+    """
+    if isinstance(obj, np.ndarray):
+        if obj.nbytes < min_shared_nbytes or obj.dtype.hasobject:
+            return obj
+        return share_array(obj)
+    elif isinstance(obj, _mesh_classes):
+        obj = copy(obj)
+        for key, val in list(vars(obj).items()):
+            setattr(obj, key, _share(val, share_array))
+        return obj
+    else:
+        return obj
+
+
+def _release_block(block):
+    """ Close and unlink a shared memory block created by `SharedMemoryPool`.
+    """
+    block.close()
+    try:
+        block.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _attach(obj, blocks):
+    """ Inverse of `_share`: replace each shared-array descriptor with a
+    zero-copy view of the corresponding shared memory block.
+    """
+    if isinstance(obj, _SharedArrayDescriptor):
+        block = _attach_block(obj.name)
+        blocks.append(block)
+        return np.ndarray(obj.shape, dtype=obj.dtype, buffer=block.buf)
+    elif isinstance(obj, _mesh_classes):
+        for key, val in list(vars(obj).items()):
+            setattr(obj, key, _attach(val, blocks))
+        return obj
+    else:
+        return obj
+
+
+def _attach_block(name):
+    """ Attach to an existing shared memory block without registering it with the
+    resource tracker of the worker process, since the block is owned and
+    unlinked by the parent process.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # python < 3.13 has no ``track`` argument
+        block = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(block._name, 'shared_memory')
+        return block
+
+
+def _shared_memory_engine_worker(task):
+    """ Function evaluated by the worker processes of `SharedMemoryPool`.
+    """
+    func, args, keywords, cell1_tuple = task
+    blocks = []
+    try:
+        args = tuple(_attach(arg, blocks) for arg in args)
+        keywords = dict((key, _attach(val, blocks)) for key, val in keywords.items())
+        result = func(*(args + (cell1_tuple, )), **keywords)
+    finally:
+        del args, keywords
+        for block in blocks:
+            try:
+                block.close()
+            except BufferError:
+                # A view of the block is still referenced, e.g., by an exception traceback;
+                # the mapping is released when that reference is garbage collected.
+                pass
+    return result
@@ -0,0 +1,114 @@
+"""
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+import json
+import numpy as np
+import pytest
+from astropy.utils.misc import NumpyRNGContext
+
+from ..npairs_3d import npairs_3d
+from ..rectangular_mesh import RectangularDoubleMesh
+from ..cell_size_tuning import auto_cell_sizes, tune_cell_sizes, _candidate_cell_sizes
+from ..mesh_helpers import _set_approximate_cell_sizes
+
+__all__ = ('test_auto_cell_sizes_npairs_3d', )
+
+fixed_seed = 43
+
+
+def test_candidate_cell_sizes_recover_mesh_geometry():
+    period = np.array([250., 250., 250.])
+    search_length = np.array([20., 20., 20.])
+    candidates = _candidate_cell_sizes(10**5, 10**5, search_length, period)
+    assert len(candidates) > 1
+
+    for approx_cell1_size, approx_cell2_size in candidates[:5]:
+        num_divs = np.floor(period/approx_cell1_size)
+        assert np.all(num_divs >= 3)
+        assert np.all(period/num_divs >= search_length)
+        assert np.all(approx_cell2_size <= period/num_divs + 1e-8)
+
+
+def test_candidate_cell_sizes_depend_on_density():
+    period = np.array([250., 250., 250.])
+    search_length = np.array([5., 5., 5.])
+    sparse_cell1_size = _candidate_cell_sizes(100, 100, search_length, period)[0][0]
+    dense_cell1_size = _candidate_cell_sizes(10**6, 10**6, search_length, period)[0][0]
+    assert np.all(sparse_cell1_size >= dense_cell1_size)
+
+
+def test_auto_cell_sizes_cache(tmpdir):
+    cache_fname = os.path.join(str(tmpdir), 'cell_sizes.json')
+    approx_cell1_size, approx_cell2_size = auto_cell_sizes(
+        1000, 2000, 20., 250., cache_fname=cache_fname)
+    assert os.path.isfile(cache_fname)
+    with open(cache_fname, 'r') as f:
+        cache = json.load(f)
+    assert len(cache) == 1
+
+    #  Overwrite the cached choice to verify that the cache is used on the next call
+    key = list(cache.keys())[0]
+    cache[key] = [[50., 50., 50.], [25., 25., 25.]]
+    with open(cache_fname, 'w') as f:
+        json.dump(cache, f)
+    approx_cell1_size, approx_cell2_size = auto_cell_sizes(
+        1000, 2000, 20., 250., cache_fname=cache_fname)
+    assert np.all(approx_cell1_size == 50.)
+    assert np.all(approx_cell2_size == 25.)
+
+
+def test_tune_cell_sizes(tmpdir):
+    cache_fname = os.path.join(str(tmpdir), 'cell_sizes.json')
+    Lbox, npts = 1., 2000
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts, 3))
+
+    tuned_cell1_size, tuned_cell2_size = tune_cell_sizes(
+        sample1, sample1, 0.1, Lbox, cache_fname=cache_fname)
+    auto_cell1_size, auto_cell2_size = auto_cell_sizes(
+        npts, npts, 0.1, Lbox, cache_fname=cache_fname)
+    assert np.all(tuned_cell1_size == auto_cell1_size)
+    assert np.all(tuned_cell2_size == auto_cell2_size)
+
+
+def test_auto_cell_sizes_npairs_3d():
+    npts1, npts2 = 1000, 2000
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts1, 3))
+        sample2 = np.random.random((npts2, 3))
+    rbins = np.logspace(-2, -1, 10)
+
+    default_result = npairs_3d(sample1, sample2, rbins, period=1)
+    auto_result = npairs_3d(sample1, sample2, rbins, period=1, approx_cell1_size='auto')
+    assert np.all(default_result == auto_result)
+
+    nonperiodic_default_result = npairs_3d(sample1, sample2, rbins)
+    nonperiodic_auto_result = npairs_3d(sample1, sample2, rbins,
+        approx_cell1_size='auto', approx_cell2_size='auto')
+    assert np.all(nonperiodic_default_result == nonperiodic_auto_result)
+
+
+def test_auto_cell_sizes_mesh():
+    npts1, npts2 = 1000, 2000
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts1, 3))
+        sample2 = np.random.random((npts2, 3))
+    x1, y1, z1 = sample1[:, 0], sample1[:, 1], sample1[:, 2]
+    x2, y2, z2 = sample2[:, 0], sample2[:, 1], sample2[:, 2]
+    period = np.array([1., 1., 1.])
+    approx_cell1_size, approx_cell2_size = _set_approximate_cell_sizes(
+        'auto', None, period, npts1=npts1, npts2=npts2, search_length=(0.1, 0.1, 0.1))
+    double_mesh = RectangularDoubleMesh(x1, y1, z1, x2, y2, z2,
+        approx_cell1_size[0], approx_cell1_size[1], approx_cell1_size[2],
+        approx_cell2_size[0], approx_cell2_size[1], approx_cell2_size[2],
+        0.1, 0.1, 0.1, 1., 1., 1.)
+    assert double_mesh.mesh1.num_xdivs == np.floor(1./approx_cell1_size[0])
+
+
+def test_auto_cell_sizes_unsupported():
+    with pytest.raises(ValueError) as err:
+        _set_approximate_cell_sizes('auto', None, np.array([1., 1., 1.]))
+    substr = "This function does not support ``approx_cell1_size`` = 'auto'"
+    assert substr in err.value.args[0]
@@ -0,0 +1,117 @@
+""" Module providing unit-testing for the ``precision`` argument
+of the pair counters.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import numpy as np
+import pytest
+from astropy.utils.misc import NumpyRNGContext
+
+from ..npairs_3d import npairs_3d
+from ..npairs_xy_z import npairs_xy_z
+from ..npairs_per_object_3d import npairs_per_object_3d
+from ..mesh_helpers import _coordinates_with_precision
+from ..pairs import npairs as pure_python_brute_force_npairs_3d
+from ...counts_in_cells import counts_in_cylinders
+
+__all__ = ('test_coordinates_with_precision', )
+
+fixed_seed = 43
+
+
+def test_coordinates_with_precision():
+    x64 = np.linspace(0, 1, 5)
+    x32 = x64.astype('f4')
+
+    result = _coordinates_with_precision(None, x32, x32)
+    assert all(x.dtype == np.float32 for x in result)
+    assert result[0] is x32
+
+    result = _coordinates_with_precision(None, x32, x64)
+    assert all(x.dtype == np.float64 for x in result)
+
+    result = _coordinates_with_precision('float32', x64, x64)
+    assert all(x.dtype == np.float32 for x in result)
+
+    result = _coordinates_with_precision('float64', x32, x32)
+    assert all(x.dtype == np.float64 for x in result)
+
+
+def test_coordinates_with_precision_error():
+    x = np.linspace(0, 1, 5)
+    with pytest.raises(ValueError) as err:
+        __ = _coordinates_with_precision('float16', x, x)
+    substr = "Input ``precision`` must be None, 'float32' or 'float64'"
+    assert substr in err.value.args[0]
+
+
+@pytest.mark.parametrize('period', (None, 1.))
+def test_npairs_3d_float32(period):
+    npts = 200
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts, 3)).astype('f4')
+        sample2 = np.random.random((npts, 3)).astype('f4')
+    rbins = np.array((0.01, 0.05, 0.1, 0.2))
+
+    result32 = npairs_3d(sample1, sample2, rbins, period=period)
+    result64 = npairs_3d(sample1, sample2, rbins, period=period, precision='float64')
+    assert np.all(result32 == result64)
+
+    result = npairs_3d(sample1.astype('f8'), sample2.astype('f8'), rbins,
+        period=period, precision='float32')
+    assert np.all(result == result64)
+
+    result_brute = pure_python_brute_force_npairs_3d(
+        sample1.astype('f8'), sample2.astype('f8'), rbins, period=period)
+    assert np.all(result64 == result_brute)
+
+
+def test_npairs_xy_z_float32():
+    npts = 200
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts, 3)).astype('f4')
+        sample2 = np.random.random((npts, 3)).astype('f4')
+    rp_bins = np.array((0.01, 0.05, 0.1, 0.2))
+    pi_bins = np.array((0.05, 0.1, 0.2))
+
+    result32 = npairs_xy_z(sample1, sample2, rp_bins, pi_bins, period=1)
+    result64 = npairs_xy_z(sample1, sample2, rp_bins, pi_bins, period=1,
+        precision='float64')
+    assert np.all(result32 == result64)
+
+
+def test_npairs_per_object_3d_float32():
+    npts = 200
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts, 3)).astype('f4')
+        sample2 = np.random.random((npts, 3)).astype('f4')
+    rbins = np.array((0.01, 0.05, 0.1, 0.2))
+
+    result32 = npairs_per_object_3d(sample1, sample2, rbins, period=1)
+    result64 = npairs_per_object_3d(sample1, sample2, rbins, period=1,
+        precision='float64')
+    assert np.all(result32 == result64)
+
+
+def test_counts_in_cylinders_float32():
+    npts = 200
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts, 3)).astype('f4')
+        sample2 = np.random.random((npts, 3)).astype('f4')
+
+    result32 = counts_in_cylinders(sample1, sample2, 0.1, 0.2, period=1)
+    result64 = counts_in_cylinders(sample1, sample2, 0.1, 0.2, period=1,
+        precision='float64')
+    assert np.all(result32 == result64)
+
+
+def test_npairs_3d_precision_error():
+    npts = 10
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts, 3))
+    rbins = np.array((0.01, 0.05, 0.1, 0.2))
+
+    with pytest.raises(ValueError) as err:
+        __ = npairs_3d(sample1, sample1, rbins, period=1, precision='double')
+    substr = "Input ``precision`` must be None, 'float32' or 'float64'"
+    assert substr in err.value.args[0]
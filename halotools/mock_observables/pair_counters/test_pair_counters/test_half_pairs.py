@@ -0,0 +1,121 @@
+"""
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import numpy as np
+import pytest
+from astropy.utils.misc import NumpyRNGContext
+
+from ..npairs_3d import npairs_3d
+from ..npairs_xy_z import npairs_xy_z
+from ..npairs_s_mu import npairs_s_mu
+from ..rectangular_mesh import RectangularDoubleMesh
+from ..mesh_helpers import _samples_are_identical, _mesh_supports_half_pairs
+from ..pairs import npairs as pure_python_brute_force_npairs_3d
+from ..pairs import xy_z_npairs as pure_python_brute_force_npairs_xy_z
+from ..pairs import s_mu_npairs as pure_python_brute_force_npairs_s_mu
+from ..cpairs import npairs_3d_engine
+
+__all__ = ('test_half_pairs_npairs_3d_periodic', )
+
+fixed_seed = 43
+
+
+@pytest.mark.parametrize('cell_size', (0.1, 0.2, 0.34))
+def test_half_pairs_npairs_3d_periodic(cell_size):
+    npts = 300
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts, 3))
+    rbins = np.array((0.0, 0.05, 0.1, 0.2))
+
+    result = npairs_3d(sample1, sample1, rbins, period=1, approx_cell1_size=cell_size)
+    test_result = pure_python_brute_force_npairs_3d(sample1, sample1, rbins, period=1)
+    assert np.all(result == test_result)
+
+
+@pytest.mark.parametrize('cell_size', (0.1, 0.2, 0.34))
+def test_half_pairs_npairs_3d_non_periodic(cell_size):
+    npts = 300
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts, 3))
+    rbins = np.array((0.0, 0.05, 0.1, 0.2))
+
+    result = npairs_3d(sample1, sample1, rbins, approx_cell1_size=cell_size)
+    test_result = pure_python_brute_force_npairs_3d(sample1, sample1, rbins)
+    assert np.all(result == test_result)
+
+
+def test_half_pairs_npairs_3d_parallel():
+    npts = 300
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts, 3))
+    rbins = np.array((0.0, 0.05, 0.1, 0.2))
+
+    serial_result = npairs_3d(sample1, sample1, rbins, period=1)
+    parallel_result = npairs_3d(sample1, sample1.copy(), rbins, period=1, num_threads=2)
+    assert np.all(serial_result == parallel_result)
+
+
+def test_half_pairs_npairs_xy_z():
+    npts = 300
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts, 3))
+    rp_bins = np.array((0.0, 0.05, 0.1, 0.2))
+    pi_bins = np.array((0.0, 0.1, 0.2))
+
+    result = npairs_xy_z(sample1, sample1, rp_bins, pi_bins, period=1)
+    test_result = pure_python_brute_force_npairs_xy_z(sample1, sample1, rp_bins, pi_bins, period=1)
+    assert np.all(result == test_result)
+
+    result = npairs_xy_z(sample1, sample1, rp_bins, pi_bins)
+    test_result = pure_python_brute_force_npairs_xy_z(sample1, sample1, rp_bins, pi_bins)
+    assert np.all(result == test_result)
+
+
+def test_half_pairs_npairs_s_mu():
+    npts = 300
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts, 3))
+    s_bins = np.array((0.0, 0.05, 0.1, 0.2))
+    mu_bins = np.linspace(0, 1, 5)
+
+    result = npairs_s_mu(sample1, sample1, s_bins, mu_bins, period=1)
+    test_result = pure_python_brute_force_npairs_s_mu(sample1, sample1, s_bins, mu_bins, period=1)
+    assert np.all(result == test_result)
+
+
+def test_samples_are_identical():
+    with NumpyRNGContext(fixed_seed):
+        x, y, z = np.random.random((3, 100))
+
+    assert _samples_are_identical(x, y, z, x, y, z)
+    assert _samples_are_identical(x, y, z, x.copy(), y.copy(), z.copy())
+    assert not _samples_are_identical(x, y, z, x[::-1], y[::-1], z[::-1])
+    assert not _samples_are_identical(x, y, z, x[1:], y[1:], z[1:])
+
+
+def test_mesh_supports_half_pairs():
+    with NumpyRNGContext(fixed_seed):
+        x, y, z = np.random.random((3, 100))
+
+    double_mesh = RectangularDoubleMesh(x, y, z, x, y, z,
+        0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.1, 0.1, 0.1, 1, 1, 1)
+    assert _mesh_supports_half_pairs(double_mesh)
+
+    double_mesh = RectangularDoubleMesh(x, y, z, x, y, z,
+        0.2, 0.2, 0.2, 0.05, 0.05, 0.05, 0.1, 0.1, 0.1, 1, 1, 1)
+    assert not _mesh_supports_half_pairs(double_mesh)
+
+
+def test_half_pairs_engine_mesh_error():
+    with NumpyRNGContext(fixed_seed):
+        x, y, z = np.random.random((3, 100))
+    rbins = np.array((0.0, 0.05, 0.1))
+
+    double_mesh = RectangularDoubleMesh(x, y, z, x, y, z,
+        0.2, 0.2, 0.2, 0.05, 0.05, 0.05, 0.1, 0.1, 0.1, 1, 1, 1)
+    with pytest.raises(ValueError) as err:
+        npairs_3d_engine(double_mesh, x, y, z, x, y, z, rbins,
+            (0, double_mesh.mesh1.ncells), half_pairs=1)
+    substr = "Counting half pairs requires mesh1 and mesh2 to have identical cells"
+    assert substr in err.value.args[0]
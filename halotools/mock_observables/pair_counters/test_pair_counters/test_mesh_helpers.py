@@ -2,12 +2,22 @@
 """
 from __future__ import absolute_import, division, print_function
 
+import itertools
+import numpy as np
 import pytest
+from astropy.utils.misc import NumpyRNGContext
 
 from ..mesh_helpers import _set_approximate_cell_sizes, _enforce_maximum_search_length
+from ..mesh_helpers import _cell1_parallelization_indices, _cell1_work_estimates
+from ..mesh_helpers import _cost_balanced_cell1_tuples
+from ..rectangular_mesh import RectangularDoubleMesh
+
+from ...tests.cf_helpers import generate_locus_of_3d_points
 
 __all__ = ('test_set_approximate_cell_sizes', )
 
+fixed_seed = 43
+
 
 def test_set_approximate_cell_sizes():
     approx_cell1_size, approx_cell2_size = 0.1, 0.1
@@ -77,3 +87,77 @@ def test_enforce_maximum_search_length_case7():
 
     search_length, period = (1, 4, 2), (4, 100, 7)
     _enforce_maximum_search_length(search_length, period)
+
+
+def test_cell1_work_estimates():
+    """ Compare the vectorized estimate against an explicit loop over the cells
+    searched by the engine for each cell1.
+    """
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((1000, 3))
+        sample2 = np.random.random((2000, 3))**2
+    double_mesh = RectangularDoubleMesh(
+        sample1[:, 0], sample1[:, 1], sample1[:, 2],
+        sample2[:, 0], sample2[:, 1], sample2[:, 2],
+        0.2, 0.25, 0.1, 0.1, 0.125, 0.05, 0.15, 0.1, 0.2, 1, 1, 1)
+    mesh1, mesh2 = double_mesh.mesh1, double_mesh.mesh2
+    num_divs1 = (mesh1.num_xdivs, mesh1.num_ydivs, mesh1.num_zdivs)
+    num_divs2 = (mesh2.num_xdivs, mesh2.num_ydivs, mesh2.num_zdivs)
+    search_lengths = (double_mesh.search_xlength, double_mesh.search_ylength,
+        double_mesh.search_zlength)
+    cell_sizes = (mesh2.xcell_size, mesh2.ycell_size, mesh2.zcell_size)
+    num_cell2_points = np.diff(mesh2.cell_id_indices).reshape(num_divs2)
+
+    work = _cell1_work_estimates(double_mesh)
+    assert len(work) == mesh1.ncells
+    for icell1 in range(mesh1.ncells):
+        cell1_index = np.unravel_index(icell1, num_divs1)
+        cell2_ranges = []
+        for i in range(3):
+            num_cell2_per_cell1 = num_divs2[i] // num_divs1[i]
+            num_covering_steps = int(np.ceil(search_lengths[i]/cell_sizes[i]))
+            first = cell1_index[i]*num_cell2_per_cell1 - num_covering_steps
+            last = (cell1_index[i]+1)*num_cell2_per_cell1 + num_covering_steps
+            cell2_ranges.append([idx % num_divs2[i] for idx in range(first, last)])
+        num_neighbors = sum(num_cell2_points[idx] for idx in itertools.product(*cell2_ranges))
+        num_cell1_points = mesh1.cell_id_indices[icell1+1] - mesh1.cell_id_indices[icell1]
+        assert work[icell1] == num_cell1_points*num_neighbors + 1
+
+
+def test_cost_balanced_cell1_tuples():
+    work = np.array([1, 1, 1, 1, 100, 1, 1, 1])
+    assert _cost_balanced_cell1_tuples(work, 3) == [(0, 4), (4, 5), (5, 8)]
+
+    work = np.ones(10)
+    assert _cost_balanced_cell1_tuples(work, 1) == [(0, 10)]
+    assert _cost_balanced_cell1_tuples(work, 10) == [(i, i+1) for i in range(10)]
+
+
+def test_cell1_parallelization_indices_clustered_sample():
+    """ For a sample with all points in a single dense clump, verify that the
+    work units tile the mesh and that the dense cells are isolated
+    in their own work units.
+    """
+    Lbox = 1.
+    sample1 = generate_locus_of_3d_points(2000, xc=0.55, yc=0.55, zc=0.55, epsilon=0.01,
+        seed=fixed_seed)
+    with NumpyRNGContext(fixed_seed):
+        sample2 = np.random.random((2000, 3))
+    double_mesh = RectangularDoubleMesh(
+        sample1[:, 0], sample1[:, 1], sample1[:, 2],
+        sample2[:, 0], sample2[:, 1], sample2[:, 2],
+        0.1, 0.1, 0.1, 0.1, 0.1, 0.1, 0.1, 0.1, 0.1, Lbox, Lbox, Lbox)
+    ncells = double_mesh.mesh1.ncells
+
+    num_threads, cell1_tuples = _cell1_parallelization_indices(ncells, 4,
+        double_mesh=double_mesh)
+    assert num_threads <= 4
+    assert cell1_tuples[0][0] == 0
+    assert cell1_tuples[-1][1] == ncells
+    assert np.all([a[1] == b[0] for a, b in zip(cell1_tuples[:-1], cell1_tuples[1:])])
+
+    dense_cell = np.argmax(np.diff(double_mesh.mesh1.cell_id_indices))
+    assert (dense_cell, dense_cell+1) in cell1_tuples
+
+    __, static_cell1_tuples = _cell1_parallelization_indices(ncells, 4)
+    assert len(static_cell1_tuples) == 4
@@ -0,0 +1,77 @@
+"""
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import numpy as np
+import pytest
+from astropy.utils.misc import NumpyRNGContext
+
+from ..npairs_3d import npairs_3d
+from ..npairs_multi_3d import npairs_multi_3d
+
+from ...tests.cf_helpers import generate_locus_of_3d_points
+
+__all__ = ('test_npairs_multi_3d_agrees_with_npairs_3d', )
+
+fixed_seed = 43
+
+
+def test_npairs_multi_3d_agrees_with_npairs_3d():
+    npts1, npts2, npts3 = 1000, 500, 2000
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts1, 3))
+        sample2 = np.random.random((npts2, 3))
+        sample3 = np.random.random((npts3, 3))
+    samples = [sample1, sample2, sample3]
+    rbins = np.logspace(-2, -1, 10)
+    pairs = [(0, 0), (0, 1), (1, 1), (0, 2), (1, 2), (2, 2), (2, 0)]
+
+    for period in (1, None):
+        result = npairs_multi_3d(samples, pairs, rbins, period=period)
+        assert result.shape == (len(pairs), len(rbins))
+        for (i, j), counts in zip(pairs, result):
+            correct_counts = npairs_3d(samples[i], samples[j], rbins, period=period)
+            assert np.all(counts == correct_counts)
+
+
+def test_npairs_multi_3d_parallel():
+    npts1, npts2 = 1000, 2000
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts1, 3))
+        sample2 = np.random.random((npts2, 3))
+    rbins = np.logspace(-2, -1, 10)
+    pairs = [(0, 0), (0, 1), (1, 1)]
+
+    serial_result = npairs_multi_3d([sample1, sample2], pairs, rbins, period=1)
+    parallel_result = npairs_multi_3d([sample1, sample2], pairs, rbins, period=1,
+        num_threads=2)
+    assert np.all(serial_result == parallel_result)
+
+
+def test_npairs_multi_3d_tight_loci():
+    """ Two tight loci separated by 0.2 in each of the x and y dimensions,
+    together with a third sample that is never paired.
+    """
+    npts1, npts2, npts3 = 100, 200, 300
+    data1 = generate_locus_of_3d_points(npts1, xc=0.1, yc=0.1, zc=0.1, seed=fixed_seed)
+    data2 = generate_locus_of_3d_points(npts2, xc=0.3, yc=0.3, zc=0.1, seed=fixed_seed)
+    data3 = generate_locus_of_3d_points(npts3, xc=0.8, yc=0.8, zc=0.8, seed=fixed_seed)
+    rbins = np.array([0.1, 0.2, 0.3])
+
+    D1D1, D1D2, D2D1 = npairs_multi_3d([data1, data2, data3],
+        [(0, 0), (0, 1), (1, 0)], rbins, period=1)
+    assert np.all(D1D1 == npts1*npts1)
+    assert np.all(D1D2 == [0, 0, npts1*npts2])
+    assert np.all(D2D1 == D1D2)
+
+
+def test_npairs_multi_3d_bad_pairs():
+    npts = 100
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts, 3))
+    rbins = np.logspace(-2, -1, 5)
+
+    with pytest.raises(ValueError) as err:
+        npairs_multi_3d([sample1], [(0, 1)], rbins, period=1)
+    substr = "Input ``pairs`` must be a non-empty sequence of two-element tuples"
+    assert substr in err.value.args[0]
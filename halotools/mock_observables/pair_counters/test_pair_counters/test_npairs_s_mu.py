@@ -168,3 +168,16 @@ def test_npairs_s_mu_point_surrounded_by_circle():
     assert np.all(pairs[1,:] == 4), msg
 
 
+
+
+def test_npairs_s_mu_fine_binning():
+    """
+    test npairs_s_mu with many bins, some of which are empty.
+    """
+    s_bins = np.linspace(0.001, 0.3, 50)
+    mu_bins = np.linspace(0, 1, 40)
+
+    result = npairs_s_mu(random_sample, random_sample, s_bins, mu_bins, period=period)
+    test_result = pure_python_brute_force_npairs_s_mu(random_sample, random_sample,
+        s_bins, mu_bins, period=period)
+    assert np.all(result == test_result)
@@ -340,3 +340,20 @@ def test_pure_python_npairs_3d_argument_handling3():
     substr = "period should have len == dimension of points"
     assert substr in err.value.args[0]
 
+
+
+def test_npairs_xy_z_fine_binning():
+    """
+    test npairs_xy_z with many bins, some of which are empty.
+    """
+    npts1, npts2 = 100, 90
+    with NumpyRNGContext(fixed_seed):
+        data1 = np.random.random((npts1, 3))
+        data2 = np.random.random((npts2, 3))
+
+    rp_bins = np.linspace(0, 0.3, 50)
+    pi_bins = np.logspace(-4, np.log10(0.3), 40)
+
+    result = npairs_xy_z(data1, data2, rp_bins, pi_bins, period=1)
+    test_result = pure_python_brute_force_npairs_xy_z(data1, data2, rp_bins, pi_bins, period=1)
+    assert np.all(result == test_result)
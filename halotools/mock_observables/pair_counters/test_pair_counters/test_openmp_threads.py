@@ -0,0 +1,84 @@
+"""
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import numpy as np
+import pytest
+from astropy.utils.misc import NumpyRNGContext
+
+from ..npairs_3d import npairs_3d
+from ..npairs_xy_z import npairs_xy_z
+from ..npairs_s_mu import npairs_s_mu
+from ..npairs_per_object_3d import npairs_per_object_3d
+from ..openmp_threads import OpenMPThreads
+
+__all__ = ('test_openmp_threads_npairs_3d', )
+
+fixed_seed = 43
+
+
+def test_openmp_threads_npairs_3d():
+    npts1, npts2 = 5000, 10000
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts1, 3))
+        sample2 = np.random.random((npts2, 3))
+    rbins = np.logspace(-2, -1, 10)
+
+    serial_result = npairs_3d(sample1, sample2, rbins, period=1)
+    threaded_result = npairs_3d(sample1, sample2, rbins, period=1,
+        num_threads=OpenMPThreads(3))
+    assert np.all(serial_result == threaded_result)
+
+    nonperiodic_serial_result = npairs_3d(sample1, sample2, rbins)
+    nonperiodic_threaded_result = npairs_3d(sample1, sample2, rbins,
+        num_threads=OpenMPThreads(3))
+    assert np.all(nonperiodic_serial_result == nonperiodic_threaded_result)
+
+
+def test_openmp_threads_npairs_xy_z():
+    npts1, npts2 = 5000, 10000
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts1, 3))
+        sample2 = np.random.random((npts2, 3))
+    rp_bins = np.logspace(-2, -1, 5)
+    pi_bins = np.linspace(0.01, 0.2, 4)
+
+    serial_result = npairs_xy_z(sample1, sample2, rp_bins, pi_bins, period=1)
+    threaded_result = npairs_xy_z(sample1, sample2, rp_bins, pi_bins, period=1,
+        num_threads=OpenMPThreads(3))
+    assert np.all(serial_result == threaded_result)
+
+
+def test_openmp_threads_npairs_s_mu():
+    npts1, npts2 = 5000, 10000
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts1, 3))
+        sample2 = np.random.random((npts2, 3))
+    s_bins = np.logspace(-2, -1, 5)
+    mu_bins = np.linspace(0, 1, 6)
+
+    serial_result = npairs_s_mu(sample1, sample2, s_bins, mu_bins, period=1)
+    threaded_result = npairs_s_mu(sample1, sample2, s_bins, mu_bins, period=1,
+        num_threads=OpenMPThreads(3))
+    assert np.all(serial_result == threaded_result)
+
+
+def test_openmp_threads_unsupported_engine():
+    npts1, npts2 = 100, 100
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts1, 3))
+        sample2 = np.random.random((npts2, 3))
+    rbins = np.logspace(-2, -1, 5)
+
+    with pytest.raises(ValueError) as err:
+        npairs_per_object_3d(sample1, sample2, rbins, period=1,
+            num_threads=OpenMPThreads(2))
+    substr = "OpenMPThreads is only supported by the pair counters"
+    assert substr in err.value.args[0]
+
+
+def test_openmp_threads_num_threads_error():
+    with pytest.raises(ValueError) as err:
+        OpenMPThreads(0)
+    substr = "Input ``num_threads`` must be a positive integer or the string 'max'"
+    assert substr in err.value.args[0]
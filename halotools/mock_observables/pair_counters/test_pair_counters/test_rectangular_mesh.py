@@ -7,7 +7,8 @@ import numpy as np
 import pytest
 from astropy.utils.misc import NumpyRNGContext
 
-from ..rectangular_mesh import RectangularDoubleMesh, sample1_cell_size
+from ..rectangular_mesh import RectangularDoubleMesh, RectangularMeshCache, sample1_cell_size
+from ..rectangular_mesh import default_mesh_cache
 
 from ...tests.cf_helpers import generate_locus_of_3d_points
 
@@ -163,3 +164,69 @@ def test_search_length_enforcement():
             xperiod, yperiod, zperiod, PBCs=PBCs)
     substr = "The maximum length over which you search for pairs of points"
     assert substr in err.value.args[0]
+
+
+def test_mesh_cache_reuses_identical_samples():
+    with NumpyRNGContext(fixed_seed):
+        points1 = np.random.random((100, 3))
+        points2 = np.random.random((200, 3))
+    cache = RectangularMeshCache(maxsize=4)
+    args = (0.1, 0.1, 0.1, 0.1, 0.1, 0.1, 0.2, 0.2, 0.2, 1, 1, 1)
+
+    double_mesh = RectangularDoubleMesh(
+        points1[:, 0], points1[:, 1], points1[:, 2],
+        points2[:, 0], points2[:, 1], points2[:, 2], *args, mesh_cache=cache)
+    assert cache.misses == 2
+    assert cache.hits == 0
+
+    double_mesh2 = RectangularDoubleMesh(
+        np.copy(points1[:, 0]), np.copy(points1[:, 1]), np.copy(points1[:, 2]),
+        points2[:, 0], points2[:, 1], points2[:, 2], *args, mesh_cache=cache)
+    assert cache.hits == 2
+    assert double_mesh2.mesh1 is double_mesh.mesh1
+    assert double_mesh2.mesh2 is double_mesh.mesh2
+
+
+def test_default_mesh_cache_is_opt_in():
+    with NumpyRNGContext(fixed_seed):
+        points = np.random.random((100, 3))
+    assert default_mesh_cache.maxsize == 0
+    args = (0.1, 0.1, 0.1, 0.1, 0.1, 0.1, 0.2, 0.2, 0.2, 1, 1, 1)
+    __ = RectangularDoubleMesh(points[:, 0], points[:, 1], points[:, 2],
+        points[:, 0], points[:, 1], points[:, 2], *args)
+    assert len(default_mesh_cache) == 0
+    assert default_mesh_cache.hits + default_mesh_cache.misses == 0
+
+
+def test_mesh_cache_distinguishes_samples():
+    with NumpyRNGContext(fixed_seed):
+        points1 = np.random.random((100, 3))
+    points2 = np.copy(points1)
+    points2[0, 0] = 0.5
+    cache = RectangularMeshCache(maxsize=4)
+    mesh1 = cache.get_mesh(points1[:, 0], points1[:, 1], points1[:, 2], 1, 1, 1, 0.1, 0.1, 0.1)
+    mesh2 = cache.get_mesh(points2[:, 0], points2[:, 1], points2[:, 2], 1, 1, 1, 0.1, 0.1, 0.1)
+    assert mesh1 is not mesh2
+    mesh3 = cache.get_mesh(points1[:, 0], points1[:, 1], points1[:, 2], 1, 1, 1, 0.2, 0.2, 0.2)
+    assert mesh3 is not mesh1
+    assert mesh3.num_xdivs == 5
+    assert cache.misses == 3
+
+
+def test_mesh_cache_eviction():
+    with NumpyRNGContext(fixed_seed):
+        points = np.random.random((5, 100, 3))
+    cache = RectangularMeshCache(maxsize=2)
+    meshes = [cache.get_mesh(p[:, 0], p[:, 1], p[:, 2], 1, 1, 1, 0.1, 0.1, 0.1) for p in points]
+    assert len(cache) == 2
+    p = points[-1]
+    assert cache.get_mesh(p[:, 0], p[:, 1], p[:, 2], 1, 1, 1, 0.1, 0.1, 0.1) is meshes[-1]
+    p = points[0]
+    assert cache.get_mesh(p[:, 0], p[:, 1], p[:, 2], 1, 1, 1, 0.1, 0.1, 0.1) is not meshes[0]
+
+    cache.maxsize = 0
+    assert len(cache) == 0
+    with pytest.raises(ValueError) as err:
+        cache.maxsize = -1
+    substr = "Input ``maxsize`` must be a non-negative integer"
+    assert substr in err.value.args[0]
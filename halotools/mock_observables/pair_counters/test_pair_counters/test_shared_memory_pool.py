@@ -0,0 +1,110 @@
+"""
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import numpy as np
+import pytest
+from astropy.utils.misc import NumpyRNGContext
+
+from ..npairs_3d import npairs_3d
+from ..npairs_xy_z import npairs_xy_z
+from ..npairs_per_object_3d import npairs_per_object_3d
+from ..shared_memory_pool import SharedMemoryPool, shared_memory
+
+from ....custom_exceptions import HalotoolsError
+
+__all__ = ('test_shared_memory_pool_npairs_3d', )
+
+fixed_seed = 43
+
+pytestmark = pytest.mark.skipif(shared_memory is None,
+    reason="SharedMemoryPool requires python 3.8 or later")
+
+
+def test_shared_memory_pool_npairs_3d():
+    npts1, npts2 = 5000, 10000
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts1, 3))
+        sample2 = np.random.random((npts2, 3))
+    rbins = np.logspace(-2, -1, 10)
+
+    serial_result = npairs_3d(sample1, sample2, rbins, period=1)
+    with SharedMemoryPool(2) as pool:
+        pool_result = npairs_3d(sample1, sample2, rbins, period=1, num_threads=pool)
+        assert np.all(serial_result == pool_result)
+        # the same workers are reused on subsequent calls
+        pool_result2 = npairs_3d(sample1, sample2, rbins[:5], period=1, num_threads=pool)
+        assert np.all(serial_result[:5] == pool_result2)
+
+
+def test_shared_memory_pool_npairs_xy_z():
+    npts1, npts2 = 5000, 10000
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts1, 3))
+        sample2 = np.random.random((npts2, 3))
+    rp_bins = np.logspace(-2, -1, 5)
+    pi_bins = np.linspace(0, 0.2, 4)
+
+    serial_result = npairs_xy_z(sample1, sample2, rp_bins, pi_bins, period=1)
+    with SharedMemoryPool(3) as pool:
+        pool_result = npairs_xy_z(sample1, sample2, rp_bins, pi_bins, period=1, num_threads=pool)
+    assert np.all(serial_result == pool_result)
+
+
+def test_shared_memory_pool_npairs_per_object_3d():
+    npts1, npts2 = 1000, 10000
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts1, 3))
+        sample2 = np.random.random((npts2, 3))
+    rbins = np.logspace(-2, -1, 5)
+
+    serial_result = npairs_per_object_3d(sample1, sample2, rbins, period=1)
+    with SharedMemoryPool(2) as pool:
+        pool_result = npairs_per_object_3d(sample1, sample2, rbins, period=1, num_threads=pool)
+    assert np.all(serial_result == pool_result)
+
+
+def test_shared_memory_pool_reuses_blocks():
+    """ Arrays passed to the pool in several calls are copied into shared memory once,
+    and their blocks are released when the arrays are garbage collected or the pool is closed.
+    """
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((10000, 3))
+        sample2 = np.random.random((10000, 3))
+    x = np.ascontiguousarray(sample1[:, 0])
+    y = np.ascontiguousarray(sample2[:, 0])
+
+    with SharedMemoryPool(2) as pool:
+        descriptor = pool._share_array(x)
+        assert pool._share_array(x) is descriptor
+        assert pool.num_shared_arrays == 1
+        __ = pool._share_array(y)
+        assert pool.num_shared_arrays == 2
+
+        del y
+        assert pool.num_shared_arrays == 1
+
+        serial_result = npairs_3d(sample1, sample2, [0.01, 0.05], period=1)
+        pool_result = npairs_3d(sample1, sample2, [0.01, 0.05], period=1, num_threads=pool)
+        assert np.all(serial_result == pool_result)
+    assert pool.num_shared_arrays == 0
+    with pytest.raises(FileNotFoundError):
+        __ = shared_memory.SharedMemory(name=descriptor.name)
+
+
+def test_shared_memory_pool_closed():
+    pool = SharedMemoryPool(2)
+    pool.close()
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((100, 3))
+    with pytest.raises(HalotoolsError) as err:
+        __ = npairs_3d(sample1, sample1, [0.1, 0.2], period=1, num_threads=pool)
+    substr = "Cannot use a SharedMemoryPool after it has been closed"
+    assert substr in err.value.args[0]
+
+
+def test_shared_memory_pool_num_processes():
+    with pytest.raises(ValueError) as err:
+        __ = SharedMemoryPool(0)
+    substr = "Input ``num_processes`` must be a positive integer or the string 'max'"
+    assert substr in err.value.args[0]
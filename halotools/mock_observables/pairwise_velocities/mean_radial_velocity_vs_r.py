@@ -7,7 +7,6 @@ as a function of 3d distance between the pairs.
 from __future__ import absolute_import, division, print_function, unicode_literals
 
 import numpy as np
-import multiprocessing
 
 from .engines import mean_radial_velocity_vs_r_engine
 
@@ -16,6 +15,8 @@ from ..radial_profiles.radial_profiles_helpers import get_normalized_rbins
 from functools import partial
 
 from ..pair_counters.mesh_helpers import _set_approximate_cell_sizes, _cell1_parallelization_indices
+from ..pair_counters.mesh_helpers import _map_engine_over_cell1_tuples
+from ..pair_counters.mesh_helpers import _is_auto
 from ..pair_counters.mesh_helpers import _enclose_in_box
 from ..pair_counters.rectangular_mesh import RectangularDoubleMesh
 from ..mock_observables_helpers import (enforce_sample_has_correct_shape,
@@ -184,7 +185,9 @@ def mean_radial_velocity_vs_r(sample1, velocities1,
 
     #  Compute the estimates for the cell sizes
     approx_cell1_size, approx_cell2_size = (
-        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period)
+        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period,
+            npts1=len(x1in), npts2=len(x2in),
+            search_length=(search_xlength, search_ylength, search_zlength), num_threads=num_threads)
         )
     approx_x1cell_size, approx_y1cell_size, approx_z1cell_size = approx_cell1_size
     approx_x2cell_size, approx_y2cell_size, approx_z2cell_size = approx_cell2_size
@@ -208,17 +211,12 @@ def mean_radial_velocity_vs_r(sample1, velocities1,
 
     # Calculate the cell1 indices that will be looped over by the engine
     num_threads, cell1_tuples = _cell1_parallelization_indices(
-        double_mesh.mesh1.ncells, num_threads)
-
-    if num_threads > 1:
-        pool = multiprocessing.Pool(num_threads)
-        result = np.array(pool.map(engine, cell1_tuples))
-        counts, vrad_sum = result[:, 0], result[:, 1]
-        counts = np.sum(counts, axis=0)
-        vrad_sum = np.sum(vrad_sum, axis=0)
-        pool.close()
-    else:
-        counts, vrad_sum = np.array(engine(cell1_tuples[0]))
+        double_mesh.mesh1.ncells, num_threads, double_mesh=double_mesh)
+
+    result = np.array(_map_engine_over_cell1_tuples(engine, cell1_tuples, num_threads))
+    counts, vrad_sum = result[:, 0], result[:, 1]
+    counts = np.sum(counts, axis=0)
+    vrad_sum = np.sum(vrad_sum, axis=0)
 
     counts = np.diff(counts)
     vrad_sum = np.diff(vrad_sum)
@@ -299,6 +297,8 @@ def _process_args(sample1, velocities1, sample2, velocities2,
         approx_cell1_size = [max_rbins_absolute, max_rbins_absolute, max_rbins_absolute]
     elif len(np.atleast_1d(approx_cell1_size)) == 1:
         approx_cell1_size = [approx_cell1_size, approx_cell1_size, approx_cell1_size]
+    if approx_cell2_size is None and _is_auto(approx_cell1_size):
+        approx_cell2_size = approx_cell1_size
     if approx_cell2_size is None:
         approx_cell2_size = [max_rbins_absolute, max_rbins_absolute, max_rbins_absolute]
     elif len(np.atleast_1d(approx_cell2_size)) == 1:
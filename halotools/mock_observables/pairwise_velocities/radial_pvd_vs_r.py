@@ -8,13 +8,13 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 import numpy as np
 from functools import partial
 
-import multiprocessing
 
 from .engines import radial_pvd_vs_r_engine
 
 from .mean_radial_velocity_vs_r import _process_args
 
 from ..pair_counters.mesh_helpers import _set_approximate_cell_sizes, _cell1_parallelization_indices
+from ..pair_counters.mesh_helpers import _map_engine_over_cell1_tuples
 from ..pair_counters.rectangular_mesh import RectangularDoubleMesh
 
 
@@ -182,7 +182,9 @@ def radial_pvd_vs_r(sample1, velocities1,
 
     #  Compute the estimates for the cell sizes
     approx_cell1_size, approx_cell2_size = (
-        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period)
+        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period,
+            npts1=len(x1in), npts2=len(x2in),
+            search_length=(search_xlength, search_ylength, search_zlength), num_threads=num_threads)
         )
     approx_x1cell_size, approx_y1cell_size, approx_z1cell_size = approx_cell1_size
     approx_x2cell_size, approx_y2cell_size, approx_z2cell_size = approx_cell2_size
@@ -206,18 +208,13 @@ def radial_pvd_vs_r(sample1, velocities1,
 
     # Calculate the cell1 indices that will be looped over by the engine
     num_threads, cell1_tuples = _cell1_parallelization_indices(
-        double_mesh.mesh1.ncells, num_threads)
-
-    if num_threads > 1:
-        pool = multiprocessing.Pool(num_threads)
-        result = np.array(pool.map(engine, cell1_tuples))
-        counts, vrad_sum, vradsq_sum = result[:, 0], result[:, 1], result[:, 2]
-        counts = np.sum(counts, axis=0)
-        vrad_sum = np.sum(vrad_sum, axis=0)
-        vradsq_sum = np.sum(vradsq_sum, axis=0)
-        pool.close()
-    else:
-        counts, vrad_sum, vradsq_sum = np.array(engine(cell1_tuples[0]))
+        double_mesh.mesh1.ncells, num_threads, double_mesh=double_mesh)
+
+    result = np.array(_map_engine_over_cell1_tuples(engine, cell1_tuples, num_threads))
+    counts, vrad_sum, vradsq_sum = result[:, 0], result[:, 1], result[:, 2]
+    counts = np.sum(counts, axis=0)
+    vrad_sum = np.sum(vrad_sum, axis=0)
+    vradsq_sum = np.sum(vradsq_sum, axis=0)
 
     counts = np.diff(counts).astype('f4')
     vrad = np.diff(vrad_sum)
@@ -1,10 +1,10 @@
 from __future__ import (absolute_import, division, print_function, unicode_literals)
 import numpy as np
-import multiprocessing
 from functools import partial
 
 from ..pair_counters.npairs_xy_z import _npairs_xy_z_process_args
 from ..pair_counters.mesh_helpers import _set_approximate_cell_sizes, _cell1_parallelization_indices
+from ..pair_counters.mesh_helpers import _map_engine_over_cell1_tuples
 from ..pair_counters.rectangular_mesh import RectangularDoubleMesh
 from .velocity_marked_npairs_3d import (
     _func_signature_int_from_vel_weight_func_id, _velocity_marked_npairs_3d_process_weights)
@@ -164,7 +164,9 @@ def velocity_marked_npairs_xy_z(sample1, sample2, rp_bins, pi_bins, period=None,
 
     # Compute the estimates for the cell sizes
     approx_cell1_size, approx_cell2_size = (
-        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period)
+        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period,
+            npts1=len(x1in), npts2=len(x2in),
+            search_length=(search_xlength, search_ylength, search_zlength), num_threads=num_threads)
         )
     approx_x1cell_size, approx_y1cell_size, approx_z1cell_size = approx_cell1_size
     approx_x2cell_size, approx_y2cell_size, approx_z2cell_size = approx_cell2_size
@@ -182,17 +184,12 @@ def velocity_marked_npairs_xy_z(sample1, sample2, rp_bins, pi_bins, period=None,
 
     # Calculate the cell1 indices that will be looped over by the engine
     num_threads, cell1_tuples = _cell1_parallelization_indices(
-        double_mesh.mesh1.ncells, num_threads)
-
-    if num_threads > 1:
-        pool = multiprocessing.Pool(num_threads)
-        result = np.array(pool.map(engine, cell1_tuples))
-        counts1, counts2, counts3 = result[:, 0], result[:, 1], result[:, 2]
-        counts1 = np.sum(counts1, axis=0)
-        counts2 = np.sum(counts2, axis=0)
-        counts3 = np.sum(counts3, axis=0)
-        pool.close()
-    else:
-        counts1, counts2, counts3 = np.array(engine(cell1_tuples[0]))
+        double_mesh.mesh1.ncells, num_threads, double_mesh=double_mesh)
+
+    result = np.array(_map_engine_over_cell1_tuples(engine, cell1_tuples, num_threads))
+    counts1, counts2, counts3 = result[:, 0], result[:, 1], result[:, 2]
+    counts1 = np.sum(counts1, axis=0)
+    counts2 = np.sum(counts2, axis=0)
+    counts3 = np.sum(counts3, axis=0)
 
     return counts1, counts2, counts3
@@ -4,7 +4,6 @@ used to calculate radial profiles as a function of 3d separation.
 from __future__ import absolute_import, division, print_function, unicode_literals
 
 import numpy as np
-import multiprocessing
 from functools import partial
 
 from .radial_profiles_helpers import (bounds_check_sample2_quantity,
@@ -14,6 +13,7 @@ from .engines import radial_profile_3d_engine
 from ..mock_observables_helpers import get_num_threads, get_period, enforce_sample_respects_pbcs
 from ..pair_counters.mesh_helpers import (_set_approximate_cell_sizes,
     _cell1_parallelization_indices, _enclose_in_box)
+from ..pair_counters.mesh_helpers import _map_engine_over_cell1_tuples
 from ..pair_counters.rectangular_mesh import RectangularDoubleMesh
 
 np.seterr(divide='ignore', invalid='ignore')  # ignore divide by zero in e.g. marked_counts/counts
@@ -224,7 +224,9 @@ def radial_profile_3d(sample1, sample2, sample2_quantity,
 
     # Compute the estimates for the cell sizes
     approx_cell1_size, approx_cell2_size = (
-        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period)
+        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period,
+            npts1=len(x1in), npts2=len(x2in),
+            search_length=(search_xlength, search_ylength, search_zlength), num_threads=num_threads)
         )
     approx_x1cell_size, approx_y1cell_size, approx_z1cell_size = approx_cell1_size
     approx_x2cell_size, approx_y2cell_size, approx_z2cell_size = approx_cell2_size
@@ -244,20 +246,14 @@ def radial_profile_3d(sample1, sample2, sample2_quantity,
 
     # Calculate the cell1 indices that will be looped over by the engine
     num_threads, cell1_tuples = _cell1_parallelization_indices(
-        double_mesh.mesh1.ncells, num_threads)
+        double_mesh.mesh1.ncells, num_threads, double_mesh=double_mesh)
 
     # print(rbins_normalized)
     # print(set(normalize_rbins_by))
 
-    if num_threads > 1:
-        pool = multiprocessing.Pool(num_threads)
-        result = np.array(pool.map(engine, cell1_tuples))
-        marked_counts, counts = result[:, 0, :], result[:, 1, :]
-        marked_counts = np.sum(np.array(marked_counts), axis=0)
-        counts = np.sum(np.array(counts), axis=0)
-        pool.close()
-    else:
-        marked_counts, counts = engine(cell1_tuples[0])
+    result = _map_engine_over_cell1_tuples(engine, cell1_tuples, num_threads)
+    marked_counts = np.sum(np.array([r[0] for r in result]), axis=0)
+    counts = np.sum(np.array([r[1] for r in result]), axis=0)
 
     marked_counts = np.diff(marked_counts)
     counts = np.diff(counts)
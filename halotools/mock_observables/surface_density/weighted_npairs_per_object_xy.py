@@ -3,7 +3,6 @@ used to count pairs as a function of separation.
 """
 from __future__ import (absolute_import, division, print_function, unicode_literals)
 import numpy as np
-import multiprocessing
 from functools import partial
 
 from .engines import weighted_npairs_per_object_xy_engine
@@ -12,6 +11,7 @@ from .weighted_npairs_xy import _weighted_npairs_xy_process_args
 from ..pair_counters.rectangular_mesh_2d import RectangularDoubleMesh2D
 from ..pair_counters.mesh_helpers import _set_approximate_2d_cell_sizes
 from ..pair_counters.mesh_helpers import _cell1_parallelization_indices
+from ..pair_counters.mesh_helpers import _map_engine_over_cell1_tuples
 
 
 __author__ = ('Andrew Hearin', )
@@ -140,15 +140,9 @@ def weighted_npairs_per_object_xy(sample1, sample2, sample2_mass, rp_bins,
 
     # # Calculate the cell1 indices that will be looped over by the engine
     num_threads, cell1_tuples = _cell1_parallelization_indices(
-        double_mesh.mesh1.ncells, num_threads)
-
-    if num_threads > 1:
-        pool = multiprocessing.Pool(num_threads)
-        result = pool.map(counting_engine, cell1_tuples)
-        counts = np.sum(np.array(result), axis=0)
-        pool.close()
-    else:
-        result = counting_engine(cell1_tuples[0])
-        counts = np.vstack(result)
+        double_mesh.mesh1.ncells, num_threads, double_mesh=double_mesh)
+
+    result = _map_engine_over_cell1_tuples(counting_engine, cell1_tuples, num_threads)
+    counts = np.sum(np.array(result), axis=0)
 
     return np.array(counts)
@@ -11,6 +11,9 @@ from .engines import weighted_npairs_xy_engine
 from ..pair_counters.rectangular_mesh_2d import RectangularDoubleMesh2D
 from ..pair_counters.mesh_helpers import _set_approximate_2d_cell_sizes
 from ..pair_counters.mesh_helpers import _enclose_in_square, _cell1_parallelization_indices
+from ..pair_counters.mesh_helpers import _map_engine_over_cell1_tuples
+from ..pair_counters.shared_memory_pool import SharedMemoryPool
+from ..pair_counters.openmp_threads import OpenMPThreads
 
 from ...utils.array_utils import array_is_monotonic, custom_len
 
@@ -139,15 +142,10 @@ def weighted_npairs_xy(sample1, sample2, sample2_mass, rp_bins,
 
     # # Calculate the cell1 indices that will be looped over by the engine
     num_threads, cell1_tuples = _cell1_parallelization_indices(
-        double_mesh.mesh1.ncells, num_threads)
+        double_mesh.mesh1.ncells, num_threads, double_mesh=double_mesh)
 
-    if num_threads > 1:
-        pool = multiprocessing.Pool(num_threads)
-        result = pool.map(counting_engine, cell1_tuples)
-        weighted_counts = np.sum(np.array(result), axis=0)
-        pool.close()
-    else:
-        weighted_counts = counting_engine(cell1_tuples[0])
+    result = _map_engine_over_cell1_tuples(counting_engine, cell1_tuples, num_threads)
+    weighted_counts = np.sum(np.array(result), axis=0)
 
     return np.array(weighted_counts)
 
@@ -159,8 +157,9 @@ def _weighted_npairs_xy_process_args(sample1, sample2, w2, rp_bins, period,
     if num_threads is not 1:
         if num_threads == 'max':
             num_threads = multiprocessing.cpu_count()
-        if not isinstance(num_threads, int):
-            msg = "Input ``num_threads`` argument must be an integer or the string 'max'"
+        if not isinstance(num_threads, (int, SharedMemoryPool, OpenMPThreads)):
+            msg = ("Input ``num_threads`` argument must be an integer or the string 'max',\n"
+                "or an instance of SharedMemoryPool or OpenMPThreads")
             raise ValueError(msg)
 
     # Passively enforce that we are working with ndarrays
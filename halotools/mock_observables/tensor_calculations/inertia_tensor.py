@@ -3,7 +3,6 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 
 import numpy as np
-import multiprocessing
 from functools import partial
 
 from .engines import inertia_tensor_per_object_engine
@@ -11,6 +10,7 @@ from .engines import inertia_tensor_per_object_engine
 from ..mock_observables_helpers import get_num_threads, get_period, enforce_sample_respects_pbcs
 from ..pair_counters.mesh_helpers import (_set_approximate_cell_sizes,
     _cell1_parallelization_indices, _enclose_in_box, _enforce_maximum_search_length)
+from ..pair_counters.mesh_helpers import _map_engine_over_cell1_tuples
 from ..pair_counters.rectangular_mesh import RectangularDoubleMesh
 
 
@@ -165,7 +165,9 @@ def inertia_tensor_per_object(sample1, sample2, weights2, smoothing_scale,
 
     # Compute the estimates for the cell sizes
     approx_cell1_size, approx_cell2_size = (
-        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period)
+        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period,
+            npts1=len(x1in), npts2=len(x2in),
+            search_length=(search_xlength, search_ylength, search_zlength), num_threads=num_threads)
         )
     approx_x1cell_size, approx_y1cell_size, approx_z1cell_size = approx_cell1_size
     approx_x2cell_size, approx_y2cell_size, approx_z2cell_size = approx_cell2_size
@@ -182,18 +184,12 @@ def inertia_tensor_per_object(sample1, sample2, weights2, smoothing_scale,
 
     # Calculate the cell1 indices that will be looped over by the engine
     num_threads, cell1_tuples = _cell1_parallelization_indices(
-        double_mesh.mesh1.ncells, num_threads)
-
-    if num_threads > 1:
-        pool = multiprocessing.Pool(num_threads)
-        result = pool.map(engine, cell1_tuples)
-        tensors = np.array([r[0] for r in result])
-        sum_of_masses = np.array([r[1] for r in result])
-        tensors = np.sum(tensors, axis=0)
-        sum_of_masses = np.sum(sum_of_masses, axis=0)
-        pool.close()
-    else:
-        result = engine(cell1_tuples[0])
-        tensors, sum_of_masses = result
+        double_mesh.mesh1.ncells, num_threads, double_mesh=double_mesh)
+
+    result = _map_engine_over_cell1_tuples(engine, cell1_tuples, num_threads)
+    tensors = np.array([r[0] for r in result])
+    sum_of_masses = np.array([r[1] for r in result])
+    tensors = np.sum(tensors, axis=0)
+    sum_of_masses = np.sum(sum_of_masses, axis=0)
 
     return np.array(tensors), np.array(sum_of_masses)
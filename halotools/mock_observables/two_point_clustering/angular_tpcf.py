@@ -10,6 +10,7 @@ from .tpcf_estimators import _TP_estimator_requirements, _TP_estimator
 from .clustering_helpers import (verify_tpcf_estimator, process_optional_input_sample2)
 
 
+from .tpcf import _fused_pair_counts
 from ..pair_counters import npairs_3d
 from ..mock_observables_helpers import get_num_threads
 
@@ -210,36 +211,6 @@ def angular_tpcf(sample1, theta_bins, sample2=None, randoms=None,
 
             return D1R, D2R, RR
 
-    def pair_counts(sample1, sample2, chord_bins,
-            N_thread, do_auto, do_cross, _sample1_is_sample2):
-        """
-        Count data-data pairs.
-        """
-
-        if do_auto is True:
-            D1D1 = npairs_3d(sample1, sample1, chord_bins, num_threads=num_threads)
-            D1D1 = np.diff(D1D1)
-        else:
-            D1D1 = None
-            D2D2 = None
-
-        if _sample1_is_sample2:
-            D1D2 = D1D1
-            D2D2 = D1D1
-        else:
-            if do_cross is True:
-                D1D2 = npairs_3d(sample1, sample2, chord_bins, num_threads=num_threads)
-                D1D2 = np.diff(D1D2)
-            else:
-                D1D2 = None
-            if do_auto is True:
-                D2D2 = npairs_3d(sample2, sample2, chord_bins, num_threads=num_threads)
-                D2D2 = np.diff(D2D2)
-            else:
-                D2D2 = None
-
-        return D1D1, D1D2, D2D2
-
     # What needs to be done?
     do_DD, do_DR, do_RR = _TP_estimator_requirements(estimator)
 
@@ -253,12 +224,15 @@ def angular_tpcf(sample1, theta_bins, sample2=None, randoms=None,
         # this is arbitrarily set, but must remain consistent!
         NR = N1
 
-    # count data pairs
-    D1D1, D1D2, D2D2 = pair_counts(sample1, sample2, chord_bins,
-        num_threads, do_auto, do_cross, _sample1_is_sample2)
-    # count random pairs
-    D1R, D2R, RR = random_counts(sample1, sample2, randoms, chord_bins,
-        num_threads, do_RR, do_DR, _sample1_is_sample2)
+    # count data pairs, and random pairs if RR-pairs are needed, in a single pass
+    D1D1, D1D2, D2D2, D1R, D2R, RR = _fused_pair_counts(sample1, sample2, randoms,
+        chord_bins, None, num_threads, do_auto, do_cross, do_DR, do_RR,
+        _sample1_is_sample2, None)
+
+    # count the random pairs not counted above, analytically if there are no randoms
+    if (randoms is None) or (do_RR is False):
+        D1R, D2R, RR = random_counts(sample1, sample2, randoms, chord_bins,
+            num_threads, do_RR, do_DR, _sample1_is_sample2)
 
     # run results through the estimator and return relavent/user specified results.
     if _sample1_is_sample2:
@@ -0,0 +1,238 @@
+""" Module containing `~halotools.mock_observables.RandomPairCountsCache`,
+an on-disk store of the random-random pair counts computed by the
+two-point clustering functions.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+import hashlib
+from time import time
+
+import numpy as np
+
+from ...sim_manager import halotools_cache_dirname
+from ...custom_exceptions import HalotoolsError
+
+__all__ = ('RandomPairCountsCache', )
+
+default_random_pair_counts_cache_fname = os.path.join(
+    halotools_cache_dirname, 'random_pair_counts.hdf5')
+
+
+class RandomPairCountsCache(object):
+    """ On-disk cache of the RR pair counts of a random catalog.
+
+    Counting the pairs of a large random catalog is usually the most expensive step
+    in computing a two-point function, yet the result only depends on the randoms
+    and on the binning. When an instance of `RandomPairCountsCache` is passed as the
+    ``random_pair_counts_cache`` argument of `~halotools.mock_observables.tpcf`,
+    `~halotools.mock_observables.tpcf_jackknife` or `~halotools.mock_observables.wp_jackknife`,
+    the RR counts are looked up in an HDF5 file using a hash of the randoms,
+    the bins and the period as the key, and are only counted if no entry is found,
+    in which case the counts are stored for subsequent calls.
+
+    The total size of the stored counts is bounded by ``max_size``;
+    when storing new counts would exceed the bound,
+    the least recently used entries are discarded first.
+
+    Notes
+    -----
+    Requires h5py. The cache file should not be written to by several processes at once.
+    Lookups only need read access to the file; when the file cannot be opened for writing,
+    the access time used to discard the least recently used entries is not updated.
+
+    Examples
+    --------
+    >>> from halotools.mock_observables import tpcf
+    >>> Npts, Nran, Lbox = 1000, 5000, 250.
+    >>> sample1 = np.random.uniform(0, Lbox, Npts*3).reshape((Npts, 3))
+    >>> randoms = np.random.uniform(0, Lbox, Nran*3).reshape((Nran, 3))
+    >>> rbins = np.logspace(-1, 1, 10)
+
+    >>> cache = RandomPairCountsCache() # doctest: +SKIP
+    >>> xi = tpcf(sample1, rbins, randoms=randoms, period=Lbox, random_pair_counts_cache=cache) # doctest: +SKIP
+
+    The second call reuses the RR counts of the first:
+
+    >>> xi = tpcf(sample1, rbins, randoms=randoms, period=Lbox, random_pair_counts_cache=cache) # doctest: +SKIP
+    """
+
+    def __init__(self, fname=default_random_pair_counts_cache_fname, max_size=2**30):
+        """
+        Parameters
+        ----------
+        fname : string, optional
+            Path to the HDF5 file storing the cached counts.
+            Default is ``random_pair_counts.hdf5`` in the Halotools cache directory.
+
+        max_size : int, optional
+            Maximum total size in bytes of the stored counts. Default is 1Gb.
+        """
+        try:
+            assert int(max_size) == max_size
+            assert max_size > 0
+        except (TypeError, ValueError, AssertionError):
+            msg = "Input ``max_size`` must be a positive integer"
+            raise ValueError(msg)
+
+        self.fname = fname
+        self.max_size = int(max_size)
+
+    @staticmethod
+    def key(kind, randoms, *args):
+        """ Hash identifying the pair counts of ``randoms`` computed by ``kind``.
+
+        Parameters
+        ----------
+        kind : string
+            Name of the calculation, e.g., 'tpcf' or 'wp_jackknife'
+
+        randoms : array_like
+            Numpy array of shape (Nran, 3) storing the random points
+
+        *args : sequence
+            Additional arrays defining the calculation, e.g., the bins and the period.
+            None values are allowed.
+
+        Returns
+        -------
+        key : string
+        """
+        h = hashlib.sha1(str(kind).encode('utf-8'))
+        for arr in (randoms, ) + args:
+            if arr is None:
+                h.update(b'None')
+            else:
+                arr = np.ascontiguousarray(arr)
+                h.update(str((arr.shape, arr.dtype.str)).encode('utf-8'))
+                h.update(arr.tobytes())
+        return h.hexdigest()
+
+    def load(self, key):
+        """ Retrieve the counts stored under ``key``.
+
+        Parameters
+        ----------
+        key : string
+            Hash returned by `key`
+
+        Returns
+        -------
+        counts : ndarray or None
+            Stored pair counts, or None if there is no entry for ``key``
+
+        NR : int or None
+            Number of random points used to compute ``counts``
+        """
+        h5py = _import_h5py()
+        if not os.path.isfile(self.fname):
+            return None, None
+
+        with h5py.File(self.fname, 'r') as f:
+            if key not in f:
+                return None, None
+            counts, NR = f[key]['counts'][...], int(f[key].attrs['NR'])
+
+        # Recording the access time is best-effort, so that lookups also work
+        # on read-only storage and while other processes have the file open
+        try:
+            with h5py.File(self.fname, 'a') as f:
+                f[key].attrs['last_access'] = time()
+        except (IOError, OSError, KeyError):
+            pass
+        return counts, NR
+
+    def store(self, key, counts, NR):
+        """ Store ``counts`` under ``key``, discarding the least recently used entries
+        if the total size of the stored counts would exceed ``max_size``.
+
+        Parameters
+        ----------
+        key : string
+            Hash returned by `key`
+
+        counts : ndarray
+            Pair counts
+
+        NR : int
+            Number of random points used to compute ``counts``
+        """
+        h5py = _import_h5py()
+        counts = np.asarray(counts)
+        if counts.nbytes > self.max_size:
+            return
+
+        dirname = os.path.dirname(os.path.abspath(self.fname))
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+
+        with h5py.File(self.fname, 'a') as f:
+            if key in f:
+                del f[key]
+            group = f.create_group(key)
+            group.create_dataset('counts', data=counts)
+            group.attrs['NR'] = int(NR)
+            group.attrs['last_access'] = time()
+
+            entries = sorted((f[name].attrs['last_access'], f[name]['counts'].nbytes, name)
+                for name in f.keys())
+            total_size = sum(entry[1] for entry in entries)
+            evicted = []
+            for last_access, nbytes, name in entries:
+                if total_size <= self.max_size:
+                    break
+                evicted.append(name)
+                total_size -= nbytes
+
+        if len(evicted) > 0:
+            self._rewrite_without(evicted)
+
+    def _rewrite_without(self, names):
+        """ Rewrite the cache file omitting the input entries, since HDF5 does not
+        return the space of deleted datasets to the file system.
+        """
+        h5py = _import_h5py()
+        tmp_fname = self.fname + '.tmp'
+        with h5py.File(self.fname, 'r') as f, h5py.File(tmp_fname, 'w') as g:
+            for name in f.keys():
+                if name not in names:
+                    f.copy(f[name], g, name=name)
+        os.replace(tmp_fname, self.fname)
+
+    def clear(self):
+        """ Delete the cache file.
+        """
+        if os.path.isfile(self.fname):
+            os.remove(self.fname)
+
+    def __len__(self):
+        h5py = _import_h5py()
+        if not os.path.isfile(self.fname):
+            return 0
+        with h5py.File(self.fname, 'r') as f:
+            return len(f.keys())
+
+
+def _import_h5py():
+    try:
+        import h5py
+    except ImportError:
+        msg = ("\nMust have h5py installed to use the RandomPairCountsCache.\n")
+        raise HalotoolsError(msg)
+    return h5py
+
+
+def _get_random_pair_counts_cache(random_pair_counts_cache):
+    """ Process the ``random_pair_counts_cache`` argument of the clustering functions.
+    The boolean True selects a cache stored in the default location.
+    """
+    if random_pair_counts_cache is None or random_pair_counts_cache is False:
+        return None
+    elif random_pair_counts_cache is True:
+        return RandomPairCountsCache()
+    elif isinstance(random_pair_counts_cache, RandomPairCountsCache):
+        return random_pair_counts_cache
+    else:
+        msg = ("Input ``random_pair_counts_cache`` must be a boolean or "
+            "an instance of RandomPairCountsCache")
+        raise ValueError(msg)
@@ -0,0 +1,142 @@
+""" Module providing unit-testing for
+`~halotools.mock_observables.RandomPairCountsCache`.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+import numpy as np
+import pytest
+from astropy.utils.misc import NumpyRNGContext
+
+from ..random_pair_counts_cache import RandomPairCountsCache
+from ..tpcf import tpcf
+from ..tpcf_jackknife import tpcf_jackknife
+from ..wp_jackknife import wp_jackknife
+
+try:
+    import h5py
+    HAS_H5PY = True
+except ImportError:
+    HAS_H5PY = False
+
+__all__ = ('test_random_pair_counts_cache_key', )
+
+fixed_seed = 43
+
+
+def test_random_pair_counts_cache_key():
+    with NumpyRNGContext(fixed_seed):
+        randoms = np.random.random((100, 3))
+    rbins = np.linspace(0.01, 0.2, 5)
+
+    key = RandomPairCountsCache.key('tpcf', randoms, rbins, None)
+    assert key == RandomPairCountsCache.key('tpcf', randoms.copy(), rbins, None)
+    assert key != RandomPairCountsCache.key('tpcf', randoms, rbins, 1.)
+    assert key != RandomPairCountsCache.key('tpcf', randoms, rbins[1:], None)
+    assert key != RandomPairCountsCache.key('tpcf', randoms[::-1], rbins, None)
+    assert key != RandomPairCountsCache.key('tpcf_jackknife', randoms, rbins, None)
+
+
+def test_random_pair_counts_cache_max_size_error():
+    with pytest.raises(ValueError) as err:
+        RandomPairCountsCache(max_size=0)
+    substr = "Input ``max_size`` must be a positive integer"
+    assert substr in err.value.args[0]
+
+
+@pytest.mark.skipif('not HAS_H5PY')
+def test_random_pair_counts_cache_eviction(tmpdir):
+    fname = os.path.join(str(tmpdir), 'random_pair_counts.hdf5')
+    counts = np.arange(100).astype('f8')
+    cache = RandomPairCountsCache(fname, max_size=2*counts.nbytes)
+
+    cache.store('a', counts, 10)
+    cache.store('b', counts+1, 20)
+    assert len(cache) == 2
+    cache.load('a')
+    cache.store('c', counts+2, 30)
+    assert len(cache) == 2
+
+    result, NR = cache.load('a')
+    assert np.all(result == counts)
+    assert NR == 10
+    assert cache.load('b') == (None, None)
+
+    with h5py.File(fname, 'r') as f:
+        assert set(f.keys()) == set(('a', 'c'))
+        assert np.all(f['c']['counts'][...] == counts+2)
+        assert f['c'].attrs['NR'] == 30
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+@pytest.mark.skipif('not HAS_H5PY')
+def test_random_pair_counts_cache_load_read_only(tmpdir):
+    """ Verify that lookups succeed when the cache file cannot be opened for writing,
+    here because it is already open read-only.
+    """
+    fname = os.path.join(str(tmpdir), 'random_pair_counts.hdf5')
+    counts = np.arange(100).astype('f8')
+    cache = RandomPairCountsCache(fname)
+    cache.store('a', counts, 10)
+
+    with h5py.File(fname, 'r') as f:
+        last_access = f['a'].attrs['last_access']
+        result, NR = cache.load('a')
+        assert np.all(result == counts)
+        assert NR == 10
+        assert cache.load('b') == (None, None)
+        assert f['a'].attrs['last_access'] == last_access
+
+
+@pytest.mark.skipif('not HAS_H5PY')
+def test_tpcf_random_pair_counts_cache(tmpdir):
+    fname = os.path.join(str(tmpdir), 'random_pair_counts.hdf5')
+    cache = RandomPairCountsCache(fname)
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((100, 3))
+        sample2 = np.random.random((100, 3))
+        randoms = np.random.random((1000, 3))
+    rbins = np.linspace(0.01, 0.2, 5)
+
+    result = tpcf(sample1, rbins, randoms=randoms, period=1, estimator='Landy-Szalay')
+    result1 = tpcf(sample1, rbins, randoms=randoms, period=1, estimator='Landy-Szalay',
+        random_pair_counts_cache=cache)
+    assert len(cache) == 1
+    result2 = tpcf(sample1, rbins, randoms=randoms, period=1, estimator='Landy-Szalay',
+        random_pair_counts_cache=cache)
+    assert len(cache) == 1
+    assert np.allclose(result, result1)
+    assert np.allclose(result, result2)
+
+    cross_result = tpcf(sample1, rbins, sample2=sample2, randoms=randoms, period=1,
+        random_pair_counts_cache=cache)
+    assert len(cache) == 1
+    assert np.allclose(cross_result, tpcf(sample1, rbins, sample2=sample2, randoms=randoms, period=1))
+
+
+@pytest.mark.slow
+@pytest.mark.skipif('not HAS_H5PY')
+def test_jackknife_random_pair_counts_cache(tmpdir):
+    fname = os.path.join(str(tmpdir), 'random_pair_counts.hdf5')
+    cache = RandomPairCountsCache(fname)
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((100, 3))
+        randoms = np.random.random((1000, 3))
+    rbins = np.linspace(0.01, 0.2, 5)
+
+    xi, xi_cov = tpcf_jackknife(sample1, randoms, rbins, Nsub=3, period=1)
+    for __ in range(2):
+        xi2, xi_cov2 = tpcf_jackknife(sample1, randoms, rbins, Nsub=3, period=1,
+            random_pair_counts_cache=cache)
+        assert np.allclose(xi, xi2)
+        assert np.allclose(xi_cov, xi_cov2)
+
+    wp, wp_cov = wp_jackknife(sample1, randoms, rbins, 0.2, Nsub=3, period=1)
+    for __ in range(2):
+        wp2, wp_cov2 = wp_jackknife(sample1, randoms, rbins, 0.2, Nsub=3, period=1,
+            random_pair_counts_cache=cache)
+        assert np.allclose(wp, wp2)
+        assert np.allclose(wp_cov, wp_cov2)
+    assert len(cache) == 2
@@ -579,3 +579,74 @@ def test_tpcf_vs_corrfunc():
 
     halotools_result2 = tpcf(sample2, rbins, period=250.0)
     assert np.allclose(halotools_result2, sinha_sample2_xi, rtol=1e-5), msg
+
+
+def test_tpcf_fused_pair_counts():
+    """ Verify that the DD, DR and RR counts computed during a single traversal
+    of the mesh agree with the counts of separate calls to the pair counter.
+    """
+    Npts, Nran = 200, 500
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((Npts, 3))
+        sample2 = np.random.random((Npts, 3))
+        randoms = np.random.random((Nran, 3))
+    period = np.array([1.0, 1.0, 1.0])
+    rbins = np.linspace(0.001, 0.3, 5)
+    num_threads, PBCs = 1, True
+    do_DR, do_RR = True, True
+
+    from ..tpcf import _random_counts, _pair_counts, _fused_pair_counts
+
+    for _sample1_is_sample2, do_auto, do_cross in ((True, True, False),
+            (False, True, True), (False, False, True), (False, True, False)):
+        s2 = sample1 if _sample1_is_sample2 else sample2
+        fused_counts = _fused_pair_counts(sample1, s2, randoms, rbins, period,
+            num_threads, do_auto, do_cross, do_DR, do_RR, _sample1_is_sample2, None)
+        separate_counts = _pair_counts(sample1, s2, rbins, period,
+            num_threads, do_auto, do_cross, _sample1_is_sample2, None, None)
+        separate_counts += _random_counts(sample1, s2, randoms, rbins, period,
+            PBCs, num_threads, do_RR, do_DR, _sample1_is_sample2, None, None, None)
+
+        for fused, separate in zip(fused_counts, separate_counts):
+            if separate is None:
+                assert fused is None
+            else:
+                assert np.all(fused == separate)
+
+    # the randoms are left out of the shared mesh when their RR-pairs are not needed
+    fused_counts = _fused_pair_counts(sample1, sample2, randoms, rbins, period,
+        num_threads, True, True, do_DR, False, False, None)
+    assert fused_counts[3:] == (None, None, None)
+
+
+def test_tpcf_shared_mesh_agrees_with_separate_meshes():
+    """ Verify that the tpcf does not depend on whether the samples share a single mesh,
+    which is the case unless ``approx_cell2_size`` or ``approx_cellran_size`` is provided,
+    or whether the RR-pairs are precomputed.
+    """
+    Npts, Nran = 200, 500
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((Npts, 3))
+        sample2 = np.random.random((Npts, 3))
+        randoms = np.random.random((Nran, 3))
+    period = np.array([1.0, 1.0, 1.0])
+    rbins = np.linspace(0.001, 0.3, 5)
+    rmax = rbins.max()
+
+    from ..tpcf import _random_counts
+    RR = _random_counts(sample1, sample1, randoms, rbins, period, True, 1,
+        True, False, True, None, None, None)[2]
+
+    for estimator in ('Natural', 'Landy-Szalay'):
+        shared = tpcf(sample1, rbins, sample2=sample2, randoms=randoms,
+            period=period, estimator=estimator)
+        separate = tpcf(sample1, rbins, sample2=sample2, randoms=randoms,
+            period=period, estimator=estimator,
+            approx_cell2_size=[rmax, rmax, rmax],
+            approx_cellran_size=[rmax, rmax, rmax])
+        precomputed = tpcf(sample1, rbins, sample2=sample2, randoms=randoms,
+            period=period, estimator=estimator,
+            RR_precomputed=RR, NR_precomputed=Nran)
+        for xi_shared, xi_separate, xi_precomputed in zip(shared, separate, precomputed):
+            assert np.allclose(xi_shared, xi_separate)
+            assert np.allclose(xi_shared, xi_precomputed)
@@ -11,11 +11,12 @@ from warnings import warn
 from .clustering_helpers import (process_optional_input_sample2,
     verify_tpcf_estimator, tpcf_estimator_dd_dr_rr_requirements)
 from .tpcf_estimators import _TP_estimator
+from .random_pair_counts_cache import _get_random_pair_counts_cache
 
 from ..mock_observables_helpers import (enforce_sample_has_correct_shape,
     get_separation_bins_array, get_period, get_num_threads)
 from ..pair_counters.mesh_helpers import _enforce_maximum_search_length
-from ..pair_counters import npairs_3d
+from ..pair_counters import npairs_3d, npairs_multi_3d
 
 from ...custom_exceptions import HalotoolsError
 ##########################################################################################
@@ -149,10 +150,58 @@ def _pair_counts(sample1, sample2, rbins,
     return D1D1, D1D2, D2D2
 
 
+def _fused_pair_counts(sample1, sample2, randoms, rbins, period, num_threads,
+        do_auto, do_cross, do_DR, do_RR, _sample1_is_sample2, approx_cell1_size):
+    r"""
+    Internal function used to calculate all the DD-, DR- and RR-pairs required
+    by the tpcf during a single traversal of a mesh shared by all the samples.
+    DR- and RR-pairs are only counted if ``randoms`` is not None and ``do_RR`` is True.
+    Otherwise the randoms are left out of the shared mesh, since every pair of
+    randoms in neighboring cells would be visited only to be discarded,
+    and the DR-pairs must be counted separately.
+    """
+    samples = [sample1] if _sample1_is_sample2 else [sample1, sample2]
+    i1, i2, iran = 0, len(samples)-1, len(samples)
+    if (randoms is None) or (do_RR is False):
+        randoms = None
+    else:
+        samples.append(randoms)
+
+    requested_pairs = {}
+    if do_auto is True:
+        requested_pairs['D1D1'] = (i1, i1)
+        if not _sample1_is_sample2:
+            requested_pairs['D2D2'] = (i2, i2)
+    if (do_cross is True) & (not _sample1_is_sample2):
+        requested_pairs['D1D2'] = (i1, i2)
+    if randoms is not None:
+        requested_pairs['RR'] = (iran, iran)
+        if do_DR is True:
+            requested_pairs['D1R'] = (i1, iran)
+            if not _sample1_is_sample2:
+                requested_pairs['D2R'] = (i2, iran)
+
+    counts = {}
+    if len(requested_pairs) > 0:
+        keys = list(requested_pairs.keys())
+        result = npairs_multi_3d(samples, [requested_pairs[key] for key in keys], rbins,
+            period=period, num_threads=num_threads, approx_cell1_size=approx_cell1_size)
+        counts = dict(zip(keys, np.diff(result, axis=1)))
+
+    D1D1 = counts.get('D1D1')
+    if _sample1_is_sample2:
+        D1D2, D2D2 = D1D1, D1D1
+    else:
+        D1D2, D2D2 = counts.get('D1D2'), counts.get('D2D2')
+
+    return D1D1, D1D2, D2D2, counts.get('D1R'), counts.get('D2R'), counts.get('RR')
+
+
 def tpcf(sample1, rbins, sample2=None, randoms=None, period=None,
         do_auto=True, do_cross=True, estimator='Natural', num_threads=1,
         approx_cell1_size=None, approx_cell2_size=None, approx_cellran_size=None,
-        RR_precomputed=None, NR_precomputed=None, seed=None):
+        RR_precomputed=None, NR_precomputed=None, seed=None,
+        random_pair_counts_cache=None):
     r"""
     Calculate the real space two-point correlation function, :math:`\xi(r)`.
 
@@ -229,14 +278,22 @@ def tpcf(sample1, rbins, sample2=None, randoms=None, period=None,
         Performance can vary sensitively with this parameter, so it is highly
         recommended that you experiment with this parameter when carrying out
         performance-critical calculations.
+        Unless ``approx_cell2_size`` or ``approx_cellran_size`` is provided,
+        all pairs are counted during a single traversal of a mesh shared by
+        ``sample1``, ``sample2`` and ``randoms``, and this argument sets the
+        cell sizes of the mesh for all samples.
 
     approx_cell2_size : array_like, optional
         Analogous to ``approx_cell1_size``, but for sample2.  See comments for
-        ``approx_cell1_size`` for details.
+        ``approx_cell1_size`` for details. Default is None, in which case
+        ``sample2`` shares the mesh of ``sample1``. Providing this argument
+        gives each sample its own mesh, at the cost of separate traversals.
 
     approx_cellran_size : array_like, optional
         Analogous to ``approx_cell1_size``, but for randoms.  See comments for
-        ``approx_cell1_size`` for details.
+        ``approx_cell1_size`` for details. Default is None, in which case
+        ``randoms`` share the mesh of ``sample1``. Providing this argument
+        gives each sample its own mesh, at the cost of separate traversals.
 
     RR_precomputed : array_like, optional
         Array storing the number of RR-counts calculated in advance during
@@ -255,6 +312,13 @@ def tpcf(sample1, rbins, sample2=None, randoms=None, period=None,
         Random number seed used to randomly downsample data, if applicable.
         Default is None, in which case downsampling will be stochastic.
 
+    random_pair_counts_cache : bool or `~halotools.mock_observables.RandomPairCountsCache`, optional
+        If provided, the RR-counts of ``randoms`` are looked up in this on-disk cache
+        and only counted if they have not been stored by a previous call
+        with the same ``randoms``, ``rbins`` and ``period``.
+        Set to True to use a cache stored in the Halotools cache directory.
+        Default is None, in which case RR-counts are always counted.
+
     Returns
     -------
     correlation_function(s) : numpy.array
@@ -337,6 +401,15 @@ def tpcf(sample1, rbins, sample2=None, randoms=None, period=None,
         # overwrite do_RR as necessary
         do_RR = False
 
+    # look up the RR-counts of previous calls with the same randoms
+    random_pair_counts_cache = _get_random_pair_counts_cache(random_pair_counts_cache)
+    RR_cached, RR_key = None, None
+    if (random_pair_counts_cache is not None) & (randoms is not None) & (do_RR is True):
+        RR_key = random_pair_counts_cache.key('tpcf', randoms, rbins, period)
+        RR_cached, __ = random_pair_counts_cache.load(RR_key)
+        if RR_cached is not None:
+            do_RR = False
+
     # How many points are there (for normalization purposes)?
     N1 = len(sample1)
     N2 = len(sample2)
@@ -350,17 +423,29 @@ def tpcf(sample1, rbins, sample2=None, randoms=None, period=None,
         else:
             NR = N1
 
-    # count data pairs
-    D1D1, D1D2, D2D2 = _pair_counts(sample1, sample2, rbins, period,
-        num_threads, do_auto, do_cross, _sample1_is_sample2,
-        approx_cell1_size, approx_cell2_size)
-
-    # count random pairs
-    D1R, D2R, RR = _random_counts(sample1, sample2, randoms, rbins,
-        period, PBCs, num_threads, do_RR, do_DR, _sample1_is_sample2,
-        approx_cell1_size, approx_cell2_size, approx_cellran_size)
+    # count data pairs, and random pairs if RR-pairs are needed, in a single pass,
+    # unless separate cell sizes have been requested for sample2 or randoms
+    _share_mesh = (approx_cell2_size is None) & (approx_cellran_size is None)
+    if _share_mesh:
+        D1D1, D1D2, D2D2, D1R, D2R, RR = _fused_pair_counts(sample1, sample2, randoms,
+            rbins, period, num_threads, do_auto, do_cross, do_DR, do_RR,
+            _sample1_is_sample2, approx_cell1_size)
+    else:
+        D1D1, D1D2, D2D2 = _pair_counts(sample1, sample2, rbins, period,
+            num_threads, do_auto, do_cross, _sample1_is_sample2,
+            approx_cell1_size, approx_cell2_size)
+
+    # count the random pairs not counted above, analytically if there are no randoms
+    if (_share_mesh is False) or (randoms is None) or (do_RR is False):
+        D1R, D2R, RR = _random_counts(sample1, sample2, randoms, rbins,
+            period, PBCs, num_threads, do_RR, do_DR, _sample1_is_sample2,
+            approx_cell1_size, approx_cell2_size, approx_cellran_size)
     if RR_precomputed is not None:
         RR = RR_precomputed
+    elif RR_cached is not None:
+        RR = RR_cached
+    elif RR_key is not None:
+        random_pair_counts_cache.store(RR_key, RR, len(randoms))
 
     # run results through the estimator and return relavent/user specified results.
     if _sample1_is_sample2:
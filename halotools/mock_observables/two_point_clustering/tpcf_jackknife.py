@@ -9,6 +9,7 @@ import numpy as np
 from astropy.utils.misc import NumpyRNGContext
 
 from .tpcf_estimators import _TP_estimator, _TP_estimator_requirements
+from .random_pair_counts_cache import _get_random_pair_counts_cache
 from ..pair_counters import npairs_jackknife_3d
 
 from .clustering_helpers import (process_optional_input_sample2, verify_tpcf_estimator)
@@ -27,7 +28,8 @@ np.seterr(divide='ignore', invalid='ignore')  # ignore divide by zero in e.g. DD
 
 def tpcf_jackknife(sample1, randoms, rbins, Nsub=[5, 5, 5],
         sample2=None, period=None, do_auto=True, do_cross=True,
-        estimator='Natural', num_threads=1, seed=None):
+        estimator='Natural', num_threads=1, seed=None,
+        random_pair_counts_cache=None):
     r"""
     Calculate the two-point correlation function, :math:`\xi(r)` and the covariance
     matrix, :math:`{C}_{ij}`, between ith and jth radial bin.
@@ -120,6 +122,13 @@ def tpcf_jackknife(sample1, randoms, rbins, Nsub=[5, 5, 5],
         Random number seed used to randomly downsample data, if applicable.
         Default is None, in which case downsampling will be stochastic.
 
+    random_pair_counts_cache : bool or `~halotools.mock_observables.RandomPairCountsCache`, optional
+        If provided, the jackknife RR-counts of ``randoms`` are looked up in this on-disk cache
+        and only counted if they have not been stored by a previous call
+        with the same ``randoms``, ``Nsub``, bins and ``period``.
+        Set to True to use a cache stored in the Halotools cache directory.
+        Default is None, in which case RR-counts are always counted.
+
     Returns
     -------
     correlation_function(s) : numpy.array
@@ -248,9 +257,19 @@ def tpcf_jackknife(sample1, randoms, rbins, Nsub=[5, 5, 5],
     D2D2_full = D2D2[0, :]
     D2D2_sub = D2D2[1:, :]
 
-    # do random counts
-    D1R, RR = jrandom_counts(sample1, randoms, j_index_1, j_index_random, N_sub_vol,
-        rbins, period, num_threads, do_DR, do_RR)
+    # do random counts, reusing the RR-counts of previous calls with the same randoms
+    random_pair_counts_cache = _get_random_pair_counts_cache(random_pair_counts_cache)
+    RR, RR_key = None, None
+    if (random_pair_counts_cache is not None) & (do_RR is True):
+        RR_key = random_pair_counts_cache.key('tpcf_jackknife', randoms, j_index_random, Nsub,
+            rbins, period)
+        RR, __ = random_pair_counts_cache.load(RR_key)
+    D1R, RR_counted = jrandom_counts(sample1, randoms, j_index_1, j_index_random, N_sub_vol,
+        rbins, period, num_threads, do_DR, do_RR & (RR is None))
+    if RR is None:
+        RR = RR_counted
+        if RR_key is not None:
+            random_pair_counts_cache.store(RR_key, RR, NR)
 
     if _sample1_is_sample2:
         D2R = D1R
@@ -16,6 +16,7 @@ from ..mock_observables_helpers import (enforce_sample_has_correct_shape,
 from ..pair_counters.mesh_helpers import _enforce_maximum_search_length
 
 from .tpcf_estimators import _TP_estimator, _TP_estimator_requirements
+from .tpcf import _fused_pair_counts, _pair_counts
 from ..pair_counters import npairs_3d
 from ..pair_counters import marked_npairs_3d
 
@@ -118,14 +119,22 @@ def tpcf_one_two_halo_decomp(sample1, sample1_host_halo_id, rbins,
         Performance can vary sensitively with this parameter, so it is highly
         recommended that you experiment with this parameter when carrying out
         performance-critical calculations.
+        Unless ``approx_cell2_size`` or ``approx_cellran_size`` is provided,
+        all pairs are counted during a single traversal of a mesh shared by
+        ``sample1``, ``sample2`` and ``randoms``, and this argument sets the
+        cell sizes of the mesh for all samples.
 
     approx_cell2_size : array_like, optional
         Analogous to ``approx_cell1_size``, but for sample2.  See comments for
-        ``approx_cell1_size`` for details.
+        ``approx_cell1_size`` for details. Default is None, in which case
+        ``sample2`` shares the mesh of ``sample1``. Providing this argument
+        gives each sample its own mesh, at the cost of separate traversals.
 
     approx_cellran_size : array_like, optional
         Analogous to ``approx_cell1_size``, but for randoms.  See comments for
-        ``approx_cell1_size`` for details.
+        ``approx_cell1_size`` for details. Default is None, in which case
+        ``randoms`` share the mesh of ``sample1``. Providing this argument
+        gives each sample its own mesh, at the cost of separate traversals.
 
     seed : int, optional
         Random number seed used to randomly downsample data, if applicable.
@@ -208,6 +217,18 @@ def tpcf_one_two_halo_decomp(sample1, sample1_host_halo_id, rbins,
         # this is arbitrarily set, but must remain consistent!
         NR = N1
 
+    # count all data pairs, and random pairs if RR-pairs are needed, in a single pass,
+    # unless separate cell sizes have been requested for sample2 or randoms
+    _share_mesh = (approx_cell2_size is None) & (approx_cellran_size is None)
+    if _share_mesh:
+        D1D1, D1D2, D2D2, D1R, D2R, RR = _fused_pair_counts(sample1, sample2, randoms,
+            rbins, period, num_threads, do_auto, do_cross, do_DR, do_RR,
+            _sample1_is_sample2, approx_cell1_size)
+    else:
+        D1D1, D1D2, D2D2 = _pair_counts(sample1, sample2, rbins, period,
+            num_threads, do_auto, do_cross, _sample1_is_sample2,
+            approx_cell1_size, approx_cell2_size)
+
     # calculate 1-halo pairs
     weight_func_id = 3
     one_halo_D1D1, one_halo_D1D2, one_halo_D2D2 = marked_pair_counts(
@@ -215,17 +236,17 @@ def tpcf_one_two_halo_decomp(sample1, sample1_host_halo_id, rbins,
             do_auto, do_cross, sample1_host_halo_id,
             sample2_host_halo_id, weight_func_id, _sample1_is_sample2)
 
-    # calculate 2-halo pairs
-    weight_func_id = 4
-    two_halo_D1D1, two_halo_D1D2, two_halo_D2D2 = marked_pair_counts(
-            sample1, sample2, rbins, period, num_threads,
-            do_auto, do_cross, sample1_host_halo_id,
-            sample2_host_halo_id, weight_func_id, _sample1_is_sample2)
+    # every data pair not residing in the same halo is a 2-halo pair
+    two_halo_D1D1, two_halo_D1D2, two_halo_D2D2 = (
+        _two_halo_counts(D1D1, one_halo_D1D1),
+        _two_halo_counts(D1D2, one_halo_D1D2),
+        _two_halo_counts(D2D2, one_halo_D2D2))
 
-    # count random pairs
-    D1R, D2R, RR = random_counts(sample1, sample2, randoms, rbins, period,
-                                 PBCs, num_threads, do_RR, do_DR, _sample1_is_sample2,
-                                 approx_cell1_size, approx_cell2_size, approx_cellran_size)
+    # count the random pairs not counted above, analytically if there are no randoms
+    if (_share_mesh is False) or (randoms is None) or (do_RR is False):
+        D1R, D2R, RR = random_counts(sample1, sample2, randoms, rbins, period,
+                                     PBCs, num_threads, do_RR, do_DR, _sample1_is_sample2,
+                                     approx_cell1_size, approx_cell2_size, approx_cellran_size)
 
     # run results through the estimator and return relavent/user specified results.
     if _sample1_is_sample2:
@@ -335,6 +356,16 @@ def random_counts(sample1, sample2, randoms, rbins, period, PBCs, num_threads,
         return D1R, D2R, RR
 
 
+def _two_halo_counts(total_counts, one_halo_counts):
+    """
+    Subtract the 1-halo pairs from the total number of data pairs.
+    """
+    if total_counts is None:
+        return None
+    else:
+        return total_counts - one_halo_counts
+
+
 def marked_pair_counts(sample1, sample2, rbins, period, num_threads,
         do_auto, do_cross, marks1, marks2, weight_func_id, _sample1_is_sample2):
     """
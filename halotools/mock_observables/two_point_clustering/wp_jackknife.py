@@ -9,6 +9,7 @@ import numpy as np
 from astropy.utils.misc import NumpyRNGContext
 
 from .tpcf_estimators import _TP_estimator, _TP_estimator_requirements
+from .random_pair_counts_cache import _get_random_pair_counts_cache
 from .tpcf_jackknife import get_subvolume_numbers, _enclose_in_box
 
 from .clustering_helpers import (process_optional_input_sample2, verify_tpcf_estimator)
@@ -30,7 +31,8 @@ np.seterr(divide='ignore', invalid='ignore')  # ignore divide by zero in e.g. DD
 def wp_jackknife(sample1, randoms, rp_bins, pi_max, Nsub=[5, 5, 5],
         sample2=None, period=None, do_auto=True, do_cross=True,
         estimator='Natural', num_threads=1, seed=None,
-        approx_cell1_size=None, approx_cell2_size=None, approx_cellran_size=None):
+        approx_cell1_size=None, approx_cell2_size=None, approx_cellran_size=None,
+        random_pair_counts_cache=None):
     r"""
     Calculate the projected two-point correlation function, :math:`w_p(r_p)` and the covariance
     matrix, :math:`{C}_{ij}`, between ith and jth projected radial bin.
@@ -128,6 +130,13 @@ def wp_jackknife(sample1, randoms, rp_bins, pi_max, Nsub=[5, 5, 5],
         Random number seed used to randomly downsample data, if applicable.
         Default is None, in which case downsampling will be stochastic.
 
+    random_pair_counts_cache : bool or `~halotools.mock_observables.RandomPairCountsCache`, optional
+        If provided, the jackknife RR-counts of ``randoms`` are looked up in this on-disk cache
+        and only counted if they have not been stored by a previous call
+        with the same ``randoms``, ``Nsub``, bins and ``period``.
+        Set to True to use a cache stored in the Halotools cache directory.
+        Default is None, in which case RR-counts are always counted.
+
     Returns
     -------
     correlation_function(s) : numpy.array
@@ -263,9 +272,19 @@ def wp_jackknife(sample1, randoms, rp_bins, pi_max, Nsub=[5, 5, 5],
         D1D2_sub = D1D2[1:, :, 0]
 
 
-    # do random counts
-    D1R, RR = jrandom_counts(sample1, randoms, j_index_1, j_index_random, N_sub_vol,
-        rp_bins, pi_bins, period, num_threads, do_DR, do_RR)
+    # do random counts, reusing the RR-counts of previous calls with the same randoms
+    random_pair_counts_cache = _get_random_pair_counts_cache(random_pair_counts_cache)
+    RR, RR_key = None, None
+    if (random_pair_counts_cache is not None) & (do_RR is True):
+        RR_key = random_pair_counts_cache.key('wp_jackknife', randoms, j_index_random, Nsub,
+            rp_bins, pi_bins, period)
+        RR, __ = random_pair_counts_cache.load(RR_key)
+    D1R, RR_counted = jrandom_counts(sample1, randoms, j_index_1, j_index_random, N_sub_vol,
+        rp_bins, pi_bins, period, num_threads, do_DR, do_RR & (RR is None))
+    if RR is None:
+        RR = RR_counted
+        if RR_key is not None:
+            random_pair_counts_cache.store(RR_key, RR, NR)
 
     if _sample1_is_sample2:
         D2R = D1R
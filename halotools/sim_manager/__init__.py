@@ -21,6 +21,7 @@ from .fake_sim import FakeSim
 from .download_manager import DownloadManager
 
 from .cached_halo_catalog import CachedHaloCatalog
+from .lazy_halo_table import LazyHaloTable
 from .user_supplied_halo_catalog import UserSuppliedHaloCatalog
 from .user_supplied_ptcl_catalog import UserSuppliedPtclCatalog
 
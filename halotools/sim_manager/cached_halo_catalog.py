@@ -7,7 +7,6 @@ from warnings import warn
 from copy import deepcopy
 import numpy as np
 
-from astropy.table import Table
 from ..utils.python_string_comparisons import _passively_decode_string, compare_strings_py23_safe
 
 try:
@@ -26,6 +25,7 @@ from ..utils import broadcast_host_halo_property, add_halo_hostid
 from .halo_table_cache import HaloTableCache
 from .ptcl_table_cache import PtclTableCache
 from .halo_table_cache_log_entry import get_redshift_string
+from .lazy_halo_table import LazyHaloTable
 
 from ..custom_exceptions import HalotoolsError, InvalidCacheLogEntry
 
@@ -33,6 +33,22 @@ from ..custom_exceptions import HalotoolsError, InvalidCacheLogEntry
 __all__ = ('CachedHaloCatalog', )
 
 
+def _halo_hostid(t):
+    add_halo_hostid(t)
+    return t['halo_hostid']
+
+
+def _halo_mvir_host_halo(t):
+    broadcast_host_halo_property(t, 'halo_mvir')
+    return t['halo_mvir_host_halo']
+
+
+_derived_halo_columns = {
+    'halo_hostid': (['halo_id', 'halo_upid'], _halo_hostid),
+    'halo_mvir_host_halo': (['halo_hostid', 'halo_id', 'halo_mvir'], _halo_mvir_host_halo)
+    }
+
+
 class CachedHaloCatalog(object):
     """
     Container class for the halo catalogs and particle data
@@ -58,7 +74,7 @@ class CachedHaloCatalog(object):
     """
     acceptable_kwargs = ('ptcl_version_name', 'fname', 'simname',
         'halo_finder', 'redshift', 'version_name', 'dz_tol', 'update_cached_fname',
-        'preload_halo_table')
+        'preload_halo_table', 'memmap')
 
     def __init__(self, *args, **kwargs):
         """
@@ -119,6 +135,14 @@ class CachedHaloCatalog(object):
             Halo catalogs in cache with a redshift that differs by greater
             than ``dz_tol`` will be ignored. Default is 0.05.
 
+        memmap : bool, optional
+            If True, the columns of `halo_table`, `lazy_halo_table` and `ptcl_table`
+            will be copy-on-write `numpy.memmap` views of the hdf5 files rather than
+            arrays read into memory. Processes that load the same catalog with ``memmap=True``
+            then share a single copy of the data in the page cache of the operating system,
+            and only the pages that are actually accessed are read from disk.
+            Default is False.
+
         Examples
         ---------
         If you followed the instructions in the
@@ -187,6 +211,8 @@ class CachedHaloCatalog(object):
             update_cached_fname = False
         self._update_cached_fname = update_cached_fname
 
+        self._memmap = kwargs.get('memmap', False)
+
         self.halo_table_cache = HaloTableCache()
 
         self._disallow_catalogs_with_known_bugs(**kwargs)
@@ -538,24 +564,47 @@ class CachedHaloCatalog(object):
         To see what halo properties are available in the catalog:
 
         >>> print(halocat.halo_table.keys()) # doctest: +SKIP
+
+        The entire catalog is read into memory the first time
+        `halo_table` is accessed. If you only need a few columns, use
+        `lazy_halo_table` instead.
         """
         try:
             return self._halo_table
+        except AttributeError:
+            self._halo_table = self.lazy_halo_table.as_table()
+            return self._halo_table
+
+    @property
+    def lazy_halo_table(self):
+        """
+        `~halotools.sim_manager.LazyHaloTable` object storing a catalog of dark matter halos
+        whose columns are only read from disk when they are first accessed.
+
+        The syntax for accessing a column is the same as for `halo_table`:
+
+        >>> halocat = CachedHaloCatalog() # doctest: +SKIP
+        >>> mass_array = halocat.lazy_halo_table['halo_mvir'] # doctest: +SKIP
+
+        Use the `~halotools.sim_manager.LazyHaloTable.as_table` method to load
+        a subset of the columns into an Astropy `~astropy.table.Table`:
+
+        >>> t = halocat.lazy_halo_table.as_table(['halo_x', 'halo_y', 'halo_z']) # doctest: +SKIP
+
+        The ``halo_hostid`` and ``halo_mvir_host_halo`` columns are computed
+        on-the-fly if they are not stored in the catalog.
+        """
+        try:
+            return self._lazy_halo_table
         except AttributeError:
             if self.log_entry.safe_for_cache is True:
-                self._halo_table = Table.read(_passively_decode_string(self.fname), path='data')
-                self._add_new_derived_columns(self._halo_table)
-                return self._halo_table
+                self._lazy_halo_table = LazyHaloTable(
+                    _passively_decode_string(self.fname), path='data',
+                    derived_columns=_derived_halo_columns, memmap=self._memmap)
+                return self._lazy_halo_table
             else:
                 raise InvalidCacheLogEntry(self.log_entry._cache_safety_message)
 
-    def _add_new_derived_columns(self, t):
-        if 'halo_hostid' not in list(t.keys()):
-            add_halo_hostid(t)
-
-        if 'halo_mvir_host_halo' not in list(t.keys()):
-            broadcast_host_halo_property(t, 'halo_mvir')
-
     def _bind_additional_metadata(self):
         """ Create convenience bindings of all metadata to the `CachedHaloCatalog` instance.
         """
@@ -626,7 +675,8 @@ class CachedHaloCatalog(object):
                 ptcl_log_entry = self.ptcl_log_entry
 
             if ptcl_log_entry.safe_for_cache is True:
-                self._ptcl_table = Table.read(_passively_decode_string(ptcl_log_entry.fname), path='data')
+                self._ptcl_table = LazyHaloTable(_passively_decode_string(ptcl_log_entry.fname),
+                    path='data', memmap=self._memmap).as_table()
                 return self._ptcl_table
             else:
                 raise InvalidCacheLogEntry(ptcl_log_entry._cache_safety_message)
@@ -0,0 +1,7 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+from .ascii_parsing_engine import ascii_parsing_engine
+
+__all__ = ('ascii_parsing_engine', )
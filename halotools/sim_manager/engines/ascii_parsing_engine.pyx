@@ -0,0 +1,214 @@
+""" Module containing the `~halotools.sim_manager.engines.ascii_parsing_engine`
+cython function driving the `~halotools.sim_manager.TabularAsciiReader.read_ascii`
+method of the `~halotools.sim_manager.TabularAsciiReader` class.
+"""
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+
+import numpy as np
+cimport numpy as cnp
+cimport cython
+from libc.stdlib cimport strtod, strtoll
+from libc.string cimport memchr, memcpy
+cimport libc.errno
+from libc.locale cimport localeconv
+
+__all__ = ('ascii_parsing_engine', )
+
+
+cdef inline bint _is_blank(char c) nogil:
+    return (c == b' ') or (c == b'\t') or (c == b'\r')
+
+
+cdef inline bint _is_delimiter(char c) nogil:
+    return (c == b' ') or (c == b'\t') or (c == b'\r') or (c == b'\n') or (c == b'\0')
+
+
+cdef inline bint _parse_field(const char* field, Py_ssize_t field_len, char* scratch, bint is_int,
+        cnp.float64_t* float_value, cnp.int64_t* int_value) nogil:
+    """ Convert the field of length ``field_len`` starting at ``field``, returning True
+    if the entire field is a number that fits in the requested type.
+    Unless ``scratch`` is NULL, the field is first copied into the scratch buffer
+    and NUL-terminated so that the conversion cannot read past the end of the block.
+    """
+    cdef const char* start = field
+    cdef char* end
+    cdef bint result
+
+    if scratch != NULL:
+        memcpy(scratch, field, field_len)
+        scratch[field_len] = b'\0'
+        start = scratch
+
+    libc.errno.errno = 0
+    if is_int:
+        int_value[0] = strtoll(start, &end, 10)
+        # strtoll saturates to LLONG_MAX or LLONG_MIN on overflow
+        result = ((field_len > 0) and (end == start + field_len) and
+            (libc.errno.errno != libc.errno.ERANGE))
+    else:
+        float_value[0] = strtod(start, &end)
+        result = (field_len > 0) and (end == start + field_len)
+    return result
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+def ascii_parsing_engine(const unsigned char[::1] block, column_indices_in, column_is_int_in, bytes header_char):
+    """
+    Cython engine for parsing the requested columns of a block of
+    whitespace-delimited ASCII data. The engine makes a single pass over the bytes
+    of the block, tokenizing each line only up to the last requested column
+    and converting the requested fields with the C library functions
+    ``strtod`` and ``strtoll``. Empty lines and lines beginning with ``header_char``
+    are skipped.
+
+    Because the result of ``strtod`` depends on the ``LC_NUMERIC`` locale of the process,
+    the engine raises a ValueError unless the decimal point of the current locale
+    is a period, in which case the data must be parsed in python instead.
+
+    Parameters
+    ----------
+    block : bytes, bytearray or memoryview
+        Contiguous block of ASCII data storing complete lines.
+        The block need not be NUL-terminated, and its last line need not end
+        with a newline: no field is read past the end of the block.
+
+    column_indices_in : numpy.array
+        Integer array storing the index of each requested column, starting from 0.
+
+    column_is_int_in : numpy.array
+        Boolean array storing whether each requested column is parsed as an integer.
+        The remaining columns are parsed as double-precision floats.
+
+    header_char : bytes
+        Single character marking lines that are not data.
+
+    Returns
+    -------
+    float_data : numpy.array
+        Array of shape (num_rows, num_float_columns) storing the columns parsed as floats,
+        in the order in which they appear in ``column_indices_in``.
+
+    int_data : numpy.array
+        Array of shape (num_rows, num_int_columns) storing the columns parsed as integers,
+        in the order in which they appear in ``column_indices_in``.
+
+    error_offset : int
+        Byte offset of the first line that could not be parsed, either because it
+        has too few columns, because a requested field is not a number,
+        or because an integer field does not fit in a 64-bit integer.
+        Equal to -1 if every line was parsed.
+    """
+    cdef const char* decimal_point = localeconv().decimal_point
+    if (decimal_point[0] != b'.') or (decimal_point[1] != b'\0'):
+        msg = ("The ascii_parsing_engine requires the decimal point of the LC_NUMERIC locale\n"
+            "to be a period, but the current locale uses ``{0}``.\n")
+        raise ValueError(msg.format((<bytes> decimal_point).decode('ascii', 'replace')))
+
+    cdef cnp.int64_t[:] column_indices = np.ascontiguousarray(column_indices_in, dtype=np.int64)
+    cdef cnp.uint8_t[:] column_is_int = np.ascontiguousarray(column_is_int_in, dtype=np.uint8)
+
+    cdef Py_ssize_t num_keep = column_indices.shape[0]
+    cdef Py_ssize_t num_lookup = np.max(column_indices_in) + 1 if num_keep > 0 else 0
+
+    # For each column of the ASCII data, slot stores the position of the column
+    # in its output array and kind stores whether the column is skipped (0),
+    # parsed as a float (1) or parsed as an integer (2)
+    cdef cnp.int64_t[:] slot = np.zeros(num_lookup, dtype=np.int64)
+    cdef cnp.uint8_t[:] kind = np.zeros(num_lookup, dtype=np.uint8)
+    cdef Py_ssize_t j, num_float = 0, num_int = 0
+    for j in range(num_keep):
+        if column_is_int[j]:
+            kind[column_indices[j]] = 2
+            slot[column_indices[j]] = num_int
+            num_int += 1
+        else:
+            kind[column_indices[j]] = 1
+            slot[column_indices[j]] = num_float
+            num_float += 1
+
+    cdef Py_ssize_t num_bytes = block.shape[0]
+    if num_bytes == 0:
+        return (np.zeros((0, num_float), dtype=np.float64),
+            np.zeros((0, num_int), dtype=np.int64), -1)
+
+    cdef const char* buf = <const char*> &block[0]
+    cdef char comment = header_char[0]
+    cdef Py_ssize_t p = 0, line_start, field_end, col, num_found, row = 0
+    cdef Py_ssize_t error_offset = -1
+    cdef cnp.float64_t float_value
+    cdef cnp.int64_t int_value
+    cdef const char* newline
+
+    # Only the last field of the block can end at the end of the block rather than
+    # at a delimiter, in which case it is parsed from a NUL-terminated copy
+    cdef Py_ssize_t tail_start = num_bytes
+    while (tail_start > 0) and (not _is_delimiter(buf[tail_start - 1])):
+        tail_start -= 1
+    scratch_out = bytearray(num_bytes - tail_start + 1)
+    cdef char* scratch = scratch_out
+
+    cdef Py_ssize_t max_num_rows = 1
+    with nogil:
+        newline = <const char*> memchr(buf, b'\n', num_bytes)
+        while newline != NULL:
+            max_num_rows += 1
+            newline = <const char*> memchr(newline + 1, b'\n', num_bytes - (newline + 1 - buf))
+
+    float_data_out = np.zeros((max_num_rows, num_float), dtype=np.float64)
+    int_data_out = np.zeros((max_num_rows, num_int), dtype=np.int64)
+    cdef cnp.float64_t[:, :] float_data = float_data_out
+    cdef cnp.int64_t[:, :] int_data = int_data_out
+
+    with nogil:
+        while p < num_bytes:
+            line_start = p
+            while (p < num_bytes) and _is_blank(buf[p]):
+                p += 1
+            if p >= num_bytes:
+                break
+            if (buf[p] == b'\n') or (buf[p] == comment):
+                newline = <const char*> memchr(buf + p, b'\n', num_bytes - p)
+                p = num_bytes if newline == NULL else (newline - buf) + 1
+                continue
+
+            col = 0
+            num_found = 0
+            while True:
+                # p is at the first character of a field
+                field_end = p
+                while (field_end < num_bytes) and (not _is_delimiter(buf[field_end])):
+                    field_end += 1
+                if (col < num_lookup) and (kind[col] != 0):
+                    if not _parse_field(buf + p, field_end - p,
+                            NULL if field_end < num_bytes else scratch,
+                            kind[col] == 2, &float_value, &int_value):
+                        error_offset = line_start
+                        break
+                    if kind[col] == 2:
+                        int_data[row, slot[col]] = int_value
+                    else:
+                        float_data[row, slot[col]] = float_value
+                    p = field_end
+                    num_found += 1
+                    if num_found == num_keep:
+                        break
+                else:
+                    p = field_end
+                col += 1
+
+                while (p < num_bytes) and _is_blank(buf[p]):
+                    p += 1
+                if (p >= num_bytes) or (buf[p] == b'\n'):
+                    error_offset = line_start
+                    break
+
+            if error_offset != -1:
+                break
+
+            row += 1
+            newline = <const char*> memchr(buf + p, b'\n', num_bytes - p)
+            p = num_bytes if newline == NULL else (newline - buf) + 1
+
+    return (float_data_out[:row], int_data_out[:row], error_offset)
@@ -15,6 +15,8 @@ except ImportError:
         "sim_manager sub-package requires h5py to be installed,\n"
         "which can be accomplished either with pip or conda. ")
 
+from .lazy_halo_table import LazyHaloTable
+
 
 __all__ = ('HaloTableCacheLogEntry', )
 
@@ -136,7 +138,7 @@ class HaloTableCacheLogEntry(object):
 
         4. Each value in the above metadata is consistent with the corresponding value bound to the `~halotools.sim_manager.HaloTableCacheLogEntry` instance.
 
-        5. The halo table data can be read in using the `~astropy.table.Table.read` method of the `~astropy.table.Table` class.
+        5. The halo table data can be read in with the `~halotools.sim_manager.LazyHaloTable` class, either because it is stored in the standard layout that can be read with the `~astropy.table.Table.read` method of the `~astropy.table.Table` class, or because it is stored in the columnar layout with one dataset per column. Only the columns needed by the remaining checks are read from disk.
 
         6. The halo table has the following columns ``halo_id``, ``halo_x``, ``halo_y``, ``halo_z``, plus at least one additional column storing a mass-like variable.
 
@@ -193,17 +195,22 @@ class HaloTableCacheLogEntry(object):
             return num_failures == 0
 
     def _verify_table_read(self, num_failures):
-        """ Enforce that the data can be read using the usual Astropy syntax
+        """ Enforce that the data can be read using either the usual Astropy syntax
+        or the columnar layout. The returned `~halotools.sim_manager.LazyHaloTable`
+        only reads the columns that are subsequently checked.
         """
         msg = ''
 
         try:
-            halo_table = Table.read(_passively_decode_string(self.fname), path='data')
+            halo_table = LazyHaloTable(_passively_decode_string(self.fname), path='data')
         except:
             num_failures += 1
-            msg = (str(num_failures)+". The hdf5 file must be readable with "
+            msg = (str(num_failures)+". The hdf5 file must either be readable with "
                 "Astropy \nusing the following syntax:\n\n"
-                ">>> halo_data = Table.read(fname, path='data')\n\n")
+                ">>> halo_data = Table.read(fname, path='data')\n\n"
+                "or store a ``data`` group with one dataset per column, "
+                "as written by the ``columnar_layout`` option of "
+                "UserSuppliedHaloCatalog.add_halocat_to_cache.\n\n")
             halo_table = Table()
         return msg, num_failures, halo_table
 
@@ -0,0 +1,316 @@
+""" Module storing the `~halotools.sim_manager.LazyHaloTable` class,
+a read-only view of a halo catalog stored on disk whose columns
+are only read into memory when they are first accessed.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+from warnings import warn
+import numpy as np
+from astropy.table import Table, Column
+from astropy.extern import six
+
+try:
+    import h5py
+    _HAS_H5PY = True
+except ImportError:
+    _HAS_H5PY = False
+
+from ..utils.python_string_comparisons import _passively_decode_string
+from ..custom_exceptions import HalotoolsError
+
+
+__all__ = ('LazyHaloTable', )
+
+uninstalled_h5py_msg = ("\nYou must have h5py installed if you want to \n"
+    "read halo catalogs stored in hdf5 files. \n")
+
+
+class LazyHaloTable(object):
+    """ Table-like view of the halos stored in an hdf5 file that reads
+    each column from disk the first time it is accessed.
+
+    The halos can be stored either in the standard Halotools layout,
+    a single compound dataset named ``path`` that can be read with
+    ``Table.read(fname, path='data')``, or in the columnar layout,
+    a group named ``path`` storing one dataset per column.
+    Reading a column from a file in the columnar layout only reads the bytes of that column,
+    whereas in the standard layout only the requested column is stored in memory.
+
+    Columns are accessed with the same syntax as an `~astropy.table.Table`,
+    and the `as_table` method loads any subset of the columns into an `~astropy.table.Table`.
+    Selecting rows with an integer, a slice, an index array or a boolean mask
+    reads every column into memory and returns the selected rows of the table.
+    Columns that are assigned to the `LazyHaloTable` are only stored in memory.
+
+    Examples
+    --------
+    >>> halos = LazyHaloTable(fname) # doctest: +SKIP
+    >>> mass = halos['halo_mvir'] # doctest: +SKIP
+    >>> halo_table = halos.as_table(['halo_x', 'halo_y', 'halo_z']) # doctest: +SKIP
+
+    Only the first million halos of the catalog:
+
+    >>> halos = LazyHaloTable(fname, rows=slice(0, int(1e6))) # doctest: +SKIP
+
+    With ``memmap=True``, the columns are memory-mapped views of the file
+    rather than arrays read into memory, so that all processes reading the same
+    catalog share the pages of the operating system's page cache:
+
+    >>> halos = LazyHaloTable(fname, memmap=True) # doctest: +SKIP
+    """
+
+    def __init__(self, fname, path='data', rows=None, derived_columns=None, memmap=False):
+        """
+        Parameters
+        ----------
+        fname : string
+            Name of the hdf5 file storing the halos.
+
+        path : string, optional
+            Name of the dataset or group storing the halos. Default is ``data``.
+
+        rows : slice, optional
+            Contiguous range of rows of the halo catalog, e.g., ``slice(0, 1000)``.
+            Default is None, in which case all rows are used.
+
+        derived_columns : dict, optional
+            Dictionary of columns that are not stored on disk but can be computed from columns
+            that are. Each key is the name of a derived column, and each value
+            is a two-element tuple storing the list of names of the columns required to compute it,
+            and a function accepting an `~astropy.table.Table` storing these columns
+            and returning the derived column. Default is None, for no derived columns.
+
+        memmap : bool, optional
+            If True, the columns are `numpy.memmap` views of the datasets in the hdf5 file.
+            Writing to a memory-mapped column only modifies the copy of the process,
+            leaving the file unchanged. Memory-mapping requires uncompressed datasets
+            with contiguous storage, as written by Halotools in both layouts; any other dataset
+            is read into memory with a warning. Default is False.
+        """
+        if not _HAS_H5PY:
+            raise HalotoolsError(uninstalled_h5py_msg)
+
+        self.fname = _passively_decode_string(fname)
+        self.path = path
+        if not os.path.isfile(self.fname):
+            msg = "\nThe following input fname does not exist: \n\n{0}\n\n".format(self.fname)
+            raise HalotoolsError(msg)
+
+        with h5py.File(self.fname, 'r') as f:
+            try:
+                obj = f[self.path]
+            except KeyError:
+                msg = ("\nThe hdf5 file ``{0}`` does not store a ``{1}`` "
+                    "dataset or group.\n".format(self.fname, self.path))
+                raise HalotoolsError(msg)
+
+            if isinstance(obj, h5py.Group):
+                self.columnar_layout = True
+                colnames = [_passively_decode_string(key) for key in obj.attrs['colnames']]
+                num_rows = obj[colnames[0]].shape[0] if len(colnames) > 0 else 0
+            else:
+                self.columnar_layout = False
+                colnames = list(obj.dtype.names)
+                num_rows = obj.shape[0]
+
+        self.rows = _process_rows(rows, num_rows)
+        self.memmap = memmap
+        self._stored_colnames = colnames
+        self._columns = {}
+        self._new_colnames = []
+        if derived_columns is None:
+            derived_columns = {}
+        self._derived_columns = dict(derived_columns)
+
+    def keys(self):
+        """ Names of the columns stored on disk, the derived columns
+        whose required columns are available, and the columns assigned in memory.
+        """
+        keys = list(self._stored_colnames)
+        for key in self._derived_columns.keys():
+            if (key not in keys) & self._derived_column_available(key):
+                keys.append(key)
+        keys.extend(key for key in self._new_colnames if key not in keys)
+        return keys
+
+    @property
+    def colnames(self):
+        return self.keys()
+
+    def _derived_column_available(self, key, _visited=()):
+        required_keys, __ = self._derived_columns[key]
+        for required_key in required_keys:
+            if (required_key in self._stored_colnames) or (required_key in self._new_colnames):
+                continue
+            elif (required_key in self._derived_columns) & (required_key not in _visited):
+                if not self._derived_column_available(required_key, _visited + (key, )):
+                    return False
+            else:
+                return False
+        return True
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def __len__(self):
+        return self.rows.stop - self.rows.start
+
+    @property
+    def loaded_colnames(self):
+        """ Names of the columns that are currently stored in memory.
+        """
+        return [key for key in self.keys() if key in self._columns]
+
+    def __getitem__(self, key):
+        if isinstance(key, six.string_types):
+            self.read([key])
+            return self._columns[key]
+        elif (isinstance(key, (list, tuple)) and (len(key) > 0) and
+                all(isinstance(name, six.string_types) for name in key)):
+            return self.as_table(list(key))
+        else:
+            # Integers, slices, index arrays and boolean masks select rows
+            # of the table of all columns, as for an astropy Table
+            return self.as_table()[key]
+
+    def __setitem__(self, key, value):
+        column = Column(data=value, name=key)
+        if len(column) != len(self):
+            msg = ("The length of the ``{0}`` column does not match "
+                "the number of rows of the table".format(key))
+            raise ValueError(msg)
+        self._columns[key] = column
+        if key not in self._new_colnames:
+            self._new_colnames.append(key)
+
+    def read(self, keys):
+        """ Read the input columns into memory, reading each column from disk
+        only if it has not already been read.
+
+        Parameters
+        ----------
+        keys : list of strings
+            Names of the columns
+        """
+        keys = [key for key in keys if key not in self._columns]
+        for key in keys:
+            if key not in self:
+                msg = "The ``{0}`` column does not appear in the halo table".format(key)
+                raise KeyError(msg)
+
+        stored_keys = [key for key in keys if key in self._stored_colnames]
+        if len(stored_keys) > 0:
+            self._read_stored_columns(stored_keys)
+
+        for key in keys:
+            if key not in self._columns:
+                self._compute_derived_column(key)
+
+    def _read_stored_columns(self, keys):
+        with h5py.File(self.fname, 'r') as f:
+            if self.columnar_layout:
+                group = f[self.path]
+                for key in keys:
+                    data = self._memmap_dataset(group[key]) if self.memmap else None
+                    if data is None:
+                        data = group[key][self.rows]
+                    else:
+                        data = data[self.rows]
+                    self._columns[key] = Column(data=data, name=key, copy=False)
+            else:
+                dset = f[self.path]
+                data = self._memmap_dataset(dset) if self.memmap else None
+                if data is not None:
+                    data = data[self.rows]
+                elif len(keys) == len(self._stored_colnames):
+                    data = dset[self.rows]
+                else:
+                    # Reading all requested fields at once requires a single pass over the dataset
+                    data = dset[(self.rows, ) + tuple(keys)]
+                    if len(keys) == 1:
+                        data = {keys[0]: data}
+                for key in keys:
+                    self._columns[key] = Column(data=data[key], name=key, copy=False)
+
+    def _memmap_dataset(self, dset):
+        """ Copy-on-write `numpy.memmap` of the input dataset, or None if the
+        storage of the dataset does not permit memory-mapping.
+        """
+        file_dtype = dset.id.get_type().dtype
+        offset = dset.id.get_offset()
+        if (dset.chunks is not None) | (offset is None) | file_dtype.hasobject:
+            msg = ("\nThe ``{0}`` dataset of the hdf5 file ``{1}`` is either compressed, chunked "
+                "or empty,\nand so it cannot be memory-mapped and will instead be read into memory.\n"
+                "Rewrite the file without compression to enable memory-mapping.\n")
+            warn(msg.format(dset.name, self.fname))
+            return None
+        return np.memmap(self.fname, mode='c', dtype=file_dtype, offset=offset, shape=dset.shape)
+
+    def _compute_derived_column(self, key):
+        required_keys, func = self._derived_columns[key]
+        self.read(required_keys)
+        t = Table([self._columns[required_key] for required_key in required_keys], copy=False)
+        self._columns[key] = Column(data=func(t), name=key)
+
+    def as_table(self, columns=None):
+        """ `~astropy.table.Table` storing the input columns.
+
+        Parameters
+        ----------
+        columns : list of strings, optional
+            Names of the columns of the returned table.
+            Default is None, in which case all columns are returned.
+
+        Returns
+        -------
+        table : `~astropy.table.Table`
+            Table whose columns share memory with the columns stored in the `LazyHaloTable`.
+        """
+        if columns is None:
+            columns = self.keys()
+        self.read(columns)
+        return Table([self._columns[key] for key in columns], copy=False)
+
+    def clear(self):
+        """ Release the memory of all columns read from disk.
+        """
+        for key in list(self._columns.keys()):
+            if key not in self._new_colnames:
+                del self._columns[key]
+
+
+def _process_rows(rows, num_rows):
+    """ Convert the ``rows`` argument of `LazyHaloTable` into a slice with unit step.
+    """
+    if rows is None:
+        return slice(0, num_rows)
+    try:
+        start, stop, step = rows.indices(num_rows)
+        assert step == 1
+    except (AttributeError, AssertionError):
+        msg = "Input ``rows`` must be a slice of contiguous rows"
+        raise ValueError(msg)
+    return slice(start, max(start, stop))
+
+
+def _write_columnar_table(table, fname, path='data', overwrite=False):
+    """ Write the input table to an hdf5 file in the columnar layout read by `LazyHaloTable`,
+    with each column stored in its own dataset of the group named ``path``.
+    """
+    if not _HAS_H5PY:
+        raise HalotoolsError(uninstalled_h5py_msg)
+
+    if os.path.isfile(fname) & (overwrite is False):
+        msg = ("\nThe file ``{0}`` already exists. Set ``overwrite`` to True "
+            "if you want to overwrite this file.\n".format(fname))
+        raise HalotoolsError(msg)
+
+    with h5py.File(fname, 'w') as f:
+        group = f.create_group(path)
+        for key in table.keys():
+            data = np.asarray(table[key])
+            if data.dtype.kind == 'U':
+                data = np.char.encode(data, 'utf-8')
+            group.create_dataset(key, data=data)
+        group.attrs['colnames'] = [np.bytes_(key) for key in table.keys()]
@@ -1,7 +1,6 @@
 """
 """
 import os
-from astropy.table import Table
 import numpy as np
 from warnings import warn
 
@@ -17,6 +16,8 @@ except ImportError:
         "sim_manager sub-package requires h5py to be installed,\n"
         "which can be accomplished either with pip or conda. ")
 
+from .lazy_halo_table import LazyHaloTable
+
 __all__ = ('PtclTableCacheLogEntry', )
 
 
@@ -133,7 +134,7 @@ class PtclTableCacheLogEntry(object):
 
         4. Each value in the above metadata is consistent with the corresponding value bound to the `~halotools.sim_manager.PtclTableCacheLogEntry` instance.
 
-        5. The particle table data can be read in using the `~astropy.table.Table.read` method of the `~astropy.table.Table` class.
+        5. The particle table data can be read in with the `~halotools.sim_manager.LazyHaloTable` class, either because it is stored in the standard layout that can be read with the `~astropy.table.Table.read` method of the `~astropy.table.Table` class, or because it is stored in the columnar layout with one dataset per column.
 
         6. The particle table has the following columns ``x``, ``y``, ``z``.
 
@@ -179,12 +180,15 @@ class PtclTableCacheLogEntry(object):
         """ Enforce that the data can be read using the usual Astropy syntax
         """
         try:
-            data = Table.read(_passively_decode_string(self.fname), path='data')
+            data = LazyHaloTable(_passively_decode_string(self.fname), path='data')
         except:
             num_failures += 1
-            msg += (str(num_failures)+". The hdf5 file must be readable with "
+            msg += (str(num_failures)+". The hdf5 file must either be readable with "
                 "Astropy \nusing the following syntax:\n\n"
-                ">>> ptcl_data = Table.read(fname, path='data')\n\n")
+                ">>> ptcl_data = Table.read(fname, path='data')\n\n"
+                "or store a ``data`` group with one dataset per column, "
+                "as written by the ``columnar_layout`` option of "
+                "UserSuppliedPtclCatalog.add_ptclcat_to_cache.\n\n")
             pass
         return msg, num_failures
 
@@ -239,7 +243,7 @@ class PtclTableCacheLogEntry(object):
         """
         """
         try:
-            data = Table.read(_passively_decode_string(self.fname), path='data')
+            data = LazyHaloTable(_passively_decode_string(self.fname), path='data')
             keys = list(data.keys())
             try:
                 assert 'x' in keys
@@ -260,7 +264,7 @@ class PtclTableCacheLogEntry(object):
         """
         """
         try:
-            data = Table.read(_passively_decode_string(self.fname), path='data')
+            data = LazyHaloTable(_passively_decode_string(self.fname), path='data')
             f = h5py.File(self.fname)
             Lbox = np.empty(3)
             Lbox[:] = f.attrs['Lbox']
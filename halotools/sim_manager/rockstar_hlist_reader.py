@@ -23,6 +23,7 @@ except ImportError:
 from .tabular_ascii_reader import TabularAsciiReader
 from .halo_table_cache import HaloTableCache
 from .halo_table_cache_log_entry import HaloTableCacheLogEntry, get_redshift_string
+from .lazy_halo_table import _write_columnar_table
 
 from ..sim_manager import halotools_cache_dirname
 from ..custom_exceptions import HalotoolsError
@@ -527,10 +528,15 @@ class RockstarHlistReader(TabularAsciiReader):
 
     def read_halocat(self, columns_to_convert_from_kpc_to_mpc,
             write_to_disk=False, update_cache_log=False,
-            add_supplementary_halocat_columns=True, **kwargs):
+            add_supplementary_halocat_columns=True, stream_to_disk=False,
+            columnar_layout=False, **kwargs):
         r""" Method reads the ascii data and
         binds the resulting catalog to ``self.halo_table``.
 
+        With ``stream_to_disk`` set to True, the catalog is instead written to
+        ``self.output_fname`` chunk by chunk, so that catalogs larger than
+        the RAM of your machine can be processed.
+
         By default, the optional ``write_to_disk`` and ``update_cache_log``
         arguments are set to False because Halotools will not
         write large amounts of data to disk without your explicit instructions
@@ -593,6 +599,28 @@ class RockstarHlistReader(TabularAsciiReader):
             choosing larger values typically improves performance.
             Default is 500 Mb.
 
+        num_threads : int, optional
+            Number of processes parsing chunks of the ASCII file in parallel.
+            A string 'max' may be used to indicate that
+            all available cores on the machine should be used.
+            Default is 1.
+
+        stream_to_disk : bool, optional
+            If True, each processed chunk of the ASCII data is appended to resizable
+            datasets of the hdf5 file ``self.output_fname``, so that only a few chunks
+            are ever stored in memory. The unit conversions of
+            ``columns_to_convert_from_kpc_to_mpc`` and the supplementary columns
+            are computed chunk by chunk. The catalog is written to disk regardless of
+            ``write_to_disk``, and it is not bound to ``self.halo_table``; once the
+            cache log is updated, the catalog can be loaded column by column with
+            `~halotools.sim_manager.CachedHaloCatalog.lazy_halo_table`.
+            The datasets of a streamed catalog are chunked, and so
+            they cannot be memory-mapped. Default is False.
+
+        columnar_layout : bool, optional
+            If True, each column of the halo table will be stored in its own
+            hdf5 dataset. See `write_to_disk`. Default is False.
+
         Notes
         -----
         Regarding the ``columns_to_convert_from_kpc_to_mpc`` argument,
@@ -609,6 +637,12 @@ class RockstarHlistReader(TabularAsciiReader):
         made on the halo_table between the time you called `read_halocat` and
         `write_to_disk`, and bind these notes to the ``processing_notes`` argument.
 
+        Examples
+        --------
+        Converting a catalog that does not fit in memory:
+
+        >>> reader = RockstarHlistReader(input_fname, columns_to_keep_dict, output_fname, simname, halo_finder, redshift, version_name, Lbox, particle_mass) # doctest: +SKIP
+        >>> reader.read_halocat(['halo_rvir', 'halo_rs'], stream_to_disk=True, update_cache_log=True, chunk_memory_size=100) # doctest: +SKIP
         """
         for key in columns_to_convert_from_kpc_to_mpc:
             try:
@@ -619,20 +653,25 @@ class RockstarHlistReader(TabularAsciiReader):
                     "``columns_to_keep_dict``\n")
                 raise HalotoolsError(msg)
 
-        result = self._read_ascii(**kwargs)
-        self.halo_table = Table(result)
+        if stream_to_disk is True:
+            self._stream_halocat_to_disk(columns_to_convert_from_kpc_to_mpc,
+                add_supplementary_halocat_columns, columnar_layout, **kwargs)
+            self._file_has_been_written_to_disk = True
+        else:
+            result = self._read_ascii(**kwargs)
+            self.halo_table = Table(result)
 
-        for key in columns_to_convert_from_kpc_to_mpc:
-            self.halo_table[key] /= 1000.
+            for key in columns_to_convert_from_kpc_to_mpc:
+                self.halo_table[key] /= 1000.
 
-        if add_supplementary_halocat_columns is True:
-            self.add_supplementary_halocat_columns()
+            if add_supplementary_halocat_columns is True:
+                self.add_supplementary_halocat_columns()
 
-        if write_to_disk is True:
-            self.write_to_disk()
-            self._file_has_been_written_to_disk = True
-        else:
-            self._file_has_been_written_to_disk = False
+            if write_to_disk is True:
+                self.write_to_disk(columnar_layout=columnar_layout)
+                self._file_has_been_written_to_disk = True
+            else:
+                self._file_has_been_written_to_disk = False
 
         if update_cache_log is True:
             if self._file_has_been_written_to_disk is True:
@@ -666,6 +705,12 @@ class RockstarHlistReader(TabularAsciiReader):
             choosing larger values typically improves performance.
             Default is 500 Mb.
 
+        num_threads : int, optional
+            Number of processes parsing chunks of the ASCII file in parallel.
+            A string 'max' may be used to indicate that
+            all available cores on the machine should be used.
+            Default is 1.
+
         Returns
         --------
         full_array : array_like
@@ -684,7 +729,75 @@ class RockstarHlistReader(TabularAsciiReader):
         """
         return TabularAsciiReader.read_ascii(self, **kwargs)
 
-    def write_to_disk(self):
+    def _stream_halocat_to_disk(self, columns_to_convert_from_kpc_to_mpc,
+            add_supplementary_halocat_columns, columnar_layout, **kwargs):
+        """ Private method appending each processed chunk of the ASCII data
+        to resizable datasets of ``self.output_fname``, and then writing the metadata.
+
+        The catalog is written to a temporary file in the same directory that is only
+        renamed to ``self.output_fname`` once every chunk and the metadata have been written,
+        so that a failure part way through never leaves a truncated catalog at ``self.output_fname``.
+        """
+        if not _HAS_H5PY:
+            raise HalotoolsError(uninstalled_h5py_msg)
+
+        output_fname = _passively_decode_string(self.output_fname)
+        if os.path.isfile(output_fname) & (self.overwrite is False):
+            msg = ("\nThe file ``{0}`` already exists. Set ``overwrite`` to True "
+                "if you want to overwrite this file.\n".format(output_fname))
+            raise HalotoolsError(msg)
+
+        def process_chunk(chunk):
+            halo_table = Table(chunk, copy=False)
+            for key in columns_to_convert_from_kpc_to_mpc:
+                halo_table[key] /= 1000.
+            if add_supplementary_halocat_columns is True:
+                _add_supplementary_halocat_columns(halo_table)
+            return halo_table
+
+        # Process an empty chunk to determine the columns of the output file
+        empty_halo_table = process_chunk(np.zeros(0, dtype=self.dt))
+        colnames = empty_halo_table.keys()
+
+        print(("\n...Streaming the processed halo catalog to the file: \n%s\n "
+               % output_fname))
+        tmp_fname = output_fname + '.{0}.tmp'.format(os.getpid())
+        try:
+            with h5py.File(tmp_fname, 'w') as f:
+                if columnar_layout is True:
+                    group = f.create_group('data')
+                    for key in colnames:
+                        group.create_dataset(key, shape=(0, ), maxshape=(None, ),
+                            dtype=empty_halo_table[key].dtype, chunks=True)
+                    group.attrs['colnames'] = [np.bytes_(key) for key in colnames]
+                else:
+                    f.create_dataset('data', shape=(0, ), maxshape=(None, ),
+                        dtype=empty_halo_table.as_array().dtype, chunks=True)
+
+                num_halos = 0
+                for chunk in self._cut_chunk_generator(**kwargs):
+                    halo_table = process_chunk(chunk)
+                    if len(halo_table) == 0:
+                        continue
+                    new_num_halos = num_halos + len(halo_table)
+                    if columnar_layout is True:
+                        for key in colnames:
+                            f['data'][key].resize((new_num_halos, ))
+                            f['data'][key][num_halos:] = halo_table[key]
+                    else:
+                        f['data'].resize((new_num_halos, ))
+                        f['data'][num_halos:] = halo_table.as_array()
+                    num_halos = new_num_halos
+
+            self._write_metadata(tmp_fname)
+            os.rename(tmp_fname, output_fname)
+        finally:
+            if os.path.isfile(tmp_fname):
+                os.remove(tmp_fname)
+
+        print(("Total number of halos written to disk = %i\n" % num_halos))
+
+    def write_to_disk(self, columnar_layout=False):
         """ Method writes ``self.halo_table`` to ``self.output_fname``
         and also calls the ``self._write_metadata`` method to place the
         hdf5 file into standard form.
@@ -692,22 +805,41 @@ class RockstarHlistReader(TabularAsciiReader):
         It is likely that you will want to call the ``update_cache_log`` method
         after calling ``write_to_disk`` so that you can take advantage of the convenient
         syntax provided by the `~halotools.sim_manager.CachedHaloCatalog` class.
+
+        Parameters
+        ----------
+        columnar_layout : bool, optional
+            If True, each column of the halo table will be stored in its own
+            hdf5 dataset, so that reading a few columns with
+            `~halotools.sim_manager.CachedHaloCatalog.lazy_halo_table` does not
+            require reading the entire catalog from disk.
+            Files written in this layout can no longer be read with
+            ``Table.read(fname, path='data')``.
+            Default is False, for the standard layout.
         """
         if not _HAS_H5PY:
             raise HalotoolsError(uninstalled_h5py_msg)
 
-        self.halo_table.write(
-            _passively_decode_string(self.output_fname), path='data', overwrite=self.overwrite)
+        if columnar_layout is True:
+            _write_columnar_table(self.halo_table,
+                _passively_decode_string(self.output_fname), path='data', overwrite=self.overwrite)
+        else:
+            self.halo_table.write(
+                _passively_decode_string(self.output_fname), path='data', overwrite=self.overwrite)
         self._write_metadata()
 
-    def _write_metadata(self):
-        """ Private method to add metadata to the hdf5 file.
+    def _write_metadata(self, fname=None):
+        """ Private method to add metadata to the hdf5 file ``fname``,
+        which defaults to ``self.output_fname``.
         """
         if not _HAS_H5PY:
             raise HalotoolsError(uninstalled_h5py_msg)
 
+        if fname is None:
+            fname = self.output_fname
+
         # Now add the metadata
-        f = h5py.File(self.output_fname)
+        f = h5py.File(fname)
         f.attrs.create('simname', np.string_(self.simname))
         f.attrs.create('halo_finder', np.string_(self.halo_finder))
         redshift_string = np.string_(get_redshift_string(self.redshift))
@@ -756,15 +888,23 @@ class RockstarHlistReader(TabularAsciiReader):
         This implementation will eventually change in favor of something
         more flexible.
         """
-        # Add the halo_nfw_conc column
-        if ('halo_rvir' in list(self.halo_table.keys())) & ('halo_rs' in list(self.halo_table.keys())):
-            self.halo_table['halo_nfw_conc'] = (
-                self.halo_table['halo_rvir'] / self.halo_table['halo_rs']
-                )
-
-        # Add the halo_nfw_conc column
-        self.halo_table['halo_hostid'] = self.halo_table['halo_id']
-        subhalo_mask = self.halo_table['halo_upid'] != -1
-        self.halo_table['halo_hostid'][subhalo_mask] = (
-            self.halo_table['halo_upid'][subhalo_mask]
+        _add_supplementary_halocat_columns(self.halo_table)
+
+
+def _add_supplementary_halocat_columns(halo_table):
+    """ Add the halo_nfw_conc and halo_hostid columns to the input table.
+    Each row of these columns only depends on the same row of the table,
+    so that the columns can be added to each chunk of a streamed catalog.
+    """
+    # Add the halo_nfw_conc column
+    if ('halo_rvir' in list(halo_table.keys())) & ('halo_rs' in list(halo_table.keys())):
+        halo_table['halo_nfw_conc'] = (
+            halo_table['halo_rvir'] / halo_table['halo_rs']
             )
+
+    # Add the halo_hostid column
+    halo_table['halo_hostid'] = halo_table['halo_id']
+    subhalo_mask = halo_table['halo_upid'] != -1
+    halo_table['halo_hostid'][subhalo_mask] = (
+        halo_table['halo_upid'][subhalo_mask]
+        )
@@ -6,13 +6,17 @@ of a data type that is known in advance.
 """
 import os
 import gzip
+import locale
 import collections
+import multiprocessing
 from time import time
 import numpy as np
 
 from astropy.extern.six.moves import xrange as range
 
+from .engines import ascii_parsing_engine
 from ..utils.python_string_comparisons import _passively_decode_string
+from ..utils.multiprocessing_utils import _process_num_threads
 
 __all__ = ('TabularAsciiReader', )
 
@@ -37,6 +41,12 @@ class TabularAsciiReader(object):
     only requires you to have enough RAM to store the *cut* catalog,
     not the entire ASCII file.
 
+    Each chunk is a block of bytes storing complete lines of the file.
+    Blocks of numerical data are tokenized by the compiled
+    `~halotools.sim_manager.engines.ascii_parsing_engine`, which only parses
+    the requested columns, and blocks can be parsed by several
+    processes at once with the ``num_threads`` argument of `read_ascii`.
+
     The primary method of the class is
     `~halotools.sim_manager.TabularAsciiReader.read_ascii`.
     The output of this method is a structured Numpy array,
@@ -493,6 +503,50 @@ class TabularAsciiReader(object):
             yield tuple(parsed_line[i] for i in self.column_indices_to_keep)
             cur += 1
 
+    def _ascii_block_generator(self, f, block_size):
+        """ Python generator reading an input open binary file object in blocks
+        of approximately ``block_size`` bytes, yielding bytearrays that end on a line boundary.
+
+        Each block is read in place into a newly allocated bytearray, and the incomplete
+        last line is carried over to the beginning of the next block,
+        so that at most one block is stored in memory by the generator.
+        """
+        remainder = b''
+        while True:
+            # A line longer than block_size doubles the size of the next block
+            block = bytearray(max(block_size, 2*len(remainder)))
+            block[:len(remainder)] = remainder
+            num_bytes = len(remainder)
+            view = memoryview(block)
+            while num_bytes < len(block):
+                num_bytes_read = f.readinto(view[num_bytes:])
+                if not num_bytes_read:
+                    break
+                num_bytes += num_bytes_read
+            del view
+
+            if num_bytes < len(block):
+                del block[num_bytes:]
+                if num_bytes > 0:
+                    yield block
+                return
+
+            last_newline = block.rfind(b'\n')
+            remainder = bytes(block[last_newline+1:])
+            del block[last_newline+1:]
+            if len(block) > 0:
+                yield block
+            # Release the previous block before allocating the next one
+            del block
+
+    def _parse_ascii_block_args(self):
+        """ Tuple of the arguments of `_parse_ascii_block` following the block,
+        passed explicitly so that the function can be sent to worker processes.
+        """
+        return (self.dt, self.column_indices_to_keep, self.header_char,
+            self.row_cut_min_dict, self.row_cut_max_dict,
+            self.row_cut_eq_dict, self.row_cut_neq_dict)
+
     def apply_row_cut(self, array_chunk):
         """ Method applies a boolean mask to the input array
         based on the row-cuts determined by the
@@ -506,27 +560,18 @@ class TabularAsciiReader(object):
         --------
         cut_array : Numpy array
         """
-        mask = np.ones(len(array_chunk), dtype=bool)
-
-        for colname, lower_bound in self.row_cut_min_dict.items():
-            mask *= array_chunk[colname] > lower_bound
-
-        for colname, upper_bound in self.row_cut_max_dict.items():
-            mask *= array_chunk[colname] < upper_bound
+        return _apply_row_cut(array_chunk, self.row_cut_min_dict, self.row_cut_max_dict,
+            self.row_cut_eq_dict, self.row_cut_neq_dict)
 
-        for colname, equality_condition in self.row_cut_eq_dict.items():
-            mask *= array_chunk[colname] == equality_condition
-
-        for colname, inequality_condition in self.row_cut_neq_dict.items():
-            mask *= array_chunk[colname] != inequality_condition
-
-        return array_chunk[mask]
-
-    def read_ascii(self, chunk_memory_size=500):
+    def read_ascii(self, chunk_memory_size=500, num_threads=1):
         """ Method reads the input ascii and returns
         a structured Numpy array of the data
         that passes the row- and column-cuts.
 
+        The file is decompressed and scanned exactly once: chunks are sized by bytes
+        rather than by a pre-computed number of rows, and the rows passing the cuts are
+        appended to an output array whose capacity grows geometrically.
+
         Parameters
         ----------
         chunk_memory_size : int, optional
@@ -536,6 +581,16 @@ class TabularAsciiReader(object):
             choosing larger values typically improves performance.
             Default is 500 Mb.
 
+        num_threads : int, optional
+            Number of processes parsing chunks of the file in parallel
+            using the python ``multiprocessing`` module. The file is read sequentially,
+            and each newly read chunk is parsed and cut by the next available process,
+            so that up to 2*num_threads chunks are held in memory at once.
+            A string 'max' may be used to indicate that
+            all available cores on the machine should be used.
+            Default is 1 for a purely serial calculation, in which case a multiprocessing
+            Pool object will never be instantiated.
+
         Returns
         --------
         full_array : array_like
@@ -552,60 +607,173 @@ class TabularAsciiReader(object):
                % self.input_fname))
         start = time()
 
-        file_size = os.path.getsize(self.input_fname)
-        # convert to bytes to match units of file_size
-        chunk_memory_size *= 1e6
-        num_data_rows = int(self.data_len())
-        print(("Total number of rows in detected data = %i" % num_data_rows))
+        full_array = np.zeros(0, dtype=self.dt)
+        num_rows = 0
+        for cut_chunk in self._cut_chunk_generator(chunk_memory_size, num_threads):
+            if num_rows + len(cut_chunk) > len(full_array):
+                capacity = max(num_rows + len(cut_chunk), 2*len(full_array))
+                full_array.resize(capacity, refcheck=False)
+            full_array[num_rows:num_rows+len(cut_chunk)] = cut_chunk
+            num_rows += len(cut_chunk)
+        full_array.resize(num_rows, refcheck=False)
+        print(("Total number of rows passing the cuts = %i" % num_rows))
 
-        # Set the number of chunks to be filesize/chunk_memory,
-        # but enforcing that 0 < Nchunks <= num_data_rows
-        try:
-            Nchunks = int(max(1, min(file_size / chunk_memory_size, num_data_rows)))
-        except ZeroDivisionError:
+        end = time()
+        runtime = (end-start)
+
+        if runtime > 60:
+            runtime = runtime/60.
+            msg = "Total runtime to read in ASCII = %.1f minutes\n"
+        else:
+            msg = "Total runtime to read in ASCII = %.2f seconds\n"
+        print((msg % runtime))
+        print("\a")
+
+        return full_array
+
+    def _cut_chunk_generator(self, chunk_memory_size=500, num_threads=1):
+        """ Python generator making a single pass over the input ASCII file
+        to yield, in order, the structured Numpy array of each chunk of rows passing the cuts.
+        Progress is reported by the fraction of the bytes of the file read from disk,
+        which for a gzipped file is the offset in the compressed stream.
+        """
+        num_threads = _process_num_threads(num_threads)
+
+        # convert to bytes to set the size of each block read from the file
+        chunk_memory_size *= 1e6
+        if chunk_memory_size <= 0:
             msg = ("\nMust choose non-zero size for input "
                    "``chunk_memory_size``")
             raise ValueError(msg)
+        block_size = int(max(1, chunk_memory_size))
+
+        file_size = max(1, os.path.getsize(self.input_fname))
+
+        with self._compression_safe_file_opener(self.input_fname, 'rb') as f:
+
+            # Lines beginning with header_char are skipped by the parser,
+            # so only an explicitly requested number of header lines needs skipping
+            if self.num_lines_header is not None:
+                for skip_header_row in range(self.num_lines_header):
+                    f.readline()
+
+            def progress_report(_i):
+                percent_read = 100.*_bytes_read_from_disk(f)/file_size
+                print(("... working on chunk %i, %.1f%% of the file read" % (_i, min(100., percent_read))))
+
+            blocks = self._ascii_block_generator(f, block_size)
+            parse_args = self._parse_ascii_block_args()
+            if num_threads == 1:
+                # Blocks are counted by hand because enumerate
+                # would hold a reference to the previous block
+                _i = 0
+                for block in blocks:
+                    progress_report(_i)
+                    cut_chunk = _parse_ascii_block(block, *parse_args)
+                    # Release the raw block before the chunk is consumed
+                    del block
+                    yield cut_chunk
+                    _i += 1
+            else:
+                pool = multiprocessing.Pool(num_threads)
+                try:
+                    pending = collections.deque()
+                    for _i, block in enumerate(blocks):
+                        progress_report(_i)
+                        pending.append(pool.apply_async(_parse_ascii_block, (block, ) + parse_args))
+                        if len(pending) >= 2*num_threads:
+                            yield pending.popleft().get()
+                    while len(pending) > 0:
+                        yield pending.popleft().get()
+                finally:
+                    pool.close()
+                    pool.join()
+
+
+def _bytes_read_from_disk(f):
+    """ Offset of the input open file object in the file on disk,
+    which for a gzipped file is the offset in the compressed stream.
+    """
+    try:
+        return f.fileobj.tell()
+    except AttributeError:
+        return f.tell()
 
-        num_rows_in_chunk = int(num_data_rows // Nchunks)
-        num_full_chunks = int(num_data_rows // num_rows_in_chunk)
-        num_rows_in_chunk_remainder = num_data_rows - num_rows_in_chunk*Nchunks
-
-        header_length = int(self.header_len())
-        print(("Number of rows in detected header = %i \n" % header_length))
 
-        chunklist = []
-        with self._compression_safe_file_opener(self.input_fname, 'r') as f:
+def _parse_ascii_block(block, dt, column_indices_to_keep, header_char,
+        row_cut_min_dict, row_cut_max_dict, row_cut_eq_dict, row_cut_neq_dict):
+    """ Function parses the requested columns of the input block of ASCII data
+    and returns the structured Numpy array of the rows passing the row-cuts.
 
-            for skip_header_row in range(header_length):
-                _s = f.readline()
+    The function is defined at module level and receives the attributes of the
+    `~halotools.sim_manager.TabularAsciiReader` as explicit arguments so that
+    it can be pickled and sent to the processes of a ``multiprocessing`` Pool.
+    """
+    is_int = [dt[key].kind in ('i', 'u') for key in dt.names]
+    is_float = [dt[key].kind == 'f' for key in dt.names]
+    # The cython engine converts floats with strtod, which depends on the locale
+    use_engine = ((len(dt.names) > 0) and np.all(np.logical_or(is_int, is_float)) and
+        (locale.localeconv()['decimal_point'] == '.'))
+    if not use_engine:
+        array_chunk = _parse_ascii_block_python(block, dt, column_indices_to_keep, header_char)
+        return _apply_row_cut(array_chunk, row_cut_min_dict, row_cut_max_dict,
+            row_cut_eq_dict, row_cut_neq_dict)
+
+    float_data, int_data, error_offset = ascii_parsing_engine(block,
+        column_indices_to_keep, is_int, header_char.encode('ascii'))
+
+    if error_offset != -1:
+        line = block[error_offset:].split(b'\n')[0].decode('ascii', 'replace')
+        msg = ("\nThe following line of the ASCII data could not be parsed:\n\n{0}\n\n"
+            "Each line of data must have at least {1} columns,\n"
+            "and each column of ``columns_to_keep_dict`` must store numbers of the requested dtype,\n"
+            "with integers fitting in 64 bits.\n")
+        raise ValueError(msg.format(line, max(column_indices_to_keep)+1))
+
+    array_chunk = np.empty(len(float_data), dtype=dt)
+    ifloat, iint = 0, 0
+    for key, key_is_int in zip(dt.names, is_int):
+        if key_is_int:
+            array_chunk[key] = int_data[:, iint]
+            iint += 1
+        else:
+            array_chunk[key] = float_data[:, ifloat]
+            ifloat += 1
+    del float_data, int_data
+    return _apply_row_cut(array_chunk, row_cut_min_dict, row_cut_max_dict,
+        row_cut_eq_dict, row_cut_neq_dict)
 
-            for _i in range(num_full_chunks):
-                print(("... working on chunk " + str(_i) +
-                       " of " + str(num_full_chunks)))
 
-                chunk_array = np.array(list(
-                    self.data_chunk_generator(num_rows_in_chunk, f)), dtype=self.dt)
-                cut_chunk = self.apply_row_cut(chunk_array)
-                chunklist.append(cut_chunk)
+def _parse_ascii_block_python(block, dt, column_indices_to_keep, header_char):
+    """ Parse the input block of ASCII data line by line, which is needed
+    for dtypes that are not numbers, e.g., strings, and for locales whose
+    decimal point is not a period.
+    """
+    rows = []
+    for line in block.decode().splitlines():
+        parsed_line = line.strip().split()
+        if (len(parsed_line) > 0) and (parsed_line[0][0:len(header_char)] != header_char):
+            rows.append(tuple(parsed_line[i] for i in column_indices_to_keep))
+    return np.array(rows, dtype=dt)
+
+
+def _apply_row_cut(array_chunk, row_cut_min_dict, row_cut_max_dict,
+        row_cut_eq_dict, row_cut_neq_dict):
+    """ Function applies the row-cuts of `~halotools.sim_manager.TabularAsciiReader.apply_row_cut`
+    to the input array, taking the row-cut dictionaries as explicit arguments.
+    """
+    mask = np.ones(len(array_chunk), dtype=bool)
 
-            # Now for the remainder chunk
-            chunk_array = np.array(list(
-                self.data_chunk_generator(num_rows_in_chunk_remainder, f)), dtype=self.dt)
-            cut_chunk = self.apply_row_cut(chunk_array)
-            chunklist.append(cut_chunk)
+    for colname, lower_bound in row_cut_min_dict.items():
+        mask *= array_chunk[colname] > lower_bound
 
-        full_array = np.concatenate(chunklist)
+    for colname, upper_bound in row_cut_max_dict.items():
+        mask *= array_chunk[colname] < upper_bound
 
-        end = time()
-        runtime = (end-start)
+    for colname, equality_condition in row_cut_eq_dict.items():
+        mask *= array_chunk[colname] == equality_condition
 
-        if runtime > 60:
-            runtime = runtime/60.
-            msg = "Total runtime to read in ASCII = %.1f minutes\n"
-        else:
-            msg = "Total runtime to read in ASCII = %.2f seconds\n"
-        print((msg % runtime))
-        print("\a")
+    for colname, inequality_condition in row_cut_neq_dict.items():
+        mask *= array_chunk[colname] != inequality_condition
 
-        return full_array
+    return array_chunk[mask]
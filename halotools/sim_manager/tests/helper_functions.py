@@ -50,3 +50,12 @@ def add_new_row_to_cache_log(scenario,
         return table_vstack([existing_table, new_table])
     except KeyError:
         return new_table
+
+
+def _is_memory_mapped(arr):
+    base = arr
+    while base is not None:
+        if isinstance(base, np.memmap):
+            return True
+        base = base.base
+    return False
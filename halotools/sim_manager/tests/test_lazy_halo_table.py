@@ -0,0 +1,217 @@
+"""
+"""
+from __future__ import absolute_import, division, print_function
+
+import os
+import shutil
+
+import numpy as np
+import pytest
+from astropy.config.paths import _find_home
+from astropy.table import Table
+
+try:
+    import h5py
+    HAS_H5PY = True
+except ImportError:
+    HAS_H5PY = False
+
+from .helper_functions import _is_memory_mapped
+from ..lazy_halo_table import LazyHaloTable, _write_columnar_table
+from ..cached_halo_catalog import _derived_halo_columns
+from ...utils import add_halo_hostid, broadcast_host_halo_property
+
+__all__ = ('test_lazy_halo_table_layouts', )
+
+tmp_dirname = os.path.join(_find_home(), '.tmp_testingdir_lazy_halo_table')
+
+
+def fake_halo_table(num_halos=100, seed=43):
+    rng = np.random.RandomState(seed)
+    halo_id = np.arange(num_halos, dtype='i8')
+    halo_upid = np.where(rng.uniform(size=num_halos) < 0.7, -1, 0)
+    is_sub = halo_upid == 0
+    halo_upid[is_sub] = rng.choice(halo_id[~is_sub], size=np.count_nonzero(is_sub))
+    t = Table()
+    t['halo_id'] = halo_id
+    t['halo_upid'] = halo_upid
+    t['halo_mvir'] = 10**rng.uniform(10, 15, num_halos)
+    for key in ('halo_x', 'halo_y', 'halo_z'):
+        t[key] = rng.uniform(0, 250, num_halos)
+    t['halo_nfw_conc'] = rng.uniform(5, 10, num_halos).astype('f4')
+    return t
+
+
+def setup_module():
+    try:
+        shutil.rmtree(tmp_dirname)
+    except OSError:
+        pass
+    os.makedirs(tmp_dirname)
+
+
+def teardown_module():
+    try:
+        shutil.rmtree(tmp_dirname)
+    except OSError:
+        pass
+
+
+@pytest.mark.skipif('not HAS_H5PY')
+def test_lazy_halo_table_layouts():
+    """ Verify that both on-disk layouts read back the same columns,
+    and that only the requested columns are stored in memory.
+    """
+    t = fake_halo_table()
+    fname_rows = os.path.join(tmp_dirname, 'rows.hdf5')
+    fname_columns = os.path.join(tmp_dirname, 'columns.hdf5')
+    t.write(fname_rows, path='data', overwrite=True)
+    _write_columnar_table(t, fname_columns, path='data', overwrite=True)
+
+    for fname, columnar_layout in ((fname_rows, False), (fname_columns, True)):
+        halos = LazyHaloTable(fname)
+        assert halos.columnar_layout is columnar_layout
+        assert halos.keys() == t.keys()
+        assert len(halos) == len(t)
+        assert halos.loaded_colnames == []
+
+        assert np.all(halos['halo_mvir'] == t['halo_mvir'])
+        assert halos.loaded_colnames == ['halo_mvir']
+        assert halos['halo_nfw_conc'].dtype == t['halo_nfw_conc'].dtype
+
+        subset = halos.as_table(['halo_x', 'halo_id'])
+        assert subset.keys() == ['halo_x', 'halo_id']
+        assert set(halos.loaded_colnames) == set(['halo_mvir', 'halo_nfw_conc', 'halo_x', 'halo_id'])
+
+        full = halos.as_table()
+        for key in t.keys():
+            assert np.all(full[key] == t[key])
+
+        halos.clear()
+        assert halos.loaded_colnames == []
+
+
+@pytest.mark.skipif('not HAS_H5PY')
+def test_lazy_halo_table_rows():
+    t = fake_halo_table()
+    fname = os.path.join(tmp_dirname, 'columns.hdf5')
+    _write_columnar_table(t, fname, path='data', overwrite=True)
+
+    halos = LazyHaloTable(fname, rows=slice(10, 30))
+    assert len(halos) == 20
+    assert np.all(halos['halo_id'] == t['halo_id'][10:30])
+
+    with pytest.raises(ValueError) as err:
+        __ = LazyHaloTable(fname, rows=slice(0, 30, 2))
+    substr = "Input ``rows`` must be a slice of contiguous rows"
+    assert substr in err.value.args[0]
+
+
+@pytest.mark.skipif('not HAS_H5PY')
+def test_lazy_halo_table_getitem_rows():
+    """ Verify that integers, slices, index arrays and boolean masks select rows
+    as for an astropy Table, while strings and lists of strings select columns.
+    """
+    t = fake_halo_table()
+    fname = os.path.join(tmp_dirname, 'columns.hdf5')
+    _write_columnar_table(t, fname, path='data', overwrite=True)
+    halos = LazyHaloTable(fname)
+
+    subset = halos[['halo_x', 'halo_id']]
+    assert subset.keys() == ['halo_x', 'halo_id']
+    assert np.all(halos[('halo_mvir', )]['halo_mvir'] == t['halo_mvir'])
+
+    row = halos[3]
+    assert row['halo_id'] == t['halo_id'][3]
+    assert row['halo_mvir'] == t['halo_mvir'][3]
+
+    mask = t['halo_upid'] == -1
+    idx = np.array([5, 1, 7])
+    for key in (slice(10, 20), mask, idx):
+        selected = halos[key]
+        assert selected.keys() == t.keys()
+        for colname in t.keys():
+            assert np.all(selected[colname] == t[colname][key])
+
+
+@pytest.mark.skipif('not HAS_H5PY')
+def test_lazy_halo_table_derived_columns():
+    """ Verify that the derived columns of `~halotools.sim_manager.CachedHaloCatalog`
+    agree with the eagerly computed columns.
+    """
+    t = fake_halo_table()
+    fname = os.path.join(tmp_dirname, 'rows.hdf5')
+    t.write(fname, path='data', overwrite=True)
+
+    halos = LazyHaloTable(fname, derived_columns=_derived_halo_columns)
+    assert halos.keys() == t.keys() + ['halo_hostid', 'halo_mvir_host_halo']
+
+    add_halo_hostid(t)
+    broadcast_host_halo_property(t, 'halo_mvir')
+    assert np.all(halos['halo_mvir_host_halo'] == t['halo_mvir_host_halo'])
+    assert 'halo_x' not in halos.loaded_colnames
+
+    full = halos.as_table()
+    assert full.keys() == t.keys()
+    assert np.all(full['halo_hostid'] == t['halo_hostid'])
+
+
+@pytest.mark.skipif('not HAS_H5PY')
+def test_lazy_halo_table_setitem():
+    t = fake_halo_table()
+    fname = os.path.join(tmp_dirname, 'rows.hdf5')
+    t.write(fname, path='data', overwrite=True)
+
+    halos = LazyHaloTable(fname)
+    halos['halo_vmax'] = np.ones(len(t))
+    assert 'halo_vmax' in halos.keys()
+    halos.clear()
+    assert halos.loaded_colnames == ['halo_vmax']
+
+    with pytest.raises(ValueError):
+        halos['halo_vpeak'] = np.ones(len(t) + 1)
+
+    with pytest.raises(KeyError):
+        __ = halos['halo_vpeak']
+
+    with h5py.File(fname, 'r') as f:
+        assert 'halo_vmax' not in f['data'].dtype.names
+
+@pytest.mark.skipif('not HAS_H5PY')
+def test_lazy_halo_table_memmap():
+    """ Verify that memory-mapped columns agree with the columns read into memory
+    for both layouts, and that modifying a column leaves the file unchanged.
+    """
+    t = fake_halo_table()
+    fname_rows = os.path.join(tmp_dirname, 'rows.hdf5')
+    fname_columns = os.path.join(tmp_dirname, 'columns.hdf5')
+    t.write(fname_rows, path='data', overwrite=True)
+    _write_columnar_table(t, fname_columns, path='data', overwrite=True)
+
+    for fname in (fname_rows, fname_columns):
+        halos = LazyHaloTable(fname, rows=slice(5, 50), memmap=True)
+        for key in t.keys():
+            assert _is_memory_mapped(halos[key])
+            assert np.all(halos[key] == t[key][5:50])
+
+        halos['halo_x'][:] = -1
+        assert np.all(LazyHaloTable(fname)['halo_x'] == t['halo_x'])
+
+        halo_table = halos.as_table()
+        assert _is_memory_mapped(halo_table['halo_mvir'])
+
+
+@pytest.mark.skipif('not HAS_H5PY')
+def test_lazy_halo_table_memmap_compressed():
+    """ Compressed datasets cannot be memory-mapped and are read into memory instead.
+    """
+    t = fake_halo_table()
+    fname = os.path.join(tmp_dirname, 'compressed.hdf5')
+    t.write(fname, path='data', overwrite=True, compression=True)
+
+    halos = LazyHaloTable(fname, memmap=True)
+    with pytest.warns(UserWarning) as record:
+        halo_mvir = halos['halo_mvir']
+    assert "cannot be memory-mapped" in str(record[0].message)
+    assert not _is_memory_mapped(halo_mvir)
+    assert np.all(halo_mvir == t['halo_mvir'])
@@ -15,6 +15,7 @@ from collections import OrderedDict
 
 from ..rockstar_hlist_reader import RockstarHlistReader, _infer_redshift_from_input_fname
 from ..halo_table_cache import HaloTableCache
+from ..lazy_halo_table import LazyHaloTable
 
 from ...custom_exceptions import HalotoolsError
 
@@ -346,6 +347,96 @@ class TestRockstarHlistReader(TestCase):
         reader.read_halocat([], add_supplementary_halocat_columns=False,
             chunk_memory_size=101, write_to_disk=False)
 
+    @pytest.mark.skipif('not HAS_H5PY')
+    def test_stream_to_disk(self):
+        """ Verify that the catalog streamed to disk chunk by chunk agrees with
+        the catalog read into memory, for both hdf5 layouts.
+        """
+        num_halos = 2000
+        temp_fname = os.path.join(self.tmpdir, 'temp_ascii_halo_catalog.list')
+        write_temporary_ascii(num_halos, temp_fname)
+
+        columns_to_keep_dict = (
+            {'halo_spin_bullock': (0, 'f4'), 'halo_id': (1, 'i8'),
+            'halo_upid': (2, 'i8'),
+            'halo_x': (3, 'f4'),
+            'halo_y': (4, 'f4'),
+            'halo_z': (5, 'f4'),
+             })
+
+        reader = RockstarHlistReader(
+            input_fname=temp_fname,
+            columns_to_keep_dict=columns_to_keep_dict,
+            output_fname=self.good_output_fname,
+            simname='bolplanck', halo_finder='rockstar', redshift=11.8008,
+            version_name='dummy', Lbox=250., particle_mass=1.35e8,
+            row_cut_min_dict={'halo_spin_bullock': 0.1}
+            )
+        reader.read_halocat(['halo_y'], write_to_disk=False)
+        halo_table = reader.halo_table
+
+        for columnar_layout in (False, True):
+            output_fname = os.path.join(self.tmpdir, 'streamed_{0}.hdf5'.format(columnar_layout))
+            reader = RockstarHlistReader(
+                input_fname=temp_fname,
+                columns_to_keep_dict=columns_to_keep_dict,
+                output_fname=output_fname,
+                simname='bolplanck', halo_finder='rockstar', redshift=11.8008,
+                version_name='dummy', Lbox=250., particle_mass=1.35e8,
+                row_cut_min_dict={'halo_spin_bullock': 0.1}
+                )
+            reader.read_halocat(['halo_y'], stream_to_disk=True,
+                columnar_layout=columnar_layout, chunk_memory_size=1e-3)
+            assert not hasattr(reader, 'halo_table')
+
+            streamed_halo_table = LazyHaloTable(output_fname).as_table()
+            assert streamed_halo_table.keys() == halo_table.keys()
+            for key in halo_table.keys():
+                assert np.all(streamed_halo_table[key] == halo_table[key])
+                assert streamed_halo_table[key].dtype == halo_table[key].dtype
+
+            with h5py.File(output_fname, 'r') as f:
+                assert f.attrs['simname'] == b'bolplanck'
+                assert f.attrs['halo_spin_bullock_row_cut_min'] == 0.1
+
+            with pytest.raises(HalotoolsError) as err:
+                reader.read_halocat(['halo_y'], stream_to_disk=True)
+            substr = "already exists. Set ``overwrite`` to True"
+            assert substr in err.value.args[0]
+
+    @pytest.mark.skipif('not HAS_H5PY')
+    def test_stream_to_disk_failure(self):
+        """ Verify that no catalog is left at the output path when
+        streaming fails part way through the ASCII file.
+        """
+        num_halos = 2000
+        temp_fname = os.path.join(self.tmpdir, 'temp_ascii_halo_catalog.list')
+        write_temporary_ascii(num_halos, temp_fname)
+        with open(temp_fname, 'a') as f:
+            f.write('not_a_number  1  -1  1.  1.  1.\n')
+
+        columns_to_keep_dict = (
+            {'halo_spin_bullock': (0, 'f4'), 'halo_id': (1, 'i8'),
+            'halo_upid': (2, 'i8'),
+            'halo_x': (3, 'f4'),
+            'halo_y': (4, 'f4'),
+            'halo_z': (5, 'f4'),
+             })
+
+        output_fname = os.path.join(self.tmpdir, 'streamed.hdf5')
+        reader = RockstarHlistReader(
+            input_fname=temp_fname,
+            columns_to_keep_dict=columns_to_keep_dict,
+            output_fname=output_fname,
+            simname='bolplanck', halo_finder='rockstar', redshift=11.8008,
+            version_name='dummy', Lbox=250., particle_mass=1.35e8,
+            )
+        with pytest.raises(ValueError) as err:
+            reader.read_halocat(['halo_y'], stream_to_disk=True, chunk_memory_size=1e-3)
+        assert "not_a_number" in err.value.args[0]
+        assert not os.path.isfile(output_fname)
+        assert not any(fname.endswith('.tmp') for fname in os.listdir(self.tmpdir))
+
     def tearDown(self):
         try:
             shutil.rmtree(self.tmpdir)
@@ -1,6 +1,9 @@
 """
 """
 import os
+import gzip
+import locale
+import pickle
 import shutil
 import numpy as np
 from unittest import TestCase
@@ -9,7 +12,9 @@ from astropy.table import Table
 
 from astropy.config.paths import _find_home
 
-from ..tabular_ascii_reader import TabularAsciiReader
+from .. import tabular_ascii_reader
+from ..tabular_ascii_reader import TabularAsciiReader, _parse_ascii_block
+from ..engines import ascii_parsing_engine
 
 
 # Determine whether the machine is mine
@@ -240,8 +245,196 @@ class TestTabularAsciiReader(TestCase):
         substr = "Must choose non-zero size for input ``chunk_memory_size``"
         assert substr in err.value.args[0]
 
+    def test_read_ascii_blocks(self):
+        """ Verify that the data are independent of the size of the blocks
+        and of the number of processes, for plain-text and gzipped files.
+        """
+        num_rows = 1000
+        rng = np.random.RandomState(43)
+        t = Table()
+        t['halo_id'] = np.arange(num_rows).astype('i8')
+        t['halo_upid'] = rng.choice([-1, 10, 3999494332], num_rows)
+        t['halo_mvir'] = 10**rng.uniform(10, 15, num_rows)
+        t['halo_spin'] = rng.uniform(0, 1, num_rows).astype('f4')
+        fname = os.path.join(self.tmpdir, 'halos.txt')
+        t.write(fname, format='ascii.commented_header')
+
+        columns_to_keep_dict = {'halo_mvir': (2, 'f8'), 'halo_id': (0, 'i8'),
+            'halo_upid': (1, 'i8'), 'halo_spin': (3, 'f4')}
+        reader = TabularAsciiReader(fname, columns_to_keep_dict)
+        arr = reader.read_ascii()
+        for key in t.keys():
+            assert np.all(arr[key] == t[key])
+
+        with open(fname, 'rb') as f_in:
+            with gzip.open(fname + '.gz', 'wb') as f_out:
+                f_out.write(f_in.read())
+
+        for input_fname in (fname, fname + '.gz'):
+            reader = TabularAsciiReader(input_fname, columns_to_keep_dict,
+                row_cut_eq_dict={'halo_upid': -1})
+            for num_threads in (1, 2):
+                arr2 = reader.read_ascii(chunk_memory_size=1e-3, num_threads=num_threads)
+                assert np.all(arr2 == arr[arr['halo_upid'] == -1])
+
+            # Blocks smaller than a single line
+            arr3 = reader.read_ascii(chunk_memory_size=1e-5)
+            assert np.all(arr3 == arr[arr['halo_upid'] == -1])
+
+    def test_read_ascii_bad_line(self):
+        write_tabular_data(self.dummy_fname)
+        with open(self.dummy_fname, 'a') as f:
+            f.write('104  500.  1e13\n')
+
+        columns_to_keep_dict = {'vmax': (1, 'f4'), 'id': (0, 'i8'), 'upid': (3, 'i8')}
+        reader = TabularAsciiReader(self.dummy_fname, columns_to_keep_dict)
+
+        with pytest.raises(ValueError) as err:
+            arr = reader.read_ascii()
+        substr = "104  500.  1e13"
+        assert substr in err.value.args[0]
+
+        with pytest.raises(ValueError) as err:
+            arr = reader.read_ascii(num_threads=0)
+        substr = "Input ``num_threads`` argument must be a positive integer or the string 'max'"
+        assert substr in err.value.args[0]
+
+    def test_read_ascii_integer_overflow(self):
+        write_tabular_data(self.dummy_fname)
+        with open(self.dummy_fname, 'a') as f:
+            f.write('99999999999999999999  500.  1e13  -1\n')
+
+        columns_to_keep_dict = {'vmax': (1, 'f4'), 'id': (0, 'i8')}
+        reader = TabularAsciiReader(self.dummy_fname, columns_to_keep_dict)
+
+        with pytest.raises(ValueError) as err:
+            arr = reader.read_ascii()
+        substr = "99999999999999999999  500.  1e13  -1"
+        assert substr in err.value.args[0]
+
+    def test_read_ascii_strings(self):
+        """ Columns that are not numbers are parsed by the python fallback.
+        """
+        write_tabular_data(self.dummy_fname)
+
+        columns_to_keep_dict = {'vmax': (1, 'f4'), 'id': (0, 'S3')}
+        reader = TabularAsciiReader(self.dummy_fname, columns_to_keep_dict)
+        arr = reader.read_ascii()
+        assert np.all(arr['id'] == [b'100', b'101', b'102', b'103'])
+        assert np.all(arr['vmax'] == [100, 200, 300, 400])
+
     def tearDown(self):
         try:
             shutil.rmtree(self.tmpdir)
         except:
             pass
+
+
+def test_read_ascii_single_pass(capsys):
+    """ Verify that the file is read without pre-counting the header and data rows,
+    and that the progress is reported as the fraction of the file read.
+    """
+    tmpdir = os.path.join(_find_home(), '.temp_halotools_testing_dir_single_pass')
+    try:
+        os.makedirs(tmpdir)
+    except OSError:
+        pass
+
+    fname1 = os.path.join(tmpdir, 'header_char.txt')
+    write_tabular_data(fname1)
+    with open(fname1, 'r') as f:
+        lines = f.readlines()
+    fname2 = os.path.join(tmpdir, 'no_header_char.txt')
+    with open(fname2, 'w') as f:
+        f.write('id  vmax  mvir  upid\n')
+        f.write(''.join(lines[1:]))
+
+    def forbidden_scan():
+        raise AssertionError("The ASCII file should only be scanned once")
+
+    columns_to_keep_dict = {'vmax': (1, 'f4'), 'id': (0, 'i8'), 'upid': (3, 'i8')}
+    try:
+        for fname, num_lines_header in ((fname1, None), (fname2, 1)):
+            reader = TabularAsciiReader(fname, columns_to_keep_dict,
+                num_lines_header=num_lines_header)
+            reader.header_len = forbidden_scan
+            reader.data_len = forbidden_scan
+
+            arr = reader.read_ascii(chunk_memory_size=20e-6)
+            assert np.all(arr['id'] == [100, 101, 102, 103])
+            assert np.all(arr['upid'] == [3999494332, -1, 3999494331, 3999494332])
+            out, err = capsys.readouterr()
+            assert "100.0% of the file read" in out
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_parse_ascii_block_pickles():
+    """ Verify that the function and arguments sent to the worker processes
+    of `~halotools.sim_manager.TabularAsciiReader.read_ascii` can be pickled.
+    """
+    tmpdir = os.path.join(_find_home(), '.temp_halotools_testing_dir_pickle')
+    try:
+        os.makedirs(tmpdir)
+    except OSError:
+        pass
+    try:
+        fname = os.path.join(tmpdir, 'abc.txt')
+        write_tabular_data(fname)
+        columns_to_keep_dict = {'vmax': (1, 'f4'), 'id': (0, 'i8')}
+        reader = TabularAsciiReader(fname, columns_to_keep_dict, row_cut_min_dict={'vmax': 150})
+
+        func = pickle.loads(pickle.dumps(_parse_ascii_block))
+        parse_args = pickle.loads(pickle.dumps(reader._parse_ascii_block_args()))
+        with open(fname, 'rb') as f:
+            arr = func(bytearray(f.read()), *parse_args)
+        assert np.all(arr['id'] == [101, 102, 103])
+        assert np.all(arr['vmax'] == [200, 300, 400])
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_read_ascii_decimal_comma_locale(monkeypatch):
+    """ The cython engine parses floats with strtod, which depends on the locale,
+    so the data are parsed in python when the decimal point is not a period.
+    """
+    tmpdir = os.path.join(_find_home(), '.temp_halotools_testing_dir_locale')
+    try:
+        os.makedirs(tmpdir)
+    except OSError:
+        pass
+    try:
+        fname = os.path.join(tmpdir, 'abc.txt')
+        write_tabular_data(fname)
+        columns_to_keep_dict = {'vmax': (1, 'f4'), 'mvir': (2, 'f8'), 'id': (0, 'i8')}
+        reader = TabularAsciiReader(fname, columns_to_keep_dict)
+
+        def engine_not_allowed(*args):
+            raise AssertionError("The cython engine should not be called")
+
+        monkeypatch.setattr(locale, 'localeconv', lambda: {'decimal_point': ','})
+        monkeypatch.setattr(tabular_ascii_reader, 'ascii_parsing_engine', engine_not_allowed)
+        arr = reader.read_ascii()
+        assert np.all(arr['id'] == [100, 101, 102, 103])
+        assert np.all(arr['vmax'] == [100, 200, 300, 400])
+        assert np.all(arr['mvir'] == [1e9, 1e10, 1e11, 1e12])
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_ascii_parsing_engine_stays_inside_block():
+    """ Verify that the engine reads no field past the end of a block that is
+    not NUL-terminated and whose last line does not end with a newline.
+    """
+    data = bytearray(b'1 a 2.5\n3 b 4.5999')
+    block = memoryview(data)[:15]
+    float_data, int_data, error_offset = ascii_parsing_engine(block,
+        np.array([0, 2]), np.array([True, False]), b'#')
+    assert error_offset == -1
+    assert np.all(int_data[:, 0] == [1, 3])
+    assert np.all(float_data[:, 0] == [2.5, 4.5])
+
+    block = memoryview(data)[:12]
+    float_data, int_data, error_offset = ascii_parsing_engine(block,
+        np.array([0, 2]), np.array([True, False]), b'#')
+    assert error_offset == 8
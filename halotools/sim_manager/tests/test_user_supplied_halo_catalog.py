@@ -20,12 +20,14 @@ import numpy as np
 from copy import deepcopy
 
 from . import helper_functions
+from .helper_functions import _is_memory_mapped
 
 from astropy.table import Table
 
 from .. import UserSuppliedHaloCatalog
 from ..user_supplied_ptcl_catalog import UserSuppliedPtclCatalog
 from ..halo_table_cache import HaloTableCache
+from ..ptcl_table_cache import PtclTableCache
 
 from ...custom_exceptions import HalotoolsError
 
@@ -42,7 +44,6 @@ else:
 
 __all__ = ('TestUserSuppliedHaloCatalog', )
 
-
 class TestUserSuppliedHaloCatalog(TestCase):
     """ Class providing tests of the `~halotools.sim_manager.UserSuppliedHaloCatalog`.
     """
@@ -458,6 +459,105 @@ class TestUserSuppliedHaloCatalog(TestCase):
             update_ascii=True,
             delete_corresponding_halo_catalog=True)
 
+    @pytest.mark.skipif('not HAS_H5PY')
+    def test_add_halocat_to_cache7(self):
+        """ Verify that a catalog stored in the columnar layout can be loaded
+        lazily by `~halotools.sim_manager.CachedHaloCatalog`.
+        """
+        halocat = UserSuppliedHaloCatalog(Lbox=200,
+            particle_mass=100, redshift=self.redshift,
+            **self.good_halocat_args)
+
+        basename = 'abc.hdf5'
+        fname = os.path.join(self.dummy_cache_baseloc, basename)
+
+        simname = 'dummy_simname'
+        halo_finder = 'dummy_halo_finder'
+        version_name = 'dummy_version_name'
+        processing_notes = 'dummy processing notes'
+
+        halocat.add_halocat_to_cache(
+            fname, simname, halo_finder, version_name, processing_notes,
+            overwrite=True, columnar_layout=True)
+
+        with h5py.File(fname, 'r') as f:
+            assert isinstance(f['data'], h5py.Group)
+
+        from ..cached_halo_catalog import CachedHaloCatalog
+        halocat2 = CachedHaloCatalog(fname=fname)
+        assert halocat2.lazy_halo_table.columnar_layout is True
+        assert np.all(halocat2.lazy_halo_table['halo_mass'] == self.halo_mass)
+        assert halocat2.lazy_halo_table.loaded_colnames == ['halo_mass']
+        for key in self.good_halocat_args.keys():
+            assert np.all(halocat2.halo_table[key] == halocat.halo_table[key])
+
+        cache = HaloTableCache()
+        cache.remove_entry_from_cache_log(
+            halocat.log_entry.simname,
+            halocat.log_entry.halo_finder,
+            halocat.log_entry.version_name,
+            halocat.log_entry.redshift,
+            halocat.log_entry.fname,
+            raise_non_existence_exception=True,
+            update_ascii=True,
+            delete_corresponding_halo_catalog=True)
+
+    @pytest.mark.skipif('not HAS_H5PY')
+    def test_add_halocat_to_cache8(self):
+        """ Verify that halos and particles cached in either layout
+        can be memory-mapped by `~halotools.sim_manager.CachedHaloCatalog`.
+        """
+        halocat = UserSuppliedHaloCatalog(Lbox=200,
+            particle_mass=100, redshift=self.redshift,
+            **self.good_halocat_args)
+        ptclcat = UserSuppliedPtclCatalog(Lbox=200,
+            particle_mass=100, redshift=self.redshift,
+            x=np.linspace(0, 200, self.num_ptcl), y=np.zeros(self.num_ptcl), z=np.zeros(self.num_ptcl))
+
+        halo_fname = os.path.join(self.dummy_cache_baseloc, 'halos.hdf5')
+        ptcl_fname = os.path.join(self.dummy_cache_baseloc, 'ptcls.hdf5')
+        simname = 'dummy_memmap_simname'
+        halo_finder = 'dummy_halo_finder'
+        version_name = 'dummy_version_name'
+        processing_notes = 'dummy processing notes'
+
+        halocat.add_halocat_to_cache(
+            halo_fname, simname, halo_finder, version_name, processing_notes,
+            overwrite=True)
+        ptclcat.add_ptclcat_to_cache(
+            ptcl_fname, simname, version_name, processing_notes,
+            overwrite=True, columnar_layout=True)
+
+        try:
+            from ..cached_halo_catalog import CachedHaloCatalog
+            halocat2 = CachedHaloCatalog(simname=simname, halo_finder=halo_finder,
+                version_name=version_name, ptcl_version_name=version_name,
+                redshift=self.redshift, memmap=True)
+            for key in self.good_halocat_args.keys():
+                assert _is_memory_mapped(halocat2.halo_table[key])
+                assert np.all(halocat2.halo_table[key] == halocat.halo_table[key])
+            for key in ('x', 'y', 'z'):
+                assert _is_memory_mapped(halocat2.ptcl_table[key])
+                assert np.all(halocat2.ptcl_table[key] == ptclcat.ptcl_table[key])
+        finally:
+            HaloTableCache().remove_entry_from_cache_log(
+                halocat.log_entry.simname,
+                halocat.log_entry.halo_finder,
+                halocat.log_entry.version_name,
+                halocat.log_entry.redshift,
+                halocat.log_entry.fname,
+                raise_non_existence_exception=False,
+                update_ascii=True,
+                delete_corresponding_halo_catalog=True)
+            PtclTableCache().remove_entry_from_cache_log(
+                ptclcat.log_entry.simname,
+                ptclcat.log_entry.version_name,
+                ptclcat.log_entry.redshift,
+                ptclcat.log_entry.fname,
+                raise_non_existence_exception=False,
+                update_ascii=True,
+                delete_corresponding_ptcl_catalog=True)
+
     def tearDown(self):
         try:
             shutil.rmtree(self.dummy_cache_baseloc)
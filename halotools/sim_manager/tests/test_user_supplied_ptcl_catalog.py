@@ -19,11 +19,13 @@ import numpy as np
 from copy import copy, deepcopy
 
 from . import helper_functions
+from .helper_functions import _is_memory_mapped
 
 from astropy.table import Table
 
 from ..user_supplied_ptcl_catalog import UserSuppliedPtclCatalog
 from ..ptcl_table_cache import PtclTableCache
+from ..lazy_halo_table import LazyHaloTable
 
 from ...custom_exceptions import HalotoolsError
 
@@ -301,6 +303,43 @@ class TestUserSuppliedPtclCatalog(TestCase):
             update_ascii=True,
             delete_corresponding_ptcl_catalog=True)
 
+    @pytest.mark.skipif('not HAS_H5PY')
+    def test_add_ptclcat_to_cache_memmap(self):
+        """ Verify that particles cached in either layout can be memory-mapped
+        the same way `~halotools.sim_manager.CachedHaloCatalog.ptcl_table` loads them.
+        """
+        ptclcat = UserSuppliedPtclCatalog(Lbox=200,
+            particle_mass=100, redshift=self.redshift,
+            **self.good_ptclcat_args)
+
+        simname = 'dummy_simname'
+        processing_notes = 'dummy processing notes'
+
+        for columnar_layout in (False, True):
+            version_name = 'dummy_version_name_' + str(columnar_layout)
+            fname = os.path.join(self.dummy_cache_baseloc, version_name + '.hdf5')
+            ptclcat.add_ptclcat_to_cache(
+                fname, simname, version_name, processing_notes,
+                overwrite=True, columnar_layout=columnar_layout)
+
+            try:
+                ptcl_table = LazyHaloTable(fname, path='data', memmap=True).as_table()
+                for key in ('x', 'y', 'z'):
+                    assert _is_memory_mapped(ptcl_table[key])
+                    assert np.all(ptcl_table[key] == ptclcat.ptcl_table[key])
+
+                ptcl_table['x'][:] = -1
+                assert np.all(LazyHaloTable(fname)['x'] == ptclcat.ptcl_table['x'])
+            finally:
+                PtclTableCache().remove_entry_from_cache_log(
+                    ptclcat.log_entry.simname,
+                    ptclcat.log_entry.version_name,
+                    ptclcat.log_entry.redshift,
+                    ptclcat.log_entry.fname,
+                    raise_non_existence_exception=False,
+                    update_ascii=True,
+                    delete_corresponding_ptcl_catalog=True)
+
     def tearDown(self):
         try:
             shutil.rmtree(self.dummy_cache_baseloc)
@@ -12,6 +12,7 @@ from astropy.table import Table, Column
 from .halo_table_cache import HaloTableCache
 from .halo_table_cache_log_entry import HaloTableCacheLogEntry, get_redshift_string
 from .user_supplied_ptcl_catalog import UserSuppliedPtclCatalog
+from .lazy_halo_table import _write_columnar_table
 
 from ..utils.array_utils import custom_len
 
@@ -318,7 +319,7 @@ class UserSuppliedHaloCatalog(object):
 
     def add_halocat_to_cache(self,
             fname, simname, halo_finder, version_name, processing_notes,
-            overwrite=False, **additional_metadata):
+            overwrite=False, columnar_layout=False, **additional_metadata):
         """
         Parameters
         ------------
@@ -350,6 +351,15 @@ class UserSuppliedHaloCatalog(object):
             If the chosen ``fname`` already exists, then you must set ``overwrite``
             to True in order to write the file to disk. Default is False.
 
+        columnar_layout : bool, optional
+            If True, each column of the halo table will be stored in its own
+            hdf5 dataset, so that reading a few columns with
+            `~halotools.sim_manager.CachedHaloCatalog.lazy_halo_table` does not
+            require reading the entire catalog from disk.
+            Files written in this layout can no longer be read with
+            ``Table.read(fname, path='data')``.
+            Default is False, for the standard layout.
+
         **additional_metadata : sequence of strings, optional
             Each keyword of ``additional_metadata`` defines the name
             of a piece of metadata stored in the hdf5 file. The
@@ -411,7 +421,10 @@ class UserSuppliedHaloCatalog(object):
         ############################################################
         # Now write the file to disk and add the appropriate metadata
 
-        self.halo_table.write(fname, path='data', overwrite=overwrite)
+        if columnar_layout is True:
+            _write_columnar_table(self.halo_table, fname, path='data', overwrite=overwrite)
+        else:
+            self.halo_table.write(fname, path='data', overwrite=overwrite)
 
         f = h5py.File(fname)
 
@@ -17,6 +17,7 @@ except ImportError:
 from .ptcl_table_cache import PtclTableCache
 from .ptcl_table_cache_log_entry import PtclTableCacheLogEntry
 from .halo_table_cache_log_entry import get_redshift_string
+from .lazy_halo_table import _write_columnar_table
 
 from ..utils.array_utils import custom_len
 from ..custom_exceptions import HalotoolsError
@@ -230,7 +231,7 @@ class UserSuppliedPtclCatalog(object):
             raise HalotoolsError(msg)
 
     def add_ptclcat_to_cache(self, fname, simname, version_name,
-                             processing_notes, overwrite=False):
+                             processing_notes, overwrite=False, columnar_layout=False):
 
         """
         Parameters
@@ -258,6 +259,14 @@ class UserSuppliedPtclCatalog(object):
             If the chosen ``fname`` already exists, then you must set ``overwrite``
             to True in order to write the file to disk. Default is False.
 
+        columnar_layout : bool, optional
+            If True, each column of the particle table will be stored in its own
+            hdf5 dataset, so that reading a few columns does not
+            require reading the entire catalog from disk.
+            Files written in this layout can no longer be read with
+            ``Table.read(fname, path='data')``.
+            Default is False, for the standard layout.
+
         """
 
         ############################################################
@@ -294,7 +303,10 @@ class UserSuppliedPtclCatalog(object):
         ############################################################
         # Now write the file to disk and add the appropriate metadata
 
-        self.ptcl_table.write(fname, path='data', overwrite=overwrite)
+        if columnar_layout is True:
+            _write_columnar_table(self.ptcl_table, fname, path='data', overwrite=overwrite)
+        else:
+            self.ptcl_table.write(fname, path='data', overwrite=overwrite)
 
         f = h5py.File(fname)
 
@@ -0,0 +1,24 @@
+""" Module storing helper functions shared by the methods of Halotools
+that run in parallel processes.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import multiprocessing
+
+
+__all__ = ()
+
+
+def _process_num_threads(num_threads):
+    """ Process the ``num_threads`` argument of the methods running in parallel processes,
+    which is either a positive integer or the string 'max' to use all available cores.
+    """
+    if num_threads == 'max':
+        num_threads = multiprocessing.cpu_count()
+    try:
+        num_threads = int(num_threads)
+        assert num_threads >= 1
+    except (TypeError, ValueError, AssertionError):
+        msg = "Input ``num_threads`` argument must be a positive integer or the string 'max'"
+        raise ValueError(msg)
+    return num_threads
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+Command-line script to benchmark how the runtime of the pair counters
+scales with the number of separation bins.
+
+The pairs of a uniform random sample in a periodic box are counted with
+`npairs_3d`, `npairs_xy_z` and `npairs_s_mu` for an increasing number of bins.
+The engines locate the bin of each pair with a binary search, so the
+runtime should remain nearly flat as the number of bins grows.
+The wall-clock time of each pair counter is printed for each number of bins.
+
+Example usage:
+
+$ python benchmark_pair_counter_binning.py 100000 -num_bins 5 20 50 100
+"""
+
+import argparse
+from time import time
+
+import numpy as np
+
+from halotools.mock_observables.pair_counters import npairs_3d, npairs_xy_z, npairs_s_mu
+
+
+def time_pair_counter(func, *args, **kwargs):
+    """ Return the wall-clock time of calling ``func``.
+    """
+    start = time()
+    func(*args, **kwargs)
+    return time() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("npts", type=int, help="Number of points in the sample")
+    parser.add_argument("-num_bins", type=int, nargs='+', default=[5, 10, 20, 50, 100],
+        help="Numbers of separation bins in each dimension")
+    parser.add_argument("-Lbox", type=float, default=250., help="Box size in Mpc/h")
+    parser.add_argument("-rmax", type=float, default=20., help="Maximum pair separation in Mpc/h")
+    parser.add_argument("-num_threads", type=int, default=1, help="Number of processes")
+    parser.add_argument("-seed", type=int, default=43, help="Random number seed")
+    args = parser.parse_args()
+
+    Lbox, rmax = args.Lbox, args.rmax
+    rng = np.random.RandomState(args.seed)
+    sample = rng.uniform(0, Lbox, (args.npts, 3))
+    kwargs = dict(period=Lbox, num_threads=args.num_threads)
+
+    print("\nSample with {0} points, rmax = {1} Mpc/h".format(args.npts, rmax))
+    print("{0:>10} {1:>12} {2:>12} {3:>12}".format(
+        "num_bins", "npairs_3d", "npairs_xy_z", "npairs_s_mu"))
+    for num_bins in args.num_bins:
+        rbins = np.logspace(-1, np.log10(rmax), num_bins)
+        pi_bins = np.linspace(0, rmax, num_bins)
+        mu_bins = np.linspace(0, 1, num_bins)
+
+        t_3d = time_pair_counter(npairs_3d, sample, sample, rbins, **kwargs)
+        t_xy_z = time_pair_counter(npairs_xy_z, sample, sample, rbins, pi_bins, **kwargs)
+        t_s_mu = time_pair_counter(npairs_s_mu, sample, sample, rbins, mu_bins, **kwargs)
+        print("{0:>10} {1:>11.2f}s {2:>11.2f}s {3:>11.2f}s".format(
+            num_bins, t_3d, t_xy_z, t_s_mu))
+    print("")
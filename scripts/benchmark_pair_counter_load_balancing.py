@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+Command-line script to benchmark the load balancing of the parallelized
+pair counters on a spatially clustered mock galaxy sample.
+
+The script generates a sample in a periodic box in which a fraction of the points
+is placed in a small number of compact clusters whose richness follows
+a power-law distribution, mimicking the one-halo term of a galaxy mock.
+The pairs of this sample are then counted with the npairs_3d engine
+using two schemes to divide the cells of the mesh among the processes:
+
+    * static: the cells are split into ``num_threads`` chunks with
+      equal numbers of cells, which was the only behavior of halotools <= 0.7
+
+    * balanced: the cells are split into many contiguous work units of equal
+      estimated cost that are handed out dynamically to the next free process
+
+The wall-clock time of each scheme is printed, together with
+the ratio of the slowest to the mean estimated cost of the work units
+assigned by the static split.
+
+Example usage:
+
+$ python benchmark_pair_counter_load_balancing.py 200000 -num_threads=4
+"""
+
+import argparse
+from functools import partial
+from time import time
+
+import numpy as np
+
+from halotools.mock_observables.pair_counters import RectangularDoubleMesh
+from halotools.mock_observables.pair_counters.cpairs import npairs_3d_engine
+from halotools.mock_observables.pair_counters.mesh_helpers import (
+    _cell1_parallelization_indices, _map_engine_over_cell1_tuples, _cell1_work_estimates)
+
+
+def clustered_mock(npts, Lbox, num_clusters, cluster_fraction, cluster_radius, seed):
+    """ Return an array of shape (npts, 3) storing a uniform background plus
+    ``num_clusters`` compact clusters containing ``cluster_fraction`` of the points.
+    """
+    rng = np.random.RandomState(seed)
+    num_cluster_pts = int(npts*cluster_fraction)
+    num_background_pts = npts - num_cluster_pts
+
+    richness = rng.pareto(1., num_clusters) + 1.
+    richness = np.round(num_cluster_pts*richness/richness.sum()).astype(int)
+    richness[0] += num_cluster_pts - richness.sum()
+
+    centers = rng.uniform(0, Lbox, (num_clusters, 3))
+    cluster_pts = np.repeat(centers, richness, axis=0)
+    cluster_pts += rng.normal(scale=cluster_radius, size=cluster_pts.shape)
+
+    background_pts = rng.uniform(0, Lbox, (num_background_pts, 3))
+    return np.mod(np.vstack((cluster_pts, background_pts)), Lbox)
+
+
+def time_scheme(engine, double_mesh, num_threads, balanced):
+    """ Return the wall-clock time and the result of counting pairs with the given scheme.
+    """
+    kwargs = {'double_mesh': double_mesh} if balanced else {}
+    start = time()
+    num_threads, cell1_tuples = _cell1_parallelization_indices(
+        double_mesh.mesh1.ncells, num_threads, **kwargs)
+    result = _map_engine_over_cell1_tuples(engine, cell1_tuples, num_threads)
+    counts = np.sum(np.array(result), axis=0)
+    return time() - start, counts, cell1_tuples
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("npts", type=int, help="Number of points in the mock")
+    parser.add_argument("-num_threads", type=int, default=4, help="Number of processes")
+    parser.add_argument("-Lbox", type=float, default=250., help="Box size in Mpc/h")
+    parser.add_argument("-rmax", type=float, default=10., help="Maximum pair separation in Mpc/h")
+    parser.add_argument("-num_clusters", type=int, default=50,
+        help="Number of compact clusters in the mock")
+    parser.add_argument("-cluster_fraction", type=float, default=0.3,
+        help="Fraction of the points residing in the clusters")
+    parser.add_argument("-cluster_radius", type=float, default=0.5,
+        help="Gaussian scatter of the cluster members about their center in Mpc/h")
+    parser.add_argument("-seed", type=int, default=43, help="Random number seed")
+    args = parser.parse_args()
+
+    Lbox, rmax = args.Lbox, args.rmax
+    sample = clustered_mock(args.npts, Lbox, args.num_clusters,
+        args.cluster_fraction, args.cluster_radius, args.seed)
+    x, y, z = sample[:, 0], sample[:, 1], sample[:, 2]
+    rbins = np.logspace(-1, np.log10(rmax), 15)
+
+    cell_size = Lbox/10.
+    double_mesh = RectangularDoubleMesh(x, y, z, x, y, z,
+        cell_size, cell_size, cell_size, cell_size, cell_size, cell_size,
+        rmax, rmax, rmax, Lbox, Lbox, Lbox)
+    engine = partial(npairs_3d_engine, double_mesh, x, y, z, x, y, z, rbins)
+
+    static_time, static_counts, static_tuples = time_scheme(
+        engine, double_mesh, args.num_threads, False)
+    balanced_time, balanced_counts, balanced_tuples = time_scheme(
+        engine, double_mesh, args.num_threads, True)
+    assert np.all(static_counts == balanced_counts)
+
+    work = _cell1_work_estimates(double_mesh)
+    static_work = np.array([work[first:last].sum() for first, last in static_tuples])
+
+    print("\nMock with {0} points, {1:.0f}% in {2} clusters".format(
+        args.npts, 100*args.cluster_fraction, args.num_clusters))
+    print("Maximum/mean estimated work per process for static split = {0:.2f}".format(
+        static_work.max()/static_work.mean()))
+    print("Static split into {0} chunks: {1:.2f} seconds".format(
+        len(static_tuples), static_time))
+    print("Balanced split into {0} work units: {1:.2f} seconds".format(
+        len(balanced_tuples), balanced_time))
+    print("Speedup = {0:.2f}\n".format(static_time/balanced_time))
@@ -11,12 +11,14 @@ from setuptools import setup
 from pkg_resources import parse_version
 try:
     import cython
-    if parse_version(cython.__version__) < parse_version('0.23'):
-            raise ImportError("Halotools requires Cython>=0.23, but your installed "
-                            "Cython is older.  Please upgrade before trying to "
-                            "build Halotools.")
 except ImportError:
     pass  # Cython not installed, which is fine for release versions
+else:
+    # const memoryviews in the cython engines require Cython>=0.28
+    if parse_version(cython.__version__) < parse_version('0.28'):
+            raise ImportError("Halotools requires Cython>=0.28, but your installed "
+                            "Cython is older.  Please upgrade before trying to "
+                            "build Halotools.")
 
 #A dirty hack to get around some early import/configurations ambiguities
 if sys.version_info[0] >= 3: